@@ -0,0 +1,102 @@
+"""
+활동 분석 저장소 (SQLite) 수집 / 조회
+
+사용법:
+    python scripts/analytics/activity_analytics.py ingest                  # downloads/, strava_data/ 수집
+    python scripts/analytics/activity_analytics.py ingest --samples 0      # 요약만 (샘플 저장 안 함)
+    python scripts/analytics/activity_analytics.py weekly --since 2025-01-01 --source strava
+    python scripts/analytics/activity_analytics.py monthly
+    python scripts/analytics/activity_analytics.py sql "SELECT sport, SUM(kilojoules) FROM activities GROUP BY 1"
+
+MyWhoosh FIT와 Strava 백업은 같은 라이딩을 중복으로 담고 있으므로 합계는 출처별로 나눠서 보여줍니다.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리 설정
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.analytics_store import DEFAULT_SAMPLE_INTERVAL, AnalyticsStore, source_files
+
+
+def cmd_ingest(store, args):
+    files = source_files(args.downloads, args.strava_dir)
+    print(f"📂 대상 파일: {len(files)}개")
+    started = time.perf_counter()
+    counts = store.ingest(files, workers=args.workers, sample_interval=args.samples, full=args.full)
+    elapsed = time.perf_counter() - started
+
+    print(f"✅ 수집 완료 ({elapsed:.2f}초)")
+    print(f"  새로 파싱: {counts['parsed']}개, 변경 없음: {counts['skipped'] + counts['unchanged']}개"
+          f" (해시 동일 {counts['unchanged']}개), 활동 없음: {counts['empty']}개")
+    for path, error in counts['errors']:
+        print(f"  ⚠️  실패: {Path(path).name} - {error}")
+    stats = store.stats()
+    print(f"  저장소: 활동 {stats['activities']:,}개, 샘플 {stats['samples']:,}개 ({store.db_path})")
+    return 1 if counts['errors'] else 0
+
+
+def print_rows(rows, elapsed):
+    if not rows:
+        print("  결과 없음")
+    else:
+        columns = rows[0].keys()
+        print('  '.join(f"{c:>12}" for c in columns))
+        for row in rows:
+            print('  '.join(f"{v:>12.1f}" if isinstance(v, float) else f"{str(v):>12}" for v in row))
+    print(f"\n⏱️  {len(rows)}행, {elapsed * 1000:.1f}ms")
+
+
+def cmd_rollup(store, args):
+    started = time.perf_counter()
+    rows = store.rollup(args.command, source=args.source, since=args.since)
+    print_rows(rows, time.perf_counter() - started)
+    return 0
+
+
+def cmd_sql(store, args):
+    started = time.perf_counter()
+    rows = store.query(args.sql)
+    print_rows(rows, time.perf_counter() - started)
+    return 0
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="활동 분석 저장소")
+    parser.add_argument('--db', help="저장소 파일 (기본: ANALYTICS_DB 또는 data/analytics.sqlite)")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    ingest = sub.add_parser('ingest', help="downloads/, strava_data/ 파일 수집")
+    ingest.add_argument('--downloads', default=str(PROJECT_ROOT / "downloads"))
+    ingest.add_argument('--strava-dir', default=str(PROJECT_ROOT / "strava_data"))
+    ingest.add_argument('--workers', type=int, help="프로세스 수 (기본: CPU 수)")
+    ingest.add_argument('--samples', type=int, default=DEFAULT_SAMPLE_INTERVAL,
+                        help=f"샘플 저장 간격 초 (기본 {DEFAULT_SAMPLE_INTERVAL}, 0이면 저장 안 함)")
+    ingest.add_argument('--full', action='store_true', help="변경 여부와 관계없이 모두 다시 파싱")
+
+    for period in ('weekly', 'monthly'):
+        rollup = sub.add_parser(period, help=f"{'주별' if period == 'weekly' else '월별'} 합계")
+        rollup.add_argument('--since', help="YYYY-MM-DD")
+        rollup.add_argument('--source', choices=('mywhoosh', 'strava'))
+
+    sql = sub.add_parser('sql', help="SQL 직접 조회")
+    sql.add_argument('sql')
+
+    args = parser.parse_args()
+    store = AnalyticsStore(args.db)
+    try:
+        if args.command == 'ingest':
+            return cmd_ingest(store, args)
+        if args.command == 'sql':
+            return cmd_sql(store, args)
+        return cmd_rollup(store, args)
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
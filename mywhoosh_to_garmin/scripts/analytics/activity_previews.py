@@ -0,0 +1,182 @@
+"""
+활동 미리보기 피라미드 / SVG 썸네일 / 카탈로그
+
+사용법:
+    python scripts/analytics/activity_previews.py build                    # downloads/, strava_data/ 전체
+    python scripts/analytics/activity_previews.py build strava_data/123_activity.json --force
+    python scripts/analytics/activity_previews.py series 2025-12-11.fit --channel power --width 800 \\
+        [--start 3600 --end 7200]                                          # 그래프용 JSON
+    python scripts/analytics/activity_previews.py catalogue [--output data/activity_catalogue.html]
+
+미리보기(<이름>.preview.npz)와 썸네일(<이름>.preview.<채널>.svg)은 활동 파일 옆에 만들어지고,
+원본이 바뀌지 않았으면 다시 만들지 않습니다.
+"""
+import argparse
+import html
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from urllib.parse import quote
+
+# 프로젝트 루트 디렉토리 설정
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.analytics_store import source_files
+from src.backup_reader import BackupFormatError, get_header_cache, read_header
+from src.fit_reader import FitFormatError
+from src.preview_pyramid import CHANNELS, Preview, build_preview, thumbnail
+
+DEFAULT_CATALOGUE = PROJECT_ROOT / "data" / "activity_catalogue.html"
+THUMBNAIL_CHANNELS = ('power', 'heart_rate')
+
+
+def activity_files(paths):
+    """인자 → 활동 파일 목록 (없으면 downloads/, strava_data/ 전체)"""
+    if not paths:
+        return [path for path, _ in source_files(PROJECT_ROOT / "downloads", PROJECT_ROOT / "strava_data")]
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(path.glob('**/*.fit')) + sorted(path.glob('*_activity.json')))
+        else:
+            files.append(path)
+    return files
+
+
+def cmd_build(args):
+    started = time.perf_counter()
+    built = 0
+    for path in activity_files(args.paths):
+        try:
+            target = build_preview(path, force=args.force)
+        except (OSError, ValueError, FitFormatError) as e:
+            print(f"  ⚠️  실패: {path.name} - {e}")
+            continue
+        if target is None:
+            print(f"  ⏭️  시계열 없음: {path.name}")
+            continue
+        built += 1
+        for channel in THUMBNAIL_CHANNELS:
+            thumbnail(path, channel)
+    print(f"✅ 미리보기 {built}개 ({time.perf_counter() - started:.2f}초)")
+    return 0
+
+
+def cmd_series(args):
+    try:
+        target = build_preview(args.file)
+    except (OSError, ValueError, FitFormatError) as e:
+        print(f"❌ 실패: {e}")
+        return 1
+    if target is None:
+        print(f"❌ 시계열 없음: {args.file}")
+        return 1
+
+    with Preview(target) as preview:
+        if args.channel not in preview.channels:
+            print(f"❌ 채널 없음: {args.channel} (있는 채널: {', '.join(preview.channels)})")
+            return 1
+        series = preview.series(args.channel, args.width, args.start, args.end)
+
+    def values(array):
+        return [None if value != value else round(float(value), 1) for value in array]
+
+    print(json.dumps({
+        'channel': args.channel,
+        'bucket': series['bucket'],
+        'start': series['start'],
+        'min': values(series['min']),
+        'max': values(series['max']),
+        'mean': values(series['mean']),
+    }, ensure_ascii=False))
+    return 0
+
+
+def image_url(image, base_dir):
+    """카탈로그 기준 상대 URL (파일명의 #, 공백 등은 URL 인코딩)"""
+    return quote(Path(os.path.relpath(image, base_dir)).as_posix())
+
+
+def describe(path, header_cache):
+    """카탈로그 행 (날짜, 이름)"""
+    if path.suffix.lower() == '.json':
+        try:
+            activity = read_header(path, header_cache)['activity']
+            return (activity.get('start_date_local') or '')[:16].replace('T', ' '), activity.get('name', path.stem)
+        except (OSError, ValueError, BackupFormatError):
+            pass
+    return path.stem[:10], path.stem
+
+
+def cmd_catalogue(args):
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    header_cache = get_header_cache()
+    started = time.perf_counter()
+
+    rows = []
+    for path in activity_files(args.paths):
+        try:
+            target = build_preview(path)
+            if target is None:
+                continue
+            with Preview(target) as preview:
+                duration = preview.duration
+            images = [thumbnail(path, channel) for channel in THUMBNAIL_CHANNELS]
+        except (OSError, ValueError, FitFormatError) as e:
+            print(f"  ⚠️  실패: {path.name} - {e}")
+            continue
+        date, name = describe(path, header_cache)
+        cells = ''.join(
+            f'<td><img src="{html.escape(image_url(image, output.parent))}" '
+            f'alt="{channel}"></td>' if image else '<td></td>'
+            for channel, image in zip(THUMBNAIL_CHANNELS, images))
+        rows.append((date, f'<tr><td>{html.escape(date)}</td><td>{html.escape(name)}</td>'
+                           f'<td>{duration // 3600}:{duration % 3600 // 60:02d}</td>{cells}</tr>'))
+    header_cache.save()
+
+    rows.sort(reverse=True)
+    headers = ''.join(f'<th>{channel}</th>' for channel in THUMBNAIL_CHANNELS)
+    output.write_text(
+        '<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>활동 카탈로그</title>'
+        '<style>body{font-family:sans-serif}td,th{padding:2px 8px;text-align:left}</style></head>\n'
+        f'<body><table><tr><th>날짜</th><th>이름</th><th>시간</th>{headers}</tr>\n'
+        + '\n'.join(row for _, row in rows)
+        + '\n</table></body></html>\n', encoding='utf-8')
+    print(f"✅ 카탈로그: {output} ({len(rows)}개, {time.perf_counter() - started:.2f}초)")
+    return 0
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="활동 미리보기 피라미드")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build = sub.add_parser('build', help="미리보기 + 썸네일 만들기")
+    build.add_argument('paths', nargs='*', help="활동 파일/폴더 (기본: downloads/, strava_data/)")
+    build.add_argument('--force', action='store_true', help="최신이어도 다시 만들기")
+
+    series = sub.add_parser('series', help="화면 너비에 맞춘 시계열 (JSON)")
+    series.add_argument('file')
+    series.add_argument('--channel', default='power', choices=CHANNELS)
+    series.add_argument('--width', type=int, default=800, help="버킷 수 상한 (픽셀 너비)")
+    series.add_argument('--start', type=int, default=0, help="시작 (초)")
+    series.add_argument('--end', type=int, help="끝 (초)")
+
+    catalogue = sub.add_parser('catalogue', help="썸네일 카탈로그 HTML")
+    catalogue.add_argument('paths', nargs='*', help="활동 파일/폴더 (기본: downloads/, strava_data/)")
+    catalogue.add_argument('--output', default=str(DEFAULT_CATALOGUE))
+
+    args = parser.parse_args()
+    if args.command == 'build':
+        return cmd_build(args)
+    if args.command == 'series':
+        return cmd_series(args)
+    return cmd_catalogue(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
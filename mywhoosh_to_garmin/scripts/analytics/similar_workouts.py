@@ -0,0 +1,112 @@
+"""
+비슷한 워크아웃 검색 (파워 프로필 특징 벡터 인덱스)
+
+사용법:
+    python scripts/analytics/similar_workouts.py add downloads/          # 과거 FIT 일괄 추가
+    python scripts/analytics/similar_workouts.py find 2025-12-11.fit -k 10
+    python scripts/analytics/similar_workouts.py remove 2025-12-11.fit
+    python scripts/analytics/similar_workouts.py stats
+
+동기화(src/main.py)는 새로 받은 FIT만 추가하므로, 처음 사용할 때 add로 이전 기록을 채웁니다.
+find에 인덱스에 없는 파일을 주면 추가하지 않고 특징만 계산해서 찾습니다.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리 설정
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.fit_reader import FitFormatError
+from src.workout_index import FEATURE_SIZE, WorkoutIndex
+
+
+def fit_files(paths):
+    """파일/폴더 인자 → FIT 파일 목록"""
+    files = []
+    for path in map(Path, paths):
+        files.extend(sorted(path.glob('**/*.fit')) if path.is_dir() else [path])
+    return files
+
+
+def format_entry(entry):
+    minutes = entry['duration'] / 60
+    return (f"{entry['start'][:16]:<18}{minutes:>7.0f}분{entry['avg_power']:>8.0f}"
+            f"{entry['normalized_power']:>7.0f}{entry['work_intervals']:>6}")
+
+
+def cmd_add(index, args):
+    started = time.perf_counter()
+    added = 0
+    for file_path in fit_files(args.paths):
+        try:
+            added += index.add_file(file_path)
+        except (OSError, ValueError, FitFormatError) as e:
+            print(f"  ⚠️  실패: {file_path.name} - {e}")
+    if added:
+        index.save()
+    print(f"✅ 추가/갱신 {added}개, 전체 {len(index)}개 ({time.perf_counter() - started:.2f}초)")
+    return 0
+
+
+def cmd_find(index, args):
+    summary, matches = index.similar_to_file(args.file, args.k)
+    if summary is None:
+        print(f"❌ 파워 데이터가 없습니다: {args.file}")
+        return 1
+
+    print(f"{'':<16}{'시작':<18}{'길이':>8}{'평균W':>8}{'NP':>7}{'작업':>6}   거리")
+    print(f"{'기준':<16}{format_entry(summary)}")
+    for entry, distance in matches:
+        delta = round(entry['normalized_power'] - summary['normalized_power'])
+        print(f"{entry['name']:<16}{format_entry(entry)}   {distance:.3f}  (NP {delta:+d}W)")
+    if not matches:
+        print("  비교할 활동이 없습니다. add로 이전 기록을 추가하세요.")
+    return 0
+
+
+def cmd_remove(index, args):
+    removed = [name for name in args.names if index.remove(name)]
+    for name in set(args.names) - set(removed):
+        print(f"  ⚠️  인덱스에 없음: {name}")
+    if removed:
+        index.save()
+        print(f"🗑️  제거: {', '.join(removed)}")
+    return 0
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="비슷한 워크아웃 검색")
+    parser.add_argument('--data-dir', help="인덱스 폴더 (기본: data/)")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    add = sub.add_parser('add', help="FIT 파일/폴더 추가")
+    add.add_argument('paths', nargs='+')
+
+    find = sub.add_parser('find', help="비슷한 활동 찾기")
+    find.add_argument('file')
+    find.add_argument('-k', type=int, default=5, help="결과 수 (기본 5)")
+
+    remove = sub.add_parser('remove', help="활동 제거 (파일명)")
+    remove.add_argument('names', nargs='+')
+
+    sub.add_parser('stats', help="인덱스 정보")
+
+    args = parser.parse_args()
+    index = WorkoutIndex(args.data_dir)
+
+    if args.command == 'add':
+        return cmd_add(index, args)
+    if args.command == 'find':
+        return cmd_find(index, args)
+    if args.command == 'remove':
+        return cmd_remove(index, args)
+    print(f"활동 {len(index)}개 × 특징 {FEATURE_SIZE}개 (float32, {index.matrix.nbytes / 1024:.1f}KB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
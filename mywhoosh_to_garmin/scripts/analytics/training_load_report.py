@@ -0,0 +1,97 @@
+"""
+훈련 부하 (CTL / ATL / TSB) 조회 / 과거 활동 반영 / 삭제
+
+사용법:
+    python scripts/analytics/training_load_report.py show [--days 42]
+    python scripts/analytics/training_load_report.py add downloads/            # 과거 FIT 일괄 반영
+    python scripts/analytics/training_load_report.py remove 2025-12-11.fit      # 삭제한 활동 제거
+
+동기화(src/main.py)는 새로 받은 FIT만 반영하므로, 처음 사용할 때 add로 이전 기록을 채웁니다.
+과거 날짜가 추가/삭제되면 그 날짜부터만 다시 계산합니다.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리 설정
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.training_load import CTL_DAYS, TrainingLoad
+
+
+def fit_files(paths):
+    """파일/폴더 인자 → FIT 파일 목록"""
+    files = []
+    for path in map(Path, paths):
+        files.extend(sorted(path.glob('**/*.fit')) if path.is_dir() else [path])
+    return files
+
+
+def print_series(model, days):
+    rows = model.series(days)
+    if not rows:
+        print("  기록된 활동이 없습니다.")
+        return
+    print(f"{'날짜':<12}{'부하':>8}{'CTL':>8}{'ATL':>8}{'TSB':>8}")
+    for day, load, ctl, atl, tsb in rows:
+        print(f"{day.isoformat():<12}{load:>8.0f}{ctl:>8.1f}{atl:>8.1f}{tsb:>+8.1f}")
+    print(f"\n활동 {len(model.activities)}개, FTP {model.ftp:g}W, LTHR {model.lthr:g}bpm")
+
+
+def cmd_add(model, args):
+    started = time.perf_counter()
+    changed = 0
+    for file_path in fit_files(args.paths):
+        try:
+            changed += model.add_file(file_path)
+        except (OSError, ValueError) as e:
+            print(f"  ⚠️  실패: {file_path.name} - {e}")
+    days = model.update()
+    model.save()
+    print(f"✅ 반영: 새/변경 활동 {changed}개, {days}일 계산 ({time.perf_counter() - started:.2f}초)")
+    return 0
+
+
+def cmd_remove(model, args):
+    for name in args.names:
+        if model.remove_activity(name):
+            print(f"🗑️  제거: {name}")
+        else:
+            print(f"  ⚠️  기록 없음: {name}")
+    days = model.update()
+    model.save()
+    print(f"✅ {days}일 다시 계산")
+    return 0
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="훈련 부하 (CTL/ATL/TSB)")
+    parser.add_argument('--data-dir', help="상태 파일 폴더 (기본: data/)")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    show = sub.add_parser('show', help="최근 시계열")
+    show.add_argument('--days', type=int, default=CTL_DAYS)
+
+    add = sub.add_parser('add', help="FIT 파일/폴더 반영")
+    add.add_argument('paths', nargs='+')
+
+    remove = sub.add_parser('remove', help="활동 제거 (파일명)")
+    remove.add_argument('names', nargs='+')
+
+    args = parser.parse_args()
+    model = TrainingLoad(args.data_dir)
+
+    if args.command == 'add':
+        return cmd_add(model, args)
+    if args.command == 'remove':
+        return cmd_remove(model, args)
+    model.update()
+    print_series(model, args.days)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
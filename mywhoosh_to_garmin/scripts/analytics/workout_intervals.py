@@ -0,0 +1,89 @@
+"""
+구조화 워크아웃 인터벌 (작업 / 회복 / 램프) 확인 및 FIT lap 기록
+
+사용법:
+    python scripts/analytics/workout_intervals.py MyWhoosh_Sweetspot_1.fit [--ftp 250]
+    python scripts/analytics/workout_intervals.py downloads/ --write-laps     # lap 기록 (lap 1개 이하 파일만)
+    python scripts/analytics/workout_intervals.py file.fit --write-laps --replace   # 기존 lap 교체
+    python scripts/analytics/workout_intervals.py file.fit --json
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리 설정
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.fit_reader import FitFormatError
+from src.interval_detector import Workout, add_laps, detect_intervals
+
+KIND_LABELS = {'work': '작업', 'recovery': '회복', 'ramp': '램프'}
+
+
+def fit_files(paths):
+    """파일/폴더 인자 → FIT 파일 목록"""
+    files = []
+    for path in map(Path, paths):
+        files.extend(sorted(path.glob('**/*.fit')) if path.is_dir() else [path])
+    return files
+
+
+def format_duration(seconds):
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+def print_intervals(file_path, intervals, elapsed):
+    print(f"\n📄 {file_path.name} ({len(intervals)}개 구간, {elapsed * 1000:.1f}ms)")
+    print(f"{'#':>3}  {'종류':<4}{'시작':>8}{'길이':>8}{'평균W':>8}{'NP':>7}{'최대W':>7}{'심박':>6}{'케이던스':>8}")
+    for number, interval in enumerate(intervals, 1):
+        heart_rate = f"{interval.avg_heart_rate:.0f}" if interval.avg_heart_rate else '-'
+        cadence = f"{interval.avg_cadence:.0f}" if interval.avg_cadence else '-'
+        print(f"{number:>3}  {KIND_LABELS[interval.kind]:<4}{format_duration(interval.start):>8}"
+              f"{format_duration(interval.duration):>8}{interval.avg_power:>8.0f}"
+              f"{interval.normalized_power:>7.0f}{interval.max_power:>7}{heart_rate:>6}{cadence:>8}")
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="워크아웃 인터벌 검출")
+    parser.add_argument('paths', nargs='+', help="FIT 파일 또는 폴더")
+    parser.add_argument('--ftp', type=float, help="기능적 역치 파워 (기본: TRAINING_FTP 또는 200)")
+    parser.add_argument('--write-laps', action='store_true', help="검출한 인터벌을 FIT lap으로 기록")
+    parser.add_argument('--replace', action='store_true', help="lap이 이미 여러 개여도 교체")
+    parser.add_argument('--json', action='store_true', help="JSON으로 출력")
+    args = parser.parse_args()
+
+    results = {}
+    for file_path in fit_files(args.paths):
+        try:
+            if args.write_laps:
+                started = time.perf_counter()
+                intervals = add_laps(file_path, args.ftp, replace=args.replace)
+                if intervals is None:
+                    print(f"⏭️  건너뜀: {file_path.name} (lap이 이미 있거나 인터벌 없음)")
+                    continue
+                print(f"🧩 lap {len(intervals)}개 기록: {file_path.name}")
+            else:
+                started = time.perf_counter()
+                workout = Workout.from_file(file_path)
+                intervals = detect_intervals(workout, args.ftp) if workout else []
+        except (OSError, ValueError, FitFormatError) as e:
+            print(f"⚠️  실패: {file_path.name} - {e}")
+            continue
+        elapsed = time.perf_counter() - started
+
+        if args.json:
+            results[file_path.name] = [interval._asdict() for interval in intervals]
+        else:
+            print_intervals(file_path, intervals, elapsed)
+
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""
+downloads/ FIT 파일과 strava_data/ JSON을 압축 아카이브로 보관
+
+사용법:
+    python scripts/archive/archive_activities.py add            # 아카이브에 추가 (원본 유지)
+    python scripts/archive/archive_activities.py add --move     # 확인 후 원본 삭제 (동기화 기간보다 오래된 것만)
+    python scripts/archive/archive_activities.py stats          # 절약된 용량
+    python scripts/archive/archive_activities.py extract alice/2025-12-11.fit [-o 경로]
+
+항목 이름은 downloads/, strava_data/ 기준 상대 경로입니다 (계정별 폴더의 같은 날짜 파일 구분).
+--move로 원본을 지워도 json_to_gpx와 비교 스크립트는 같은 경로로 아카이브에서 읽습니다.
+동기화는 downloads/에 파일이 없으면 다시 받으므로, 최근 --older-than일(기본 30일) 파일은 지우지 않습니다.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리 설정
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.activity_archive import SOURCE_ROOTS, ActivityArchive
+
+
+def source_files(args):
+    """아카이브할 파일 목록"""
+    files = sorted(Path(args.downloads).glob('**/*.fit'))
+    files += sorted(Path(args.strava_dir).glob('*.json'))
+    return files
+
+
+def source_roots(args):
+    """항목 이름의 기준 폴더"""
+    if args.command == 'add':
+        return Path(args.downloads), Path(args.strava_dir)
+    return SOURCE_ROOTS
+
+
+def print_stats(archive):
+    """저장 통계 출력"""
+    stats = archive.stats()
+    logical = stats['logical_bytes']
+    stored = stats['stored_bytes']
+    print(f"  항목 {stats['entries']}개 (고유 내용 {stats['objects']}개, 코덱: {archive.codec})")
+    print(f"  원본 {logical / 1024 / 1024:.1f} MB → 저장 {stored / 1024 / 1024:.1f} MB"
+          + (f" ({logical / stored:.1f}배 절약)" if stored else ""))
+
+
+def cmd_add(archive, args):
+    files = source_files(args)
+    if not files:
+        print("  아카이브할 파일이 없습니다.")
+        return 0
+
+    result = archive.add_files(files)
+    print(f"✅ 추가: 새 내용 {result['added']}개, 중복 {result['duplicates']}개")
+
+    if args.move:
+        cutoff = time.time() - args.older_than * 86400
+        removed = 0
+        for path in files:
+            if path.stat().st_mtime >= cutoff:
+                continue
+            name = archive.entry_name(path)
+            if archive.verify(name, path.read_bytes()):
+                path.unlink()
+                removed += 1
+            else:
+                print(f"  ⚠️  확인 실패, 원본 유지: {name}")
+        print(f"🗑️  원본 삭제: {removed}개 ({args.older_than}일보다 오래된 파일)")
+
+    print_stats(archive)
+    return 0
+
+
+def cmd_extract(archive, args):
+    output = Path(args.output or Path(args.name).name)
+    output.write_bytes(archive.read_bytes(args.name))
+    print(f"✅ 저장: {output}")
+    return 0
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="활동 파일 압축 아카이브")
+    parser.add_argument('--archive', help="아카이브 위치 (기본: ACTIVITY_ARCHIVE_DIR 또는 archive/)")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    add = sub.add_parser('add', help="downloads/, strava_data/ 파일 추가")
+    add.add_argument('--downloads', default=str(PROJECT_ROOT / "downloads"))
+    add.add_argument('--strava-dir', default=str(PROJECT_ROOT / "strava_data"))
+    add.add_argument('--move', action='store_true', help="아카이브 확인 후 원본 삭제")
+    add.add_argument('--older-than', type=int, default=30, help="--move 시 이 일수보다 오래된 파일만 삭제")
+
+    sub.add_parser('stats', help="저장 통계")
+
+    extract = sub.add_parser('extract', help="항목을 파일로 꺼내기")
+    extract.add_argument('name')
+    extract.add_argument('-o', '--output')
+
+    args = parser.parse_args()
+    archive = ActivityArchive(args.archive, source_roots(args))
+
+    if args.command == 'add':
+        return cmd_add(archive, args)
+    if args.command == 'extract':
+        return cmd_extract(archive, args)
+    print_stats(archive)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+Strava 백업 딕셔너리 vs Activity(StreamSet) 메모리 / 변환 시간 비교
+
+합성 GPS 활동 JSON을 json.loads한 딕셔너리와, 그것을 Activity로 바꾼 뒤 딕셔너리를 버린 경우의
+유지 메모리(tracemalloc 현재 할당량)를 샘플당 바이트로 비교합니다.
+
+사용법:
+    python scripts/benchmark/measure_activity_model.py [--scales 1h,6h,24h] [--indoor]
+"""
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# 프로젝트 루트 및 스크립트 디렉토리 설정
+BENCHMARK_DIR = Path(__file__).parent
+PROJECT_ROOT = BENCHMARK_DIR.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from synthetic_data import generate_strava_activity
+from src.activity_model import Activity
+
+SCALES = {'1h': 3600, '6h': 6 * 3600, '24h': 24 * 3600}
+
+
+def retained_bytes(build):
+    """build()가 돌려준 객체가 유지하는 메모리 (바이트, 객체와 함께 반환)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        value = build()
+        gc.collect()
+        return value, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="Activity 데이터 모델 메모리 비교")
+    parser.add_argument('--scales', default='1h,6h,24h', help=f"측정할 규모 (쉼표 구분: {','.join(SCALES)})")
+    parser.add_argument('--indoor', action='store_true', help="GPS 없는 실내 활동으로 측정")
+    args = parser.parse_args()
+
+    print(f"{'규모':<6}{'딕셔너리 (MB)':>16}{'Activity (MB)':>16}{'샘플당 (B)':>16}{'배율':>8}{'변환 (ms)':>12}")
+    for scale in args.scales.split(','):
+        duration_s = SCALES[scale]
+        raw = json.dumps(generate_strava_activity(duration_s, gps=not args.indoor))
+
+        data, dict_bytes = retained_bytes(lambda: json.loads(raw))
+        del data
+
+        def build():
+            return Activity.from_strava(json.loads(raw))
+        activity, activity_bytes = retained_bytes(build)
+
+        data = json.loads(raw)
+        started = time.perf_counter()
+        Activity.from_strava(data)
+        elapsed = time.perf_counter() - started
+
+        print(f"{scale:<6}{dict_bytes / 1024 / 1024:>16.1f}{activity_bytes / 1024 / 1024:>16.1f}"
+              f"{dict_bytes / duration_s:>8.0f} → {activity_bytes / duration_s:<5.0f}"
+              f"{dict_bytes / activity_bytes:>7.1f}x{elapsed * 1000:>12.1f}")
+        del activity, data
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
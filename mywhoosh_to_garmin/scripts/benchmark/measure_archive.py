@@ -0,0 +1,129 @@
+"""
+활동 아카이브 용량 절약 / 읽기 지연 측정
+
+합성 FIT/Strava JSON(30분 ~ 2시간, 실내/GPS)을 만들어 아카이브에 넣고
+원본 대비 저장 크기(사전 사용/미사용)와 항목 1개 읽기 시간을 비교합니다.
+
+사용법:
+    python scripts/benchmark/measure_archive.py [--count 20] [--repeat 20]
+"""
+import argparse
+import json
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 프로젝트 루트 및 스크립트 디렉토리 설정
+BENCHMARK_DIR = Path(__file__).parent
+PROJECT_ROOT = BENCHMARK_DIR.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from synthetic_data import write_fit, write_strava_json
+from src.activity_archive import ActivityArchive
+
+DURATIONS = (1800, 3600, 5400, 7200)
+
+
+def make_files(work_dir, count):
+    """합성 활동 파일 생성 (마지막 파일은 다른 이름의 중복 복사본)"""
+    files = []
+    start = datetime(2025, 1, 1, 18, 0)
+    for i in range(count):
+        duration = DURATIONS[i % len(DURATIONS)]
+        gps = i % 3 == 0
+        day = start + timedelta(days=i)
+        files.append(write_strava_json(work_dir / f"{day:%Y-%m-%d}_ride_{i}_activity.json",
+                                       duration, gps=gps, seed=i, start=day))
+        files.append(write_fit(work_dir / f"{day:%Y-%m-%d}.fit", duration, gps=gps, seed=i, start=day))
+    duplicate = work_dir / "duplicate_copy.fit"
+    shutil.copy(files[-1], duplicate)
+    files.append(duplicate)
+    return [Path(f) for f in files]
+
+
+def stored_by_kind(archive):
+    """종류별 (원본 바이트, 중복 제거 후 저장 바이트)"""
+    totals = {}
+    seen = set()
+    for name, digest in archive.entries.items():
+        kind = 'json' if name.endswith('.json') else 'fit'
+        info = archive.objects[digest]
+        raw, stored = totals.get(kind, (0, 0))
+        if digest not in seen:
+            seen.add(digest)
+            stored += info['stored']
+        totals[kind] = (raw + info['size'], stored)
+    return totals
+
+
+def median_ms(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="활동 아카이브 측정")
+    parser.add_argument('--count', type=int, default=20, help="활동 수")
+    parser.add_argument('--repeat', type=int, default=20, help="읽기 반복 횟수 (중앙값 사용)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        work_dir = Path(tmp)
+        source_dir = work_dir / "source"
+        source_dir.mkdir()
+        files = make_files(source_dir, args.count)
+
+        archive = ActivityArchive(work_dir / "archive")
+        started = time.perf_counter()
+        result = archive.add_files(files)
+        add_seconds = time.perf_counter() - started
+
+        # 사전 없이 압축한 경우와 비교
+        plain = ActivityArchive(work_dir / "archive_plain")
+        plain.dictionaries[f"json-{plain.codec}"] = None
+        plain.add_files(files)
+
+        print(f"\n{'='*64}")
+        print(f"활동 {args.count}개 (파일 {len(files)}개, 중복 {result['duplicates']}개), "
+              f"코덱: {archive.codec}, 추가 {add_seconds:.2f}초")
+        print(f"{'='*64}")
+        print(f"{'종류':<8}{'원본 (KB)':>12}{'사전 없음 (KB)':>16}{'사전 사용 (KB)':>16}{'비율':>10}")
+        with_dict = stored_by_kind(archive)
+        without_dict = stored_by_kind(plain)
+        for kind in ('json', 'fit'):
+            raw, stored = with_dict[kind]
+            print(f"{kind:<8}{raw / 1024:>12,.0f}{without_dict[kind][1] / 1024:>16,.0f}"
+                  f"{stored / 1024:>16,.0f}{raw / stored:>9.1f}x")
+        stats = archive.stats()
+        print(f"{'전체':<8}{stats['logical_bytes'] / 1024:>12,.0f}"
+              f"{plain.stats()['stored_bytes'] / 1024:>16,.0f}{stats['stored_bytes'] / 1024:>16,.0f}"
+              f"{stats['logical_bytes'] / stats['stored_bytes']:>9.1f}x")
+
+        # 읽기 지연: 인덱스를 새로 로드한 아카이브에서 항목 1개
+        reader = ActivityArchive(work_dir / "archive")
+        json_file = next(f for f in files if f.suffix == '.json')
+        fit_file = next(f for f in files if f.suffix == '.fit')
+        print(f"\n{'읽기 (중앙값)':<24}{'원본 파일 (ms)':>16}{'아카이브 (ms)':>16}")
+        raw_json = median_ms(lambda: json.loads(json_file.read_bytes()), args.repeat)
+        archived_json = median_ms(lambda: reader.read_json(json_file.name), args.repeat)
+        print(f"{'JSON 읽기 + 파싱':<24}{raw_json:>16.2f}{archived_json:>16.2f}")
+        raw_fit = median_ms(lambda: fit_file.read_bytes(), args.repeat)
+        archived_fit = median_ms(lambda: reader.read_bytes(fit_file.name), args.repeat)
+        print(f"{'FIT 읽기':<24}{raw_fit:>16.2f}{archived_fit:>16.2f}")
+        index_ms = median_ms(lambda: ActivityArchive(work_dir / "archive"), args.repeat)
+        print(f"{'인덱스 로드':<24}{'-':>16}{index_ms:>16.2f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+형식별 저장 vs 한 번 순회 내보내기 비교 (시간 / 최대 메모리)
+
+StravaDataSaver의 save_as_gpx + save_as_csv(형식마다 스트림을 따로 순회, GPX는 DOM 생성)와
+export()(한 번 순회로 GPX/CSV/TCX 동시 작성)를 합성 활동으로 측정합니다.
+
+사용법:
+    python scripts/benchmark/measure_export.py [--scales 1h,6h,24h] [--repeat 3]
+"""
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# 프로젝트 루트 및 스크립트 디렉토리 설정
+BENCHMARK_DIR = Path(__file__).parent
+PROJECT_ROOT = BENCHMARK_DIR.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / 'scripts' / 'strava'))
+
+from synthetic_data import generate_strava_activity
+from strava_data_saver import StravaDataSaver
+
+SCALES = {'1h': 3600, '6h': 6 * 3600, '24h': 24 * 3600}
+
+
+def make_saver(work_dir, data):
+    """API 호출 대신 합성 데이터를 돌려주는 StravaDataSaver"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        saver = StravaDataSaver()
+    saver.output_dir = work_dir
+    saver.get_activity_detail = lambda activity_id: data['activity']
+    saver.get_activity_streams = lambda activity_id: data['streams']
+    return saver
+
+
+def run_quiet(func):
+    with contextlib.redirect_stdout(io.StringIO()):
+        func()
+
+
+def best_seconds(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run_quiet(func)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def peak_mb(func):
+    tracemalloc.start()
+    try:
+        run_quiet(func)
+        return tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="내보내기 방식 비교")
+    parser.add_argument('--scales', default='1h,6h', help=f"측정할 규모 (쉼표 구분: {','.join(SCALES)})")
+    parser.add_argument('--repeat', type=int, default=3, help="반복 횟수 (최솟값 사용)")
+    args = parser.parse_args()
+
+    print(f"{'경우':<34}{'시간 (초)':>12}{'최대 메모리 (MB)':>18}")
+    with tempfile.TemporaryDirectory() as tmp:
+        work_dir = Path(tmp)
+        for scale in args.scales.split(','):
+            data = generate_strava_activity(SCALES[scale], gps=True)
+            saver = make_saver(work_dir, data)
+            activity_id = data['activity']['id']
+            cases = [
+                ('형식별 (GPX + CSV)',
+                 lambda: (saver.save_as_gpx(activity_id), saver.save_as_csv(activity_id))),
+                ('한 번 순회 (GPX + CSV)',
+                 lambda: saver.export(activity_id, formats=('gpx', 'csv'))),
+                ('한 번 순회 (GPX + TCX + CSV)',
+                 lambda: saver.export(activity_id)),
+            ]
+            print(f"\n▶ {scale} GPS 활동 ({SCALES[scale]:,} 포인트)")
+            for name, case in cases:
+                seconds = best_seconds(case, args.repeat)
+                print(f"  {name:<32}{seconds:>12.2f}{peak_mb(case):>18.1f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
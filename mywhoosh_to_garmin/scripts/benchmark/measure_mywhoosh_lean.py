@@ -0,0 +1,81 @@
+"""
+MyWhoosh lean 모드 효과 측정 (첫 다운로드까지 걸린 시간)
+
+실제 계정으로 lean 모드 끄기/켜기를 번갈아 실행하고 로그인 시간과
+첫 다운로드까지 걸린 시간을 비교합니다.
+매번 빈 임시 다운로드 폴더를 사용하므로 기존 downloads/에는 영향이 없습니다.
+
+사용법:
+    python scripts/benchmark/measure_mywhoosh_lean.py [--repeat 2] [--days 30]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 프로젝트 루트 디렉토리 설정
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.mywhoosh_downloader import MyWhooshDownloader
+
+
+def measure(email, password, lean, days):
+    """1회 실행 후 단계별 시간 반환"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        downloader = MyWhooshDownloader(email, password,
+                                        download_dir=Path(tmp_dir) / "downloads",
+                                        screenshot_dir=Path(tmp_dir) / "screenshot",
+                                        lean=lean)
+        downloader.download_recent_activities(days=days)
+        if downloader.last_error:
+            print(f"  ⚠️  오류: {downloader.last_error}")
+        return dict(downloader.timings)
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="MyWhoosh lean 모드 측정")
+    parser.add_argument('--repeat', type=int, default=2)
+    parser.add_argument('--days', type=int, default=30)
+    args = parser.parse_args()
+
+    email = os.getenv('MYWHOOSH_EMAIL')
+    password = os.getenv('MYWHOOSH_PASSWORD')
+    if not email or not password:
+        print("❌ MYWHOOSH_EMAIL, MYWHOOSH_PASSWORD 환경 변수가 필요합니다.")
+        return 1
+
+    results = {False: [], True: []}
+    for i in range(args.repeat):
+        # 캐시/서버 상태 영향을 줄이기 위해 번갈아 실행
+        for lean in (False, True):
+            print(f"\n[{i + 1}/{args.repeat}] lean 모드 {'켜짐' if lean else '꺼짐'}")
+            results[lean].append(measure(email, password, lean, args.days))
+
+    print()
+    print("=" * 60)
+    print(f"{'단계':<16}{'기본 (초)':>14}{'lean (초)':>14}{'차이':>10}")
+    print("=" * 60)
+    for key in ('login', 'first_download', 'total'):
+        normal = [t[key] for t in results[False] if key in t]
+        lean = [t[key] for t in results[True] if key in t]
+        if not normal or not lean:
+            print(f"{key:<16}{'-':>14}{'-':>14}   (측정값 없음: 다운로드할 활동이 없었을 수 있음)")
+            continue
+        normal_median = statistics.median(normal)
+        lean_median = statistics.median(lean)
+        change = (lean_median - normal_median) / normal_median * 100
+        print(f"{key:<16}{normal_median:>14.1f}{lean_median:>14.1f}{change:>+9.0f}%")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
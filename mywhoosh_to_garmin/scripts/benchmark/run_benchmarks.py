@@ -0,0 +1,364 @@
+"""
+변환/분석/이력 관리 성능 벤치마크
+
+합성 데이터(synthetic_data.py)를 규모별로 생성하여 측정하고,
+결과를 JSON 베이스라인과 비교해 성능 저하(regression)를 잡아냅니다.
+
+기계마다 속도가 다르므로 같은 프로세스에서 고정 작업(보정 케이스)을 측정해
+각 시간을 보정 시간 대비 배율로 바꾼 뒤 비교합니다.
+- 보정 시간 차이와 관계없이, NOISE_FLOOR보다 짧은 차이는 저하로 보지 않음
+- 베이스라인과 Python 버전/아키텍처가 다르면 비교 결과는 참고용 (종료 코드 0)
+
+사용법 (프로젝트 루트에서):
+    python scripts/benchmark/run_benchmarks.py                  # 측정 + 베이스라인 비교
+    python scripts/benchmark/run_benchmarks.py --save-baseline  # 베이스라인 갱신
+    python scripts/benchmark/run_benchmarks.py --scales 1m,1h   # 일부 규모만
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# 프로젝트 루트 및 스크립트 디렉토리 설정
+BENCHMARK_DIR = Path(__file__).parent
+PROJECT_ROOT = BENCHMARK_DIR.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+for sub_dir in ('converter', 'strava', 'comparison'):
+    sys.path.insert(0, str(PROJECT_ROOT / 'scripts' / sub_dir))
+
+from synthetic_data import generate_strava_activity, write_fit, write_strava_json
+from json_to_gpx import json_to_gpx
+from strava_data_saver import StravaDataSaver
+from compare_json_fit import analyze_json_file, analyze_fit_file
+from src.history_manager import HistoryManager
+from src.interval_detector import Workout, detect_intervals
+from src.preview_pyramid import Preview, build_preview
+from src.reconciliation import ActivitySource, SourceActivity, reconcile
+from src.workout_index import FEATURE_SIZE, WorkoutIndex
+
+BASELINE_FILE = BENCHMARK_DIR / "baseline.json"
+
+# 활동 길이 (초)
+SCALES = {
+    '1m': 60,
+    '1h': 3600,
+    '6h': 6 * 3600,
+    '24h': 24 * 3600,
+}
+
+NOISE_FLOOR = 0.002     # 초 (이보다 작은 차이는 측정 잡음으로 봄)
+CALIBRATION_REPEAT = 5
+
+# 이력 관리자 규모 (활동 수)
+HISTORY_SCALES = {
+    '1m': 10,
+    '1h': 100,
+    '6h': 500,
+    '24h': 1000,
+}
+
+
+def measure(func, repeat):
+    """repeat회 실행 중 가장 빠른 시간 (출력은 숨김)"""
+    best = None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def calibration_workload(data):
+    """
+    보정 케이스: 벤치마크 대상과 비슷한 JSON 파싱 / 문자열 포맷 / numpy 연산
+
+    코드가 바뀌어도 이 작업은 바뀌지 않으므로, 기계 속도의 기준으로만 씁니다.
+    """
+    import numpy as np
+
+    parsed = json.loads(json.dumps(data))
+    watts = parsed['streams']['watts']['data']
+    ''.join(f"<p>{value}</p>" for value in watts)
+    array = np.asarray(watts, dtype=float)
+    np.sort(np.convolve(array, np.ones(30) / 30, mode='valid'))
+
+
+def calibrate(repeat=CALIBRATION_REPEAT):
+    """보정 케이스 시간 (초, repeat회 중 최솟값)"""
+    data = generate_strava_activity(1800, gps=True)
+    return measure(lambda: calibration_workload(data), repeat)
+
+
+def bench_json_to_gpx(work_dir, duration_s, repeat, simplify=None):
+    """json_to_gpx (GPS 활동, simplify가 있으면 RDP 5m 단순화)"""
+    json_path = write_strava_json(work_dir / "gps_activity.json", duration_s, gps=True)
+    gpx_path = work_dir / "gps_activity.gpx"
+    return measure(lambda: json_to_gpx(json_path, gpx_path, simplify=simplify), repeat)
+
+
+def bench_save_as_csv(work_dir, duration_s, repeat, gps):
+    """StravaDataSaver.save_as_csv (API 호출 대신 합성 데이터 주입)"""
+    data = generate_strava_activity(duration_s, gps=gps)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        saver = StravaDataSaver()
+    saver.output_dir = work_dir
+    saver.get_activity_detail = lambda activity_id: data['activity']
+    saver.get_activity_streams = lambda activity_id: data['streams']
+
+    return measure(lambda: saver.save_as_csv(data['activity']['id']), repeat)
+
+
+def bench_export(work_dir, duration_s, repeat, gps):
+    """StravaDataSaver.export (GPX/TCX/CSV 한 번 순회)"""
+    data = generate_strava_activity(duration_s, gps=gps)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        saver = StravaDataSaver()
+    saver.output_dir = work_dir
+    saver.get_activity_detail = lambda activity_id: data['activity']
+    saver.get_activity_streams = lambda activity_id: data['streams']
+
+    return measure(lambda: saver.export(data['activity']['id']), repeat)
+
+
+def bench_analyze_json(work_dir, duration_s, repeat, gps):
+    """compare_json_fit.analyze_json_file (헤더 캐시 없이 매번 파일 읽기)"""
+    json_path = write_strava_json(work_dir / "analyze_activity.json", duration_s, gps=gps)
+    return measure(lambda: analyze_json_file(json_path, cache=False), repeat)
+
+
+def bench_analyze_fit(work_dir, duration_s, repeat, gps):
+    """compare_json_fit.analyze_fit_file"""
+    fit_path = write_fit(work_dir / "analyze_activity.fit", duration_s, gps=gps)
+    return measure(lambda: analyze_fit_file(str(fit_path)), repeat)
+
+
+def bench_detect_intervals(work_dir, duration_s, repeat):
+    """interval_detector (FIT 읽기 + 인터벌 검출, 실내 워크아웃)"""
+    raw = write_fit(work_dir / "workout.fit", duration_s).read_bytes()
+    return measure(lambda: detect_intervals(Workout.from_fit(raw), ftp=200), repeat)
+
+
+def bench_preview_series(work_dir, duration_s, repeat):
+    """preview_pyramid 전체 보기 (800px, 미리보기는 미리 만들어 둠)"""
+    target = build_preview(write_fit(work_dir / "preview_activity.fit", duration_s, gps=True), force=True)
+
+    def run():
+        with Preview(target) as preview:
+            preview.series('power', 800)
+    return measure(run, repeat)
+
+
+def bench_history_marks(work_dir, count, repeat):
+    """HistoryManager.mark_downloaded + mark_uploaded (활동 count개)"""
+    def run():
+        history_dir = Path(tempfile.mkdtemp(dir=work_dir))
+        history = HistoryManager(data_dir=history_dir)
+        for i in range(count):
+            file_name = f"activity_{i:05d}.fit"
+            history.mark_downloaded(file_name)
+            history.mark_uploaded(file_name)
+    return measure(run, repeat)
+
+
+def bench_reconcile(count, repeat):
+    """reconcile (활동 count개씩 두 출처, 하루 2회 라이딩, 일부 누락/시각 차이)"""
+    import random
+    rng = random.Random(0)
+    base = datetime(2020, 1, 1).timestamp()
+    reference, other = [], []
+    for i in range(count):
+        start = base + (i // 2) * 86400 + (i % 2) * 43200 + rng.uniform(0, 3600)
+        duration = rng.uniform(1800, 7200)
+        reference.append(SourceActivity('a', i, start, duration, 'cycling'))
+        if i % 50:
+            other.append(SourceActivity('b', i, start + rng.uniform(-30, 30), duration, 'cycling'))
+    left, right = ActivitySource('a', reference), ActivitySource('b', other)
+    return measure(lambda: reconcile(left, right), repeat)
+
+
+def bench_workout_index(work_dir, count, repeat):
+    """WorkoutIndex.nearest (활동 count개 행렬에서 가까운 10개)"""
+    import numpy as np
+    rng = np.random.default_rng(0)
+    index = WorkoutIndex(Path(tempfile.mkdtemp(dir=work_dir)), ftp=200)
+    for i, vector in enumerate(rng.random((count, FEATURE_SIZE), dtype=np.float32)):
+        index.add(f"activity_{i:05d}.fit", vector, {})
+    query = index.matrix[0]
+    return measure(lambda: index.nearest(query, k=10), repeat)
+
+
+def run_benchmarks(scales, repeat):
+    """선택한 규모에서 모든 벤치마크 실행"""
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        work_dir = Path(tmp)
+
+        for scale in scales:
+            duration_s = SCALES[scale]
+            print(f"\n▶ 규모: {scale} ({duration_s:,}초)")
+
+            cases = [
+                (f"json_to_gpx[gps,{scale}]",
+                 lambda: bench_json_to_gpx(work_dir, duration_s, repeat)),
+                (f"json_to_gpx[gps,rdp,{scale}]",
+                 lambda: bench_json_to_gpx(work_dir, duration_s, repeat, simplify='rdp')),
+            ]
+            for variant, gps in (('indoor', False), ('gps', True)):
+                cases += [
+                    (f"save_as_csv[{variant},{scale}]",
+                     lambda gps=gps: bench_save_as_csv(work_dir, duration_s, repeat, gps)),
+                    (f"export_all[{variant},{scale}]",
+                     lambda gps=gps: bench_export(work_dir, duration_s, repeat, gps)),
+                    (f"analyze_json_file[{variant},{scale}]",
+                     lambda gps=gps: bench_analyze_json(work_dir, duration_s, repeat, gps)),
+                    (f"analyze_fit_file[{variant},{scale}]",
+                     lambda gps=gps: bench_analyze_fit(work_dir, duration_s, repeat, gps)),
+                ]
+            cases.append((f"detect_intervals[indoor,{scale}]",
+                          lambda: bench_detect_intervals(work_dir, duration_s, repeat)))
+            cases.append((f"preview_series[gps,{scale}]",
+                          lambda: bench_preview_series(work_dir, duration_s, repeat)))
+            count = HISTORY_SCALES[scale]
+            cases.append((f"history_marks[{count}]",
+                          lambda: bench_history_marks(work_dir, count, repeat)))
+            # 몇 년치 이력 (24h 규모: 20,000개 ≈ 27년, 하루 2회)
+            activities = count * 20
+            cases.append((f"reconcile[{activities}]",
+                          lambda: bench_reconcile(activities, repeat)))
+            cases.append((f"workout_index[{activities}]",
+                          lambda: bench_workout_index(work_dir, activities, repeat)))
+
+            for name, case in cases:
+                seconds = case()
+                results[name] = round(seconds, 6)
+                print(f"  {name:<36} {seconds * 1000:>10.1f} ms")
+
+    return results
+
+
+def load_baseline(path):
+    """베이스라인 파일 로드"""
+    if not Path(path).exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(path, results, calibration):
+    """측정 결과를 베이스라인으로 저장"""
+    baseline = {
+        'created_at': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'calibration': round(calibration, 6),
+        'results': results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2, ensure_ascii=False)
+    print(f"\n✅ 베이스라인 저장: {path}")
+
+
+def compare_with_baseline(results, baseline, tolerance, calibration):
+    """
+    베이스라인 대비 느려진 항목 목록 반환
+
+    베이스라인에 보정 시간이 있으면 베이스라인 시간을 이 기계 속도로 환산해 비교합니다.
+    """
+    base_calibration = baseline.get('calibration')
+    scale = calibration / base_calibration if base_calibration else 1.0
+
+    print(f"\n{'='*60}")
+    print(f"베이스라인 비교 (허용 오차 +{tolerance*100:.0f}%, 잡음 하한 {NOISE_FLOOR * 1000:.0f}ms)")
+    print(f"{'='*60}\n")
+    if base_calibration:
+        print(f"  보정: 베이스라인 {base_calibration * 1000:.1f}ms → 지금 {calibration * 1000:.1f}ms "
+              f"(기계 속도 {scale:.2f}배로 환산)\n")
+    else:
+        print("  ⚠️  베이스라인에 보정 시간이 없어 절대 시간으로 비교합니다.\n")
+
+    regressions = []
+    for name, seconds in results.items():
+        base = baseline['results'].get(name)
+        if not base:
+            print(f"  {name:<36} (베이스라인 없음)")
+            continue
+
+        expected = base * scale
+        ratio = seconds / expected
+        mark = "✅"
+        if ratio > 1 + tolerance and seconds - expected > NOISE_FLOOR:
+            mark = "❌"
+            regressions.append(name)
+        print(f"  {mark} {name:<36} {ratio:>6.2f}x")
+
+    return regressions
+
+
+def same_environment(baseline):
+    """베이스라인과 같은 Python 버전 / 아키텍처인지"""
+    return (baseline.get('python') == platform.python_version()
+            and baseline.get('machine') == platform.machine())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="성능 벤치마크")
+    parser.add_argument('--scales', default=','.join(SCALES),
+                        help=f"측정할 규모 (쉼표 구분, 기본: {','.join(SCALES)})")
+    parser.add_argument('--repeat', type=int, default=3, help="반복 횟수 (최솟값 사용)")
+    parser.add_argument('--baseline', default=str(BASELINE_FILE), help="베이스라인 JSON 경로")
+    parser.add_argument('--save-baseline', action='store_true', help="결과를 베이스라인으로 저장")
+    parser.add_argument('--tolerance', type=float, default=0.3,
+                        help="허용 오차 비율 (기본 0.3 = 30%%)")
+    args = parser.parse_args()
+
+    scales = [s.strip() for s in args.scales.split(',') if s.strip()]
+    unknown = [s for s in scales if s not in SCALES]
+    if unknown:
+        print(f"❌ 알 수 없는 규모: {', '.join(unknown)} (사용 가능: {', '.join(SCALES)})")
+        return 1
+
+    print("=" * 60)
+    print("성능 벤치마크")
+    print("=" * 60)
+
+    # 측정 앞뒤로 보정 케이스를 재서 더 빠른 쪽 사용 (도중 부하 변화 완화)
+    calibration = calibrate()
+    results = run_benchmarks(scales, args.repeat)
+    calibration = min(calibration, calibrate())
+    print(f"\n  보정 케이스: {calibration * 1000:.1f} ms")
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results, calibration)
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if not baseline:
+        print("\n⚠️  베이스라인이 없습니다. --save-baseline으로 먼저 생성하세요.")
+        return 0
+
+    regressions = compare_with_baseline(results, baseline, args.tolerance, calibration)
+    if regressions:
+        print(f"\n❌ 성능 저하 {len(regressions)}건: {', '.join(regressions)}")
+        if not same_environment(baseline):
+            print(f"⚠️  베이스라인 환경(Python {baseline.get('python')}, {baseline.get('machine')})과 달라 "
+                  f"참고용으로만 표시합니다.")
+            return 0
+        return 1
+
+    print("\n✅ 성능 저하 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+"""
+벤치마크용 합성 데이터 생성기
+
+- Strava API 형식 JSON ({activity, streams})
+- FIT 파일 (file_id, record, lap, session, activity)
+
+1분 ~ 24시간 길이, 실내(GPS 없음)/실외(GPS) 활동을 생성할 수 있습니다.
+같은 seed를 주면 항상 같은 데이터가 만들어집니다.
+"""
+import json
+import math
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리 설정
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.fit_encoder import FitEncoder
+
+DEFAULT_START = datetime(2025, 12, 11, 11, 14, 44, tzinfo=timezone.utc)
+
+# 기준 좌표 (MyWhoosh 기본 코스 부근)
+BASE_LAT = -31.887501
+BASE_LNG = 115.792401
+
+SEMICIRCLES_PER_DEGREE = 2 ** 31 / 180
+
+
+def _workout_power(t, ftp, rng):
+    """구조화 워크아웃 형태의 파워 (워밍업 → 인터벌 반복 → 쿨다운)"""
+    if t < 600:
+        target = ftp * (0.5 + 0.25 * t / 600)
+    else:
+        # 10분 스윗스팟 + 5분 회복 반복
+        phase = (t - 600) % 900
+        target = ftp * (0.9 if phase < 600 else 0.55)
+    return max(0, int(target + rng.gauss(0, 8)))
+
+
+def generate_samples(duration_s, gps=False, seed=0, ftp=200):
+    """1Hz 샘플 생성 (스트림별 리스트 딕셔너리)"""
+    rng = random.Random(seed)
+
+    samples = {
+        'time': [], 'distance': [], 'altitude': [], 'velocity_smooth': [],
+        'heartrate': [], 'cadence': [], 'watts': [], 'moving': [], 'grade_smooth': [],
+    }
+    if gps:
+        samples['latlng'] = []
+
+    distance = 0.0
+    altitude = 10.0
+    heart_rate = 80.0
+    heading = rng.uniform(0, 2 * math.pi)
+    lat, lng = BASE_LAT, BASE_LNG
+
+    for t in range(duration_s):
+        power = _workout_power(t, ftp, rng)
+        speed = round(max(0.0, 3.0 + power / 25 + rng.gauss(0, 0.3)), 1)
+        grade = round(4 * math.sin(t / 300) + rng.gauss(0, 0.3), 1)
+        distance += speed
+        altitude += speed * grade / 100
+        heart_rate += (80 + power * 0.35 - heart_rate) * 0.02
+
+        samples['time'].append(t)
+        samples['distance'].append(round(distance, 1))
+        samples['altitude'].append(round(altitude, 1))
+        samples['velocity_smooth'].append(speed)
+        samples['heartrate'].append(int(heart_rate))
+        samples['cadence'].append(max(0, int(88 + rng.gauss(0, 3))) if power else 0)
+        samples['watts'].append(power)
+        samples['moving'].append(speed > 0)
+        samples['grade_smooth'].append(grade)
+
+        if gps:
+            heading += rng.gauss(0, 0.05)
+            lat += speed * math.cos(heading) / 111320
+            lng += speed * math.sin(heading) / (111320 * math.cos(math.radians(lat)))
+            samples['latlng'].append([round(lat, 6), round(lng, 6)])
+
+    return samples
+
+
+def generate_strava_activity(duration_s, gps=False, seed=0, start=DEFAULT_START):
+    """Strava API 형식의 {activity, streams} 딕셔너리 생성"""
+    samples = generate_samples(duration_s, gps=gps, seed=seed)
+    watts = samples['watts']
+    heartrate = samples['heartrate']
+    distance = samples['distance'][-1] if duration_s else 0.0
+
+    activity = {
+        'id': 10_000_000_000 + seed,
+        'name': f"Synthetic {'Ride' if gps else 'Indoor'} {duration_s}s",
+        'distance': distance,
+        'moving_time': duration_s,
+        'elapsed_time': duration_s,
+        'type': 'Ride' if gps else 'VirtualRide',
+        'sport_type': 'Ride' if gps else 'VirtualRide',
+        'device_name': 'Synthetic',
+        'start_date': start.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'start_date_local': start.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'trainer': not gps,
+        'average_speed': distance / duration_s if duration_s else 0.0,
+        'average_watts': sum(watts) / len(watts) if watts else 0.0,
+        'max_watts': max(watts, default=0),
+        'has_heartrate': True,
+        'average_heartrate': sum(heartrate) / len(heartrate) if heartrate else 0.0,
+        'max_heartrate': max(heartrate, default=0),
+        'start_latlng': samples['latlng'][0] if gps and duration_s else [],
+    }
+
+    streams = {
+        name: {
+            'data': data,
+            'series_type': 'distance',
+            'original_size': len(data),
+            'resolution': 'high',
+        }
+        for name, data in samples.items()
+    }
+
+    return {
+        'activity': activity,
+        'streams': streams,
+        'downloaded_at': datetime.now().isoformat(),
+    }
+
+
+def write_strava_json(path, duration_s, gps=False, seed=0, start=DEFAULT_START):
+    """합성 Strava JSON 파일 저장 (strava_data/와 같은 indent=2 형식)"""
+    data = generate_strava_activity(duration_s, gps=gps, seed=seed, start=start)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    return path
+
+
+def write_fit(path, duration_s, gps=False, seed=0, start=DEFAULT_START, lap_seconds=600):
+    """합성 FIT 활동 파일 저장"""
+    samples = generate_samples(duration_s, gps=gps, seed=seed)
+    encoder = FitEncoder()
+
+    encoder.write('file_id', {
+        'type': 4, 'manufacturer': 255, 'product': 0,
+        'serial_number': 12345 + seed, 'time_created': start,
+    })
+    encoder.write('event', {'timestamp': start, 'event': 'timer', 'event_type': 'start'})
+
+    laps = []
+    lap_start = 0
+    for i in range(duration_s):
+        values = {
+            'timestamp': start + timedelta(seconds=i),
+            'distance': samples['distance'][i],
+            'altitude': samples['altitude'][i],
+            'speed': samples['velocity_smooth'][i],
+            'heart_rate': samples['heartrate'][i],
+            'cadence': samples['cadence'][i],
+            'power': samples['watts'][i],
+        }
+        if gps:
+            lat, lng = samples['latlng'][i]
+            values['position_lat'] = int(lat * SEMICIRCLES_PER_DEGREE)
+            values['position_long'] = int(lng * SEMICIRCLES_PER_DEGREE)
+        encoder.write('record', values)
+
+        if i + 1 - lap_start >= lap_seconds or i == duration_s - 1:
+            laps.append((lap_start, i + 1))
+            lap_start = i + 1
+
+    end = start + timedelta(seconds=duration_s)
+    encoder.write('event', {'timestamp': end, 'event': 'timer', 'event_type': 'stop_all'})
+
+    for index, (begin, finish) in enumerate(laps):
+        watts = samples['watts'][begin:finish]
+        hr = samples['heartrate'][begin:finish]
+        encoder.write('lap', {
+            'timestamp': start + timedelta(seconds=finish),
+            'message_index': index,
+            'event': 'lap',
+            'event_type': 'stop',
+            'start_time': start + timedelta(seconds=begin),
+            'total_elapsed_time': finish - begin,
+            'total_timer_time': finish - begin,
+            'avg_power': sum(watts) // len(watts),
+            'max_power': max(watts),
+            'avg_heart_rate': sum(hr) // len(hr),
+            'max_heart_rate': max(hr),
+            'lap_trigger': 'time',
+            'sport': 'cycling',
+        })
+
+    watts = samples['watts'] or [0]
+    hr = samples['heartrate'] or [0]
+    encoder.write('session', {
+        'timestamp': end,
+        'event': 'session',
+        'event_type': 'stop',
+        'start_time': start,
+        'sport': 'cycling',
+        'sub_sport': 'road' if gps else 'virtual_activity',
+        'total_elapsed_time': duration_s,
+        'total_timer_time': duration_s,
+        'total_distance': samples['distance'][-1] if duration_s else 0,
+        'avg_power': sum(watts) // len(watts),
+        'max_power': max(watts),
+        'avg_heart_rate': sum(hr) // len(hr),
+        'max_heart_rate': max(hr),
+        'first_lap_index': 0,
+        'num_laps': len(laps),
+    })
+    encoder.write('activity', {
+        'timestamp': end,
+        'total_timer_time': duration_s,
+        'num_sessions': 1,
+        'type': 0,
+        'event': 'activity',
+        'event_type': 'stop',
+    })
+
+    return encoder.save(path)
+
+
+if __name__ == "__main__":
+    # 예시: 1시간 실내 라이딩 FIT + JSON 생성
+    output_dir = Path("strava_data")
+    output_dir.mkdir(exist_ok=True)
+    fit_path = write_fit(output_dir / "synthetic_indoor_1h.fit", 3600)
+    json_path = write_strava_json(output_dir / "synthetic_indoor_1h_activity.json", 3600)
+    print(f"✅ 생성 완료: {fit_path}, {json_path}")
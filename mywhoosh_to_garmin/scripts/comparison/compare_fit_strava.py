@@ -1,16 +1,26 @@
 """
 FIT 파일과 Strava API 데이터 비교 스크립트
 """
-import os
+import sys
 import requests
 from dotenv import load_dotenv
 from datetime import datetime
+from pathlib import Path
 import json
 
 # 환경 변수 로드
 load_dotenv()
 
-STRAVA_ACCESS_TOKEN = os.getenv('STRAVA_ACCESS_TOKEN')
+# 프로젝트 루트 디렉토리 설정
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.activity_archive import open_activity
+from src.strava_streams import STREAM_CACHE_DIR, SUMMARY_TIER, StreamCache, fetch_streams, stream_points
+from src.strava_token_manager import get_token_manager
+
+# 만료 전에 자동 갱신되는 토큰 (.strava_token.json)
+token_manager = get_token_manager()
 
 def analyze_fit_file(fit_file_path):
     """FIT 파일 분석 (fitparse 사용)"""
@@ -21,10 +31,12 @@ def analyze_fit_file(fit_file_path):
         print(f"FIT 파일 분석: {fit_file_path}")
         print(f"{'='*60}\n")
 
-        fitfile = FitFile(fit_file_path)
+        # 원본이 없으면 아카이브에서 읽음
+        raw = open_activity(fit_file_path)
+        fitfile = FitFile(raw)
 
         # 파일 크기
-        file_size = os.path.getsize(fit_file_path)
+        file_size = len(raw)
         print(f"파일 크기: {file_size:,} bytes ({file_size/1024:.1f} KB)")
 
         # 데이터 필드 수집
@@ -64,11 +76,10 @@ def get_strava_activities(limit=10):
     print(f"{'='*60}\n")
 
     url = "https://www.strava.com/api/v3/athlete/activities"
-    headers = {"Authorization": f"Bearer {STRAVA_ACCESS_TOKEN}"}
     params = {"per_page": limit}
 
     try:
-        response = requests.get(url, headers=headers, params=params)
+        response = token_manager.get(url, params=params)
         response.raise_for_status()
 
         activities = response.json()
@@ -90,38 +101,35 @@ def get_strava_activities(limit=10):
         return None
 
 
-def get_strava_activity_streams(activity_id):
-    """특정 활동의 스트림 데이터 가져오기"""
+def get_strava_activity_streams(activity_id, resolution=SUMMARY_TIER['resolution']):
+    """
+    특정 활동의 스트림 데이터 가져오기
+
+    비교에는 어떤 스트림이 있는지와 포인트 수만 필요하므로 기본은 저해상도로 받고
+    (포인트 수는 original_size), 응답은 data/stream_cache/에 캐시합니다.
+
+    Args:
+        resolution: 'low'/'medium'/'high' 또는 None(전체 해상도)
+    """
     print(f"\n{'='*60}")
     print(f"Strava API: 활동 스트림 데이터 조회 (ID: {activity_id})")
     print(f"{'='*60}\n")
 
-    url = f"https://www.strava.com/api/v3/activities/{activity_id}/streams"
-    headers = {"Authorization": f"Bearer {STRAVA_ACCESS_TOKEN}"}
-
-    # 모든 가능한 스트림 타입 요청
-    stream_types = [
-        'time', 'latlng', 'distance', 'altitude', 'velocity_smooth',
-        'heartrate', 'cadence', 'watts', 'temp', 'moving', 'grade_smooth'
-    ]
-    params = {"keys": ','.join(stream_types), "key_by_type": True}
-
+    cache = StreamCache(STREAM_CACHE_DIR)
     try:
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
-
-        streams = response.json()
+        streams = fetch_streams(token_manager.get, activity_id, resolution=resolution,
+                                series_type=SUMMARY_TIER['series_type'] if resolution else None,
+                                cache=cache)
 
-        print(f"사용 가능한 스트림 데이터 ({len(streams)}개):")
+        print(f"사용 가능한 스트림 데이터 ({len(streams)}개{', 캐시' if cache.hits else ''}):")
         for stream_name, stream_data in streams.items():
-            data_points = len(stream_data.get('data', []))
-            print(f"  - {stream_name}: {data_points:,} 포인트")
+            print(f"  - {stream_name}: {stream_points(stream_data):,} 포인트")
 
         return streams
 
     except requests.exceptions.RequestException as e:
         print(f"❌ Strava Streams API 오류: {e}")
-        if response.status_code == 404:
+        if getattr(e.response, 'status_code', None) == 404:
             print("활동을 찾을 수 없습니다. ID를 확인하세요.")
         return None
 
@@ -7,25 +7,57 @@ JSON (Strava API) vs FIT (원본 파일) 비교 스크립트
 3. 어느 형식이 더 많은 정보를 담고 있는지 비교
 """
 import json
+import sys
 from pathlib import Path
 from datetime import datetime
 
+# 프로젝트 루트 디렉토리 설정
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
 
-def analyze_json_file(json_path):
-    """JSON 파일 분석 (Strava API 데이터)"""
+from src.activity_archive import get_archive, open_activity
+from src.activity_model import Activity
+from src.backup_reader import read_header
+
+
+def load_json_header(json_path, fast=True, cache=None):
+    """
+    JSON 파일 헤더 (메타데이터 + 스트림별 포인트 수)
+
+    fast=True면 스트림 배열을 만들지 않고 원소 수만 세며, 같은 파일은 헤더 캐시에서 바로 읽습니다.
+    fast=False면 전체를 읽어 Activity로 (원본이 없으면 아카이브에서 읽음)
+    """
+    if fast:
+        return read_header(json_path, cache)
+    raw = open_activity(json_path)
+    activity = Activity.from_strava(json.loads(raw), Path(json_path))
+    return {
+        'file_size': len(raw),
+        'activity': activity.meta,
+        'streams': {name: activity.streams.size(name) for name in activity.streams},
+    }
+
+
+def analyze_json_file(json_path, fast=True, cache=None):
+    """
+    JSON 파일 분석 (Strava API 데이터)
+
+    Args:
+        fast: 스트림 배열을 만들지 않는 빠른 경로 사용 (기본)
+        cache: 헤더 캐시 (None이면 data/backup_header_cache.json, False면 사용 안 함)
+    """
     print(f"\n{'='*60}")
     print(f"JSON 파일 분석: {json_path}")
     print(f"{'='*60}\n")
 
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    header = load_json_header(json_path, fast, cache)
 
     # 파일 크기
-    file_size = Path(json_path).stat().st_size
+    file_size = header['file_size']
     print(f"파일 크기: {file_size:,} bytes ({file_size/1024:.1f} KB)")
 
     # 메타데이터
-    activity = data.get('activity', {})
+    activity = header['activity']
     print(f"\n📋 메타데이터:")
     print(f"  이름: {activity.get('name')}")
     print(f"  날짜: {activity.get('start_date')}")
@@ -35,16 +67,14 @@ def analyze_json_file(json_path):
     print(f"  평균 속도: {activity.get('average_speed', 0)*3.6:.1f} km/h")
 
     # 스트림 데이터
-    streams = data.get('streams', {})
+    streams = header['streams']
     if streams:
         print(f"\n📊 스트림 데이터 ({len(streams)}개 타입):")
 
         total_points = 0
-        for stream_name, stream_data in streams.items():
-            if isinstance(stream_data, dict) and 'data' in stream_data:
-                data_points = len(stream_data['data'])
-                total_points = max(total_points, data_points)
-                print(f"  - {stream_name}: {data_points:,} 포인트")
+        for stream_name, data_points in streams.items():
+            total_points = max(total_points, data_points)
+            print(f"  - {stream_name}: {data_points:,} 포인트")
 
         print(f"\n  총 데이터 포인트: {total_points:,}")
     else:
@@ -76,11 +106,12 @@ def analyze_fit_file(fit_path):
         print("   설치: pip install fitparse")
         return None
 
-    # 파일 크기
-    file_size = Path(fit_path).stat().st_size
+    # 파일 크기 (원본이 없으면 아카이브에서 읽음)
+    raw = open_activity(fit_path)
+    file_size = len(raw)
     print(f"파일 크기: {file_size:,} bytes ({file_size/1024:.1f} KB)")
 
-    fitfile = FitFile(fit_path)
+    fitfile = FitFile(raw)
 
     # 데이터 수집
     data_fields = set()
@@ -329,12 +360,12 @@ def main():
     json_path = input("JSON 파일 경로: ").strip()
     fit_path = input("FIT 파일 경로: ").strip()
 
-    # 파일 존재 확인
-    if not Path(json_path).exists():
+    # 파일 존재 확인 (아카이브 항목 포함)
+    if not Path(json_path).exists() and not get_archive().find(json_path):
         print(f"❌ JSON 파일을 찾을 수 없습니다: {json_path}")
         return
 
-    if not Path(fit_path).exists():
+    if not Path(fit_path).exists() and not get_archive().find(fit_path):
         print(f"❌ FIT 파일을 찾을 수 없습니다: {fit_path}")
         return
 
@@ -0,0 +1,117 @@
+"""
+MyWhoosh / Strava 백업 / Garmin Connect 활동 대조 리포트
+
+downloads/(MyWhoosh FIT), strava_data/(Strava JSON), Garmin 활동 목록을
+(시작 시각 ± 허용 오차, 경과 시간, 종목)으로 맞춰 보고 어디에 무엇이 빠졌는지 출력합니다.
+
+Garmin 활동은 기본적으로 data/garmin_activity_index.json 캐시(최근 동기화 기간)를 사용하고,
+--garmin을 주면 GARMIN_EMAIL/GARMIN_PASSWORD로 로그인하여 비교 기간 전체를 조회합니다.
+
+사용법:
+    python scripts/comparison/reconcile_sources.py [--since 2024-01-01] [--garmin] [--json report.json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 프로젝트 루트 디렉토리 설정
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.garmin_activity_index import START_TOLERANCE
+from src.reconciliation import (SummaryCache, load_garmin_activities, load_garmin_index,
+                                load_mywhoosh, load_strava, reconcile)
+
+# 기준 → 비교 대상
+PAIRS = (('mywhoosh', 'garmin'), ('mywhoosh', 'strava'), ('strava', 'garmin'))
+
+
+def load_sources(args):
+    """출처별 활동 목록 로드"""
+    cache = SummaryCache(PROJECT_ROOT / "data" / "reconcile_cache.json")
+    sources = {
+        'mywhoosh': load_mywhoosh(args.downloads, cache),
+        'strava': load_strava(args.strava_dir, cache),
+    }
+    cache.save()
+    print(f"  파일 요약: 캐시 {cache.hits}개, 새로 읽음 {cache.misses}개")
+
+    if args.garmin:
+        from src.garmin_uploader import GarminUploader
+        uploader = GarminUploader(os.getenv('GARMIN_EMAIL'), os.getenv('GARMIN_PASSWORD'),
+                                  token_dir=PROJECT_ROOT / ".garminconnect")
+        starts = [a.start for s in sources.values() for a in s.activities]
+        start_date = args.since or (datetime.fromtimestamp(min(starts)) if starts else datetime.now())
+        sources['garmin'] = load_garmin_activities(uploader.garmin, start_date, datetime.now())
+    else:
+        garmin = load_garmin_index(args.garmin_index)
+        if garmin is None:
+            print(f"  ⚠️  Garmin 활동 인덱스 캐시 없음 ({args.garmin_index}), Garmin 대조 생략")
+        else:
+            sources['garmin'] = garmin
+
+    if args.since:
+        since = args.since.timestamp()
+        for source in sources.values():
+            source.activities = [a for a in source.activities if a.start >= since]
+    return sources
+
+
+def print_report(report):
+    """대조 결과 1쌍 출력"""
+    print(f"\n{'='*60}")
+    print(f"{report['reference']} → {report['other']}: 일치 {report['matched']}개, "
+          f"누락 {len(report['missing'])}개, 추가 {len(report['extra'])}개, "
+          f"불일치 {len(report['mismatch'])}개")
+    print(f"{'='*60}")
+    for activity in report['missing']:
+        print(f"  ❌ {report['other']}에 없음: {activity['start']} {activity['ref']}")
+    for activity in report['extra']:
+        print(f"  ➕ {report['reference']}에 없음: {activity['start']} {activity['ref']}")
+    for item in report['mismatch']:
+        print(f"  ⚠️  {item['reference']['ref']} ↔ {item['other']['ref']}: {', '.join(item['reasons'])}")
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="MyWhoosh / Strava / Garmin 활동 대조")
+    parser.add_argument('--downloads', default=str(PROJECT_ROOT / "downloads"))
+    parser.add_argument('--strava-dir', default=str(PROJECT_ROOT / "strava_data"))
+    parser.add_argument('--garmin-index', default=str(PROJECT_ROOT / "data" / "garmin_activity_index.json"))
+    parser.add_argument('--garmin', action='store_true', help="Garmin Connect에서 직접 조회")
+    parser.add_argument('--since', type=lambda s: datetime.strptime(s, '%Y-%m-%d'),
+                        help="이 날짜 이후 활동만 대조 (YYYY-MM-DD)")
+    parser.add_argument('--tolerance', type=int, default=START_TOLERANCE,
+                        help=f"시작 시각 허용 오차 (초, 기본 {START_TOLERANCE})")
+    parser.add_argument('--json', help="결과를 JSON으로 저장할 경로")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    sources = load_sources(args)
+    for name, source in sources.items():
+        print(f"  {name}: 활동 {len(source.activities)}개")
+
+    reports = [reconcile(sources[reference], sources[other], args.tolerance)
+               for reference, other in PAIRS if reference in sources and other in sources]
+    for report in reports:
+        print_report(report)
+    print(f"\n⏱️  {time.perf_counter() - started:.2f}초")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, indent=2, ensure_ascii=False)
+        print(f"✅ 저장: {args.json}")
+
+    return 1 if any(r['missing'] or r['mismatch'] for r in reports) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,26 +1,44 @@
 """
 JSON 파일을 GPX로 변환하여 Garmin 업로드 가능하게 만들기
+(위치가 기록된 FIT 파일도 같은 방법으로 변환 가능)
 """
-import json
+import argparse
+import sys
 from pathlib import Path
 from datetime import datetime
 from xml.etree.ElementTree import Element, SubElement, tostring
 from xml.dom import minidom
 
+# 프로젝트 루트 디렉토리 설정
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
 
-def json_to_gpx(json_path, output_path=None):
-    """JSON 파일을 GPX로 변환"""
+from src.activity_model import Activity
+from src.track_simplify import METHODS, format_report, simplify_track
+
+
+def json_to_gpx(json_path, output_path=None, simplify=None, tolerance=5.0, interval=None):
+    """
+    JSON 파일을 GPX로 변환 (.fit이면 FIT 파일에서)
+
+    Args:
+        simplify: 트랙 단순화 방법 ('rdp', 'visvalingam', None이면 모든 포인트)
+        tolerance: 단순화 허용 거리 (m)
+        interval: 시간 간격 솎아내기 (초, 파워/심박 최고점은 유지)
+    """
 
     print(f"\n{'='*60}")
     print(f"JSON → GPX 변환")
     print(f"{'='*60}\n")
 
-    # JSON 읽기
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # JSON/FIT 읽기 (원본이 없으면 아카이브에서)
+    loaded = Activity.load(json_path)
+    if loaded is None:
+        print("❌ 기록(record)이 없는 FIT 파일입니다.")
+        return None
 
-    activity = data['activity']
-    streams = data.get('streams', {})
+    activity = loaded.meta
+    streams = loaded.streams
 
     # GPS 좌표 확인
     if 'latlng' not in streams:
@@ -55,43 +73,41 @@ def json_to_gpx(json_path, output_path=None):
 
     trkseg = SubElement(trk, 'trkseg')
 
-    # 데이터 추출
-    latlng_data = streams['latlng']['data']
-    time_data = streams['time']['data']
-    altitude_data = streams.get('altitude', {}).get('data', [])
-    heartrate_data = streams.get('heartrate', {}).get('data', [])
-    cadence_data = streams.get('cadence', {}).get('data', [])
-    watts_data = streams.get('watts', {}).get('data', [])
+    has_extensions = any(name in streams for name in ('heartrate', 'cadence', 'watts'))
 
     start_time = datetime.fromisoformat(activity['start_date'].replace('Z', '+00:00'))
 
     print(f"변환 중: {activity['name']}")
-    print(f"  포인트 수: {len(latlng_data):,}")
+
+    # 직렬화 전에 남길 포인트 선택
+    indices, report = simplify_track(streams, simplify, tolerance, interval)
+    for line in format_report(report):
+        print(line)
 
     # 각 포인트 추가
-    for i, (lat, lng) in enumerate(latlng_data):
-        trkpt = SubElement(trkseg, 'trkpt', {'lat': str(lat), 'lon': str(lng)})
+    for point in streams.rows(indices):
+        trkpt = SubElement(trkseg, 'trkpt', {'lat': str(point['lat']), 'lon': str(point['lng'])})
 
         # 시간
-        point_time = start_time.timestamp() + time_data[i]
+        point_time = start_time.timestamp() + point['time']
         time_str = datetime.fromtimestamp(point_time).isoformat() + 'Z'
         SubElement(trkpt, 'time').text = time_str
 
         # 고도
-        if i < len(altitude_data):
-            SubElement(trkpt, 'ele').text = str(altitude_data[i])
+        if 'altitude' in point:
+            SubElement(trkpt, 'ele').text = str(point['altitude'])
 
         # 확장 데이터 (심박수, 케이던스, 파워)
-        if heartrate_data or cadence_data or watts_data:
+        if has_extensions:
             extensions = SubElement(trkpt, 'extensions')
             tpx = SubElement(extensions, 'gpxtpx:TrackPointExtension')
 
-            if i < len(heartrate_data):
-                SubElement(tpx, 'gpxtpx:hr').text = str(int(heartrate_data[i]))
-            if i < len(cadence_data):
-                SubElement(tpx, 'gpxtpx:cad').text = str(int(cadence_data[i]))
-            if i < len(watts_data):
-                SubElement(tpx, 'gpxtpx:power').text = str(int(watts_data[i]))
+            if 'heartrate' in point:
+                SubElement(tpx, 'gpxtpx:hr').text = str(int(point['heartrate']))
+            if 'cadence' in point:
+                SubElement(tpx, 'gpxtpx:cad').text = str(int(point['cadence']))
+            if 'watts' in point:
+                SubElement(tpx, 'gpxtpx:power').text = str(int(point['watts']))
 
     # 포맷팅 및 저장
     rough_string = tostring(gpx, 'utf-8')
@@ -113,5 +129,12 @@ def json_to_gpx(json_path, output_path=None):
 
 
 if __name__ == "__main__":
-    json_path = "strava_data/2025-12-11_MyWhoosh_-_Sweetspot_#1_activity.json"
-    json_to_gpx(json_path)
+    parser = argparse.ArgumentParser(description="Strava JSON (또는 FIT) → GPX 변환")
+    parser.add_argument('json_path', nargs='?',
+                        default="strava_data/2025-12-11_MyWhoosh_-_Sweetspot_#1_activity.json")
+    parser.add_argument('-o', '--output')
+    parser.add_argument('--simplify', choices=METHODS, help="트랙 단순화 방법")
+    parser.add_argument('--tolerance', type=float, default=5.0, help="단순화 허용 거리 (m, 기본 5)")
+    parser.add_argument('--interval', type=float, help="N초 간격으로 솎아내기 (파워/심박 최고점 유지)")
+    args = parser.parse_args()
+    json_to_gpx(args.json_path, args.output, args.simplify, args.tolerance, args.interval)
@@ -1,7 +1,7 @@
 """
 Strava API로 특정 날짜의 활동 찾기 및 다운로드
 """
-import os
+import sys
 import json
 import requests
 from dotenv import load_dotenv
@@ -10,7 +10,15 @@ from datetime import datetime
 
 load_dotenv()
 
-STRAVA_ACCESS_TOKEN = os.getenv('STRAVA_ACCESS_TOKEN')
+# 프로젝트 루트 디렉토리 설정
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.strava_streams import fetch_streams
+from src.strava_token_manager import get_token_manager
+
+# 만료 전에 자동 갱신되는 토큰 (.strava_token.json)
+token_manager = get_token_manager()
 
 
 def get_recent_activities(per_page=30):
@@ -20,11 +28,10 @@ def get_recent_activities(per_page=30):
     print(f"{'='*60}\n")
 
     url = "https://www.strava.com/api/v3/athlete/activities"
-    headers = {"Authorization": f"Bearer {STRAVA_ACCESS_TOKEN}"}
     params = {"per_page": per_page}
 
     try:
-        response = requests.get(url, headers=headers, params=params)
+        response = token_manager.get(url, params=params)
         response.raise_for_status()
 
         activities = response.json()
@@ -34,8 +41,8 @@ def get_recent_activities(per_page=30):
 
     except requests.exceptions.HTTPError as e:
         if e.response.status_code == 401:
-            print("❌ 인증 오류: Access Token이 만료되었습니다.")
-            print("   refresh_strava_token.py를 실행하여 토큰을 갱신하세요.")
+            print("❌ 인증 오류: Access Token을 갱신할 수 없습니다.")
+            print("   .env의 STRAVA_REFRESH_TOKEN, STRAVA_CLIENT_ID, STRAVA_CLIENT_SECRET을 확인하세요.")
         else:
             print(f"❌ Strava API 오류: {e}")
         return None
@@ -84,27 +91,15 @@ def find_activity_by_date(activities, target_date):
 def get_activity_detail(activity_id):
     """활동 상세 정보 가져오기"""
     url = f"https://www.strava.com/api/v3/activities/{activity_id}"
-    headers = {"Authorization": f"Bearer {STRAVA_ACCESS_TOKEN}"}
 
-    response = requests.get(url, headers=headers)
+    response = token_manager.get(url)
     response.raise_for_status()
     return response.json()
 
 
 def get_activity_streams(activity_id):
-    """활동 스트림 데이터 가져오기"""
-    url = f"https://www.strava.com/api/v3/activities/{activity_id}/streams"
-    headers = {"Authorization": f"Bearer {STRAVA_ACCESS_TOKEN}"}
-
-    stream_types = [
-        'time', 'latlng', 'distance', 'altitude', 'velocity_smooth',
-        'heartrate', 'cadence', 'watts', 'temp', 'moving', 'grade_smooth'
-    ]
-    params = {"keys": ','.join(stream_types), "key_by_type": True}
-
-    response = requests.get(url, headers=headers, params=params)
-    response.raise_for_status()
-    return response.json()
+    """활동 스트림 데이터 가져오기 (백업용: 모든 스트림, 전체 해상도)"""
+    return fetch_streams(token_manager.get, activity_id)
 
 
 def save_activity_as_json(activity_id, output_dir="strava_data"):
@@ -0,0 +1,76 @@
+"""
+strava_data/ 백업 JSON 목록 (메타데이터 + 스트림 포인트 수)
+
+스트림 배열을 만들지 않는 빠른 경로로 헤더만 읽고, 한 번 읽은 파일은
+data/backup_header_cache.json에서 바로 가져오므로 수백 개도 금방 나열됩니다.
+
+사용법:
+    python scripts/strava/list_backups.py [--dir strava_data] [--no-cache] [--full]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리 설정
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.backup_reader import BackupFormatError, backup_header, get_header_cache, read_header
+
+
+def full_header(path):
+    """비교용: json.load로 전체를 읽어 같은 헤더 만들기"""
+    raw = path.read_bytes()
+    data = json.loads(raw)
+    return {
+        'file_size': len(raw),
+        'activity': data.get('activity', {}),
+        'streams': {name: len(stream.get('data', [])) for name, stream in data.get('streams', {}).items()},
+    }
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="Strava 백업 목록")
+    parser.add_argument('--dir', default=str(PROJECT_ROOT / "strava_data"), help="백업 폴더")
+    parser.add_argument('--no-cache', action='store_true', help="헤더 캐시 사용 안 함")
+    parser.add_argument('--full', action='store_true', help="json.load로 전체 읽기 (비교용)")
+    args = parser.parse_args()
+
+    files = sorted(Path(args.dir).glob('*_activity.json'))
+    cache = False if args.no_cache or args.full else get_header_cache()
+
+    started = time.perf_counter()
+    print(f"{'날짜':<12}{'종류':<14}{'거리(km)':>10}{'시간(분)':>10}{'포인트':>9}  이름")
+    for path in files:
+        try:
+            if args.full:
+                header = full_header(path)
+            elif cache is False:
+                header = backup_header(path.read_bytes())
+            else:
+                header = read_header(path, cache)
+        except (OSError, ValueError, BackupFormatError) as e:
+            print(f"⚠️  {path.name}: {e}")
+            continue
+        activity = header['activity']
+        points = max(header['streams'].values(), default=0)
+        print(f"{(activity.get('start_date') or '')[:10]:<12}"
+              f"{activity.get('sport_type') or activity.get('type') or '':<14}"
+              f"{(activity.get('distance') or 0) / 1000:>10.2f}"
+              f"{(activity.get('moving_time') or 0) / 60:>10.1f}"
+              f"{points:>9,}  {activity.get('name', '')}")
+    elapsed = time.perf_counter() - started
+
+    if cache:
+        cache.save()
+        print(f"\n{len(files)}개, {elapsed * 1000:.1f}ms (캐시 적중 {cache.hits}, 새로 읽음 {cache.misses})")
+    else:
+        print(f"\n{len(files)}개, {elapsed * 1000:.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,67 +1,55 @@
 """
 Strava Access Token 갱신 스크립트
+
+갱신된 토큰은 .strava_token.json에 자동 저장되며,
+다른 Strava 스크립트는 만료 전에 알아서 갱신하므로 보통은 실행할 필요가 없습니다.
+(토큰이 폐기되었거나 즉시 갱신이 필요할 때 사용)
 """
-import os
+import sys
 import requests
+from datetime import datetime
 from dotenv import load_dotenv
+from pathlib import Path
 
 load_dotenv()
 
-CLIENT_ID = os.getenv('STRAVA_CLIENT_ID')
-CLIENT_SECRET = os.getenv('STRAVA_CLIENT_SECRET')
-REFRESH_TOKEN = os.getenv('STRAVA_REFRESH_TOKEN')
+# 프로젝트 루트 디렉토리 설정
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.strava_token_manager import StravaTokenManager
+
 
 def refresh_access_token():
-    """Refresh Token으로 새로운 Access Token 발급"""
+    """Refresh Token으로 새로운 Access Token 발급 후 토큰 파일에 저장"""
 
     print("="*60)
     print("Strava Access Token 갱신")
     print("="*60)
 
-    url = "https://www.strava.com/oauth/token"
-    payload = {
-        'client_id': CLIENT_ID,
-        'client_secret': CLIENT_SECRET,
-        'refresh_token': REFRESH_TOKEN,
-        'grant_type': 'refresh_token'
-    }
+    token_manager = StravaTokenManager()
 
     print(f"\n요청 중...")
-    print(f"Client ID: {CLIENT_ID}")
-    print(f"Refresh Token: {REFRESH_TOKEN[:20]}...")
+    print(f"Client ID: {token_manager.client_id}")
 
     try:
-        response = requests.post(url, data=payload)
-        response.raise_for_status()
-
-        token_data = response.json()
+        token_data = token_manager.refresh()
 
-        new_access_token = token_data['access_token']
-        new_refresh_token = token_data['refresh_token']
-        expires_at = token_data['expires_at']
-
-        from datetime import datetime
-        expiry_time = datetime.fromtimestamp(expires_at)
+        expiry_time = datetime.fromtimestamp(token_data['expires_at'])
 
         print(f"\n✅ 토큰 갱신 성공!")
-        print(f"\n새로운 Access Token:")
-        print(f"{new_access_token}")
-        print(f"\n새로운 Refresh Token:")
-        print(f"{new_refresh_token}")
-        print(f"\n만료 시간: {expiry_time}")
-
-        # .env 파일 업데이트 안내
-        print(f"\n{'='*60}")
-        print(".env 파일을 아래 값으로 업데이트하세요:")
-        print(f"{'='*60}")
-        print(f"STRAVA_ACCESS_TOKEN={new_access_token}")
-        print(f"STRAVA_REFRESH_TOKEN={new_refresh_token}")
+        print(f"   Access Token: {token_data['access_token'][:10]}...")
+        print(f"   만료 시간: {expiry_time}")
+        print(f"   저장 위치: {token_manager.token_file}")
 
         return token_data
 
+    except RuntimeError as e:
+        print(f"\n❌ 토큰 갱신 불가: {e}")
+        return None
     except requests.exceptions.RequestException as e:
         print(f"\n❌ 토큰 갱신 실패: {e}")
-        if hasattr(e.response, 'text'):
+        if getattr(e, 'response', None) is not None:
             print(f"응답: {e.response.text}")
         return None
 
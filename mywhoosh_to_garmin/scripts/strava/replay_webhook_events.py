@@ -0,0 +1,160 @@
+"""
+Strava 웹훅 이벤트 재생기 (로컬 테스트/부하 테스트용)
+
+webhook_receiver.py에 구독 검증 요청과 activity 이벤트를 보냅니다.
+- --events 파일(JSON Lines)이 있으면 그 이벤트를, 없으면 합성 이벤트를 전송
+- 합성 이벤트는 --activities개의 활동에 create/update가 섞여 들어가므로
+  수신기 쪽 중복 묶기(coalesce) 동작도 확인할 수 있음
+
+사용법:
+    python scripts/strava/webhook_receiver.py --dry-run          # 다른 터미널
+    python scripts/strava/replay_webhook_events.py --count 5000 --rate 100
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def synthetic_events(count, activities=50, owner_id=1, seed=42, subscription_id=1):
+    """합성 activity 이벤트 생성 (활동마다 첫 이벤트는 create)"""
+    rng = random.Random(seed)
+    base_id = 16_000_000_000
+    created = set()
+    for _ in range(count):
+        activity_id = base_id + rng.randrange(activities)
+        aspect = 'update' if activity_id in created else 'create'
+        created.add(activity_id)
+        event = {
+            'aspect_type': aspect,
+            'event_time': int(time.time()),
+            'object_id': activity_id,
+            'object_type': 'activity',
+            'owner_id': owner_id,
+            'subscription_id': subscription_id,
+            'updates': {'title': f"Ride {rng.randrange(1000)}"} if aspect == 'update' else {},
+        }
+        yield event
+
+
+def load_events(path):
+    """JSON Lines 파일에서 이벤트 읽기"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def verify_handshake(url, verify_token):
+    """구독 검증 요청이 challenge를 그대로 돌려주는지 확인"""
+    challenge = f"replay-{random.randrange(10**9)}"
+    response = requests.get(url, params={
+        'hub.mode': 'subscribe',
+        'hub.verify_token': verify_token,
+        'hub.challenge': challenge,
+    }, timeout=5)
+    return response.status_code == 200 and response.json().get('hub.challenge') == challenge
+
+
+def percentile(values, pct):
+    """정렬된 목록의 백분위수"""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(len(values) * pct / 100))
+    return values[index]
+
+
+def replay(url, events, rate=0, concurrency=8):
+    """
+    이벤트 전송
+
+    Args:
+        rate: 초당 전송 수 (0이면 최대 속도)
+
+    Returns:
+        dict: 전송 통계
+    """
+    local = threading.local()
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def send(event):
+        nonlocal errors
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+        started = time.perf_counter()
+        try:
+            ok = local.session.post(url, json=event, timeout=5).status_code == 200
+        except requests.RequestException:
+            ok = False
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            if not ok:
+                errors += 1
+
+    interval = 1.0 / rate if rate else 0
+    started = time.perf_counter()
+    sent = 0
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for event in events:
+            if interval:
+                # 시작 시각 기준으로 일정한 간격 유지 (누적 오차 없음)
+                delay = started + sent * interval - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            executor.submit(send, event)
+            sent += 1
+    total = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'sent': sent,
+        'errors': errors,
+        'seconds': round(total, 2),
+        'per_minute': round(sent / total * 60) if total else 0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 1),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 1),
+    }
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="Strava 웹훅 이벤트 재생기")
+    parser.add_argument('--url', default=f"http://127.0.0.1:{os.getenv('STRAVA_WEBHOOK_PORT', '8080')}/")
+    parser.add_argument('--events', help="이벤트 파일 (JSON Lines)")
+    parser.add_argument('--count', type=int, default=1000, help="합성 이벤트 수")
+    parser.add_argument('--activities', type=int, default=50, help="합성 이벤트의 활동 수")
+    parser.add_argument('--rate', type=float, default=0, help="초당 전송 수 (0: 최대 속도)")
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    verify_token = os.getenv('STRAVA_WEBHOOK_VERIFY_TOKEN')
+    if verify_token:
+        ok = verify_handshake(args.url, verify_token)
+        print(f"{'✅' if ok else '❌'} 구독 검증 요청")
+
+    events = load_events(args.events) if args.events else \
+        synthetic_events(args.count, activities=args.activities,
+                         subscription_id=int(os.getenv('STRAVA_WEBHOOK_SUBSCRIPTION_ID') or 1))
+    result = replay(args.url, events, rate=args.rate, concurrency=args.concurrency)
+
+    print(f"전송: {result['sent']:,}개 ({result['seconds']}초, 분당 {result['per_minute']:,}개)")
+    print(f"오류: {result['errors']}개")
+    print(f"응답 시간: p50 {result['p50_ms']}ms, p99 {result['p99_ms']}ms")
+
+    return 0 if result['errors'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,7 +2,7 @@
 Strava API 데이터 저장 스크립트
 여러 형식으로 활동 데이터를 저장할 수 있습니다.
 """
-import os
+import sys
 import json
 import csv
 import requests
@@ -12,36 +12,48 @@ from pathlib import Path
 
 load_dotenv()
 
-STRAVA_ACCESS_TOKEN = os.getenv('STRAVA_ACCESS_TOKEN')
+# 프로젝트 루트 디렉토리 설정
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.activity_export import export_files
+from src.activity_model import as_streams
+from src.strava_streams import StreamCache, fetch_streams
+from src.strava_token_manager import get_token_manager
+from src.track_simplify import format_report, simplify_track
+
+# 만료 전에 자동 갱신되는 토큰 (.strava_token.json)
+token_manager = get_token_manager()
 
 
 class StravaDataSaver:
     """Strava API 데이터를 여러 형식으로 저장"""
 
     def __init__(self):
-        self.headers = {"Authorization": f"Bearer {STRAVA_ACCESS_TOKEN}"}
+        self.token_manager = token_manager
         self.output_dir = Path("strava_data")
         self.output_dir.mkdir(exist_ok=True)
+        # 같은 실행 중 여러 형식으로 저장할 때 스트림을 다시 받지 않도록
+        self.stream_cache = StreamCache()
 
     def get_activity_detail(self, activity_id):
         """활동 상세 정보 가져오기"""
         url = f"https://www.strava.com/api/v3/activities/{activity_id}"
-        response = requests.get(url, headers=self.headers)
+        response = self.token_manager.get(url)
         response.raise_for_status()
         return response.json()
 
-    def get_activity_streams(self, activity_id):
-        """활동 스트림 데이터 가져오기"""
-        url = f"https://www.strava.com/api/v3/activities/{activity_id}/streams"
-        stream_types = [
-            'time', 'latlng', 'distance', 'altitude', 'velocity_smooth',
-            'heartrate', 'cadence', 'watts', 'temp', 'moving', 'grade_smooth'
-        ]
-        params = {"keys": ','.join(stream_types), "key_by_type": True}
+    def get_activity_streams(self, activity_id, keys=None, resolution=None, series_type=None):
+        """
+        활동 스트림 데이터 가져오기
 
-        response = requests.get(url, headers=self.headers, params=params)
-        response.raise_for_status()
-        return response.json()
+        Args:
+            keys: 받을 스트림 (None이면 전체)
+            resolution: 'low'/'medium'/'high' (None이면 전체 해상도, 저장용 기본값)
+            series_type: 'time'/'distance'
+        """
+        return fetch_streams(self.token_manager.get, activity_id, keys, resolution, series_type,
+                             cache=self.stream_cache)
 
     # ==================== 저장 방법 1: JSON 파일 ====================
     def save_as_json(self, activity_id, include_streams=True):
@@ -87,7 +99,7 @@ class StravaDataSaver:
         return filename
 
     # ==================== 저장 방법 2: GPX 파일 ====================
-    def save_as_gpx(self, activity_id):
+    def save_as_gpx(self, activity_id, simplify=None, tolerance=5.0, interval=None):
         """
         GPX (GPS Exchange Format) 파일로 저장
 
@@ -99,13 +111,15 @@ class StravaDataSaver:
         단점:
         - GPS 좌표가 없으면 생성 불가
         - 파워, 심박수 등은 확장 필드로 저장
+
+        simplify('rdp'/'visvalingam')나 interval(초)을 주면 포인트를 줄여 저장합니다.
         """
         print(f"\n{'='*60}")
         print(f"방법 2: GPX 파일로 저장")
         print(f"{'='*60}\n")
 
         activity = self.get_activity_detail(activity_id)
-        streams = self.get_activity_streams(activity_id)
+        streams = as_streams(self.get_activity_streams(activity_id))
 
         # GPS 좌표 확인
         if 'latlng' not in streams:
@@ -118,7 +132,10 @@ class StravaDataSaver:
         name = activity['name'].replace('/', '-')
         start_time = activity['start_date']
 
-        gpx_content = self._create_gpx_xml(activity, streams)
+        indices, report = simplify_track(streams, simplify, tolerance, interval)
+        for line in format_report(report):
+            print(line)
+        gpx_content = self._create_gpx_xml(activity, streams, indices)
 
         # 저장
         filename = self.output_dir / f"{date}_{name}.gpx"
@@ -129,8 +146,8 @@ class StravaDataSaver:
         print(f"   파일 크기: {filename.stat().st_size / 1024:.1f} KB")
         return filename
 
-    def _create_gpx_xml(self, activity, streams):
-        """GPX XML 문자열 생성"""
+    def _create_gpx_xml(self, activity, streams, indices=None):
+        """GPX XML 문자열 생성 (indices가 있으면 해당 포인트만)"""
         from xml.etree.ElementTree import Element, SubElement, tostring
         from xml.dom import minidom
 
@@ -156,38 +173,37 @@ class StravaDataSaver:
         trkseg = SubElement(trk, 'trkseg')
 
         # 각 포인트 추가
-        latlng_data = streams['latlng']['data']
-        time_data = streams['time']['data']
-        altitude_data = streams.get('altitude', {}).get('data', [])
-        heartrate_data = streams.get('heartrate', {}).get('data', [])
-        cadence_data = streams.get('cadence', {}).get('data', [])
-        watts_data = streams.get('watts', {}).get('data', [])
+        streams = as_streams(streams)
+        has_extensions = any(name in streams for name in ('heartrate', 'cadence', 'watts'))
 
         start_time = datetime.fromisoformat(activity['start_date'].replace('Z', '+00:00'))
 
-        for i, (lat, lng) in enumerate(latlng_data):
-            trkpt = SubElement(trkseg, 'trkpt', {'lat': str(lat), 'lon': str(lng)})
+        if indices is None:
+            indices = range(streams.size('latlng'))
+
+        for point in streams.rows(indices):
+            trkpt = SubElement(trkseg, 'trkpt', {'lat': str(point['lat']), 'lon': str(point['lng'])})
 
             # 시간
-            point_time = start_time.timestamp() + time_data[i]
+            point_time = start_time.timestamp() + point['time']
             time_str = datetime.fromtimestamp(point_time).isoformat() + 'Z'
             SubElement(trkpt, 'time').text = time_str
 
             # 고도
-            if i < len(altitude_data):
-                SubElement(trkpt, 'ele').text = str(altitude_data[i])
+            if 'altitude' in point:
+                SubElement(trkpt, 'ele').text = str(point['altitude'])
 
             # 확장 데이터 (심박수, 케이던스, 파워)
-            if heartrate_data or cadence_data or watts_data:
+            if has_extensions:
                 extensions = SubElement(trkpt, 'extensions')
                 tpx = SubElement(extensions, 'gpxtpx:TrackPointExtension')
 
-                if i < len(heartrate_data):
-                    SubElement(tpx, 'gpxtpx:hr').text = str(int(heartrate_data[i]))
-                if i < len(cadence_data):
-                    SubElement(tpx, 'gpxtpx:cad').text = str(int(cadence_data[i]))
-                if i < len(watts_data):
-                    SubElement(tpx, 'gpxtpx:power').text = str(int(watts_data[i]))
+                if 'heartrate' in point:
+                    SubElement(tpx, 'gpxtpx:hr').text = str(int(point['heartrate']))
+                if 'cadence' in point:
+                    SubElement(tpx, 'gpxtpx:cad').text = str(int(point['cadence']))
+                if 'watts' in point:
+                    SubElement(tpx, 'gpxtpx:power').text = str(int(point['watts']))
 
         # 포맷팅
         rough_string = tostring(gpx, 'utf-8')
@@ -213,25 +229,19 @@ class StravaDataSaver:
         print(f"{'='*60}\n")
 
         activity = self.get_activity_detail(activity_id)
-        streams = self.get_activity_streams(activity_id)
+        streams = as_streams(self.get_activity_streams(activity_id))
 
         date = activity['start_date'][:10]
         name = activity['name'].replace('/', '-')
 
-        # CSV 헤더 생성
+        # CSV 헤더 생성 (latlng는 위도/경도 두 컬럼)
         headers = ['time']
-        data_arrays = {'time': streams['time']['data']}
-
-        # 사용 가능한 스트림 추가
-        for stream_name, stream_data in streams.items():
-            if stream_name != 'time':
-                if stream_name == 'latlng':
-                    headers.extend(['latitude', 'longitude'])
-                    data_arrays['latitude'] = [point[0] for point in stream_data['data']]
-                    data_arrays['longitude'] = [point[1] for point in stream_data['data']]
-                else:
-                    headers.append(stream_name)
-                    data_arrays[stream_name] = stream_data['data']
+        for stream_name in streams:
+            if stream_name == 'latlng':
+                headers.extend(['latitude', 'longitude'])
+            elif stream_name != 'time':
+                headers.append(stream_name)
+        keys = [{'latitude': 'lat', 'longitude': 'lng'}.get(header, header) for header in headers]
 
         # CSV 저장
         filename = self.output_dir / f"{date}_{name}_data.csv"
@@ -240,22 +250,48 @@ class StravaDataSaver:
             writer = csv.writer(f)
             writer.writerow(headers)
 
-            # 데이터 행 작성
-            num_rows = len(data_arrays['time'])
-            for i in range(num_rows):
-                row = []
-                for header in headers:
-                    if header in data_arrays and i < len(data_arrays[header]):
-                        row.append(data_arrays[header][i])
-                    else:
-                        row.append('')
-                writer.writerow(row)
+            # 데이터 행 작성 (time 스트림 길이 기준, 없는 값은 빈 칸)
+            writer.writerows(streams.records(keys, missing=''))
 
         print(f"✅ 저장 완료: {filename}")
         print(f"   파일 크기: {filename.stat().st_size / 1024:.1f} KB")
         print(f"   컬럼: {', '.join(headers)}")
         return filename
 
+    # ==================== 저장 방법 3-1: 여러 형식 한 번에 ====================
+    def export(self, activity_id, formats=('gpx', 'tcx', 'csv'), simplify=None, tolerance=5.0,
+               interval=None):
+        """
+        활동을 한 번 조회하고 스트림을 한 번 순회하여 여러 형식으로 저장
+
+        - TCX는 GPS 좌표가 없어도 저장되므로 실내 MyWhoosh 라이딩도 내보낼 수 있음
+        - GPX는 GPS 좌표가 없으면 건너뜀
+        - simplify/interval을 주면 GPS 활동의 포인트를 줄여서 저장 (모든 형식에 같은 포인트)
+        """
+        print(f"\n{'='*60}")
+        print(f"여러 형식 저장: {', '.join(formats)}")
+        print(f"{'='*60}\n")
+
+        activity = self.get_activity_detail(activity_id)
+        streams = as_streams(self.get_activity_streams(activity_id))
+
+        indices = None
+        if (simplify or interval) and 'latlng' in streams:
+            indices, report = simplify_track(streams, simplify, tolerance, interval)
+            for line in format_report(report):
+                print(line)
+
+        written, skipped = export_files(activity, streams, self.output_dir, formats, indices)
+        for sink in written:
+            print(f"✅ 저장 완료: {sink.path} ({sink.path.stat().st_size / 1024:.1f} KB, {sink.count:,} 포인트)")
+        for sink in skipped:
+            print(f"⏭️  {sink.name.upper()} 건너뜀: {sink.skipped}")
+        return [sink.path for sink in written]
+
+    def save_as_tcx(self, activity_id):
+        """TCX 파일로 저장 (GPS 좌표 없는 실내 활동 포함)"""
+        return self.export(activity_id, formats=('tcx',))
+
     # ==================== 저장 방법 4: FIT 파일 변환 ====================
     def save_as_fit(self, activity_id):
         """
@@ -340,8 +376,9 @@ def main():
     print("2. GPX (GPS 앱 호환, 지도 표시 가능)")
     print("3. CSV (Excel 분석용)")
     print("4. 모두 저장")
+    print("5. TCX (실내 라이딩 포함, Garmin 업로드 가능)")
 
-    choice = input("\n선택 (1-4): ").strip()
+    choice = input("\n선택 (1-5): ").strip()
 
     try:
         if choice == '1':
@@ -353,8 +390,9 @@ def main():
         elif choice == '4':
             print("\n모든 형식으로 저장합니다...\n")
             saver.save_as_json(activity_id)
-            saver.save_as_gpx(activity_id)
-            saver.save_as_csv(activity_id)
+            saver.export(activity_id)
+        elif choice == '5':
+            saver.save_as_tcx(activity_id)
         else:
             print("잘못된 선택입니다.")
 
@@ -362,8 +400,8 @@ def main():
 
     except requests.exceptions.HTTPError as e:
         if e.response.status_code == 401:
-            print("\n❌ 인증 오류: Access Token이 만료되었거나 잘못되었습니다.")
-            print("   refresh_strava_token.py를 실행하여 토큰을 갱신하세요.")
+            print("\n❌ 인증 오류: Access Token이 잘못되었거나 갱신할 수 없습니다.")
+            print("   .env의 STRAVA_REFRESH_TOKEN, STRAVA_CLIENT_ID, STRAVA_CLIENT_SECRET을 확인하세요.")
         elif e.response.status_code == 404:
             print(f"\n❌ 활동을 찾을 수 없습니다 (ID: {activity_id})")
         else:
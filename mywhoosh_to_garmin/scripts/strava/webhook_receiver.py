@@ -0,0 +1,321 @@
+"""
+Strava 웹훅 수신기 (활동 목록 폴링 대신 푸시 방식)
+
+- GET: 구독 생성 시 Strava가 보내는 검증 요청(hub.challenge)에 응답
+- POST: activity create/update 이벤트를 로컬 디스크 큐(data/webhook_spool/)에
+  바로 기록하고 200 응답 (Strava는 2초 안에 응답을 요구)
+- 워커: 큐를 비우며 변경된 활동만 download_activity.save_activity_as_json으로 백업
+  (같은 활동의 이벤트가 여러 개 쌓여 있으면 한 번만 백업)
+
+큐 디렉토리 구조:
+    incoming/    수신된 이벤트 (파일 1개 = 이벤트 1개)
+    processing/  워커가 가져간 이벤트 (재시작 시 incoming/으로 복구)
+    failed/      재시도 횟수를 넘긴 이벤트
+
+설정 (환경 변수):
+    STRAVA_WEBHOOK_VERIFY_TOKEN      구독 검증 토큰 (필수)
+    STRAVA_WEBHOOK_SUBSCRIPTION_ID   구독 ID (설정하면 다른 구독 ID의 이벤트는 403으로 거부,
+                                     구독 등록 응답의 id 값 - 등록 전에는 비워 둠)
+
+사용법:
+    STRAVA_WEBHOOK_VERIFY_TOKEN=... python scripts/strava/webhook_receiver.py [--port 8080]
+    python scripts/strava/webhook_receiver.py --dry-run   # 백업 없이 큐 처리만 (부하 테스트용)
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 프로젝트 루트 디렉토리 설정
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+DEFAULT_SPOOL_DIR = PROJECT_ROOT / "data" / "webhook_spool"
+BACKUP_ASPECTS = ('create', 'update')
+MAX_ATTEMPTS = 3
+RETRY_DELAY = 60  # 초, 시도할 때마다 두 배
+
+
+class EventSpool:
+    """디스크 기반 이벤트 큐 (쓰기는 임시 파일 → rename으로 원자적)"""
+
+    def __init__(self, spool_dir=None):
+        self.spool_dir = Path(spool_dir) if spool_dir else DEFAULT_SPOOL_DIR
+        self.incoming = self.spool_dir / "incoming"
+        self.processing = self.spool_dir / "processing"
+        self.failed = self.spool_dir / "failed"
+        for directory in (self.incoming, self.processing, self.failed):
+            directory.mkdir(parents=True, exist_ok=True)
+        self._counter = 0
+        self._counter_lock = threading.Lock()
+
+    def _next_name(self, event, not_before_ns):
+        """시간순 정렬되는 고유 파일명 (맨 앞은 처리 가능 시각)"""
+        with self._counter_lock:
+            self._counter += 1
+            counter = self._counter
+        return f"{not_before_ns}_{os.getpid()}_{counter}_{event.get('object_id')}.json"
+
+    def put(self, event, directory=None, delay=0):
+        """이벤트 1개 기록 (기록 후에만 incoming/에 보임, delay초 뒤부터 처리)"""
+        directory = directory or self.incoming
+        name = self._next_name(event, time.time_ns() + int(delay * 1e9))
+        tmp_file = self.spool_dir / f".{name}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(event, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, directory / name)
+
+    def recover(self):
+        """이전 실행에서 처리 중이던 이벤트를 incoming/으로 되돌림"""
+        recovered = 0
+        for path in self.processing.glob('*.json'):
+            os.replace(path, self.incoming / path.name)
+            recovered += 1
+        return recovered
+
+    def claim(self, limit=500):
+        """
+        incoming/의 이벤트를 최대 limit개 가져옴
+
+        processing/으로 rename에 성공한 파일만 가져가므로
+        여러 워커가 동시에 호출해도 같은 이벤트를 두 번 처리하지 않습니다.
+        """
+        claimed = []
+        now_ns = time.time_ns()
+        for path in sorted(self.incoming.glob('*.json'))[:limit]:
+            if int(path.name.split('_', 1)[0]) > now_ns:
+                break  # 재시도 대기 중 (이후 파일도 모두 더 늦음)
+            target = self.processing / path.name
+            try:
+                os.replace(path, target)
+            except FileNotFoundError:
+                continue  # 다른 워커가 먼저 가져감
+            try:
+                with open(target, 'r', encoding='utf-8') as f:
+                    claimed.append((target, json.load(f)))
+            except (OSError, json.JSONDecodeError):
+                os.replace(target, self.failed / target.name)
+        return claimed
+
+    def done(self, paths):
+        """처리 완료된 이벤트 삭제"""
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+    def retry(self, paths, events):
+        """실패한 이벤트를 시도 횟수를 늘려 나중에 다시 처리 (초과 시 failed/)"""
+        for path, event in zip(paths, events):
+            event['attempts'] = event.get('attempts', 0) + 1
+            if event['attempts'] >= MAX_ATTEMPTS:
+                self.put(event, self.failed)
+            else:
+                self.put(event, delay=RETRY_DELAY * 2 ** (event['attempts'] - 1))
+            path.unlink(missing_ok=True)
+
+    def pending_count(self):
+        """처리 대기 중인 이벤트 수"""
+        return sum(1 for _ in self.incoming.glob('*.json'))
+
+
+def coalesce(claimed):
+    """
+    활동별로 이벤트 묶기
+
+    Returns:
+        dict: {activity_id: [(path, event), ...]} (create/update만, delete 등은 None 키)
+    """
+    groups = {}
+    for path, event in claimed:
+        if event.get('object_type') == 'activity' and event.get('aspect_type') in BACKUP_ASPECTS:
+            key = event['object_id']
+        else:
+            key = None
+        groups.setdefault(key, []).append((path, event))
+    return groups
+
+
+class SpoolWorker(threading.Thread):
+    """큐를 비우며 변경된 활동만 백업하는 워커"""
+
+    def __init__(self, spool, backup_fn, stats, poll_interval=1.0, batch_size=500):
+        super().__init__(daemon=True)
+        self.spool = spool
+        self.backup_fn = backup_fn
+        self.stats = stats
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.stop_event = threading.Event()
+
+    def run(self):
+        while not self.stop_event.is_set():
+            claimed = self.spool.claim(self.batch_size)
+            if not claimed:
+                self.stop_event.wait(self.poll_interval)
+                continue
+            self.process(claimed)
+
+    def process(self, claimed):
+        """가져온 이벤트 묶음 처리"""
+        groups = coalesce(claimed)
+
+        ignored = groups.pop(None, [])
+        self.spool.done(path for path, _ in ignored)
+        self.stats.add('ignored', len(ignored))
+
+        for activity_id, items in groups.items():
+            paths = [path for path, _ in items]
+            try:
+                self.backup_fn(activity_id)
+            except Exception as e:
+                print(f"❌ 활동 {activity_id} 백업 실패: {e}")
+                self.spool.retry(paths, [event for _, event in items])
+                self.stats.add('failed', 1)
+                continue
+            self.spool.done(paths)
+            self.stats.add('backed_up', 1)
+            self.stats.add('coalesced', len(items) - 1)
+
+
+class Stats:
+    """스레드 안전 카운터"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {'received': 0, 'backed_up': 0, 'coalesced': 0, 'ignored': 0, 'failed': 0, 'rejected': 0}
+
+    def add(self, key, n=1):
+        with self._lock:
+            self.counts[key] += n
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.counts)
+
+
+def make_handler(spool, verify_token, stats, subscription_id=None):
+    """요청 핸들러 클래스 생성 (subscription_id가 있으면 그 구독의 이벤트만 받음)"""
+
+    class WebhookHandler(BaseHTTPRequestHandler):
+        def _respond(self, status, body=None):
+            payload = json.dumps(body).encode('utf-8') if body is not None else b''
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            """구독 검증 (hub.mode=subscribe, hub.verify_token, hub.challenge)"""
+            query = parse_qs(urlparse(self.path).query)
+            mode = query.get('hub.mode', [None])[0]
+            token = query.get('hub.verify_token', [None])[0]
+            challenge = query.get('hub.challenge', [None])[0]
+
+            if mode == 'subscribe' and challenge and token == verify_token:
+                self._respond(200, {'hub.challenge': challenge})
+            else:
+                self._respond(403, {'error': 'verification failed'})
+
+        def do_POST(self):
+            """이벤트 수신 → 디스크 큐에 기록 후 바로 응답"""
+            length = int(self.headers.get('Content-Length', 0))
+            try:
+                event = json.loads(self.rfile.read(length))
+            except json.JSONDecodeError:
+                self._respond(400, {'error': 'invalid json'})
+                return
+            if not isinstance(event, dict):
+                self._respond(400, {'error': 'event must be an object'})
+                return
+            if subscription_id and str(event.get('subscription_id')) != str(subscription_id):
+                # 공개 주소로 임의 활동 ID를 보내 API 한도를 쓰게 하는 요청 차단
+                stats.add('rejected')
+                self._respond(403, {'error': 'unknown subscription'})
+                return
+
+            spool.put(event)
+            stats.add('received')
+            self._respond(200)
+
+        def log_message(self, format, *args):
+            pass  # 요청마다 로그를 남기지 않음 (부하 시 출력이 병목)
+
+    return WebhookHandler
+
+
+def default_backup_fn(output_dir):
+    """download_activity.py의 JSON 저장 경로로 백업하는 함수"""
+    from scripts.strava.download_activity import save_activity_as_json
+
+    def backup(activity_id):
+        save_activity_as_json(activity_id, output_dir=output_dir)
+
+    return backup
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="Strava 웹훅 수신기")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=int(os.getenv('STRAVA_WEBHOOK_PORT', '8080')))
+    parser.add_argument('--workers', type=int, default=2, help="백업 워커 수")
+    parser.add_argument('--spool-dir', default=None, help="이벤트 큐 디렉토리")
+    parser.add_argument('--output-dir', default=str(PROJECT_ROOT / "strava_data"))
+    parser.add_argument('--dry-run', action='store_true', help="Strava API 호출 없이 큐만 처리")
+    args = parser.parse_args()
+
+    verify_token = os.getenv('STRAVA_WEBHOOK_VERIFY_TOKEN')
+    if not verify_token:
+        print("❌ STRAVA_WEBHOOK_VERIFY_TOKEN 환경 변수가 필요합니다.")
+        return 1
+    subscription_id = os.getenv('STRAVA_WEBHOOK_SUBSCRIPTION_ID')
+
+    spool = EventSpool(args.spool_dir)
+    recovered = spool.recover()
+    stats = Stats()
+
+    backup_fn = (lambda activity_id: None) if args.dry_run else default_backup_fn(args.output_dir)
+    workers = [SpoolWorker(spool, backup_fn, stats) for _ in range(args.workers)]
+    for worker in workers:
+        worker.start()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(spool, verify_token, stats, subscription_id))
+    print("=" * 60)
+    print("Strava 웹훅 수신기")
+    print("=" * 60)
+    print(f"주소: http://{args.host}:{args.port}/")
+    print(f"큐: {spool.spool_dir} (대기 {spool.pending_count()}개, 복구 {recovered}개)")
+    print(f"워커: {args.workers}개{' (dry-run)' if args.dry_run else ''}")
+    if subscription_id:
+        print(f"구독 ID: {subscription_id} (다른 구독의 이벤트는 거부)")
+    else:
+        print("⚠️  STRAVA_WEBHOOK_SUBSCRIPTION_ID 미설정: 모든 이벤트를 받음 (구독 등록 후 설정하세요)")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n종료 중...")
+    finally:
+        server.server_close()
+        for worker in workers:
+            worker.stop_event.set()
+        for worker in workers:
+            worker.join()
+        print(f"통계: {stats.snapshot()}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
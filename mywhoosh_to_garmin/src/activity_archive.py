@@ -0,0 +1,300 @@
+"""
+downloads/ FIT 파일과 strava_data/ JSON을 위한 압축 아카이브 (내용 주소 저장소)
+
+- 파일 내용의 SHA-256으로 저장하므로 같은 내용은 한 번만 저장 (중복 제거)
+- zstandard 패키지가 있으면 zstd, 없으면 zlib로 압축
+- Strava JSON은 여러 파일에서 학습한 사전(dictionary)으로 압축
+  (zstd: train_dictionary, zlib: 자주 나오는 줄을 모은 32KB 프리셋 사전)
+- index.json(항목 이름 → 해시, 해시 → 코덱/크기)만 읽고, 내용은 요청할 때 해당 객체만 풀어서 읽음
+- 항목 이름은 downloads/, strava_data/ 기준 상대 경로 (예: alice/2025-12-11.fit)
+  → 계정별 폴더의 같은 날짜 파일이 서로 덮어쓰지 않음
+
+아카이브 위치: ACTIVITY_ARCHIVE_DIR (기본 archive/)
+    archive/index.json
+    archive/objects/ab/abcdef....   압축된 내용
+    archive/dicts/<사전 ID>.dict
+
+open_activity()/load_activity_json()은 원본 파일이 있으면 그대로 읽고,
+없으면 같은 경로의 아카이브 항목(예전 인덱스는 파일명 항목)을 읽습니다 (변환/비교 스크립트용).
+"""
+import hashlib
+import json
+import os
+import threading
+import zlib
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성
+    zstandard = None
+
+ZLIB_DICT_SIZE = 32 * 1024       # deflate 창 크기 (프리셋 사전 최대)
+ZSTD_DICT_SIZE = 112 * 1024
+ZSTD_LEVEL = 12
+DICT_SAMPLE_BYTES = 64 * 1024    # zlib 사전 학습 시 파일당 앞부분만 사용
+MAX_DICT_SAMPLES = 100
+
+PROJECT_ROOT = Path(__file__).parent.parent
+SOURCE_ROOTS = (PROJECT_ROOT / "downloads", PROJECT_ROOT / "strava_data")
+
+
+def file_kind(name):
+    """파일 종류 (사전 선택용)"""
+    return 'json' if str(name).endswith('.json') else 'fit'
+
+
+def entry_name(path, roots=SOURCE_ROOTS):
+    """
+    아카이브 항목 이름 (roots 중 path를 포함하는 폴더 기준 상대 경로, 밖에 있으면 파일명)
+
+    downloads/2025-12-11.fit → 2025-12-11.fit, downloads/alice/2025-12-11.fit → alice/2025-12-11.fit
+    """
+    path = Path(path).resolve()
+    for root in roots:
+        try:
+            return path.relative_to(Path(root).resolve()).as_posix()
+        except ValueError:
+            continue
+    return path.name
+
+
+def build_zlib_dictionary(samples, size=ZLIB_DICT_SIZE):
+    """
+    zlib 프리셋 사전 만들기
+
+    여러 파일에 공통으로 나오는 줄(키, 들여쓰기, 자주 나오는 값)을 모으고
+    가장 흔한 줄을 끝에 둡니다 (deflate는 가까운 위치를 더 짧게 참조).
+    """
+    counts = Counter()
+    for sample in samples:
+        counts.update(set(sample[:DICT_SAMPLE_BYTES].splitlines(keepends=True)))
+    min_count = 2 if len(samples) > 1 else 1
+    common = [line for line, count in sorted(counts.items(), key=lambda item: (item[1], item[0]))
+              if count >= min_count]
+    return b''.join(common)[-size:]
+
+
+class ActivityArchive:
+    """내용 주소 기반 압축 아카이브"""
+
+    def __init__(self, root=None, source_roots=SOURCE_ROOTS):
+        default_root = os.getenv('ACTIVITY_ARCHIVE_DIR') or PROJECT_ROOT / "archive"
+        self.root = Path(root) if root else Path(default_root)
+        self.source_roots = tuple(Path(r) for r in source_roots)  # 항목 이름의 기준 폴더
+        self.index_file = self.root / "index.json"
+        self.objects_dir = self.root / "objects"
+        self.dicts_dir = self.root / "dicts"
+        self.codec = 'zstd' if zstandard else 'zlib'
+        self.entries = {}      # 항목 이름(상대 경로) → 해시
+        self.objects = {}      # 해시 → {codec, dict, size, stored}
+        self.dictionaries = {}  # '종류-코덱' → 현재 사전 ID
+        self._dict_cache = {}
+        self._lock = threading.Lock()
+        self._load_index()
+
+    def _load_index(self):
+        """인덱스 파일 로드"""
+        if not self.index_file.exists():
+            return
+        with open(self.index_file, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        self.entries = index.get('entries', {})
+        self.objects = index.get('objects', {})
+        self.dictionaries = index.get('dictionaries', {})
+
+    def _save_index(self):
+        """인덱스 파일 저장 (임시 파일 → 교체)"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.index_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'updated_at': datetime.now().isoformat(),
+                'dictionaries': self.dictionaries,
+                'entries': self.entries,
+                'objects': self.objects,
+            }, f, indent=1)
+        os.replace(tmp_file, self.index_file)
+
+    def _object_path(self, digest):
+        return self.objects_dir / digest[:2] / digest
+
+    def _dictionary(self, dict_id):
+        """사전 내용 (한 번 읽은 사전은 메모리에 보관)"""
+        if dict_id not in self._dict_cache:
+            self._dict_cache[dict_id] = (self.dicts_dir / f"{dict_id}.dict").read_bytes()
+        return self._dict_cache[dict_id]
+
+    def train_dictionary(self, kind, samples):
+        """
+        샘플 파일 내용으로 사전 학습 후 해당 종류의 현재 사전으로 등록
+
+        Returns:
+            str or None: 사전 ID (샘플이 부족해 학습하지 못하면 None)
+        """
+        samples = [s for s in samples if s][:MAX_DICT_SAMPLES]
+        if not samples:
+            return None
+        if self.codec == 'zstd':
+            try:
+                data = zstandard.train_dictionary(ZSTD_DICT_SIZE, samples).as_bytes()
+            except zstandard.ZstdError:
+                return None
+        else:
+            data = build_zlib_dictionary(samples)
+        if not data:
+            return None
+
+        dict_id = f"{kind}-{self.codec}-{hashlib.sha256(data).hexdigest()[:12]}"
+        self.dicts_dir.mkdir(parents=True, exist_ok=True)
+        (self.dicts_dir / f"{dict_id}.dict").write_bytes(data)
+        with self._lock:
+            self.dictionaries[f"{kind}-{self.codec}"] = dict_id
+            self._save_index()
+        return dict_id
+
+    def _compress(self, raw, dict_id):
+        dictionary = self._dictionary(dict_id) if dict_id else None
+        if self.codec == 'zstd':
+            dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+            return zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=dict_data).compress(raw)
+        compressor = zlib.compressobj(9, zlib.DEFLATED, 15, 9, zdict=dictionary) if dictionary \
+            else zlib.compressobj(9)
+        return compressor.compress(raw) + compressor.flush()
+
+    def _decompress(self, blob, codec, dict_id):
+        dictionary = self._dictionary(dict_id) if dict_id else None
+        if codec == 'zstd':
+            if zstandard is None:
+                raise RuntimeError("zstd로 압축된 항목입니다. zstandard 패키지를 설치하세요.")
+            dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+            return zstandard.ZstdDecompressor(dict_data=dict_data).decompress(blob)
+        decompressor = zlib.decompressobj(zdict=dictionary) if dictionary else zlib.decompressobj()
+        return decompressor.decompress(blob) + decompressor.flush()
+
+    def add_bytes(self, name, raw):
+        """
+        내용을 항목 이름으로 저장 (같은 내용이 이미 있으면 압축/쓰기 생략)
+
+        Returns:
+            bool: 새 객체를 저장했으면 True (중복이면 False)
+        """
+        digest = hashlib.sha256(raw).hexdigest()
+        with self._lock:
+            known = digest in self.objects
+        created = False
+        if not known:
+            dict_id = self.dictionaries.get(f"{file_kind(name)}-{self.codec}")
+            blob = self._compress(raw, dict_id)
+            object_path = self._object_path(digest)
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = object_path.with_suffix('.tmp')
+            tmp_path.write_bytes(blob)
+            os.replace(tmp_path, object_path)
+            created = True
+
+        with self._lock:
+            if created:
+                self.objects[digest] = {'codec': self.codec, 'dict': dict_id,
+                                        'size': len(raw), 'stored': len(blob)}
+            self.entries[name] = digest
+        return created
+
+    def add_files(self, paths):
+        """
+        파일 여러 개 저장 (JSON 사전이 아직 없으면 이번 파일들로 먼저 학습)
+
+        항목 이름은 source_roots 기준 상대 경로입니다.
+
+        Returns:
+            dict: {'added': 새 객체 수, 'duplicates': 중복 수}
+        """
+        paths = [Path(p) for p in paths]
+        if f"json-{self.codec}" not in self.dictionaries:
+            json_paths = [p for p in paths if file_kind(p.name) == 'json'][:MAX_DICT_SAMPLES]
+            self.train_dictionary('json', [p.read_bytes() for p in json_paths])
+
+        added = duplicates = 0
+        for path in paths:
+            if self.add_bytes(self.entry_name(path), path.read_bytes()):
+                added += 1
+            else:
+                duplicates += 1
+        with self._lock:
+            self._save_index()
+        return {'added': added, 'duplicates': duplicates}
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def entry_name(self, path):
+        """path를 저장할 항목 이름"""
+        return entry_name(path, self.source_roots)
+
+    def find(self, path):
+        """
+        path에 해당하는 항목 이름 (상대 경로 항목 우선, 예전 인덱스의 파일명 항목도 찾음)
+
+        Returns:
+            str or None
+        """
+        for name in (self.entry_name(path), Path(path).name):
+            if name in self.entries:
+                return name
+        return None
+
+    def read_bytes(self, name):
+        """항목 이름으로 원래 내용 읽기 (해당 객체만 풀어서)"""
+        digest = self.entries.get(name)
+        if digest is None:
+            raise FileNotFoundError(f"아카이브에 없음: {name}")
+        info = self.objects[digest]
+        raw = self._decompress(self._object_path(digest).read_bytes(), info['codec'], info['dict'])
+        if len(raw) != info['size']:
+            raise ValueError(f"아카이브 항목 크기 불일치: {name}")
+        return raw
+
+    def read_json(self, name):
+        return json.loads(self.read_bytes(name))
+
+    def verify(self, name, raw):
+        """저장된 내용이 raw와 같은지 (원본 삭제 전 확인용)"""
+        return self.entries.get(name) == hashlib.sha256(raw).hexdigest() and self.read_bytes(name) == raw
+
+    def stats(self):
+        """저장 통계 (항목 수, 원본 합계, 중복 제거 후 원본, 압축 후)"""
+        logical = sum(self.objects[digest]['size'] for digest in self.entries.values())
+        unique = sum(info['size'] for info in self.objects.values())
+        stored = sum(info['stored'] for info in self.objects.values())
+        return {'entries': len(self.entries), 'objects': len(self.objects),
+                'logical_bytes': logical, 'unique_bytes': unique, 'stored_bytes': stored}
+
+
+_default_archive = None
+
+
+def get_archive():
+    """기본 위치 아카이브 (프로세스당 한 번 로드)"""
+    global _default_archive
+    if _default_archive is None:
+        _default_archive = ActivityArchive()
+    return _default_archive
+
+
+def open_activity(path, archive=None):
+    """원본 파일이 있으면 그 내용, 없으면 같은 경로의 아카이브 내용"""
+    path = Path(path)
+    if path.exists():
+        return path.read_bytes()
+    archive = archive or get_archive()
+    name = archive.find(path)
+    if name:
+        return archive.read_bytes(name)
+    raise FileNotFoundError(f"파일도 아카이브 항목도 없음: {path}")
+
+
+def load_activity_json(path, archive=None):
+    """open_activity + JSON 파싱"""
+    return json.loads(open_activity(path, archive))
@@ -0,0 +1,238 @@
+"""
+Strava 활동 스트림 → 여러 형식 동시 내보내기 (한 번 순회)
+
+스트림 배열을 포인트 단위로 한 번만 훑으면서, 등록된 싱크(sink)들이 각자 형식으로 바로 씁니다.
+- GpxSink: GPX 1.1 (위치가 있는 포인트만, 실내 라이딩은 건너뜀)
+- TcxSink: TCX (위치 없이도 시간/심박/케이던스/파워/거리 기록 → 실내 MyWhoosh 라이딩도 가능)
+- CsvSink: 스트림 전체 컬럼
+
+XML DOM을 만들지 않고 포인트마다 파일에 쓰므로 메모리 사용량은 포인트 수와 무관합니다.
+스트림은 Strava 딕셔너리, StreamSet, Activity(스트림 인자 None) 모두 받습니다.
+새 형식은 open/write/close를 가진 싱크 클래스를 추가하면 됩니다.
+"""
+import csv
+import time
+from datetime import datetime
+from pathlib import Path
+from xml.sax.saxutils import escape, quoteattr
+
+from src.activity_model import Activity, as_streams
+
+def _start_timestamp(activity):
+    return datetime.fromisoformat(activity['start_date'].replace('Z', '+00:00')).timestamp()
+
+
+def iso_time(timestamp):
+    """Unix 시각 → UTC ISO 8601 (초 단위, Z)"""
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(timestamp))
+
+
+class GpxSink:
+    """GPX 1.1 스트리밍 작성 (trkpt는 위치가 있어야 하므로 실내 활동은 건너뜀)"""
+
+    name = 'gpx'
+    suffix = '.gpx'
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.count = 0
+        self.skipped = None
+        self._file = None
+
+    def open(self, activity, streams):
+        if 'latlng' not in streams:
+            self.skipped = "GPS 좌표 없음 (실내 활동은 TCX 사용)"
+            return False
+        self._file = open(self.path, 'w', encoding='utf-8', buffering=1 << 16)
+        name = escape(activity.get('name', ''))
+        self._file.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<gpx version="1.1" creator="MyWhoosh to Garmin Exporter" '
+            'xmlns="http://www.topografix.com/GPX/1/1" '
+            'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+            'xmlns:gpxtpx="http://www.garmin.com/xmlschemas/TrackPointExtension/v1">\n'
+            f'  <metadata>\n    <name>{name}</name>\n    <time>{activity["start_date"]}</time>\n  </metadata>\n'
+            f'  <trk>\n    <name>{name}</name>\n    <type>{escape(activity.get("type", ""))}</type>\n'
+            '    <trkseg>\n')
+        return True
+
+    def write(self, point):
+        if point.get('lat') is None:
+            return
+        parts = [f'      <trkpt lat="{point["lat"]}" lon="{point["lng"]}">\n'
+                 f'        <time>{point["iso_time"]}</time>\n']
+        if point.get('altitude') is not None:
+            parts.append(f'        <ele>{point["altitude"]}</ele>\n')
+        extensions = ''.join(
+            f'<gpxtpx:{tag}>{int(point[key])}</gpxtpx:{tag}>'
+            for key, tag in (('heartrate', 'hr'), ('cadence', 'cad'), ('watts', 'power'))
+            if point.get(key) is not None)
+        if extensions:
+            parts.append('        <extensions><gpxtpx:TrackPointExtension>'
+                         f'{extensions}</gpxtpx:TrackPointExtension></extensions>\n')
+        parts.append('      </trkpt>\n')
+        self._file.write(''.join(parts))
+        self.count += 1
+
+    def close(self):
+        self._file.write('    </trkseg>\n  </trk>\n</gpx>\n')
+        self._file.close()
+
+
+class TcxSink:
+    """TCX 스트리밍 작성 (위치가 없어도 트랙 포인트 기록 가능)"""
+
+    name = 'tcx'
+    suffix = '.tcx'
+    SPORTS = {'Ride': 'Biking', 'VirtualRide': 'Biking', 'EBikeRide': 'Biking',
+              'Run': 'Running', 'VirtualRun': 'Running'}
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.count = 0
+        self.skipped = None
+        self._file = None
+
+    def open(self, activity, streams):
+        self._file = open(self.path, 'w', encoding='utf-8', buffering=1 << 16)
+        sport = self.SPORTS.get(activity.get('sport_type') or activity.get('type'), 'Other')
+        start = iso_time(_start_timestamp(activity))
+        self._file.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<TrainingCenterDatabase '
+            'xmlns="http://www.garmin.com/xmlschemas/TrainingCenterDatabase/v2" '
+            'xmlns:ns3="http://www.garmin.com/xmlschemas/ActivityExtension/v2">\n'
+            f'  <Activities>\n    <Activity Sport={quoteattr(sport)}>\n      <Id>{start}</Id>\n'
+            f'      <Lap StartTime="{start}">\n'
+            f'        <TotalTimeSeconds>{float(activity.get("elapsed_time") or 0)}</TotalTimeSeconds>\n'
+            f'        <DistanceMeters>{float(activity.get("distance") or 0)}</DistanceMeters>\n'
+            f'        <Calories>{int(activity.get("calories") or 0)}</Calories>\n'
+            '        <Intensity>Active</Intensity>\n        <TriggerMethod>Manual</TriggerMethod>\n'
+            '        <Track>\n')
+        return True
+
+    def write(self, point):
+        parts = [f'          <Trackpoint>\n            <Time>{point["iso_time"]}</Time>\n']
+        if point.get('lat') is not None:
+            parts.append(f'            <Position><LatitudeDegrees>{point["lat"]}</LatitudeDegrees>'
+                         f'<LongitudeDegrees>{point["lng"]}</LongitudeDegrees></Position>\n')
+        if point.get('altitude') is not None:
+            parts.append(f'            <AltitudeMeters>{point["altitude"]}</AltitudeMeters>\n')
+        if point.get('distance') is not None:
+            parts.append(f'            <DistanceMeters>{point["distance"]}</DistanceMeters>\n')
+        if point.get('heartrate') is not None:
+            parts.append(f'            <HeartRateBpm><Value>{int(point["heartrate"])}</Value></HeartRateBpm>\n')
+        if point.get('cadence') is not None:
+            parts.append(f'            <Cadence>{int(point["cadence"])}</Cadence>\n')
+        extensions = ''
+        if point.get('velocity_smooth') is not None:
+            extensions += f'<ns3:Speed>{point["velocity_smooth"]}</ns3:Speed>'
+        if point.get('watts') is not None:
+            extensions += f'<ns3:Watts>{int(point["watts"])}</ns3:Watts>'
+        if extensions:
+            parts.append(f'            <Extensions><ns3:TPX>{extensions}</ns3:TPX></Extensions>\n')
+        parts.append('          </Trackpoint>\n')
+        self._file.write(''.join(parts))
+        self.count += 1
+
+    def close(self):
+        self._file.write('        </Track>\n      </Lap>\n'
+                         '    </Activity>\n  </Activities>\n</TrainingCenterDatabase>\n')
+        self._file.close()
+
+
+class CsvSink:
+    """CSV 작성 (StravaDataSaver.save_as_csv와 같은 컬럼 순서)"""
+
+    name = 'csv'
+    suffix = '_data.csv'
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.count = 0
+        self.skipped = None
+        self.headers = []
+        self._keys = []
+        self._file = None
+        self._writer = None
+
+    def open(self, activity, streams):
+        self.headers = ['time']
+        for stream_name in streams:
+            if stream_name == 'latlng':
+                self.headers.extend(['latitude', 'longitude'])
+            elif stream_name != 'time':
+                self.headers.append(stream_name)
+        self._keys = [{'latitude': 'lat', 'longitude': 'lng'}.get(h, h) for h in self.headers]
+        self._file = open(self.path, 'w', newline='', encoding='utf-8', buffering=1 << 16)
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.headers)
+        return True
+
+    def write(self, point):
+        self._writer.writerow([point.get(key, '') for key in self._keys])
+        self.count += 1
+
+    def close(self):
+        self._file.close()
+
+
+SINKS = {sink.name: sink for sink in (GpxSink, TcxSink, CsvSink)}
+
+
+def _unpack(activity, streams):
+    """(Activity 또는 activity 딕셔너리, 스트림) → (activity 딕셔너리, StreamSet)"""
+    if isinstance(activity, Activity):
+        return activity.meta, activity.streams if streams is None else as_streams(streams)
+    return activity, as_streams(streams)
+
+
+def iter_points(activity, streams, indices=None):
+    """
+    스트림 배열 → 포인트 딕셔너리 (지정한 인덱스만, 없는 값은 키 없음)
+
+    time 스트림 길이를 기준으로 하며 짧은 스트림은 끝 이후 값이 빠집니다.
+    """
+    activity, streams = _unpack(activity, streams)
+    if 'time' not in streams:
+        return
+    start = _start_timestamp(activity)
+    for point in streams.rows(indices):
+        point['iso_time'] = iso_time(start + point['time'])
+        yield point
+
+
+def export_activity(activity, streams, sinks, indices=None):
+    """
+    한 번 순회로 여러 싱크에 내보내기
+
+    Returns:
+        list: 실제로 쓴 싱크 (open에서 건너뛴 싱크는 제외, 각 싱크의 skipped에 사유)
+    """
+    activity, streams = _unpack(activity, streams)
+    active = [sink for sink in sinks if sink.open(activity, streams)]
+    if not active:
+        return []
+    try:
+        for point in iter_points(activity, streams, indices):
+            for sink in active:
+                sink.write(point)
+    finally:
+        for sink in active:
+            sink.close()
+    return active
+
+
+def export_files(activity, streams, output_dir, formats=('gpx', 'tcx', 'csv'), indices=None):
+    """
+    활동 파일명 규칙(날짜_이름)으로 여러 형식 저장
+
+    Returns:
+        tuple: (쓴 싱크 목록, 건너뛴 싱크 목록)
+    """
+    activity, streams = _unpack(activity, streams)
+    date = activity['start_date'][:10]
+    name = activity['name'].replace('/', '-')
+    sinks = [SINKS[fmt](Path(output_dir) / f"{date}_{name}{SINKS[fmt].suffix}") for fmt in formats]
+    written = export_activity(activity, streams, sinks, indices)
+    return written, [sink for sink in sinks if sink not in written]
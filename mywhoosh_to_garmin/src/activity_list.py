@@ -0,0 +1,53 @@
+"""
+MyWhoosh ACTIVITIES 목록 페이지 구성 판별
+
+첫 화면에 보이는 활동만 읽으면 페이지가 나뉘어 있거나 스크롤로 더 불러오는 경우
+기간 안의 오래된 활동을 놓치므로, 목록이 어떤 방식으로 이어지는지 판별합니다.
+- 'pages':  ?page=N 링크가 있음 → 각 페이지 URL을 여러 탭에서 동시에 열 수 있음
+- 'next':   '다음' 버튼만 있음 → 페이지 k는 다음 버튼을 k번 눌러야 열림
+- 'scroll': 맨 아래로 스크롤하면 행이 늘어남 (무한 스크롤)
+- 'single': 한 화면에 전부 있음
+"""
+import re
+
+DOWNLOAD_BUTTON_TEXT = "download"
+PAGE_LINK_SELECTOR = 'a[href*="page="]'
+NEXT_BUTTON_SELECTOR = ', '.join([
+    'button[aria-label*="next" i]', 'a[aria-label*="next" i]',
+    'button:has-text("Next")', 'a:has-text("Next")',
+    'button:has-text("다음")', 'li.next a', '.pagination-next',
+])
+SCROLL_TO_BOTTOM = "window.scrollTo(0, document.body.scrollHeight)"
+
+# 한 번에 여는 목록 페이지 수 / 최대 페이지 수 (사이트 이상 동작 시 무한 반복 방지)
+DEFAULT_PAGE_CONCURRENCY = 3
+MAX_LIST_PAGES = 50
+MAX_SCROLL_ROUNDS = 50
+
+_PAGE_PARAM = re.compile(r'([?&]page=)(\d+)')
+
+
+def page_urls_from_hrefs(hrefs):
+    """
+    페이지 링크 목록 → 2번째 페이지부터의 URL 목록
+
+    링크에 보이는 가장 큰 페이지 번호까지 만들며, 중간 번호가 생략(1 2 3 … 10)되어도
+    같은 형식으로 채웁니다.
+
+    Returns:
+        list: 페이지 URL (페이지가 하나뿐이면 빈 목록)
+    """
+    numbered = {}
+    for href in hrefs:
+        match = _PAGE_PARAM.search(href or '')
+        if match:
+            numbered[int(match.group(2))] = href
+    if not numbered:
+        return []
+
+    # 현재 페이지는 링크가 아닐 수 있으므로 page=0 링크가 있을 때만 0부터 세는 것으로 봄
+    first = 0 if 0 in numbered else 1
+    last = max(numbered)
+    template = numbered[last]
+    return [_PAGE_PARAM.sub(lambda m, n=n: f"{m.group(1)}{n}", template, count=1)
+            for n in range(first + 1, last + 1)]
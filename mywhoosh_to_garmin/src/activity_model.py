@@ -0,0 +1,387 @@
+"""
+활동 데이터 모델 (Activity / StreamSet, 컬럼별 numpy 배열)
+
+Strava 백업 JSON을 그대로 들고 다니면 포인트마다 파이썬 int/float 객체와
+latlng의 [위도, 경도] 리스트가 생겨 샘플 하나에 수십~백여 바이트를 씁니다.
+StreamSet은 스트림마다 타입이 정해진 배열 하나로 저장합니다.
+- 정수 스트림(파워/심박/케이던스/시간): 값 범위에 맞춰 int16 / int32 / int64
+- 실수 스트림(거리/고도/속도/경사): float64 (JSON 값 그대로 다시 쓸 수 있음)
+- latlng: 위도(lat) / 경도(lng) float64 두 컬럼
+- 값이 빠진(null) 스트림: float64 + NaN (다시 내보낼 때는 None, 정수 스트림은 정수로)
+슬라이스(streams[100:200], Activity.window)는 배열 뷰라 복사하지 않습니다.
+
+Strava 스트림 딕셔너리를 받던 내보내기/단순화 함수(activity_export, track_simplify)는
+as_streams()로 둘 다 받으므로 기존 호출은 그대로 동작합니다.
+"""
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from src.activity_archive import load_activity_json, open_activity
+from src.fit_encoder import FIT_EPOCH_OFFSET, MESG_FIELDS, MESG_NUMS
+from src.fit_reader import FitFormatError, iter_messages
+
+ROW_CHUNK = 4096        # rows()가 한 번에 파이썬 값으로 바꾸는 포인트 수
+SEMICIRCLE = 180.0 / 2 ** 31
+
+# FIT record 필드 이름 → Strava 스트림 이름 (위치는 따로 처리)
+FIT_STREAMS = {
+    'altitude': 'altitude',
+    'heart_rate': 'heartrate',
+    'cadence': 'cadence',
+    'distance': 'distance',
+    'speed': 'velocity_smooth',
+    'power': 'watts',
+    'temperature': 'temp',
+}
+# 기본 필드가 없을 때 쓰는 enhanced 필드 번호 → (기본 필드 이름, scale, offset)
+FIT_ENHANCED = {73: ('speed', 1000, 0), 78: ('altitude', 5, 500)}
+# FIT session 필드 번호 → (키, scale)
+FIT_SESSION = {
+    2: ('start_time', 1), 5: ('sport', 1), 6: ('sub_sport', 1),
+    7: ('elapsed_time', 1000), 8: ('moving_time', 1000), 9: ('distance', 100), 11: ('calories', 1),
+    16: ('average_heartrate', 1), 17: ('max_heartrate', 1), 20: ('average_watts', 1), 21: ('max_watts', 1),
+}
+# session에 있을 때만 activity 메타데이터에 넣는 값 (Strava activity 키 이름)
+FIT_SESSION_OPTIONAL = ('calories', 'average_watts', 'max_watts', 'average_heartrate', 'max_heartrate')
+FIT_TYPES = {1: 'Run', 2: 'Ride', 5: 'Swim', 11: 'Walk', 17: 'Hike'}
+FIT_VIRTUAL_SUB_SPORT = 58
+
+
+def _column(data):
+    """
+    JSON 배열 → 타입이 정해진 numpy 배열
+
+    Returns:
+        tuple: (배열, null이 섞인 정수 스트림이라 float로 저장했는지)
+    """
+    array = np.asarray(data)
+    if array.dtype == object:
+        # null이 섞인 스트림
+        integer = all(isinstance(value, int) for value in data if value is not None)
+        return np.array([np.nan if value is None else value for value in data], dtype=float), integer
+    return _narrow(array), False
+
+
+def _narrow(array):
+    """정수 배열을 값 범위에 맞는 가장 작은 정수 타입으로"""
+    if array.dtype.kind in 'iu' and len(array):
+        low, high = int(array.min()), int(array.max())
+        for dtype in (np.int16, np.int32):
+            info = np.iinfo(dtype)
+            if info.min <= low and high <= info.max:
+                return array.astype(dtype)
+    return array
+
+
+def _pylist(values, integer=False):
+    """배열 → 파이썬 값 목록 (NaN은 None, integer면 나머지 값은 int)"""
+    items = values.tolist()
+    if values.dtype.kind == 'f' and (integer or np.isnan(values).any()):
+        items = [None if value != value else int(value) if integer else value for value in items]
+    return items
+
+
+class StreamSet:
+    """스트림 이름 → 배열 (latlng는 lat / lng 컬럼으로 나눠 저장)"""
+
+    __slots__ = ('_columns', '_order', '_meta', '_integers')
+
+    def __init__(self, columns, order=None, meta=None, integers=()):
+        self._columns = columns                 # 컬럼 이름 → np.ndarray
+        self._order = tuple(order) if order is not None else self._strava_names(columns)
+        self._meta = meta or {}                 # 스트림 이름 → series_type 등 data 외 키
+        self._integers = frozenset(integers)    # null 때문에 float로 저장한 정수 스트림
+
+    @staticmethod
+    def _strava_names(columns):
+        names = []
+        for name in columns:
+            if name in ('lat', 'lng'):
+                if 'latlng' not in names:
+                    names.append('latlng')
+            else:
+                names.append(name)
+        return tuple(names)
+
+    @classmethod
+    def from_strava(cls, streams):
+        """Strava 스트림 딕셔너리 ({이름: {'data': [...]}}) → StreamSet"""
+        columns, order, meta, integers = {}, [], {}, set()
+        for name, stream in (streams or {}).items():
+            if not isinstance(stream, dict) or 'data' not in stream:
+                continue
+            order.append(name)
+            meta[name] = {key: value for key, value in stream.items() if key != 'data'}
+            if name == 'latlng':
+                coords = np.asarray(stream['data'], dtype=float).reshape(-1, 2)
+                columns['lat'] = np.ascontiguousarray(coords[:, 0])
+                columns['lng'] = np.ascontiguousarray(coords[:, 1])
+            else:
+                columns[name], integer = _column(stream['data'])
+                if integer:
+                    integers.add(name)
+        return cls(columns, order, meta, integers)
+
+    def to_strava(self):
+        """StreamSet → Strava 스트림 딕셔너리 (JSON 저장용)"""
+        streams = {}
+        for name in self._order:
+            if name == 'latlng':
+                data = np.column_stack((self._columns['lat'], self._columns['lng'])).tolist()
+            else:
+                data = _pylist(self._columns[name], name in self._integers)
+            streams[name] = {'data': data, **self._meta.get(name, {})}
+        return streams
+
+    @property
+    def length(self):
+        """포인트 수 (time 스트림 기준, 없으면 가장 긴 스트림)"""
+        if 'time' in self._columns:
+            return len(self._columns['time'])
+        return max((len(column) for column in self._columns.values()), default=0)
+
+    @property
+    def nbytes(self):
+        return sum(column.nbytes for column in self._columns.values())
+
+    @property
+    def columns(self):
+        """컬럼 이름 목록 (latlng 대신 lat, lng)"""
+        return list(self._columns)
+
+    def to_list(self, name):
+        """Strava 스트림 하나를 파이썬 값 목록으로 (없는 값은 None, 정수 스트림은 int)"""
+        return _pylist(self._columns[name], name in self._integers)
+
+    def size(self, name):
+        """Strava 스트림 하나의 포인트 수"""
+        return len(self._columns['lat' if name == 'latlng' else name])
+
+    def column(self, name):
+        """컬럼 배열 (lat / lng 포함, 없으면 KeyError)"""
+        return self._columns[name]
+
+    def get(self, name, default=None):
+        """
+        Strava 스트림 이름으로 배열 조회
+
+        'latlng'는 N×2 배열을 새로 만들어 돌려주므로, 위도/경도만 필요하면 column('lat')을 사용합니다.
+        """
+        if name == 'latlng':
+            if 'lat' not in self._columns:
+                return default
+            return np.column_stack((self._columns['lat'], self._columns['lng']))
+        return self._columns.get(name, default)
+
+    def __getitem__(self, key):
+        """streams['watts'] → 배열, streams[100:200] → 복사 없는 StreamSet 뷰"""
+        if isinstance(key, slice):
+            return StreamSet({name: column[key] for name, column in self._columns.items()},
+                             self._order, self._meta, self._integers)
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, name):
+        return name in self._order or name in self._columns
+
+    def __iter__(self):
+        """Strava 스트림 이름 순서 (딕셔너리처럼 for name in streams)"""
+        return iter(self._order)
+
+    def __len__(self):
+        """스트림 종류 수 (딕셔너리의 len과 같은 의미, 포인트 수는 length)"""
+        return len(self._order)
+
+    def __repr__(self):
+        return f"StreamSet({', '.join(self._order)}; {self.length:,} points, {self.nbytes:,} bytes)"
+
+    def _chunks(self, names, indices, chunk):
+        """chunk개씩 [(이름, 파이썬 값 목록, None 포함 여부)] (없는 컬럼/범위 밖은 None)"""
+        indices = np.arange(self.length) if indices is None else np.asarray(indices, dtype=np.int64)
+        for begin in range(0, len(indices), chunk):
+            part = indices[begin:begin + chunk]
+            lists = []
+            for name in names:
+                column = self._columns.get(name)
+                if column is None:
+                    lists.append((name, [None] * len(part), True))
+                    continue
+                integer = name in self._integers
+                valid = part < len(column)
+                if valid.all():
+                    items = _pylist(column[part], integer)
+                else:
+                    items = [None] * len(part)
+                    for position, value in zip(np.flatnonzero(valid), _pylist(column[part[valid]], integer)):
+                        items[position] = value
+                lists.append((name, items, None in items))
+            yield len(part), lists
+
+    def rows(self, indices=None, chunk=ROW_CHUNK):
+        """
+        포인트별 딕셔너리 ({컬럼: 파이썬 값}, 없는 값은 키 없음)
+
+        chunk개씩 파이썬 값으로 바꾸므로 긴 활동도 메모리는 chunk 크기만큼만 씁니다.
+        """
+        for count, lists in self._chunks(list(self._columns), indices, chunk):
+            full = [name for name, _, missing in lists if not missing]
+            partial = [(name, items) for name, items, missing in lists if missing]
+            for j, values in enumerate(zip(*[items for _, items, missing in lists if not missing])
+                                       if full else ((),) * count):
+                point = dict(zip(full, values))
+                for name, items in partial:
+                    if items[j] is not None:
+                        point[name] = items[j]
+                yield point
+
+    def records(self, names, indices=None, missing=None, chunk=ROW_CHUNK):
+        """
+        포인트별 튜플 (names 순서, 없는 값은 missing) - CSV처럼 컬럼이 정해진 출력용
+        """
+        for _, lists in self._chunks(names, indices, chunk):
+            columns = [[missing if value is None else value for value in items] if has_missing else items
+                       for _, items, has_missing in lists]
+            yield from zip(*columns)
+
+
+def as_streams(streams):
+    """StreamSet 또는 Strava 스트림 딕셔너리 → StreamSet"""
+    return streams if isinstance(streams, StreamSet) else StreamSet.from_strava(streams)
+
+
+class Activity:
+    """활동 메타데이터(Strava activity 형식 딕셔너리) + StreamSet"""
+
+    __slots__ = ('meta', 'streams', 'source')
+
+    def __init__(self, meta, streams, source=None):
+        self.meta = meta
+        self.streams = streams
+        self.source = source            # 읽어 온 파일 경로 (없으면 None)
+
+    @classmethod
+    def from_strava(cls, data, source=None):
+        """Strava 백업 딕셔너리 ({'activity': ..., 'streams': ...})"""
+        return cls(data.get('activity') or {}, StreamSet.from_strava(data.get('streams')), source)
+
+    @classmethod
+    def from_json(cls, path):
+        """Strava 백업 JSON 파일 (원본이 없으면 아카이브에서)"""
+        return cls.from_strava(load_activity_json(path), Path(path))
+
+    @classmethod
+    def from_fit(cls, raw, name=None, source=None):
+        """
+        FIT 내용 → Activity (record를 Strava 스트림 이름으로, session을 activity 메타데이터로)
+
+        Returns:
+            Activity or None: record가 없으면 None
+        """
+        record_fields = {number: (field, scale, offset)
+                         for field, (number, _, scale, offset) in MESG_FIELDS['record'].items()
+                         if field in FIT_STREAMS or field.startswith('position_')}
+        record, session_mesg = MESG_NUMS['record'], MESG_NUMS['session']
+        timestamps, rows, session = [], [], {}
+        try:
+            for message in iter_messages(raw, fields={record: set(record_fields) | set(FIT_ENHANCED),
+                                                      session_mesg: set(FIT_SESSION)}):
+                if message.mesg_num == record and message.timestamp is not None:
+                    timestamps.append(message.timestamp)
+                    rows.append(message.fields)
+                elif message.mesg_num == session_mesg and not session:
+                    session = {key: message.fields[num] / scale
+                               for num, (key, scale) in FIT_SESSION.items() if num in message.fields}
+        except FitFormatError:
+            pass  # 잘린 파일은 읽은 곳까지 사용
+        if not timestamps:
+            return None
+
+        count = len(rows)
+
+        def field(number, scale=1, offset=0):
+            values = np.fromiter((row.get(number, np.nan) for row in rows), float, count)
+            if np.isnan(values).all():
+                return None
+            # 단위 변환 후 부동소수 오차 정리 (가장 작은 단위: 속도 mm/s)
+            return np.round(values / scale - offset, 3) if scale != 1 or offset else values
+
+        first = timestamps[0]
+        columns = {'time': _narrow(np.asarray(timestamps, dtype=np.int64) - first)}
+        by_name = {name: (number, scale, offset) for number, (name, scale, offset) in record_fields.items()}
+        lat, lng = field(by_name['position_lat'][0]), field(by_name['position_long'][0])
+        if lat is not None and lng is not None:
+            columns['lat'], columns['lng'] = lat * SEMICIRCLE, lng * SEMICIRCLE
+        enhanced = {name: (number, scale, offset) for number, (name, scale, offset) in FIT_ENHANCED.items()}
+        integers = set()
+        for fit_name, stream_name in FIT_STREAMS.items():
+            values = field(*by_name[fit_name])
+            if values is None and fit_name in enhanced:
+                values = field(*enhanced[fit_name])
+            if values is None:
+                continue
+            _, scale, offset = by_name[fit_name]
+            if scale == 1 and offset == 0:
+                # 파워/심박/케이던스/온도는 정수 컬럼으로 (빠진 값이 있으면 NaN이 든 float)
+                if np.isnan(values).any():
+                    integers.add(stream_name)
+                else:
+                    values = _narrow(values.astype(np.int64))
+            columns[stream_name] = values
+
+        start = session.get('start_time', first)
+        sport = FIT_TYPES.get(session.get('sport'), 'Workout')
+        if session.get('sub_sport') == FIT_VIRTUAL_SUB_SPORT and sport in ('Ride', 'Run'):
+            sport = 'Virtual' + sport
+        distance = columns.get('distance')
+        meta = {
+            'name': name or (Path(source).stem if source else 'FIT activity'),
+            'type': sport,
+            'sport_type': sport,
+            'start_date': datetime.fromtimestamp(start + FIT_EPOCH_OFFSET, timezone.utc)
+                                  .strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'elapsed_time': session.get('elapsed_time', timestamps[-1] - first),
+            'moving_time': session.get('moving_time', session.get('elapsed_time', timestamps[-1] - first)),
+            'distance': session.get('distance', float(np.nanmax(distance)) if distance is not None else 0.0),
+        }
+        meta.update((key, session[key]) for key in FIT_SESSION_OPTIONAL if key in session)
+        return cls(meta, StreamSet(columns, integers=integers), Path(source) if source else None)
+
+    @classmethod
+    def load(cls, path):
+        """FIT 또는 Strava 백업 JSON 파일 (확장자로 구분, 원본이 없으면 아카이브에서)"""
+        path = Path(path)
+        if path.suffix.lower() == '.fit':
+            return cls.from_fit(open_activity(path), source=path)
+        return cls.from_json(path)
+
+    def to_strava(self):
+        """Strava 백업 딕셔너리 형식으로 (JSON 저장용)"""
+        return {'activity': self.meta, 'streams': self.streams.to_strava()}
+
+    @property
+    def name(self):
+        return self.meta.get('name', '')
+
+    @property
+    def start_timestamp(self):
+        """시작 시각 (Unix 초)"""
+        return datetime.fromisoformat(self.meta['start_date'].replace('Z', '+00:00')).timestamp()
+
+    def window(self, start, end=None):
+        """
+        시작 기준 [start, end)초 구간 (스트림은 복사 없는 뷰, 메타데이터는 공유)
+        """
+        times = self.streams.get('time')
+        if times is None:
+            return Activity(self.meta, self.streams[start:end], self.source)
+        first = int(np.searchsorted(times, start, side='left'))
+        last = len(times) if end is None else int(np.searchsorted(times, end, side='left'))
+        return Activity(self.meta, self.streams[first:last], self.source)
+
+    def __repr__(self):
+        return f"Activity({self.name!r}, {self.meta.get('start_date')}, {self.streams!r})"
+
@@ -0,0 +1,421 @@
+"""
+downloads/ FIT + strava_data/ JSON → SQLite 분석 저장소
+
+"최근 1년 주별 시간/kJ" 같은 집계를 파일을 매번 다시 읽지 않고 SQL로 바로 조회합니다.
+- 파일 파싱은 프로세스 풀에서 병렬로 (FIT는 Activity.from_fit으로)
+- 크기/수정 시각이 같은 파일은 읽지 않고, 바뀌었어도 내용 해시가 같으면 파싱하지 않음
+- 활동 요약(activities)과 선택적으로 N초 평균 샘플(samples)을 한 트랜잭션으로 일괄 저장
+- 수집 후 주별/월별 합계(weekly_rollup, monthly_rollup)를 다시 만들어 둠
+
+저장 위치: ANALYTICS_DB (기본 data/analytics.sqlite)
+원본 파일이 아카이브로 옮겨져 없어져도 이미 수집한 활동은 그대로 남습니다.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from src.activity_model import Activity
+from src.reconciliation import STRAVA_SPORTS
+
+SCHEMA_VERSION = 1
+DEFAULT_SAMPLE_INTERVAL = 10   # 초 (0이면 샘플 저장 안 함)
+WORK_MAX_GAP = 10              # kJ 계산 시 이보다 긴 기록 공백(일시정지)은 이 값으로 제한
+POOL_MIN_FILES = 4             # 이보다 적으면 프로세스 풀 없이 처리
+
+# Strava 스트림 이름 → 샘플 컬럼
+STRAVA_STREAMS = {
+    'watts': 'power',
+    'heartrate': 'heart_rate',
+    'cadence': 'cadence',
+    'velocity_smooth': 'speed',
+    'altitude': 'altitude',
+    'distance': 'distance',
+}
+SAMPLE_COLUMNS = ('power', 'heart_rate', 'cadence', 'speed', 'altitude', 'distance')
+ACTIVITY_COLUMNS = (
+    'source', 'file', 'start', 'elapsed_time', 'moving_time', 'distance', 'sport',
+    'avg_power', 'max_power', 'avg_heart_rate', 'max_heart_rate', 'kilojoules', 'samples',
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS activities (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    file TEXT NOT NULL UNIQUE,
+    start REAL NOT NULL,
+    elapsed_time REAL,
+    moving_time REAL,
+    distance REAL,
+    sport TEXT,
+    avg_power REAL,
+    max_power REAL,
+    avg_heart_rate REAL,
+    max_heart_rate REAL,
+    kilojoules REAL,
+    samples INTEGER
+);
+CREATE INDEX IF NOT EXISTS activities_start ON activities (start);
+CREATE TABLE IF NOT EXISTS samples (
+    activity_id INTEGER NOT NULL,
+    t INTEGER NOT NULL,
+    power REAL,
+    heart_rate REAL,
+    cadence REAL,
+    speed REAL,
+    altitude REAL,
+    distance REAL,
+    PRIMARY KEY (activity_id, t)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS weekly_rollup (
+    source TEXT NOT NULL,
+    period TEXT NOT NULL,
+    activities INTEGER,
+    hours REAL,
+    moving_hours REAL,
+    distance_km REAL,
+    kilojoules REAL,
+    PRIMARY KEY (source, period)
+);
+CREATE TABLE IF NOT EXISTS monthly_rollup (
+    source TEXT NOT NULL,
+    period TEXT NOT NULL,
+    activities INTEGER,
+    hours REAL,
+    moving_hours REAL,
+    distance_km REAL,
+    kilojoules REAL,
+    PRIMARY KEY (source, period)
+);
+"""
+
+# 기간 키 (로컬 시각 기준, 주는 월요일 시작)
+PERIODS = {
+    'weekly': "date(start, 'unixepoch', 'localtime', '-6 days', 'weekday 1')",
+    'monthly': "strftime('%Y-%m', start, 'unixepoch', 'localtime')",
+}
+
+
+def file_sha256(raw):
+    return hashlib.sha256(raw).hexdigest()
+
+
+def downsample(times, columns, interval):
+    """
+    interval초 구간 평균 샘플 (거리는 구간 마지막 값)
+
+    Args:
+        times: 시작 기준 초 (오름차순)
+        columns: {컬럼: 값 리스트 (times와 같은 길이, 없는 값은 None)}
+
+    Returns:
+        list: (t, power, heart_rate, cadence, speed, altitude, distance) 튜플
+    """
+    buckets = {}
+    for i, t in enumerate(times):
+        buckets.setdefault(int(t // interval), []).append(i)
+
+    rows = []
+    for bucket, indices in buckets.items():
+        values = []
+        for name in SAMPLE_COLUMNS:
+            data = columns.get(name, [])
+            present = [data[i] for i in indices if i < len(data) and data[i] is not None]
+            if name == 'distance':
+                values.append(present[-1] if present else None)
+            else:
+                values.append(sum(present) / len(present) if present else None)
+        rows.append((bucket * interval, *values))
+    return rows
+
+
+def work_kilojoules(times, watts):
+    """파워 × 시간 간격 합계 (kJ, 긴 공백은 WORK_MAX_GAP초로 제한)"""
+    total = 0.0
+    previous = None
+    for t, power in zip(times, watts):
+        if previous is not None and power is not None:
+            total += power * min(t - previous, WORK_MAX_GAP)
+        previous = t
+    return total / 1000
+
+
+def parse_fit(raw):
+    """
+    FIT 내용 → (활동 요약, 시작 기준 초, 컬럼 딕셔너리)
+
+    Activity.from_fit으로 읽어 session 값을 쓰고, 없는 값은 record에서 계산합니다.
+    """
+    activity = Activity.from_fit(raw)
+    if activity is None:
+        return None, [], {}
+
+    meta, streams = activity.meta, activity.streams
+    times = streams.to_list('time')
+    columns = {column: streams.to_list(name) for name, column in STRAVA_STREAMS.items() if name in streams}
+    powers = [p for p in columns.get('power', []) if p is not None]
+    heart_rates = [h for h in columns.get('heart_rate', []) if h is not None]
+
+    summary = {
+        'start': activity.start_timestamp,
+        'elapsed_time': meta['elapsed_time'],
+        'moving_time': meta['moving_time'],
+        'distance': meta['distance'] if meta['distance'] or 'distance' in columns else None,
+        'sport': STRAVA_SPORTS.get(meta['sport_type']),
+        'avg_power': meta.get('average_watts', sum(powers) / len(powers) if powers else None),
+        'max_power': meta.get('max_watts', max(powers, default=None)),
+        'avg_heart_rate': meta.get('average_heartrate',
+                                   sum(heart_rates) / len(heart_rates) if heart_rates else None),
+        'max_heart_rate': meta.get('max_heartrate', max(heart_rates, default=None)),
+        'kilojoules': work_kilojoules(times, columns['power']) if powers else None,
+    }
+    return summary, times, columns
+
+
+def parse_strava_json(raw):
+    """Strava 백업 JSON 내용 → (활동 요약, 시작 기준 초, 컬럼 딕셔너리)"""
+    data = json.loads(raw)
+    activity = data.get('activity') if isinstance(data, dict) else None
+    if not isinstance(activity, dict) or not activity.get('start_date'):
+        return None, [], {}
+    streams = data.get('streams') or {}
+    times = streams.get('time', {}).get('data', [])
+    columns = {column: streams[name]['data'] for name, column in STRAVA_STREAMS.items() if name in streams}
+
+    kilojoules = activity.get('kilojoules')
+    if kilojoules is None and 'power' in columns:
+        kilojoules = work_kilojoules(times, columns['power'])
+
+    summary = {
+        'start': datetime.fromisoformat(activity['start_date'].replace('Z', '+00:00')).timestamp(),
+        'elapsed_time': activity.get('elapsed_time'),
+        'moving_time': activity.get('moving_time'),
+        'distance': activity.get('distance'),
+        'sport': STRAVA_SPORTS.get(activity.get('sport_type') or activity.get('type')),
+        'avg_power': activity.get('average_watts'),
+        'max_power': activity.get('max_watts'),
+        'avg_heart_rate': activity.get('average_heartrate'),
+        'max_heart_rate': activity.get('max_heartrate'),
+        'kilojoules': kilojoules,
+    }
+    return summary, times, columns
+
+
+PARSERS = {'mywhoosh': parse_fit, 'strava': parse_strava_json}
+
+
+def ingest_file(task):
+    """
+    파일 1개 읽기 → 해시 → (바뀌었으면) 파싱 (프로세스 풀 작업 단위)
+
+    Args:
+        task: (경로, 출처, 이전 해시 또는 None, 샘플 간격)
+
+    Returns:
+        dict: path, size, mtime_ns, sha256, status('unchanged'/'parsed'/'empty'/'error'),
+              activity, samples, error
+    """
+    path, source, known_hash, sample_interval = task
+    result = {'path': path, 'source': source, 'activity': None, 'samples': [], 'error': None}
+    try:
+        stat = os.stat(path)
+        raw = Path(path).read_bytes()
+    except OSError as e:
+        result.update(status='error', error=str(e))
+        return result
+
+    result.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns, sha256=file_sha256(raw))
+    if result['sha256'] == known_hash:
+        result['status'] = 'unchanged'
+        return result
+
+    try:
+        summary, times, columns = PARSERS[source](raw)
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        # 형식이 깨진 파일 하나가 전체 수집을 멈추지 않도록 파일별 오류로 기록
+        result.update(status='error', error=str(e))
+        return result
+    if summary is None:
+        result['status'] = 'empty'
+        return result
+
+    samples = downsample(times, columns, sample_interval) if sample_interval and times else []
+    summary.update(source=source, file=path, samples=len(samples))
+    result.update(status='parsed', activity=summary, samples=samples)
+    return result
+
+
+class AnalyticsStore:
+    """활동 분석용 SQLite 저장소"""
+
+    def __init__(self, db_path=None):
+        default_path = os.getenv('ANALYTICS_DB') or Path(__file__).parent.parent / "data" / "analytics.sqlite"
+        self.db_path = Path(db_path) if db_path else Path(default_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._ensure_schema()
+
+    def _ensure_schema(self):
+        """스키마 생성 (버전이 다르면 다시 만듦 - 원본 파일에서 다시 수집 가능)"""
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            for table in ('files', 'activities', 'samples', 'weekly_rollup', 'monthly_rollup'):
+                self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+        self.conn.executescript(SCHEMA)
+        self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def _known_files(self):
+        return {path: (size, mtime_ns, sha256) for path, size, mtime_ns, sha256
+                in self.conn.execute("SELECT path, size, mtime_ns, sha256 FROM files")}
+
+    def pending_tasks(self, files, sample_interval=DEFAULT_SAMPLE_INTERVAL, full=False):
+        """
+        다시 읽어야 할 파일만 작업으로 (크기/수정 시각이 같으면 제외)
+
+        Args:
+            files: (경로, 출처) 목록
+            full: True면 모두 다시 파싱
+
+        Returns:
+            tuple: (작업 목록, 건너뛴 파일 수)
+        """
+        known = {} if full else self._known_files()
+        tasks = []
+        skipped = 0
+        for path, source in files:
+            path = str(Path(path).resolve())
+            previous = known.get(path)
+            if previous:
+                stat = os.stat(path)
+                if (stat.st_size, stat.st_mtime_ns) == previous[:2]:
+                    skipped += 1
+                    continue
+            tasks.append((path, source, previous[2] if previous else None, sample_interval))
+        return tasks, skipped
+
+    def ingest(self, files, workers=None, sample_interval=DEFAULT_SAMPLE_INTERVAL, full=False):
+        """
+        파일 목록 수집 후 주별/월별 합계 갱신
+
+        Returns:
+            dict: 상태별 파일 수 (+ 'skipped': 크기/수정 시각이 같아 읽지 않은 수, 'errors': [(경로, 오류)])
+        """
+        tasks, skipped = self.pending_tasks(files, sample_interval, full)
+        counts = {'skipped': skipped, 'unchanged': 0, 'parsed': 0, 'empty': 0, 'error': 0, 'errors': []}
+        if not tasks:
+            return counts
+
+        if len(tasks) < POOL_MIN_FILES or workers == 1:
+            results = map(ingest_file, tasks)
+            self._store(results, counts)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                chunksize = max(1, len(tasks) // ((workers or os.cpu_count() or 1) * 4))
+                self._store(executor.map(ingest_file, tasks, chunksize=chunksize), counts)
+
+        self.refresh_rollups()
+        return counts
+
+    def _store(self, results, counts):
+        """작업 결과를 한 트랜잭션으로 저장 (결과가 도착하는 대로)"""
+        activity_sql = (f"INSERT INTO activities ({', '.join(ACTIVITY_COLUMNS)}) "
+                        f"VALUES ({', '.join('?' * len(ACTIVITY_COLUMNS))})")
+        sample_sql = (f"INSERT INTO samples (activity_id, t, {', '.join(SAMPLE_COLUMNS)}) "
+                      f"VALUES (?, ?{', ?' * len(SAMPLE_COLUMNS)})")
+        with self.conn:
+            for result in results:
+                counts[result['status']] += 1
+                if result['status'] == 'error':
+                    counts['errors'].append((result['path'], result['error']))
+                    continue
+
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO files (path, size, mtime_ns, sha256) VALUES (?, ?, ?, ?)",
+                    (result['path'], result['size'], result['mtime_ns'], result['sha256']))
+                if result['status'] == 'unchanged':
+                    continue
+
+                self._delete_activity(result['path'])
+                activity = result['activity']
+                if activity is None:
+                    continue
+                cursor = self.conn.execute(activity_sql, [activity[c] for c in ACTIVITY_COLUMNS])
+                activity_id = cursor.lastrowid
+                self.conn.executemany(sample_sql, ((activity_id, *row) for row in result['samples']))
+
+    def _delete_activity(self, path):
+        row = self.conn.execute("SELECT id FROM activities WHERE file = ?", (path,)).fetchone()
+        if row:
+            self.conn.execute("DELETE FROM samples WHERE activity_id = ?", row)
+            self.conn.execute("DELETE FROM activities WHERE id = ?", row)
+
+    def refresh_rollups(self):
+        """주별/월별 합계 테이블 다시 만들기"""
+        with self.conn:
+            for period, expression in PERIODS.items():
+                table = f"{period}_rollup"
+                self.conn.execute(f"DELETE FROM {table}")
+                self.conn.execute(f"""
+                    INSERT INTO {table}
+                    SELECT source, {expression}, COUNT(*),
+                           SUM(elapsed_time) / 3600.0, SUM(moving_time) / 3600.0,
+                           SUM(distance) / 1000.0, SUM(kilojoules)
+                    FROM activities GROUP BY 1, 2
+                """)
+
+    def rollup(self, period='weekly', source=None, since=None):
+        """
+        주별/월별 합계 조회
+
+        Args:
+            period: 'weekly' 또는 'monthly'
+            source: 'mywhoosh'/'strava' (None이면 출처별 모두)
+            since: 'YYYY-MM-DD' (주: 그 날짜 이후 시작한 주, 월: 그 달부터)
+
+        Returns:
+            list: sqlite3.Row (source, period, activities, hours, moving_hours, distance_km, kilojoules)
+        """
+        if period not in PERIODS:
+            raise ValueError(f"알 수 없는 기간: {period} (가능: {', '.join(PERIODS)})")
+        sql = f"SELECT * FROM {period}_rollup WHERE 1 = 1"
+        params = []
+        if source:
+            sql += " AND source = ?"
+            params.append(source)
+        if since:
+            sql += " AND period >= ?"
+            params.append(since if period == 'weekly' else since[:7])
+        return self.query(sql + " ORDER BY period, source", params)
+
+    def query(self, sql, params=()):
+        """임의 SQL 조회 (sqlite3.Row 목록)"""
+        cursor = self.conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        return cursor.execute(sql, params).fetchall()
+
+    def stats(self):
+        """저장 현황 (파일/활동/샘플 수)"""
+        return {table: self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ('files', 'activities', 'samples')}
+
+
+def source_files(downloads_dir, strava_dir):
+    """수집 대상 (경로, 출처) 목록 (다중 계정 하위 폴더 포함)"""
+    files = [(path, 'mywhoosh') for path in sorted(Path(downloads_dir).glob('**/*.fit'))]
+    files += [(path, 'strava') for path in sorted(Path(strava_dir).glob('*_activity.json'))]
+    return files
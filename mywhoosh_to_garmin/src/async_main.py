@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+MyWhoosh to Garmin Connect 동기화 스크립트 (asyncio 버전)
+
+다운로드, Garmin 업로드, Strava 백업을 한 프로세스에서 겹쳐서 진행합니다.
+- MyWhoosh: playwright.async_api, 다운로드 완료 즉시 업로드 큐로 전달
+- Garmin: 블로킹 라이브러리 호출은 스레드로 넘겨 이벤트 루프를 막지 않음
+- Strava: httpx 비동기 클라이언트 (Strava 토큰이 설정된 경우만, 만료 전 자동 갱신)
+
+동시성/제한 시간 환경 변수 (선택):
+    SYNC_MAX_DOWNLOADS (기본 3), SYNC_MAX_UPLOADS (기본 2), SYNC_MAX_STRAVA (기본 4)
+    SYNC_TASK_TIMEOUT (작업 1건당 초, 기본 120)
+    SYNC_MAX_LIST_PAGES (MyWhoosh 활동 목록이 여러 페이지일 때 동시에 여는 페이지 수, 기본 3)
+"""
+import asyncio
+import os
+import signal
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리 설정
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.async_mywhoosh_downloader import AsyncMyWhooshDownloader
+from src.async_strava import AsyncStravaBackup
+from src.garmin_uploader import GarminUploader
+from src.history_manager import HistoryManager
+from src.strava_token_manager import get_token_manager
+from src.upload_queue import PERMANENT, TRANSIENT, UploadQueue
+from src.upload_verifier import UploadVerifier, record_results
+from src.garmin_activity_index import GarminActivityIndex
+from src import fit_validator, interval_detector, training_load, workout_index
+
+
+def env_int(name, default):
+    """정수 환경 변수 읽기"""
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+class UploadStage:
+    """다운로드 큐를 소비하며 Garmin에 업로드 (최대 max_concurrent개 동시 진행)"""
+
+    def __init__(self, email, password, history, max_concurrent=2, task_timeout=120, token_dir=None,
+                 upload_queue=None, verify=None):
+        self.email = email
+        self.password = password
+        self.token_dir = token_dir
+        self.history = history
+        self.upload_queue = upload_queue or UploadQueue(history.data_dir)
+        self.activity_index = GarminActivityIndex(history.data_dir, days=30)
+        self.verify = os.getenv('UPLOAD_VERIFY') == '1' if verify is None else verify
+        self.verifier = None
+        self.max_concurrent = max_concurrent
+        self.task_timeout = task_timeout
+        self._login_task = None
+        self.success_count = 0
+        self.skip_count = 0
+        self.error_count = 0
+        self.deferred_count = 0
+        self._seen = set()
+
+    def enqueue_retries(self, queue):
+        """재시도 시각이 된 이전 실패 파일을 업로드 큐에 추가"""
+        retry_files = self.upload_queue.due()
+        for file_path in retry_files:
+            queue.put_nowait(file_path)
+        if retry_files:
+            print(f"🔁 재시도 대기열에서 {len(retry_files)}개 추가")
+        return retry_files
+
+    def _record_failure(self, file_path, error, error_class=TRANSIENT):
+        """실패를 재시도 큐에 기록"""
+        entry = self.upload_queue.record_failure(file_path, error, error_class)
+        if 'dead_letter' in entry:
+            print(f"   → 격리 ({entry['error_class']}, {entry['attempts']}회 시도)")
+        self.error_count += 1
+
+    async def _get_uploader(self):
+        """첫 파일이 도착했을 때 한 번만 로그인 (새 활동이 없으면 로그인하지 않음)"""
+        if self._login_task is None:
+            print("2️⃣  Garmin Connect 로그인 시작...")
+            self._login_task = asyncio.create_task(asyncio.to_thread(self._login))
+        return await self._login_task
+
+    def _login(self):
+        """Garmin 로그인 (스레드에서 실행), 필요하면 처리 확인 스레드 시작"""
+        uploader = GarminUploader(self.email, self.password, self.token_dir, self.activity_index)
+        if self.verify:
+            self.verifier = UploadVerifier(uploader.garmin)
+            self.verifier.start()
+        return uploader
+
+    async def _worker(self, queue):
+        """큐에서 파일을 꺼내 업로드 (None을 받으면 종료)"""
+        while True:
+            file_path = await queue.get()
+            if file_path is None:
+                return
+            await self._upload_one(file_path)
+
+    async def _upload_one(self, file_path):
+        """파일 1개 업로드"""
+        file_name = os.path.basename(file_path)
+
+        # 재시도 파일이 다운로드로 다시 들어온 경우 한 번만 처리
+        if file_name in self._seen:
+            return
+        self._seen.add(file_name)
+
+        if self.history.is_uploaded(file_name):
+            print(f"⏭️  건너뜀: {file_name} (이미 업로드됨)")
+            self.skip_count += 1
+            return
+
+        if self.upload_queue.is_dead(file_name) or self.upload_queue.is_waiting(file_name):
+            print(f"⏳ 건너뜀: {file_name} (재시도 대기/격리됨)")
+            self.deferred_count += 1
+            return
+
+        # 업로드 전 로컬 검증 (잘린 파일은 복구, 복구할 수 없으면 격리)
+        validation = await asyncio.to_thread(fit_validator.prepare_for_upload, file_path)
+        if validation.repaired:
+            print(f"🩹 {validation.warnings[-1]}: {file_name}")
+        elif not validation.ok:
+            print(f"❌ 검증 실패: {file_name} - {validation.describe()}")
+            self._record_failure(file_path, validation.describe(), PERMANENT)
+            return
+
+        # 캐시된 Garmin 활동 목록에 이미 있으면 로그인/업로드 없이 건너뜀
+        if self.activity_index.is_fresh() and \
+                await asyncio.to_thread(self.activity_index.find_file, file_path):
+            print(f"🔄 중복: {file_name} (Garmin 활동 목록에 존재)")
+            self.history.mark_uploaded(file_name)
+            self.upload_queue.record_success(file_name)
+            self.skip_count += 1
+            return
+
+        # 구조화 워크아웃 인터벌을 lap으로 기록 (WORKOUT_LAPS=1)
+        await asyncio.to_thread(interval_detector.add_laps_for_upload, file_path)
+
+        try:
+            uploader = await self._get_uploader()
+            # 스레드 작업은 중단할 수 없으므로 시간 초과 시 결과만 버림
+            result = await asyncio.wait_for(
+                asyncio.to_thread(uploader.upload, file_path), timeout=self.task_timeout)
+        except asyncio.TimeoutError:
+            print(f"❌ 업로드 시간 초과: {file_name}")
+            self._record_failure(file_path, "업로드 시간 초과")
+            return
+        except Exception as e:
+            # 로그인 실패 등
+            print(f"❌ 업로드 실패: {file_name} - {e}")
+            self._record_failure(file_path, e)
+            return
+
+        if result['success']:
+            print(f"✅ 업로드 성공: {file_name}")
+            self.history.mark_uploaded(file_name)
+            self.upload_queue.record_success(file_name)
+            if self.verifier:
+                await asyncio.to_thread(self.verifier.add, file_path, result)
+            self.success_count += 1
+        elif result.get('duplicate'):
+            print(f"🔄 중복: {file_name} (이미 Garmin에 존재)")
+            self.history.mark_uploaded(file_name)
+            self.upload_queue.record_success(file_name)
+            self.skip_count += 1
+        else:
+            print(f"❌ 업로드 실패: {file_name} - {result.get('error')}")
+            self._record_failure(file_path, result.get('error'), result.get('error_class') or TRANSIENT)
+
+    async def run(self, queue):
+        """업로드 워커 실행 (큐에 None이 max_concurrent개 들어오면 종료)"""
+        workers = [asyncio.create_task(self._worker(queue)) for _ in range(self.max_concurrent)]
+        try:
+            await asyncio.gather(*workers)
+            if self.verifier:
+                # 업로드가 모두 끝난 뒤 남은 처리 확인을 기다림
+                record_results(await asyncio.to_thread(self.verifier.finish), self.history)
+        except asyncio.CancelledError:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise
+
+
+async def sync(mywhoosh_email, mywhoosh_password, garmin_email, garmin_password):
+    """다운로드 → 업로드 파이프라인 + Strava 백업을 동시에 실행"""
+    max_downloads = env_int('SYNC_MAX_DOWNLOADS', 3)
+    max_uploads = env_int('SYNC_MAX_UPLOADS', 2)
+    max_strava = env_int('SYNC_MAX_STRAVA', 4)
+    task_timeout = env_int('SYNC_TASK_TIMEOUT', 120)
+    max_list_pages = env_int('SYNC_MAX_LIST_PAGES', 3)
+
+    history = HistoryManager()
+    queue = asyncio.Queue()
+
+    downloader = AsyncMyWhooshDownloader(mywhoosh_email, mywhoosh_password)
+    upload_stage = UploadStage(garmin_email, garmin_password, history,
+                               max_concurrent=max_uploads, task_timeout=task_timeout)
+
+    strava_task = None
+    token_manager = get_token_manager()
+    try:
+        strava_enabled = bool(await asyncio.to_thread(token_manager.get_access_token))
+    except Exception as e:
+        print(f"⚠️  Strava 토큰 갱신 실패, 백업 생략: {e}")
+        strava_enabled = False
+    if strava_enabled:
+        print("3️⃣  Strava 백업 시작 (동시 진행)...")
+        backup = AsyncStravaBackup(token_manager, max_concurrent=max_strava, task_timeout=task_timeout)
+        strava_task = asyncio.create_task(backup.backup_recent(days=30))
+
+    print("1️⃣  MyWhoosh 다운로드 시작...")
+    upload_stage.enqueue_retries(queue)
+    upload_task = asyncio.create_task(upload_stage.run(queue))
+    try:
+        try:
+            downloaded_files = await downloader.download_recent_activities(
+                days=30, queue=queue, max_concurrent=max_downloads, task_timeout=task_timeout,
+                page_concurrency=max_list_pages)
+            print(f"✅ {len(downloaded_files)}개 활동 다운로드 완료")
+            await asyncio.to_thread(training_load.record_downloads, downloaded_files)
+            await asyncio.to_thread(workout_index.index_downloads, downloaded_files)
+        finally:
+            # 다운로드가 끝나면(실패 포함) 업로드 워커 종료 신호
+            for _ in range(max_uploads):
+                queue.put_nowait(None)
+        await upload_task
+
+        strava_files = []
+        if strava_task:
+            try:
+                strava_files = await strava_task
+            except Exception as e:
+                print(f"⚠️  Strava 백업 실패: {e}")
+
+    except BaseException:
+        # 다운로드 실패/취소 시 업로드·백업 작업을 정리하고 나서 전파 (asyncio.run 종료 중 끊기지 않도록)
+        for task in (upload_task, strava_task):
+            if task:
+                task.cancel()
+        await asyncio.gather(*(t for t in (upload_task, strava_task) if t), return_exceptions=True)
+        raise
+
+    print()
+    print("=" * 60)
+    print("동기화 완료")
+    print("=" * 60)
+    print(f"✅ 성공: {upload_stage.success_count}개")
+    print(f"⏭️  건너뜀: {upload_stage.skip_count}개")
+    print(f"❌ 실패: {upload_stage.error_count}개")
+    if upload_stage.deferred_count:
+        print(f"⏳ 재시도 대기/격리로 생략: {upload_stage.deferred_count}개")
+    if strava_task:
+        print(f"💾 Strava 백업: {len(strava_files)}개")
+    print(f"종료 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print()
+
+    return 0 if upload_stage.error_count == 0 else 1
+
+
+async def main_async():
+    """메인 실행 함수 (SIGTERM 수신 시 진행 중인 작업 취소)"""
+    print("=" * 60)
+    print("MyWhoosh to Garmin Connect 동기화 시작 (asyncio)")
+    print("=" * 60)
+    print(f"시작 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print()
+
+    mywhoosh_email = os.getenv('MYWHOOSH_EMAIL')
+    mywhoosh_password = os.getenv('MYWHOOSH_PASSWORD')
+    garmin_email = os.getenv('GARMIN_EMAIL')
+    garmin_password = os.getenv('GARMIN_PASSWORD')
+
+    if not all([mywhoosh_email, mywhoosh_password, garmin_email, garmin_password]):
+        print("❌ 환경 변수가 설정되지 않았습니다!")
+        print("필요한 환경 변수: MYWHOOSH_EMAIL, MYWHOOSH_PASSWORD, GARMIN_EMAIL, GARMIN_PASSWORD")
+        return 1
+
+    sync_task = asyncio.create_task(
+        sync(mywhoosh_email, mywhoosh_password, garmin_email, garmin_password))
+    loop = asyncio.get_running_loop()
+    try:
+        loop.add_signal_handler(signal.SIGTERM, sync_task.cancel)
+    except NotImplementedError:
+        pass  # Windows
+
+    try:
+        return await sync_task
+    except asyncio.CancelledError:
+        print("\n⚠️  동기화가 취소되었습니다.")
+        return 1
+    except Exception as e:
+        print(f"❌ 예상치 못한 오류: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    try:
+        exit_code = asyncio.run(main_async())
+    except KeyboardInterrupt:
+        exit_code = 1
+    sys.exit(exit_code)
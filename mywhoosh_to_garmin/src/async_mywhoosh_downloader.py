@@ -0,0 +1,421 @@
+"""
+MyWhoosh 활동 다운로더 (asyncio 버전)
+
+playwright.async_api 기반으로 동작하며, 다운로드를 동시에 진행하고
+완료된 파일을 큐로 넘겨 업로드와 겹쳐서 처리할 수 있습니다.
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
+
+from src.activity_list import (DEFAULT_PAGE_CONCURRENCY, DOWNLOAD_BUTTON_TEXT, MAX_LIST_PAGES,
+                               MAX_SCROLL_ROUNDS, NEXT_BUTTON_SELECTOR, PAGE_LINK_SELECTOR,
+                               SCROLL_TO_BOTTOM, page_urls_from_hrefs)
+from src.diagnostics import ArtifactRingBuffer, diagnostics_enabled
+from src.lean_browser import RouteBlocker, lean_enabled
+
+LOGIN_URL = "https://event.mywhoosh.com/auth/login"
+ACTIVITIES_URL = "https://event.mywhoosh.com/user/activities#profile"
+
+
+class AsyncMyWhooshDownloader:
+    """MyWhoosh 웹사이트에서 활동 다운로드 (비동기)"""
+
+    def __init__(self, email, password, download_dir=None, screenshot_dir=None, lean=None,
+                 diagnostics=None):
+        self.email = email
+        self.password = password
+        self.download_dir = Path(download_dir) if download_dir else Path(__file__).parent.parent / "downloads"
+        self.download_dir.mkdir(parents=True, exist_ok=True)
+        self.screenshot_dir = Path(screenshot_dir) if screenshot_dir else Path(__file__).parent.parent / "screenshot"
+        self.screenshot_dir.mkdir(parents=True, exist_ok=True)
+        self.lean = lean_enabled() if lean is None else lean
+        # lean 모드: 페이지 이동은 DOM 준비까지만 대기 (필요한 요소는 각각 wait_for로 기다림)
+        self.navigation_wait = "domcontentloaded" if self.lean else "networkidle"
+        self.diagnostics = diagnostics_enabled() if diagnostics is None else diagnostics
+        self.artifacts = ArtifactRingBuffer(self.screenshot_dir / "failures")
+        self.last_error = None
+        self.failed_steps = []
+        self.timings = {}  # 단계별 소요 시간 (초, 시작 기준)
+
+    async def download_recent_activities(self, days=30, browser=None, queue=None,
+                                         max_concurrent=3, task_timeout=120,
+                                         page_concurrency=DEFAULT_PAGE_CONCURRENCY):
+        """
+        최근 N일간의 활동 다운로드
+
+        Args:
+            browser: 공유할 Browser (없으면 직접 실행 후 종료)
+            queue: 다운로드 완료된 파일 경로를 넣을 asyncio.Queue
+            max_concurrent: 동시에 저장할 최대 다운로드 수
+            task_timeout: 다운로드 1건당 제한 시간 (초)
+            page_concurrency: 목록이 여러 페이지일 때 동시에 여는 페이지 수
+        """
+        if browser is not None:
+            return await self._download_with_browser(browser, days, queue, max_concurrent, task_timeout,
+                                                     page_concurrency)
+
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            try:
+                return await self._download_with_browser(browser, days, queue, max_concurrent,
+                                                         task_timeout, page_concurrency)
+            finally:
+                await browser.close()
+
+    async def _download_with_browser(self, browser, days, queue, max_concurrent, task_timeout,
+                                     page_concurrency):
+        """독립된 브라우저 컨텍스트에서 로그인 후 다운로드"""
+        downloaded_files = []
+        tasks = []
+        started = time.perf_counter()
+        self.timings = {}
+        self.failed_steps = []
+        context = await browser.new_context(accept_downloads=True)
+        if self.diagnostics:
+            # DOM 스냅샷/네트워크/타이밍을 기록해 두고 실패했을 때만 저장
+            await context.tracing.start(screenshots=True, snapshots=True)
+        blocker = None
+        if self.lean:
+            blocker = RouteBlocker()
+            await context.route("**/*", blocker.handle_async)
+        page = await context.new_page()
+
+        try:
+            await self._login(page)
+            self.timings['login'] = time.perf_counter() - started
+            targets = await self._collect_targets(context, page, days, page_concurrency)
+
+            semaphore = asyncio.Semaphore(max_concurrent)
+            # 클릭 잠금은 목록 페이지마다 따로 (다른 페이지의 다운로드는 동시에 진행)
+            click_locks = {}
+            tasks.extend(
+                asyncio.create_task(self._download_one(list_page, button, file_path, semaphore,
+                                                       click_locks.setdefault(list_page, asyncio.Lock()),
+                                                       task_timeout))
+                for list_page, button, file_path in targets
+            )
+
+            for task in asyncio.as_completed(tasks):
+                file_path = await task
+                if file_path:
+                    self.timings.setdefault('first_download', time.perf_counter() - started)
+                    downloaded_files.append(file_path)
+                    if queue is not None:
+                        await queue.put(file_path)
+
+        except asyncio.CancelledError:
+            print("  ⚠️  다운로드 작업이 취소되었습니다.")
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        except PlaywrightTimeout as e:
+            print(f"  ⚠️  타임아웃 오류: {e}")
+            self.last_error = f"타임아웃: {e}"
+            await self._failure_screenshot(page, "error")
+        except Exception as e:
+            print(f"  ❌ 오류 발생: {e}")
+            self.last_error = str(e)
+            await self._failure_screenshot(page, "error")
+            import traceback
+            traceback.print_exc()
+        finally:
+            if self.diagnostics:
+                await self._stop_tracing(context)
+            await context.close()
+
+        self.timings['total'] = time.perf_counter() - started
+        timing_text = ', '.join(f"{k} {v:.1f}초" for k, v in self.timings.items())
+        print(f"  ⏱️  {timing_text}" + (f" (lean 모드, {blocker.summary()})" if blocker else ""))
+
+        return downloaded_files
+
+    async def _failure_screenshot(self, page, name):
+        """실패한 단계 기록 + 스크린샷 (스크린샷 실패는 무시)"""
+        self.failed_steps.append(name)
+        try:
+            screenshot_path = self.artifacts.path_for(name, ".png")
+            await page.screenshot(path=str(screenshot_path))
+            self.artifacts.prune()
+            print(f"  실패 스크린샷: {screenshot_path}")
+        except Exception:
+            pass
+
+    async def _stop_tracing(self, context):
+        """trace 기록 종료 (실패한 단계가 있을 때만 파일로 저장)"""
+        try:
+            if not self.failed_steps:
+                await context.tracing.stop()
+                return
+            trace_path = self.artifacts.path_for('trace_' + '_'.join(self.failed_steps), ".zip")
+            await context.tracing.stop(path=str(trace_path))
+            self.artifacts.prune()
+            print(f"  trace 저장: {trace_path} (playwright show-trace로 확인)")
+        except Exception as e:
+            print(f"  ⚠️  trace 저장 실패: {e}")
+
+    async def _login(self, page):
+        """MyWhoosh 로그인 (정책 동의 + reCAPTCHA 처리)"""
+        print(f"  MyWhoosh 로그인 중... ({self.email})")
+        await page.goto(LOGIN_URL, timeout=60000)
+        await page.wait_for_load_state(self.navigation_wait, timeout=60000)
+        await page.wait_for_timeout(3000)
+
+        # 정책 동의 버튼 클릭 (Accept All)
+        try:
+            accept_btn = page.locator('button:has-text("Accept All"), button:has-text("Accept all"), button:has-text("동의")').first
+            await accept_btn.wait_for(state="visible", timeout=5000)
+            await accept_btn.click()
+            print("  ✅ 'Accept All' 버튼 클릭 완료")
+            await page.wait_for_timeout(1000)
+        except Exception as e:
+            print(f"  정책 동의 버튼 없음 또는 이미 동의함: {e}")
+
+        email_input = page.locator('input[type="text"], input[name="username"], input[placeholder*="mail" i]').first
+        await email_input.wait_for(state="visible", timeout=30000)
+        await email_input.fill(self.email)
+
+        password_input = page.locator('input[type="password"]').first
+        await password_input.wait_for(state="visible", timeout=30000)
+        await password_input.fill(self.password)
+
+        # reCAPTCHA 체크박스 클릭 (필수)
+        print("  reCAPTCHA 로드 대기 중... (5초)")
+        await page.wait_for_timeout(5000)
+
+        if not await self._click_recaptcha(page):
+            print("  ⚠️ 모든 reCAPTCHA 클릭 방법 실패")
+            await self._failure_screenshot(page, "recaptcha_failed")
+
+        submit_btn = page.locator('button[type="submit"]').first
+        if await submit_btn.get_attribute("disabled"):
+            print("  ⚠️  Submit 버튼이 비활성화되어 있습니다. 5초 대기 후 재시도...")
+            await page.wait_for_timeout(5000)
+
+        print("  로그인 버튼 클릭...")
+        await submit_btn.click()
+        await page.wait_for_load_state("networkidle", timeout=60000)
+        await page.wait_for_timeout(3000)
+
+    async def _click_recaptcha(self, page):
+        """reCAPTCHA 클릭 (iframe 내부 → iframe 자체 → 좌표 순서로 시도)"""
+        iframe_selector = 'iframe[src*="recaptcha/api2/anchor"]'
+
+        # 방법 1: iframe 내부 여러 셀렉터 시도
+        recaptcha_frame = page.frame_locator(iframe_selector).first
+        for selector in ['#recaptcha-anchor', '.recaptcha-checkbox-border',
+                         '.recaptcha-checkbox-checkmark', 'div.recaptcha-checkbox']:
+            try:
+                await recaptcha_frame.locator(selector).first.click(timeout=3000, force=True)
+                await page.wait_for_timeout(5000)
+                print("  ✅ reCAPTCHA 처리 완료 (방법 1)")
+                return True
+            except Exception:
+                continue
+
+        # 방법 2: 메인 페이지에서 iframe 전체 클릭
+        iframe = page.locator(iframe_selector).first
+        try:
+            await iframe.click(timeout=3000, force=True)
+            await page.wait_for_timeout(5000)
+            print("  ✅ reCAPTCHA 처리 완료 (방법 2)")
+            return True
+        except Exception as e:
+            print(f"  ⚠️ 방법 2 실패: {e}")
+
+        # 방법 3: 좌표 기반 클릭
+        try:
+            box = await iframe.bounding_box()
+            if box:
+                await page.mouse.click(box['x'] + box['width'] / 2, box['y'] + box['height'] / 2)
+                await page.wait_for_timeout(5000)
+                print("  ✅ reCAPTCHA 처리 완료 (방법 3)")
+                return True
+        except Exception as e:
+            print(f"  ⚠️ 방법 3 실패: {e}")
+
+        return False
+
+    async def _collect_targets(self, context, page, days, page_concurrency):
+        """
+        기간 내이면서 아직 없는 활동의 (목록 페이지, 다운로드 버튼, 저장 경로) 목록
+
+        목록이 여러 페이지로 나뉘어 있으면 같은 컨텍스트에서 탭을 여러 개 열어
+        page_concurrency개씩 동시에 읽고, 기간을 벗어난 페이지가 나오면 멈춘 뒤 합칩니다.
+        """
+        print("  Activities 페이지 접속 중...")
+        await self._open_activities(page)
+        cutoff_date = datetime.now() - timedelta(days=days)
+
+        mode, page_urls = await self._detect_list_mode(page)
+        if mode == 'scroll':
+            rows, _ = await self._scroll_rows(page, cutoff_date)
+        else:
+            rows, reached_cutoff = await self._collect_rows(page, cutoff_date)
+            if mode != 'single' and not reached_cutoff and rows:
+                rows += await self._collect_other_pages(context, mode, page_urls, cutoff_date,
+                                                        page_concurrency)
+        print(f"  {len(rows)}개 활동 발견 (목록 형식: {mode})")
+
+        targets = []
+        seen = set()
+        for list_page, button, activity_date in rows:
+            file_path = self.download_dir / (activity_date.strftime("%Y-%m-%d") + ".fit")
+            if file_path in seen:
+                continue
+            seen.add(file_path)
+            if file_path.exists():
+                print(f"  ⏭️  {activity_date:%d/%m/%Y} - 이미 존재함")
+                continue
+            targets.append((list_page, button, file_path))
+
+        return targets
+
+    async def _open_activities(self, page, url=ACTIVITIES_URL):
+        """목록 페이지 열기 + ACTIVITIES 탭 선택"""
+        await page.goto(url)
+        await page.wait_for_load_state(self.navigation_wait)
+        await page.click('tab[name="ACTIVITIES"]', timeout=5000)
+        await page.wait_for_timeout(2000)
+
+    async def _detect_list_mode(self, page):
+        """목록이 이어지는 방식 판별 → (모드, 페이지 URL 목록)"""
+        hrefs = await page.eval_on_selector_all(PAGE_LINK_SELECTOR, 'els => els.map(e => e.href)')
+        page_urls = page_urls_from_hrefs(hrefs)
+        if page_urls:
+            return 'pages', page_urls[:MAX_LIST_PAGES - 1]
+
+        if await self._next_button_enabled(page):
+            return 'next', []
+
+        before = await self._row_count(page)
+        await page.evaluate(SCROLL_TO_BOTTOM)
+        await page.wait_for_timeout(1500)
+        if await self._row_count(page) > before:
+            return 'scroll', []
+        return 'single', []
+
+    async def _row_count(self, page):
+        return await page.locator('button').filter(has_text=DOWNLOAD_BUTTON_TEXT).count()
+
+    async def _next_button_enabled(self, page):
+        next_button = page.locator(NEXT_BUTTON_SELECTOR).first
+        try:
+            return await next_button.count() > 0 and await next_button.is_visible() \
+                and await next_button.is_enabled()
+        except Exception:
+            return False
+
+    async def _collect_rows(self, page, cutoff_date, skip=0):
+        """
+        페이지에 보이는 다운로드 버튼을 날짜와 함께 읽기 (skip개 이후부터)
+
+        Returns:
+            tuple: ([(페이지, 버튼, 날짜), ...], 기간을 벗어난 행이 있었는지)
+        """
+        buttons = await page.locator('button').filter(has_text=DOWNLOAD_BUTTON_TEXT).all()
+        rows = []
+        for button in buttons[skip:]:
+            row = button.locator('xpath=ancestor::tr')
+            date_text = (await row.locator('td').first.inner_text()).strip()
+
+            try:
+                activity_date = datetime.strptime(date_text, "%d/%m/%Y")
+            except ValueError:
+                print(f"  ⚠️  날짜 파싱 실패: {date_text}")
+                continue
+
+            if activity_date < cutoff_date:
+                print(f"  ⏭️  {date_text} - 기간 초과, 중단")
+                return rows, True
+
+            rows.append((page, button, activity_date))
+        return rows, False
+
+    async def _scroll_rows(self, page, cutoff_date):
+        """무한 스크롤 목록: 기간을 벗어나거나 더 늘지 않을 때까지 스크롤하며 읽기"""
+        rows, reached_cutoff = await self._collect_rows(page, cutoff_date)
+        seen = await self._row_count(page)
+        for _ in range(MAX_SCROLL_ROUNDS):
+            if reached_cutoff:
+                break
+            await page.evaluate(SCROLL_TO_BOTTOM)
+            await page.wait_for_timeout(1500)
+            count = await self._row_count(page)
+            if count <= seen:
+                break
+            more, reached_cutoff = await self._collect_rows(page, cutoff_date, skip=seen)
+            rows += more
+            seen = count
+        return rows, reached_cutoff
+
+    async def _collect_other_pages(self, context, mode, page_urls, cutoff_date, page_concurrency):
+        """2번째 페이지부터 page_concurrency개씩 동시에 열어 읽기 (페이지 순서대로 합침)"""
+        semaphore = asyncio.Semaphore(page_concurrency)
+
+        async def load(index):
+            # index: 첫 페이지 기준 몇 번째 다음 페이지인지 (1부터)
+            async with semaphore:
+                list_page = await context.new_page()
+                try:
+                    if mode == 'pages':
+                        await self._open_activities(list_page, page_urls[index - 1])
+                    else:
+                        await self._open_activities(list_page)
+                        for _ in range(index):
+                            if not await self._next_button_enabled(list_page):
+                                return [], False
+                            await list_page.locator(NEXT_BUTTON_SELECTOR).first.click(timeout=5000)
+                            await list_page.wait_for_timeout(1500)
+                    return await self._collect_rows(list_page, cutoff_date)
+                except PlaywrightTimeout as e:
+                    print(f"  ⚠️  목록 {index + 1}페이지 열기 실패: {e}")
+                    await self._failure_screenshot(list_page, f"list_page_{index + 1}")
+                    return [], False
+
+        last_index = len(page_urls) if mode == 'pages' else MAX_LIST_PAGES - 1
+        rows = []
+        index = 1
+        while index <= last_index:
+            batch = range(index, min(index + page_concurrency, last_index + 1))
+            results = await asyncio.gather(*(load(i) for i in batch))
+            for page_rows, reached_cutoff in results:
+                rows += page_rows
+                # 페이지는 최신순이므로 기간을 벗어났거나 빈 페이지 이후는 볼 필요 없음
+                if reached_cutoff or not page_rows:
+                    return rows
+            index += len(batch)
+        return rows
+
+    async def _download_one(self, page, button, file_path, semaphore, click_lock, task_timeout):
+        """다운로드 1건 (클릭은 직렬, 저장은 병렬)"""
+        async with semaphore:
+            try:
+                # 같은 페이지에서 expect_download가 섞이지 않도록 클릭 구간만 잠금
+                async with click_lock:
+                    async with page.expect_download(timeout=task_timeout * 1000) as download_info:
+                        await button.click()
+                    download = await download_info.value
+
+                await asyncio.wait_for(download.save_as(file_path), timeout=task_timeout)
+                print(f"  ✅ 저장됨: {file_path.name}")
+                return str(file_path)
+
+            except asyncio.CancelledError:
+                # 저장 중 취소되면 부분 파일이 다음 실행에서 '이미 존재함'으로 처리되지 않도록 삭제
+                file_path.unlink(missing_ok=True)
+                raise
+            except asyncio.TimeoutError:
+                print(f"  ⚠️  다운로드 시간 초과: {file_path.name}")
+            except PlaywrightTimeout as e:
+                print(f"  ⚠️  다운로드 타임아웃: {file_path.name} - {e}")
+            except Exception as e:
+                print(f"  ❌ 다운로드 실패: {file_path.name} - {e}")
+
+            if 'download' not in self.failed_steps:
+                self.failed_steps.append('download')
+            file_path.unlink(missing_ok=True)
+            return None
@@ -0,0 +1,122 @@
+"""
+Strava 활동 JSON 백업 (httpx 비동기 버전)
+
+scripts/strava/download_activity.py와 같은 형식으로 strava_data/에 저장합니다.
+"""
+import asyncio
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import httpx
+
+from src.strava_streams import STRAVA_API_URL, stream_params
+
+
+def activity_json_path(output_dir, activity):
+    """활동 JSON 저장 경로 (download_activity.py와 동일한 파일명 규칙)"""
+    date = activity['start_date'][:10]
+    name = activity['name'].replace('/', '-').replace(' ', '_')
+    return Path(output_dir) / f"{date}_{name}_activity.json"
+
+
+def _write_json(path, data):
+    """JSON 파일 저장 (스레드에서 실행)"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+class AsyncStravaBackup:
+    """최근 Strava 활동을 동시에 백업"""
+
+    def __init__(self, token_manager, output_dir=None, max_concurrent=4, task_timeout=60):
+        self.token_manager = token_manager
+        self.output_dir = Path(output_dir) if output_dir else Path(__file__).parent.parent / "strava_data"
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.max_concurrent = max_concurrent
+        self.task_timeout = task_timeout
+
+    def _client(self):
+        """Strava API용 AsyncClient (요청마다 만료 임박 여부를 확인한 토큰 사용)"""
+        async def add_auth(request):
+            # 갱신 시 파일 잠금/HTTP 요청이 있을 수 있으므로 스레드에서 실행
+            access_token = await asyncio.to_thread(self.token_manager.get_access_token)
+            request.headers["Authorization"] = f"Bearer {access_token}"
+
+        return httpx.AsyncClient(
+            base_url=STRAVA_API_URL,
+            event_hooks={'request': [add_auth]},
+            timeout=httpx.Timeout(30.0),
+        )
+
+    async def list_activities(self, client, after, per_page=100):
+        """after(datetime) 이후의 활동 목록 (페이지 단위 조회)"""
+        activities = []
+        page = 1
+        while True:
+            response = await client.get("/athlete/activities", params={
+                "after": int(after.timestamp()),
+                "per_page": per_page,
+                "page": page,
+            })
+            response.raise_for_status()
+            batch = response.json()
+            activities.extend(batch)
+            if len(batch) < per_page:
+                return activities
+            page += 1
+
+    async def backup_activity(self, client, activity_id):
+        """활동 상세 + 스트림을 받아 JSON으로 저장"""
+        detail_response, streams_response = await asyncio.gather(
+            client.get(f"/activities/{activity_id}"),
+            client.get(f"/activities/{activity_id}/streams", params=stream_params()),
+        )
+        detail_response.raise_for_status()
+        activity = detail_response.json()
+
+        try:
+            streams_response.raise_for_status()
+            streams = streams_response.json()
+        except httpx.HTTPStatusError as e:
+            print(f"  ⚠️  스트림 데이터 가져오기 실패: {e}")
+            streams = {}
+
+        output_data = {
+            'activity': activity,
+            'streams': streams,
+            'downloaded_at': datetime.now().isoformat()
+        }
+
+        filename = activity_json_path(self.output_dir, activity)
+        await asyncio.to_thread(_write_json, filename, output_data)
+        return filename
+
+    async def backup_recent(self, days=30):
+        """최근 N일 활동 중 아직 백업되지 않은 것을 동시에 저장"""
+        saved_files = []
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        async with self._client() as client:
+            after = datetime.now() - timedelta(days=days)
+            activities = await self.list_activities(client, after)
+            pending = [a for a in activities if not activity_json_path(self.output_dir, a).exists()]
+            print(f"  Strava 활동 {len(activities)}개 중 {len(pending)}개 백업 필요")
+
+            async def backup(activity):
+                async with semaphore:
+                    try:
+                        filename = await asyncio.wait_for(
+                            self.backup_activity(client, activity['id']), timeout=self.task_timeout)
+                        print(f"  ✅ Strava 백업: {filename.name}")
+                        return filename
+                    except asyncio.TimeoutError:
+                        print(f"  ⚠️  Strava 백업 시간 초과: {activity['id']}")
+                    except httpx.HTTPError as e:
+                        print(f"  ❌ Strava 백업 실패: {activity['id']} - {e}")
+                    return None
+
+            results = await asyncio.gather(*(backup(a) for a in pending))
+            saved_files = [f for f in results if f]
+
+        return saved_files
@@ -0,0 +1,237 @@
+"""
+Strava 백업 JSON 헤더 읽기 (스트림 배열을 만들지 않는 빠른 경로)
+
+백업 파일({activity, streams, downloaded_at})의 대부분은 streams.*.data 배열입니다.
+메타데이터와 스트림별 포인트 수만 필요할 때는 json.load로 전체를 만들지 않고
+- 최상위/스트림 객체는 키 단위로 훑으면서 activity 같은 값은 그대로 해석하고
+- streams.*.data 배열은 bytes에서 끝 위치를 찾아 쉼표만 세서 원소 수를 셉니다
+  (숫자/불리언 배열과 latlng 같은 배열의 배열. 그 밖의 모양은 일반 해석으로 대체)
+파일을 문자열로 디코딩하지도 않으므로 시간/메모리가 스트림 크기에 거의 비례하지 않습니다.
+
+헤더는 (파일 크기, 수정 시각)이 같으면 data/backup_header_cache.json에서 바로 돌려줍니다.
+"""
+import json
+import re
+from pathlib import Path
+
+from src.activity_archive import open_activity
+
+HEADER_CACHE_FILE = Path(__file__).parent.parent / "data" / "backup_header_cache.json"
+
+# 헤더에 남길 활동 필드 (segment_efforts 같은 큰 값은 캐시하지 않음)
+ACTIVITY_FIELDS = (
+    'id', 'name', 'type', 'sport_type', 'start_date', 'start_date_local', 'distance',
+    'moving_time', 'elapsed_time', 'average_speed', 'average_watts', 'average_heartrate',
+    'kilojoules', 'trainer', 'device_name',
+)
+
+FULL_PARSE_BYTES = 64 * 1024   # 이보다 작은 파일은 json.loads가 더 빠름
+
+_WHITESPACE = re.compile(rb'[ \t\n\r]*')
+_STRING = re.compile(rb'"(?:[^"\\]|\\.)*"', re.DOTALL)
+_SCALAR = re.compile(rb'-?[0-9][0-9.eE+-]*|true|false|null')
+_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"|[\[\]{}]', re.DOTALL)
+_ARRAYS_END = re.compile(rb'\][ \t\n\r]*\]')
+
+
+class BackupFormatError(ValueError):
+    """백업 JSON 구조 오류"""
+
+
+def _skip(raw, pos):
+    return _WHITESPACE.match(raw, pos).end()
+
+
+def _expect(raw, pos, char):
+    pos = _skip(raw, pos)
+    if raw[pos:pos + 1] != char:
+        raise BackupFormatError(f"'{char.decode()}' 필요 (위치 {pos})")
+    return pos + 1
+
+
+def _value_end(raw, pos):
+    """pos에서 시작하는 JSON 값의 끝 위치 (문자열 안 괄호는 무시)"""
+    first = raw[pos:pos + 1]
+    if first == b'"':
+        match = _STRING.match(raw, pos)
+    elif first not in (b'{', b'['):
+        match = _SCALAR.match(raw, pos)
+    else:
+        depth = 0
+        for token in _TOKEN.finditer(raw, pos):
+            char = token.group()
+            if char in (b'{', b'['):
+                depth += 1
+            elif char in (b'}', b']'):
+                depth -= 1
+                if depth == 0:
+                    return token.end()
+        match = None
+    if match is None:
+        raise BackupFormatError(f"값을 해석할 수 없음 (위치 {pos})")
+    return match.end()
+
+
+_LITERALS = {b'true': True, b'false': False, b'null': None}
+
+
+def _decode(token):
+    """짧은 문자열/숫자는 json.loads 없이 바로 변환"""
+    if token[:1] == b'"':
+        return json.loads(token) if b'\\' in token else token[1:-1].decode('utf-8')
+    if token in _LITERALS:
+        return _LITERALS[token]
+    if token[:1] in b'-0123456789':
+        return float(token) if any(c in token for c in b'.eE') else int(token)
+    return json.loads(token)
+
+
+def _read_value(raw, pos):
+    end = _value_end(raw, pos)
+    return _decode(raw[pos:end]), end
+
+
+def count_array(raw, pos):
+    """
+    pos의 배열 원소 수 (배열을 만들지 않음)
+
+    슬라이스를 만들지 않고 bytes.find/count로 범위 안의 쉼표나 여는 괄호만 셉니다.
+
+    Returns:
+        tuple: (원소 수, 배열 다음 위치)
+    """
+    close = raw.find(b']', pos)
+    inner = _skip(raw, pos + 1)
+    if close != -1 and all(raw.find(char, pos + 1, close) == -1 for char in (b'[', b'{', b'"')):
+        # 숫자·불리언·null 배열
+        return (0 if inner == close else raw.count(b',', pos, close) + 1), close + 1
+
+    if raw[inner:inner + 1] == b'[':
+        # 배열의 배열 (latlng): 처음 나오는 ']]'까지 괄호 수가 맞으면 바깥 배열의 끝
+        match = _ARRAYS_END.search(raw, inner)
+        if match:
+            close = match.end() - 1
+            opened = raw.count(b'[', pos + 1, close)
+            if opened == raw.count(b']', pos + 1, close) and \
+                    raw.find(b'{', pos, close) == -1 and raw.find(b'"', pos, close) == -1:
+                return opened, close + 1
+
+    value, end = _read_value(raw, pos)
+    return len(value), end
+
+
+def _scan_object(raw, pos, read_value):
+    """
+    객체를 키 단위로 훑기
+
+    Args:
+        read_value: (키, 값 시작 위치) → (값, 값 다음 위치)
+
+    Returns:
+        tuple: ({키: 값}, 객체 다음 위치)
+    """
+    pos = _skip(raw, _expect(raw, pos, b'{'))
+    result = {}
+    if raw[pos:pos + 1] == b'}':
+        return result, pos + 1
+
+    while True:
+        match = _STRING.match(raw, _skip(raw, pos))
+        if match is None:
+            raise BackupFormatError(f"키 필요 (위치 {pos})")
+        key = _decode(match.group())
+        pos = _skip(raw, _expect(raw, match.end(), b':'))
+        result[key], pos = read_value(key, pos)
+        pos = _skip(raw, pos)
+        if raw[pos:pos + 1] == b',':
+            pos += 1
+            continue
+        return result, _expect(raw, pos, b'}')
+
+
+def scan_backup(raw):
+    """
+    백업 JSON 헤더 해석
+
+    Returns:
+        dict: {'activity': 활동 딕셔너리 전체, 'streams': {이름: {'points': 수, 그 밖의 키...}},
+               최상위의 나머지 키...}
+    """
+    raw = raw.encode('utf-8') if isinstance(raw, str) else bytes(raw)
+
+    def read_stream(key, pos):
+        if key == 'data' and raw[pos:pos + 1] == b'[':
+            return count_array(raw, pos)
+        return _read_value(raw, pos)
+
+    def read_streams(key, pos):
+        if raw[pos:pos + 1] != b'{':
+            return _read_value(raw, pos)
+        stream, end = _scan_object(raw, pos, read_stream)
+        if 'data' in stream:
+            stream['points'] = stream.pop('data')
+        return stream, end
+
+    def read_top(key, pos):
+        if key == 'streams' and raw[pos:pos + 1] == b'{':
+            return _scan_object(raw, pos, read_streams)
+        return _read_value(raw, pos)
+
+    try:
+        header, _ = _scan_object(raw, _skip(raw, 0), read_top)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise BackupFormatError(f"백업 JSON 해석 실패: {e}") from e
+    return header
+
+
+def backup_header(raw):
+    """메타데이터 + 스트림별 포인트 수 + 파일 크기 (캐시에 저장하는 형태)"""
+    if len(raw) < FULL_PARSE_BYTES:
+        data = json.loads(raw)
+        streams = {name: {'points': len(stream.get('data', []))}
+                   for name, stream in (data.get('streams') or {}).items() if isinstance(stream, dict)}
+    else:
+        data = scan_backup(raw)
+        streams = data.get('streams') or {}
+    activity = data.get('activity') or {}
+    return {
+        'file_size': len(raw),
+        'activity': {key: activity[key] for key in ACTIVITY_FIELDS if key in activity},
+        'streams': {name: stream.get('points', 0) for name, stream in streams.items()
+                    if isinstance(stream, dict)},
+    }
+
+
+_header_cache = None
+
+
+def get_header_cache():
+    """기본 헤더 캐시 (프로세스당 한 번 로드)"""
+    global _header_cache
+    if _header_cache is None:
+        from src.reconciliation import SummaryCache  # reconciliation이 이 모듈을 import
+        _header_cache = SummaryCache(HEADER_CACHE_FILE, restore=dict)
+    return _header_cache
+
+
+def read_header(path, cache=None):
+    """
+    백업 파일 헤더 (원본이 있으면 캐시 사용, 없으면 아카이브에서 읽어 계산)
+
+    Args:
+        cache: SummaryCache (None이면 기본 캐시에서 읽고 새 헤더는 바로 저장,
+               False면 캐시 사용 안 함, 직접 넘긴 캐시는 호출한 쪽에서 save)
+    """
+    path = Path(path)
+    save = cache is None
+    if save:
+        cache = get_header_cache()
+    if cache is False or not path.exists():
+        return backup_header(open_activity(path))
+    misses = cache.misses
+    header = cache.summary(path, lambda p: backup_header(p.read_bytes()))
+    if save and cache.misses != misses:
+        cache.save()
+    if header is None:
+        raise BackupFormatError(f"헤더를 읽을 수 없음: {path.name}")
+    return header
@@ -0,0 +1,55 @@
+"""
+실패 진단 자료 관리
+
+- 실패 스크린샷/Playwright trace를 screenshot/failures/에 시각별 파일명으로 저장
+  (같은 파일을 덮어쓰지 않아 여러 번의 실패 기록이 남음)
+- 개수(DIAGNOSTICS_MAX_FILES, 기본 20)와 전체 크기(DIAGNOSTICS_MAX_MB, 기본 100MB)를 넘으면
+  가장 오래된 파일부터 삭제 (링 버퍼)
+- MYWHOOSH_DIAGNOSTICS=1이면 브라우저 세션 동안 trace(DOM 스냅샷, 네트워크, 타이밍)를 기록하고
+  단계가 실패했을 때만 저장 (정상 실행에서는 파일을 쓰지 않음)
+"""
+import os
+from datetime import datetime
+from pathlib import Path
+
+
+def diagnostics_enabled():
+    """trace 기록 사용 여부 (환경 변수)"""
+    return os.getenv('MYWHOOSH_DIAGNOSTICS') == '1'
+
+
+class ArtifactRingBuffer:
+    """개수/크기 제한이 있는 진단 파일 보관소"""
+
+    def __init__(self, directory, max_files=None, max_bytes=None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_files = max_files or int(os.getenv('DIAGNOSTICS_MAX_FILES', '20'))
+        self.max_bytes = max_bytes or int(os.getenv('DIAGNOSTICS_MAX_MB', '100')) * 1024 * 1024
+
+    def path_for(self, name, suffix):
+        """새 진단 파일 경로 (시각순 정렬되는 고유 이름)"""
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        return self.directory / f"{timestamp}_{name}{suffix}"
+
+    def entries(self):
+        """보관 중인 파일 (오래된 순)"""
+        return sorted(p for p in self.directory.iterdir() if p.is_file())
+
+    def prune(self):
+        """
+        제한을 넘으면 오래된 파일부터 삭제
+
+        Returns:
+            int: 삭제한 파일 수
+        """
+        entries = self.entries()
+        total = sum(p.stat().st_size for p in entries)
+        removed = 0
+        # 방금 저장한 가장 최근 파일은 크기 제한을 넘더라도 남김
+        while len(entries) > 1 and (len(entries) > self.max_files or total > self.max_bytes):
+            oldest = entries.pop(0)
+            total -= oldest.stat().st_size
+            oldest.unlink(missing_ok=True)
+            removed += 1
+        return removed
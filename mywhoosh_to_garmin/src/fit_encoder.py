@@ -0,0 +1,246 @@
+"""
+FIT 파일 인코더 (최소 구현)
+
+합성 FIT 파일 생성, CRC 계산, 기존 파일에 메시지 추가에 사용합니다.
+필요한 메시지(file_id, record, event, lap, session, activity)만 지원합니다.
+"""
+import struct
+from datetime import datetime, timezone
+from pathlib import Path
+
+# FIT 시간 기준점 (1989-12-31 00:00:00 UTC)
+FIT_EPOCH_OFFSET = 631065600
+
+FIT_HEADER_SIZE = 14
+FIT_PROTOCOL_VERSION = 0x20
+FIT_PROFILE_VERSION = 2132
+
+# 베이스 타입: 이름 → (타입 코드, struct 포맷, invalid 값)
+BASE_TYPES = {
+    'enum': (0x00, 'B', 0xFF),
+    'sint8': (0x01, 'b', 0x7F),
+    'uint8': (0x02, 'B', 0xFF),
+    'sint16': (0x83, 'h', 0x7FFF),
+    'uint16': (0x84, 'H', 0xFFFF),
+    'sint32': (0x85, 'i', 0x7FFFFFFF),
+    'uint32': (0x86, 'I', 0xFFFFFFFF),
+    'uint32z': (0x8C, 'I', 0x00000000),
+}
+
+# 메시지 번호
+MESG_NUMS = {
+    'file_id': 0,
+    'session': 18,
+    'lap': 19,
+    'record': 20,
+    'event': 21,
+    'activity': 34,
+}
+
+# 메시지별 필드: 이름 → (필드 번호, 베이스 타입, scale, offset)
+MESG_FIELDS = {
+    'file_id': {
+        'type': (0, 'enum', 1, 0),
+        'manufacturer': (1, 'uint16', 1, 0),
+        'product': (2, 'uint16', 1, 0),
+        'serial_number': (3, 'uint32z', 1, 0),
+        'time_created': (4, 'uint32', 1, 0),
+    },
+    'record': {
+        'timestamp': (253, 'uint32', 1, 0),
+        'position_lat': (0, 'sint32', 1, 0),
+        'position_long': (1, 'sint32', 1, 0),
+        'altitude': (2, 'uint16', 5, 500),
+        'heart_rate': (3, 'uint8', 1, 0),
+        'cadence': (4, 'uint8', 1, 0),
+        'distance': (5, 'uint32', 100, 0),
+        'speed': (6, 'uint16', 1000, 0),
+        'power': (7, 'uint16', 1, 0),
+        'temperature': (13, 'sint8', 1, 0),
+    },
+    'event': {
+        'timestamp': (253, 'uint32', 1, 0),
+        'event': (0, 'enum', 1, 0),
+        'event_type': (1, 'enum', 1, 0),
+    },
+    'lap': {
+        'timestamp': (253, 'uint32', 1, 0),
+        'message_index': (254, 'uint16', 1, 0),
+        'event': (0, 'enum', 1, 0),
+        'event_type': (1, 'enum', 1, 0),
+        'start_time': (2, 'uint32', 1, 0),
+        'total_elapsed_time': (7, 'uint32', 1000, 0),
+        'total_timer_time': (8, 'uint32', 1000, 0),
+        'total_distance': (9, 'uint32', 100, 0),
+        'avg_heart_rate': (15, 'uint8', 1, 0),
+        'max_heart_rate': (16, 'uint8', 1, 0),
+        'avg_cadence': (17, 'uint8', 1, 0),
+        'avg_power': (19, 'uint16', 1, 0),
+        'max_power': (20, 'uint16', 1, 0),
+        'intensity': (23, 'enum', 1, 0),
+        'lap_trigger': (24, 'enum', 1, 0),
+        'sport': (25, 'enum', 1, 0),
+    },
+    'session': {
+        'timestamp': (253, 'uint32', 1, 0),
+        'event': (0, 'enum', 1, 0),
+        'event_type': (1, 'enum', 1, 0),
+        'start_time': (2, 'uint32', 1, 0),
+        'sport': (5, 'enum', 1, 0),
+        'sub_sport': (6, 'enum', 1, 0),
+        'total_elapsed_time': (7, 'uint32', 1000, 0),
+        'total_timer_time': (8, 'uint32', 1000, 0),
+        'total_distance': (9, 'uint32', 100, 0),
+        'avg_speed': (14, 'uint16', 1000, 0),
+        'avg_heart_rate': (16, 'uint8', 1, 0),
+        'max_heart_rate': (17, 'uint8', 1, 0),
+        'avg_cadence': (18, 'uint8', 1, 0),
+        'avg_power': (20, 'uint16', 1, 0),
+        'max_power': (21, 'uint16', 1, 0),
+        'first_lap_index': (25, 'uint16', 1, 0),
+        'num_laps': (26, 'uint16', 1, 0),
+    },
+    'activity': {
+        'timestamp': (253, 'uint32', 1, 0),
+        'total_timer_time': (0, 'uint32', 1000, 0),
+        'num_sessions': (1, 'uint16', 1, 0),
+        'type': (2, 'enum', 1, 0),
+        'event': (3, 'enum', 1, 0),
+        'event_type': (4, 'enum', 1, 0),
+    },
+}
+
+# 자주 쓰는 enum 값 (이름으로도 지정할 수 있도록)
+ENUM_VALUES = {
+    'sport': {'generic': 0, 'cycling': 2},
+    'sub_sport': {'generic': 0, 'indoor_cycling': 6, 'road': 7, 'virtual_activity': 58},
+    'event': {'timer': 0, 'session': 8, 'lap': 9, 'activity': 26},
+    'event_type': {'start': 0, 'stop': 1, 'marker': 3, 'stop_all': 4},
+    'intensity': {'active': 0, 'rest': 1, 'warmup': 2, 'cooldown': 3},
+    'lap_trigger': {'manual': 0, 'time': 1, 'session_end': 7},
+}
+
+def _make_crc_table():
+    """CRC-16 (다항식 0xA001) 바이트 단위 테이블"""
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+        table.append(crc)
+    return tuple(table)
+
+
+_CRC_TABLE = _make_crc_table()
+
+
+def fit_crc(data, crc=0):
+    """FIT CRC-16 계산"""
+    table = _CRC_TABLE
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc
+
+
+def to_fit_timestamp(value):
+    """datetime 또는 Unix 타임스탬프를 FIT 타임스탬프로 변환"""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        value = value.timestamp()
+    return int(value) - FIT_EPOCH_OFFSET
+
+
+def from_fit_timestamp(value):
+    """FIT 타임스탬프를 UTC datetime으로 변환"""
+    return datetime.fromtimestamp(value + FIT_EPOCH_OFFSET, tz=timezone.utc)
+
+
+def build_header(data_size):
+    """14바이트 FIT 헤더 생성 (헤더 CRC 포함)"""
+    header = struct.pack('<BBHI4s', FIT_HEADER_SIZE, FIT_PROTOCOL_VERSION,
+                         FIT_PROFILE_VERSION, data_size, b'.FIT')
+    return header + struct.pack('<H', fit_crc(header))
+
+
+class FitEncoder:
+    """FIT 메시지를 순서대로 기록하여 파일로 저장"""
+
+    def __init__(self, body=b''):
+        self.body = bytearray(body)
+        self._local_types = {}   # (메시지, 필드 목록) → 로컬 타입
+        self._next_local = 0
+
+    @classmethod
+    def from_file(cls, path):
+        """기존 FIT 파일의 데이터 레코드에 이어서 기록"""
+        raw = Path(path).read_bytes()
+        header_size = raw[0]
+        data_size = struct.unpack('<I', raw[4:8])[0]
+        return cls(raw[header_size:header_size + data_size])
+
+    def write(self, mesg_name, values):
+        """
+        메시지 하나 기록
+
+        values는 물리 단위 값(scale/offset 적용 전)입니다.
+        None 값은 기록하지 않습니다.
+        """
+        spec = MESG_FIELDS[mesg_name]
+        fields = tuple(name for name in spec if values.get(name) is not None)
+        local_type = self._define(mesg_name, fields)
+
+        data = bytearray([local_type])
+        for name in fields:
+            _, base_type, scale, offset = spec[name]
+            _, fmt, invalid = BASE_TYPES[base_type]
+            raw = self._encode_value(name, values[name], scale, offset, invalid)
+            data += struct.pack('<' + fmt, raw)
+        self.body += data
+
+    def _define(self, mesg_name, fields):
+        """필요하면 정의 메시지를 기록하고 로컬 타입 반환"""
+        key = (mesg_name, fields)
+        if key in self._local_types:
+            return self._local_types[key]
+
+        # 로컬 타입 0~15 순환 사용 (재사용되는 타입의 기존 정의는 제거)
+        local_type = self._next_local
+        self._next_local = (self._next_local + 1) % 16
+        for old_key, old_type in list(self._local_types.items()):
+            if old_type == local_type:
+                del self._local_types[old_key]
+
+        spec = MESG_FIELDS[mesg_name]
+        definition = bytearray([0x40 | local_type, 0, 0])
+        definition += struct.pack('<HB', MESG_NUMS[mesg_name], len(fields))
+        for name in fields:
+            field_num, base_type, _, _ = spec[name]
+            type_code, fmt, _ = BASE_TYPES[base_type]
+            definition += bytes([field_num, struct.calcsize(fmt), type_code])
+        self.body += definition
+
+        self._local_types[key] = local_type
+        return local_type
+
+    @staticmethod
+    def _encode_value(name, value, scale, offset, invalid):
+        """물리 값을 FIT 원시 값으로 변환"""
+        if name in ENUM_VALUES and isinstance(value, str):
+            return ENUM_VALUES[name][value]
+        if name in ('timestamp', 'start_time', 'time_created'):
+            return to_fit_timestamp(value)
+        raw = int(round((value + offset) * scale))
+        if raw < 0 and invalid in (0xFF, 0xFFFF, 0xFFFFFFFF):
+            return invalid
+        return raw
+
+    def to_bytes(self):
+        """헤더 + 데이터 + 파일 CRC"""
+        content = build_header(len(self.body)) + bytes(self.body)
+        return content + struct.pack('<H', fit_crc(content))
+
+    def save(self, path):
+        """FIT 파일로 저장"""
+        Path(path).write_bytes(self.to_bytes())
+        return path
@@ -0,0 +1,173 @@
+"""
+FIT 파일 스트리밍 리더 (최소 구현)
+
+메시지를 하나씩 읽어 넘기며, 전체 메시지 목록을 만들지 않습니다.
+각 메시지에서는 timestamp와 요청한 필드만 해석하므로 fitparse보다 훨씬 가볍습니다.
+(검증/요약처럼 구조만 필요한 곳에 사용, 상세 분석은 fitparse 사용)
+"""
+import struct
+from collections import namedtuple
+
+from src.fit_encoder import fit_crc
+
+TIMESTAMP_FIELD = 253
+
+# 베이스 타입 번호(하위 5비트) → (struct 포맷, invalid 값)
+_BASE_TYPE_FORMATS = {
+    0: ('B', 0xFF), 1: ('b', 0x7F), 2: ('B', 0xFF),
+    3: ('h', 0x7FFF), 4: ('H', 0xFFFF), 5: ('i', 0x7FFFFFFF), 6: ('I', 0xFFFFFFFF),
+    8: ('f', None), 9: ('d', None),
+    10: ('B', 0x00), 11: ('H', 0x0000), 12: ('I', 0x00000000),
+    14: ('q', 0x7FFFFFFFFFFFFFFF), 15: ('Q', 0xFFFFFFFFFFFFFFFF), 16: ('Q', 0),
+}
+
+FitHeader = namedtuple('FitHeader', 'header_size protocol_version profile_version data_size signature header_crc')
+
+# offset/size: 파일 내 위치와 길이(헤더 바이트 포함)
+# mesg_num: 전역 메시지 번호 (정의 메시지는 None)
+# fields: {필드 번호: 값} (timestamp + 요청한 필드만, invalid 값은 제외)
+FitMessage = namedtuple('FitMessage', 'offset size mesg_num local_type timestamp fields')
+
+
+class FitFormatError(Exception):
+    """FIT 구조 오류 (offset: 문제가 시작된 위치)"""
+
+    def __init__(self, message, offset=None):
+        super().__init__(message)
+        self.offset = offset
+
+
+class FitTruncatedError(FitFormatError):
+    """메시지 중간에서 데이터가 끝남"""
+
+
+def read_header(raw):
+    """FIT 헤더 해석 (12 또는 14바이트)"""
+    if len(raw) < 12:
+        raise FitFormatError(f"파일이 너무 짧음 ({len(raw)} bytes)", 0)
+    header_size = raw[0]
+    if header_size not in (12, 14) or len(raw) < header_size:
+        raise FitFormatError(f"잘못된 헤더 크기: {header_size}", 0)
+    protocol_version, profile_version, data_size, signature = struct.unpack_from('<BHI4s', raw, 1)
+    header_crc = struct.unpack_from('<H', raw, 12)[0] if header_size == 14 else None
+    return FitHeader(header_size, protocol_version, profile_version, data_size, signature, header_crc)
+
+
+def header_crc_ok(raw, header):
+    """헤더 CRC 확인 (CRC가 없거나 0이면 통과)"""
+    if not header.header_crc:
+        return True
+    return fit_crc(raw[:12]) == header.header_crc
+
+
+class _Definition:
+    """정의 메시지에서 만든 데이터 메시지 해석 정보"""
+
+    __slots__ = ('mesg_num', 'size', 'decoders')
+
+    def __init__(self, mesg_num, size, decoders):
+        self.mesg_num = mesg_num
+        self.size = size
+        self.decoders = decoders   # [(필드 번호, 위치, struct, invalid)]
+
+
+def _parse_definition(raw, pos, end, wanted):
+    """정의 메시지 해석 → (_Definition, 다음 위치)"""
+    has_dev_fields = raw[pos] & 0x20
+    if pos + 6 > end:
+        raise FitTruncatedError("정의 메시지가 잘림", pos)
+    architecture = raw[pos + 2]
+    endian = '>' if architecture == 1 else '<'
+    mesg_num = struct.unpack_from(endian + 'H', raw, pos + 3)[0]
+    num_fields = raw[pos + 5]
+    cursor = pos + 6
+    if cursor + num_fields * 3 > end:
+        raise FitTruncatedError("정의 메시지가 잘림", pos)
+
+    wanted_fields = wanted.get(mesg_num, ())
+    decoders = []
+    size = 0
+    for i in range(num_fields):
+        field_num, field_size, base_type = raw[cursor + i * 3:cursor + i * 3 + 3]
+        if field_num == TIMESTAMP_FIELD or field_num in wanted_fields:
+            fmt, invalid = _BASE_TYPE_FORMATS.get(base_type & 0x1F, (None, None))
+            if fmt and struct.calcsize(fmt) == field_size:
+                decoders.append((field_num, size, struct.Struct(endian + fmt), invalid))
+        size += field_size
+    cursor += num_fields * 3
+
+    if has_dev_fields:
+        if cursor + 1 > end:
+            raise FitTruncatedError("정의 메시지가 잘림", pos)
+        num_dev_fields = raw[cursor]
+        cursor += 1
+        if cursor + num_dev_fields * 3 > end:
+            raise FitTruncatedError("정의 메시지가 잘림", pos)
+        size += sum(raw[cursor + i * 3 + 1] for i in range(num_dev_fields))
+        cursor += num_dev_fields * 3
+
+    return _Definition(mesg_num, size, decoders), cursor
+
+
+def iter_messages(raw, fields=None, include_definitions=False, data_end=None):
+    """
+    FIT 데이터 레코드를 순서대로 읽기
+
+    Args:
+        raw: 파일 전체 바이트
+        fields: {메시지 번호: {필드 번호, ...}} 추가로 해석할 필드 (timestamp는 항상 해석)
+        include_definitions: 정의 메시지도 넘길지
+        data_end: 읽기를 끝낼 위치 (헤더의 data_size를 믿을 수 없을 때 지정)
+
+    기본적으로 헤더의 data_size와 실제 파일 크기 중 작은 쪽까지 읽으며,
+    메시지 중간에서 끝나면 FitTruncatedError(offset=잘린 메시지 시작 위치)를 발생시킵니다.
+    """
+    header = read_header(raw)
+    wanted = fields or {}
+    pos = header.header_size
+    end = min(data_end or header.header_size + header.data_size, len(raw))
+    definitions = {}
+    last_timestamp = None
+
+    while pos < end:
+        record_header = raw[pos]
+
+        if record_header & 0x80:
+            # 압축 타임스탬프 헤더 (로컬 타입 0~3, 5비트 시간 오프셋)
+            local_type = (record_header >> 5) & 0x03
+            time_offset = record_header & 0x1F
+            if last_timestamp is None:
+                raise FitFormatError("기준 timestamp 없이 압축 타임스탬프 사용", pos)
+            timestamp = (last_timestamp & ~0x1F) + time_offset
+            if time_offset < (last_timestamp & 0x1F):
+                timestamp += 0x20
+        elif record_header & 0x40:
+            definition, next_pos = _parse_definition(raw, pos, end, wanted)
+            definitions[record_header & 0x0F] = definition
+            if include_definitions:
+                yield FitMessage(pos, next_pos - pos, None, record_header & 0x0F, None, None)
+            pos = next_pos
+            continue
+        else:
+            local_type = record_header & 0x0F
+            timestamp = None
+
+        definition = definitions.get(local_type)
+        if definition is None:
+            raise FitFormatError(f"정의되지 않은 로컬 타입 {local_type}", pos)
+        size = 1 + definition.size
+        if pos + size > end:
+            raise FitTruncatedError("데이터 메시지가 잘림", pos)
+
+        values = {}
+        for field_num, field_pos, unpacker, invalid in definition.decoders:
+            value = unpacker.unpack_from(raw, pos + 1 + field_pos)[0]
+            if value != invalid:
+                values[field_num] = value
+        if TIMESTAMP_FIELD in values:
+            timestamp = values[TIMESTAMP_FIELD]
+        if timestamp is not None:
+            last_timestamp = timestamp
+
+        yield FitMessage(pos, size, definition.mesg_num, local_type, timestamp, values)
+        pos += size
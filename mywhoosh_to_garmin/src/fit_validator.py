@@ -0,0 +1,214 @@
+"""
+업로드 전 FIT 파일 검증/복구
+
+Garmin에 올리기 전에 로컬에서 빠르게 확인합니다 (fit_reader로 스트리밍, 메시지 목록을 만들지 않음).
+- 헤더: 크기, '.FIT' 시그니처, 헤더 CRC
+- 파일 크기와 파일 CRC
+- 메시지 구조 (잘린 메시지, 정의되지 않은 로컬 타입)
+- record timestamp 단조 증가
+- session / activity 메시지 존재
+
+다운로드가 중간에 끊긴 파일처럼 흔한 잘림은 마지막 완전한 메시지까지 자른 뒤
+빠진 lap/session/activity를 record로부터 만들어 붙이고 헤더와 CRC를 다시 씁니다.
+"""
+import os
+import struct
+from collections import Counter
+from pathlib import Path
+
+from src.fit_encoder import FitEncoder, MESG_NUMS, fit_crc, from_fit_timestamp
+from src.fit_reader import FitFormatError, FitTruncatedError, header_crc_ok, iter_messages, read_header
+
+RECORD = MESG_NUMS['record']
+LAP = MESG_NUMS['lap']
+SESSION = MESG_NUMS['session']
+ACTIVITY = MESG_NUMS['activity']
+RECORD_DISTANCE_FIELD = 5
+
+# 복구로 해결할 수 있는 오류
+REPAIRABLE = {'header_crc', 'truncated', 'no_session', 'no_activity'}
+
+
+class ValidationResult:
+    """검증 결과"""
+
+    def __init__(self):
+        self.errors = []      # [(오류 코드, 설명)]
+        self.warnings = []
+        self.counts = Counter()
+        self.first_timestamp = None
+        self.last_timestamp = None
+        self.last_distance = None
+        self.header_size = None
+        self.last_complete_offset = None   # 마지막으로 완전한 메시지의 끝 위치
+        self.repaired = False
+
+    def error(self, code, message):
+        self.errors.append((code, message))
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    @property
+    def repairable(self):
+        """모든 오류가 복구 가능하고, 복구에 쓸 record가 있는지"""
+        return bool(self.errors) and self.counts[RECORD] > 0 and \
+            all(code in REPAIRABLE for code, _ in self.errors)
+
+    def describe(self):
+        """오류 요약 문자열"""
+        return '; '.join(message for _, message in self.errors)
+
+
+def validate_bytes(raw):
+    """FIT 바이트 검증"""
+    result = ValidationResult()
+
+    try:
+        header = read_header(raw)
+    except FitFormatError as e:
+        result.error('header', str(e))
+        return result
+    if header.signature != b'.FIT':
+        result.error('header', "'.FIT' 시그니처 없음")
+        return result
+    if not header_crc_ok(raw, header):
+        result.error('header_crc', "헤더 CRC 불일치")
+    result.header_size = header.header_size
+
+    data_end = header.header_size + header.data_size
+    if header.data_size == 0 or len(raw) < data_end + 2:
+        # 남아 있는 데이터를 끝까지 읽어 마지막 완전한 메시지 위치를 찾음
+        result.error('truncated', f"파일이 잘림 (헤더 기준 {data_end + 2:,} bytes, 실제 {len(raw):,} bytes)")
+        scan_end = len(raw)
+    else:
+        if len(raw) > data_end + 2:
+            result.warnings.append(f"파일 끝에 불필요한 데이터 {len(raw) - data_end - 2:,} bytes")
+        file_crc = struct.unpack_from('<H', raw, data_end)[0]
+        if fit_crc(raw[:data_end]) != file_crc:
+            result.error('crc', "파일 CRC 불일치 (데이터 손상)")
+        scan_end = data_end
+
+    _scan_messages(raw, scan_end, result)
+
+    if result.counts[RECORD] == 0:
+        result.error('no_records', "record 메시지 없음")
+    if result.counts[SESSION] == 0:
+        result.error('no_session', "session 메시지 없음")
+    if result.counts[ACTIVITY] == 0:
+        result.error('no_activity', "activity 메시지 없음")
+
+    return result
+
+
+def _scan_messages(raw, scan_end, result):
+    """메시지를 스트리밍으로 읽으며 개수/시간 범위/timestamp 역행 확인"""
+    counts = result.counts
+    last_complete = result.header_size
+    previous = None
+    backwards = 0
+    truncated = any(code == 'truncated' for code, _ in result.errors)
+
+    try:
+        for message in iter_messages(raw, fields={RECORD: {RECORD_DISTANCE_FIELD}},
+                                     include_definitions=True, data_end=scan_end):
+            last_complete = message.offset + message.size
+            if message.mesg_num is None:
+                continue
+            counts[message.mesg_num] += 1
+            if message.mesg_num != RECORD or message.timestamp is None:
+                continue
+
+            if previous is not None and message.timestamp < previous:
+                backwards += 1
+            previous = message.timestamp
+            if result.first_timestamp is None:
+                result.first_timestamp = message.timestamp
+            result.last_timestamp = max(result.last_timestamp or 0, message.timestamp)
+            distance = message.fields.get(RECORD_DISTANCE_FIELD)
+            if distance is not None:
+                result.last_distance = distance / 100
+    except FitTruncatedError as e:
+        if not truncated:
+            # 헤더 크기는 맞지만 메시지 중간에서 데이터 영역이 끝남
+            result.error('structure', f"{e.offset:,}번째 바이트에서 메시지가 잘림")
+    except FitFormatError as e:
+        if truncated:
+            # 잘린 파일에서 CRC 등 끝부분을 메시지로 읽은 경우: 그 앞까지만 사용
+            pass
+        else:
+            result.error('structure', f"메시지 구조 오류 ({e.offset:,}번째 바이트): {e}")
+
+    result.last_complete_offset = last_complete
+    if backwards:
+        result.error('timestamps', f"record timestamp 역행 {backwards}회")
+
+
+def repair_bytes(raw, result):
+    """
+    잘린 파일 복구
+
+    마지막 완전한 메시지까지 자르고, 없는 lap/session/activity를 record 범위로 만들어
+    붙인 뒤 헤더(데이터 크기, CRC)와 파일 CRC를 새로 씁니다.
+    """
+    body = raw[result.header_size:result.last_complete_offset]
+    encoder = FitEncoder(body)
+
+    start = from_fit_timestamp(result.first_timestamp)
+    end = from_fit_timestamp(result.last_timestamp)
+    elapsed = result.last_timestamp - result.first_timestamp
+    summary = {
+        'timestamp': end,
+        'start_time': start,
+        'total_elapsed_time': elapsed,
+        'total_timer_time': elapsed,
+        'total_distance': result.last_distance,
+    }
+
+    if result.counts[SESSION] == 0:
+        encoder.write('event', {'timestamp': end, 'event': 'timer', 'event_type': 'stop_all'})
+        if result.counts[LAP] == 0:
+            encoder.write('lap', dict(summary, message_index=0, event='lap', event_type='stop',
+                                      lap_trigger='session_end', sport='cycling'))
+        encoder.write('session', dict(summary, event='session', event_type='stop',
+                                      sport='cycling', sub_sport='virtual_activity',
+                                      first_lap_index=0, num_laps=max(result.counts[LAP], 1)))
+    if result.counts[ACTIVITY] == 0:
+        encoder.write('activity', {'timestamp': end, 'total_timer_time': elapsed,
+                                   'num_sessions': max(result.counts[SESSION], 1),
+                                   'type': 0, 'event': 'activity', 'event_type': 'stop'})
+
+    return encoder.to_bytes()
+
+
+def validate_file(path):
+    """FIT 파일 검증"""
+    return validate_bytes(Path(path).read_bytes())
+
+
+def prepare_for_upload(path):
+    """
+    업로드 전 검증, 복구 가능하면 파일을 복구본으로 교체
+
+    Returns:
+        ValidationResult: 최종 결과 (복구했다면 repaired=True, 복구본 기준 검증 결과)
+    """
+    path = Path(path)
+    raw = path.read_bytes()
+    result = validate_bytes(raw)
+    if result.ok or not result.repairable:
+        return result
+
+    repaired = repair_bytes(raw, result)
+    repaired_result = validate_bytes(repaired)
+    if not repaired_result.ok:
+        return result
+
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_bytes(repaired)
+    os.replace(tmp_path, path)
+
+    repaired_result.repaired = True
+    repaired_result.warnings.append(f"복구됨: {result.describe()}")
+    return repaired_result
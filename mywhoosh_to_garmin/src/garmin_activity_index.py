@@ -0,0 +1,214 @@
+"""
+Garmin Connect 활동 인덱스 (중복 업로드 사전 차단)
+
+동기화 기간의 Garmin 활동 목록을 페이지 단위로 한 번에 받아
+(시작 시각, 경과 시간) 기준 인덱스를 만들고 data/garmin_activity_index.json에 캐시합니다.
+이미 Garmin에 있는 활동은 업로드(→ 409 응답) 왕복 없이 바로 건너뜁니다.
+
+캐시 유효 시간: GARMIN_INDEX_TTL_MINUTES (기본 60분)
+"""
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from src.fit_encoder import FIT_EPOCH_OFFSET, MESG_NUMS
+from src.fit_reader import FitFormatError, iter_messages
+
+# 같은 활동으로 볼 허용 오차
+START_TOLERANCE = 60          # 초
+DURATION_TOLERANCE = 60       # 초 (또는 경과 시간의 2% 중 큰 값)
+
+SESSION_START_TIME_FIELD = 2
+SESSION_SPORT_FIELD = 5
+SESSION_ELAPSED_TIME_FIELD = 7
+
+
+def fit_session_summary(file_path):
+    """
+    FIT 파일의 시작 시각(Unix), 경과 시간(초), 종목(FIT sport 값)
+
+    session 메시지를 우선 사용하고, 없으면 record timestamp 범위를 사용합니다 (이때 종목은 None).
+
+    Returns:
+        tuple or None: (start, duration, sport)
+    """
+    raw = Path(file_path).read_bytes()
+    session = MESG_NUMS['session']
+    wanted = {SESSION_START_TIME_FIELD, SESSION_SPORT_FIELD, SESSION_ELAPSED_TIME_FIELD}
+    first = last = None
+    try:
+        for message in iter_messages(raw, fields={session: wanted}):
+            if message.mesg_num == session and SESSION_START_TIME_FIELD in message.fields:
+                start = message.fields[SESSION_START_TIME_FIELD] + FIT_EPOCH_OFFSET
+                elapsed = message.fields.get(SESSION_ELAPSED_TIME_FIELD)
+                if elapsed is not None:
+                    return start, elapsed / 1000, message.fields.get(SESSION_SPORT_FIELD)
+            if message.mesg_num == MESG_NUMS['record'] and message.timestamp is not None:
+                first = message.timestamp if first is None else first
+                last = message.timestamp
+    except FitFormatError:
+        pass
+
+    if first is None:
+        return None
+    return first + FIT_EPOCH_OFFSET, last - first, None
+
+
+def fit_start_and_duration(file_path):
+    """
+    FIT 파일의 시작 시각(Unix)과 경과 시간(초)
+
+    Returns:
+        tuple or None: (start, duration)
+    """
+    summary = fit_session_summary(file_path)
+    return summary[:2] if summary else None
+
+
+def is_same_activity(start, duration, other_start, other_duration):
+    """시작 시각/경과 시간이 허용 오차 안인지"""
+    return abs(other_start - start) <= START_TOLERANCE and \
+        abs(other_duration - duration) <= max(DURATION_TOLERANCE, duration * 0.02)
+
+
+def garmin_activity_summary(activity):
+    """Garmin 활동 목록 항목 → (시작 Unix 시각, 경과 시간, 활동 ID, activityType.typeKey)"""
+    start_gmt = activity.get('startTimeGMT')
+    if not start_gmt:
+        return None
+    start = datetime.strptime(start_gmt, '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
+    duration = activity.get('elapsedDuration') or activity.get('duration') or 0
+    type_key = (activity.get('activityType') or {}).get('typeKey')
+    return start.timestamp(), float(duration), activity.get('activityId'), type_key
+
+
+def parse_garmin_activity(activity):
+    """Garmin 활동 목록 항목 → (시작 Unix 시각, 경과 시간, 활동 ID)"""
+    summary = garmin_activity_summary(activity)
+    return summary[:3] if summary else None
+
+
+class GarminActivityIndex:
+    """Garmin 활동 목록 인덱스 (시작 시각 분 단위 버킷)"""
+
+    def __init__(self, data_dir=None, days=30, ttl_minutes=None):
+        self.data_dir = Path(data_dir) if data_dir else Path(__file__).parent.parent / "data"
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_file = self.data_dir / "garmin_activity_index.json"
+        self.days = days
+        self.ttl = timedelta(minutes=ttl_minutes or int(os.getenv('GARMIN_INDEX_TTL_MINUTES', '60')))
+        self.fetched_at = None
+        self.window_start = None
+        self._entries = []
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._load_cache()
+
+    def _load_cache(self):
+        """캐시 파일 로드"""
+        if not self.cache_file.exists():
+            return
+        with open(self.cache_file, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        self.fetched_at = datetime.fromisoformat(cache['fetched_at'])
+        self.window_start = datetime.fromisoformat(cache['window_start'])
+        self._set_entries(tuple(entry) for entry in cache['activities'])
+
+    def _save_cache(self):
+        """캐시 파일 저장 (임시 파일 → 교체)"""
+        tmp_file = self.cache_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'fetched_at': self.fetched_at.isoformat(),
+                'window_start': self.window_start.isoformat(),
+                'activities': self._entries,
+            }, f)
+        os.replace(tmp_file, self.cache_file)
+
+    def _set_entries(self, entries):
+        """인덱스 재구성"""
+        self._entries = []
+        self._buckets = {}
+        for entry in entries:
+            self._add_entry(entry)
+
+    def _add_entry(self, entry):
+        """항목 1개를 분 단위 버킷에 추가"""
+        self._entries.append(list(entry))
+        self._buckets.setdefault(int(entry[0] // 60), []).append(entry)
+
+    def is_fresh(self, now=None):
+        """캐시가 유효 시간 안이고 동기화 기간 전체를 포함하는지"""
+        now = now or datetime.now()
+        return self.fetched_at is not None and now - self.fetched_at < self.ttl \
+            and self.window_start <= now - timedelta(days=self.days)
+
+    def refresh(self, garmin, now=None, page_size=100):
+        """
+        Garmin 활동 목록을 최신순으로 페이지 단위 조회하여 인덱스 재구성
+
+        동기화 기간보다 오래된 활동이 나오면 조회를 멈춥니다.
+
+        Returns:
+            int: 인덱스 항목 수
+        """
+        now = now or datetime.now()
+        window_start = now - timedelta(days=self.days)
+        cutoff = window_start.timestamp() - 86400  # 시간대 차이 여유
+
+        entries = []
+        start = 0
+        while True:
+            batch = garmin.get_activities(start, page_size) or []
+            parsed = [p for p in (parse_garmin_activity(a) for a in batch) if p]
+            entries.extend(p for p in parsed if p[0] >= cutoff)
+            if len(batch) < page_size or (parsed and parsed[-1][0] < cutoff):
+                break
+            start += page_size
+
+        with self._lock:
+            self._set_entries(entries)
+            self.fetched_at = now
+            self.window_start = window_start
+            self._save_cache()
+        return len(entries)
+
+    def ensure_fresh(self, garmin):
+        """캐시가 오래되었으면 다시 조회 (여러 스레드에서 불러도 한 번만 조회)"""
+        with self._refresh_lock:
+            if not self.is_fresh():
+                count = self.refresh(garmin)
+                print(f"  Garmin 활동 인덱스 갱신: 최근 {self.days}일 활동 {count}개")
+
+    def find(self, start, duration):
+        """
+        시작 시각/경과 시간이 허용 오차 안인 Garmin 활동 ID
+
+        Returns:
+            int, True or None: 활동 ID (방금 업로드해 ID를 모르면 True, 없으면 None)
+        """
+        bucket = int(start // 60)
+        with self._lock:
+            for key in (bucket - 1, bucket, bucket + 1):
+                for entry_start, entry_duration, activity_id in self._buckets.get(key, ()):
+                    if is_same_activity(start, duration, entry_start, entry_duration):
+                        return activity_id or True
+        return None
+
+    def find_file(self, file_path):
+        """FIT 파일과 같은 Garmin 활동 ID (없거나 알 수 없으면 None)"""
+        summary = fit_start_and_duration(file_path)
+        return self.find(*summary) if summary else None
+
+    def add_file(self, file_path, activity_id=None):
+        """업로드한 파일을 인덱스에 추가 (캐시가 있을 때만 저장)"""
+        summary = fit_start_and_duration(file_path)
+        if not summary:
+            return
+        with self._lock:
+            self._add_entry((summary[0], summary[1], activity_id))
+            if self.fetched_at is not None:
+                self._save_cache()
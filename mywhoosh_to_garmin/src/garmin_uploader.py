@@ -1,60 +1,152 @@
 """
 Garmin Connect 업로더
 """
-from garminconnect import Garmin
+from pathlib import Path
+from garminconnect import (
+    Garmin,
+    GarminConnectAuthenticationError,
+    GarminConnectInvalidFileFormatError,
+    GarminConnectTooManyRequestsError,
+)
 from garth.exc import GarthHTTPError
 
+from src.upload_queue import AUTH, PERMANENT, TRANSIENT
+
+
+def http_status(error):
+    """GarthHTTPError의 HTTP 상태 코드 (알 수 없으면 None)"""
+    response = getattr(error.error, 'response', None)
+    return getattr(response, 'status_code', None)
+
+
+def classify_error(error):
+    """
+    업로드 오류 분류 (재시도 여부 판단용)
+
+    Returns:
+        str: 'transient' (나중에 재시도), 'auth' (로그인 문제, 재시도), 'permanent' (파일 문제, 격리)
+    """
+    if isinstance(error, (GarminConnectInvalidFileFormatError, FileNotFoundError, ValueError)):
+        return PERMANENT
+    if isinstance(error, GarminConnectAuthenticationError):
+        return AUTH
+    if isinstance(error, GarminConnectTooManyRequestsError):
+        return TRANSIENT
+    if isinstance(error, GarthHTTPError):
+        status = http_status(error)
+        if status in (401, 403):
+            return AUTH
+        if status is not None and 400 <= status < 500 and status not in (408, 429):
+            return PERMANENT
+    return TRANSIENT
+
 
 class GarminUploader:
     """Garmin Connect에 활동 업로드"""
 
-    def __init__(self, email, password):
+    def __init__(self, email, password, token_dir=None, activity_index=None):
         self.email = email
         self.password = password
+        self.token_dir = Path(token_dir) if token_dir else None
+        self.activity_index = activity_index  # GarminActivityIndex (선택)
         self.garmin = None
         self._login()
 
     def _login(self):
-        """Garmin Connect 로그인"""
+        """Garmin Connect 로그인 (token_dir가 있으면 저장된 세션 재사용)"""
         try:
             self.garmin = Garmin(self.email, self.password)
+
+            if self.token_dir and any(self.token_dir.glob('*.json')):
+                try:
+                    self.garmin.login(str(self.token_dir))
+                    print(f"  Garmin Connect 세션 재사용 ({self.email})")
+                    return
+                except Exception as e:
+                    print(f"  저장된 Garmin 세션 사용 불가, 다시 로그인합니다: {e}")
+                    self.garmin = Garmin(self.email, self.password)
+
             self.garmin.login()
             print(f"  Garmin Connect 로그인 성공 ({self.email})")
+
+            if self.token_dir:
+                self.token_dir.mkdir(parents=True, exist_ok=True)
+                self.garmin.garth.dump(str(self.token_dir))
         except Exception as e:
             print(f"  ❌ Garmin 로그인 실패: {e}")
             raise
 
+    def find_existing(self, file_path):
+        """활동 인덱스로 이미 Garmin에 있는 활동인지 확인 (인덱스가 오래되었으면 갱신)"""
+        if self.activity_index is None:
+            return None
+        try:
+            self.activity_index.ensure_fresh(self.garmin)
+        except Exception as e:
+            print(f"  ⚠️  Garmin 활동 목록 조회 실패, 업로드로 확인합니다: {e}")
+            return None
+        return self.activity_index.find_file(file_path)
+
+    @staticmethod
+    def _parse_upload_response(response):
+        """업로드 응답에서 upload_id와 활동 ID 추출 (처리 중이면 활동 ID 없음)"""
+        try:
+            detail = response.json().get('detailedImportResult') or {}
+        except Exception:
+            return {}
+        successes = detail.get('successes') or []
+        return {
+            'upload_id': detail.get('uploadId'),
+            'activity_id': successes[0].get('internalId') if successes else None
+        }
+
     def upload(self, file_path):
         """
-        FIT 파일 업로드
+        FIT 파일 업로드 (활동 인덱스에 이미 있으면 업로드하지 않고 중복으로 처리)
 
         Returns:
             dict: {
                 'success': bool,
                 'duplicate': bool,
-                'error': str or None
+                'error': str or None,
+                'error_class': str or None,  # classify_error 참고
+                'upload_id': int or None,
+                'activity_id': int or None  # Garmin이 아직 처리 중이면 None
             }
         """
         result = {
             'success': False,
             'duplicate': False,
-            'error': None
+            'error': None,
+            'error_class': None,
+            'upload_id': None,
+            'activity_id': None
         }
 
+        if self.find_existing(file_path):
+            result['duplicate'] = True
+            result['error'] = 'Duplicate activity'
+            return result
+
         try:
-            self.garmin.upload_activity(file_path)
+            response = self.garmin.upload_activity(file_path)
             result['success'] = True
+            result.update(self._parse_upload_response(response))
+            if self.activity_index is not None:
+                self.activity_index.add_file(file_path)
             return result
 
         except GarthHTTPError as e:
             # HTTP 409 = 중복
-            if '409' in str(e) or 'Conflict' in str(e):
+            if http_status(e) == 409:
                 result['duplicate'] = True
                 result['error'] = 'Duplicate activity'
             else:
                 result['error'] = str(e)
+                result['error_class'] = classify_error(e)
             return result
 
         except Exception as e:
             result['error'] = str(e)
+            result['error_class'] = classify_error(e)
             return result
@@ -9,9 +9,9 @@ from datetime import datetime
 class HistoryManager:
     """활동 다운로드/업로드 이력 관리"""
 
-    def __init__(self):
-        self.data_dir = Path(__file__).parent.parent / "data"
-        self.data_dir.mkdir(exist_ok=True)
+    def __init__(self, data_dir=None):
+        self.data_dir = Path(data_dir) if data_dir else Path(__file__).parent.parent / "data"
+        self.data_dir.mkdir(parents=True, exist_ok=True)
         self.history_file = self.data_dir / "history.json"
         self.history = self._load_history()
 
@@ -42,6 +42,13 @@ class HistoryManager:
         }
         self._save_history()
 
+    def mark_garmin_activity(self, file_name, activity_id):
+        """업로드한 파일이 Garmin에서 처리되어 만들어진 활동 ID 기록"""
+        entry = self.history['uploaded'].setdefault(file_name, {'status': 'success'})
+        entry['garmin_activity_id'] = activity_id
+        entry['processed_at'] = datetime.now().isoformat()
+        self._save_history()
+
     def is_downloaded(self, file_name):
         """파일이 이미 다운로드되었는지 확인"""
         return file_name in self.history['downloaded']
@@ -52,3 +59,15 @@ class HistoryManager:
             'downloaded_at': datetime.now().isoformat()
         }
         self._save_history()
+
+    def get_sync_state(self):
+        """마지막 정상 동기화 정보 (사전 점검용 워터마크)"""
+        return self.history.get('sync_state', {})
+
+    def mark_synced(self, seen_activity_ids=None):
+        """정상 완료된 동기화 시각과 확인한 Strava 활동 ID 기록"""
+        self.history['sync_state'] = {
+            'last_sync': datetime.now().isoformat(),
+            'seen_activity_ids': sorted(seen_activity_ids or [])
+        }
+        self._save_history()
@@ -0,0 +1,411 @@
+"""
+구조화 워크아웃 인터벌 검출 (numpy) + FIT lap 기록
+
+MyWhoosh 워크아웃 파일에는 보통 lap이 하나뿐이라 전체 평균만 보입니다.
+파워 스트림을 작업(work) / 회복(recovery) / 램프(ramp) 구간으로 나눕니다.
+- 1Hz 격자로 맞춘 파워를 짧게 이동 평균한 뒤
+- 각 시점 앞/뒤 WINDOW초 평균 차이를 누적합으로 한 번에 계산해서,
+  차이가 기준 이상인 짧은 구간은 계단 변화(가장 큰 지점), 긴 구간은 램프 시작/끝으로 사용
+- 일정하게 오르거나 내리는 구간(선형 회귀 기울기 × 길이, R²)은 램프로 묶고,
+  평균이 비슷한 이웃 구간과 MIN_INTERVAL초보다 짧은 구간은 합침
+구간별 통계도 누적합으로 O(1)에 계산하므로 3시간 파일도 수십 ms 안에 끝납니다.
+
+설정 (환경 변수):
+    WORKOUT_LAPS=1  동기화 중 업로드 전에 검출한 인터벌을 lap으로 기록 (lap이 1개 이하인 파일만)
+    TRAINING_FTP    작업/회복 구분과 변화 기준에 사용 (training_load와 같은 값)
+"""
+import os
+import struct
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+
+from src.fit_encoder import FIT_EPOCH_OFFSET, MESG_NUMS, FitEncoder
+from src.fit_reader import FitFormatError, iter_messages
+from src.training_load import DEFAULT_FTP, env_number, normalized_power
+
+SMOOTH_SECONDS = 5      # 변화점 검출 전 이동 평균 (초)
+WINDOW = 20             # 변화점 앞/뒤 평균 구간 (초)
+MIN_STEP = 0.1          # 변화로 볼 최소 파워 차이 (FTP 대비, 기본 20W)
+MIN_INTERVAL = 30       # 이보다 짧은 구간은 이웃에 합침 (초)
+WORK_RATIO = 0.75       # 평균이 FTP의 이 비율 이상이면 작업 구간
+RAMP_R2 = 0.5           # 램프로 볼 선형 회귀 최소 설명력
+
+# record / session 필드 번호
+_HEART_RATE, _CADENCE, _DISTANCE, _POWER = 3, 4, 5, 7
+_FIRST_LAP_INDEX, _NUM_LAPS = 25, 26
+
+# start/duration: 워크아웃 시작 기준 초
+Interval = namedtuple('Interval', 'kind start duration avg_power normalized_power max_power '
+                                  'avg_heart_rate max_heart_rate avg_cadence distance')
+
+# 구간 종류 → FIT lap intensity
+_INTENSITY = {'work': 'active', 'recovery': 'rest'}
+
+
+class Workout:
+    """FIT record를 1Hz 격자로 맞춘 컬럼 (없는 초는 파워 0, 심박/케이던스 NaN)"""
+
+    def __init__(self, start, power, heart_rate, cadence, distance, lap_count=0):
+        self.start = start              # 첫 record의 FIT 타임스탬프
+        self.power = power
+        self.heart_rate = heart_rate
+        self.cadence = cadence
+        self.distance = distance        # 누적 거리 (m, 없으면 None)
+        self.lap_count = lap_count
+
+    @classmethod
+    def from_fit(cls, raw):
+        """FIT 내용에서 record의 파워/심박/케이던스/거리만 읽기"""
+        record, lap = MESG_NUMS['record'], MESG_NUMS['lap']
+        timestamps, rows = [], []
+        lap_count = 0
+        try:
+            for message in iter_messages(raw, fields={record: {_HEART_RATE, _CADENCE, _DISTANCE, _POWER}}):
+                if message.mesg_num == record and message.timestamp is not None:
+                    timestamps.append(message.timestamp)
+                    rows.append(message.fields)
+                elif message.mesg_num == lap:
+                    lap_count += 1
+        except FitFormatError:
+            pass  # 잘린 파일은 읽은 곳까지 사용
+        if not timestamps:
+            return None
+
+        seconds = np.asarray(timestamps, dtype=np.int64)
+        start = int(seconds.min())
+        index = seconds - start
+        size = int(index.max()) + 1
+
+        def grid(field_num, fill):
+            column = np.full(size, fill, dtype=float)
+            column[index] = np.fromiter((row.get(field_num, fill) for row in rows), float, len(rows))
+            return column
+
+        meters = grid(_DISTANCE, np.nan) / 100
+        if np.isnan(meters).all():
+            meters = None
+        else:
+            meters = np.fmax.accumulate(np.nan_to_num(meters))
+        return cls(start, grid(_POWER, 0.0), grid(_HEART_RATE, np.nan), grid(_CADENCE, np.nan),
+                   meters, lap_count)
+
+    @classmethod
+    def from_file(cls, path):
+        return cls.from_fit(Path(path).read_bytes())
+
+
+def moving_average(values, window):
+    """가운데 정렬 이동 평균 (양 끝은 있는 값만)"""
+    if window <= 1 or len(values) < window:
+        return values
+    cumsum = np.concatenate(([0.0], np.cumsum(values)))
+    index = np.arange(len(values))
+    low = np.maximum(index - window // 2, 0)
+    high = np.minimum(index - window // 2 + window, len(values))
+    return (cumsum[high] - cumsum[low]) / (high - low)
+
+
+def change_points(power, window=WINDOW, min_step=20.0):
+    """
+    변화점 인덱스
+
+    앞/뒤 window초 평균 차이가 같은 방향으로 min_step / 2 이상인 연속 구간마다
+    - 2 × window초 이하면 계단 변화: 차이가 min_step 이상이면 가장 큰 지점 하나
+    - 더 길면 램프: 그 구간의 시작/끝 (램프 안쪽은 나누지 않음)
+
+    Returns:
+        np.ndarray: 변화점 인덱스 (오름차순)
+    """
+    count = len(power)
+    if count < 2 * window:
+        return np.array([], dtype=np.int64)
+    cumsum = np.concatenate(([0.0], np.cumsum(power)))
+    index = np.arange(window, count - window + 1)
+    score = (cumsum[index + window] - 2 * cumsum[index] + cumsum[index - window]) / window
+
+    label = np.where(np.abs(score) >= min_step / 2, np.sign(score), 0).astype(np.int8)
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], label, [0]))))
+    points = []
+    for start, end in zip(edges[:-1], edges[1:]):
+        if not label[start]:
+            continue
+        if end - start > 2 * window:
+            points += [index[start], index[end - 1]]
+        else:
+            peak = start + int(np.argmax(np.abs(score[start:end])))
+            if abs(score[peak]) >= min_step:
+                points.append(index[peak])
+    return np.unique(np.asarray(points, dtype=np.int64))
+
+
+class _Segments:
+    """구간 [a, b)의 평균 / 선형 회귀를 누적합으로 O(1)에 계산"""
+
+    def __init__(self, power):
+        t = np.arange(len(power), dtype=float)
+        zero = np.zeros(1)
+        self.p = np.concatenate((zero, np.cumsum(power)))
+        self.pp = np.concatenate((zero, np.cumsum(power * power)))
+        self.tp = np.concatenate((zero, np.cumsum(t * power)))
+
+    def mean(self, a, b):
+        return (self.p[b] - self.p[a]) / (b - a)
+
+    def trend(self, a, b):
+        """(기울기 W/s, R²)"""
+        length = b - a
+        if length < 3:
+            return 0.0, 0.0
+        sum_p = self.p[b] - self.p[a]
+        sum_t = (a + b - 1) * length / 2
+        s_tt = (length ** 3 - length) / 12
+        s_tp = self.tp[b] - self.tp[a] - sum_t * sum_p / length
+        s_pp = self.pp[b] - self.pp[a] - sum_p * sum_p / length
+        slope = s_tp / s_tt
+        r2 = slope * s_tp / s_pp if s_pp > 0 else 0.0
+        return slope, r2
+
+    def direction(self, a, b, min_step):
+        """램프면 +1/-1, 아니면 0"""
+        slope, r2 = self.trend(a, b)
+        if abs(slope) * (b - a) >= min_step and r2 >= RAMP_R2:
+            return 1 if slope > 0 else -1
+        return 0
+
+
+def segment(power, ftp=DEFAULT_FTP, window=WINDOW, min_interval=MIN_INTERVAL):
+    """
+    파워 → 구간 경계 [(시작, 끝, 램프 방향)]
+
+    Args:
+        power: 1Hz 파워 (np.ndarray)
+    """
+    count = len(power)
+    if count == 0:
+        return []
+    min_step = MIN_STEP * ftp
+    smoothed = moving_average(power, SMOOTH_SECONDS)
+    bounds = [0] + change_points(smoothed, window, min_step).tolist() + [count]
+    stats = _Segments(power)
+    parts = [[a, b, stats.direction(a, b, min_step)] for a, b in zip(bounds, bounds[1:])]
+
+    def merge(i):
+        """parts[i]와 parts[i + 1] 합치기"""
+        a, b = parts[i][0], parts[i + 1][1]
+        parts[i:i + 2] = [[a, b, stats.direction(a, b, min_step)]]
+
+    def same_ramp(i):
+        """기울기 방향과 크기가 비슷하고 합치면 램프인 이웃 (잡음으로 R²가 낮은 조각 포함)"""
+        (a, b, _), (c, d, _) = parts[i], parts[i + 1]
+        first, second = stats.trend(a, b)[0], stats.trend(c, d)[0]
+        return (first * second > 0 and 0.5 <= first / second <= 2
+                and min(abs(first) * (b - a), abs(second) * (d - c)) >= min_step / 2
+                and stats.direction(a, d, min_step) != 0)
+
+    # 1) 같은 램프 조각 (가파른 램프는 window 간격으로 잘림)
+    i = 0
+    while i < len(parts) - 1:
+        if same_ramp(i):
+            merge(i)
+        else:
+            i += 1
+
+    # 2) 평균이 비슷한 이웃 일정 구간
+    i = 0
+    while i < len(parts) - 1:
+        (a, b, ramp), (c, d, next_ramp) = parts[i], parts[i + 1]
+        if not ramp and not next_ramp and abs(stats.mean(a, b) - stats.mean(c, d)) < min_step:
+            merge(i)
+        else:
+            i += 1
+
+    # 3) 짧은 구간은 평균이 더 가까운 이웃에 (가장 짧은 것부터)
+    while len(parts) > 1:
+        lengths = [b - a for a, b, _ in parts]
+        i = min(range(len(parts)), key=lengths.__getitem__)
+        if lengths[i] >= min_interval:
+            break
+        level = stats.mean(parts[i][0], parts[i][1])
+        neighbors = [j for j in (i - 1, i + 1) if 0 <= j < len(parts)]
+        j = min(neighbors, key=lambda j: abs(stats.mean(parts[j][0], parts[j][1]) - level))
+        merge(min(i, j))
+
+    return [tuple(part) for part in parts]
+
+
+def _mean(values):
+    """NaN을 뺀 평균 (값이 없으면 None)"""
+    values = values[~np.isnan(values)]
+    return float(values.mean()) if len(values) else None
+
+
+def detect_intervals(workout, ftp=None, window=WINDOW, min_interval=MIN_INTERVAL):
+    """
+    워크아웃 → Interval 목록
+
+    Args:
+        workout: Workout
+        ftp: 기능적 역치 파워 (None이면 TRAINING_FTP, 기본 200)
+
+    Returns:
+        list: Interval (파워가 없으면 빈 목록)
+    """
+    ftp = ftp or env_number('TRAINING_FTP', DEFAULT_FTP)
+    power = workout.power
+    if not power.any():
+        return []
+
+    intervals = []
+    for a, b, ramp in segment(power, ftp, window, min_interval):
+        watts = power[a:b]
+        heart_rate = workout.heart_rate[a:b]
+        avg_power = float(watts.mean())
+        if ramp:
+            kind = 'ramp'
+        else:
+            kind = 'work' if avg_power >= WORK_RATIO * ftp else 'recovery'
+        intervals.append(Interval(
+            kind=kind,
+            start=a,
+            duration=b - a,
+            avg_power=round(avg_power, 1),
+            normalized_power=round(normalized_power(watts), 1),
+            max_power=int(watts.max()),
+            avg_heart_rate=_mean(heart_rate),
+            max_heart_rate=None if np.isnan(heart_rate).all() else float(np.nanmax(heart_rate)),
+            avg_cadence=_mean(workout.cadence[a:b]),
+            distance=None if workout.distance is None else
+            float(workout.distance[b - 1] - (workout.distance[a - 1] if a else 0.0)),
+        ))
+    return intervals
+
+
+def _intensity(interval, index, count):
+    if interval.kind != 'ramp':
+        return _INTENSITY[interval.kind]
+    if index == 0:
+        return 'warmup'
+    if index == count - 1:
+        return 'cooldown'
+    return 'active'
+
+
+def lap_messages(workout, intervals):
+    """Interval 목록 → FitEncoder.write('lap', ...)에 넘길 값 목록"""
+    laps = []
+    for index, interval in enumerate(intervals):
+        start = workout.start + FIT_EPOCH_OFFSET + interval.start
+        laps.append({
+            'timestamp': start + interval.duration,
+            'message_index': index,
+            'event': 'lap',
+            'event_type': 'stop',
+            'start_time': start,
+            'total_elapsed_time': interval.duration,
+            'total_timer_time': interval.duration,
+            'total_distance': interval.distance,
+            'avg_heart_rate': interval.avg_heart_rate,
+            'max_heart_rate': interval.max_heart_rate,
+            'avg_cadence': interval.avg_cadence,
+            'avg_power': interval.avg_power,
+            'max_power': interval.max_power,
+            'intensity': _intensity(interval, index, len(intervals)),
+            'lap_trigger': 'session_end' if index == len(intervals) - 1 else 'manual',
+            'sport': 'cycling',
+        })
+    return laps
+
+
+def _set_uint16(chunk, definition, field_num, value):
+    """데이터 메시지 바이트의 uint16 필드 값 바꾸기 (정의에 없는 필드면 그대로)"""
+    endian = '>' if definition[2] == 1 else '<'
+    pos = 1
+    for i in range(definition[5]):
+        number, size, _ = definition[6 + i * 3:9 + i * 3]
+        if number == field_num and size == 2:
+            struct.pack_into(endian + 'H', chunk, pos, value)
+        pos += size
+
+
+def write_laps(raw, laps):
+    """
+    FIT 내용의 lap을 주어진 lap으로 교체
+
+    기존 lap 데이터 메시지는 빼고, 첫 session 앞(없으면 끝)에 새 lap을 넣습니다.
+    새 lap이 로컬 타입 정의를 덮어쓰므로 넣은 뒤 그 시점의 정의를 다시 기록하고,
+    session의 num_laps / first_lap_index도 새 lap에 맞춥니다.
+
+    Returns:
+        bytes: 헤더/CRC를 새로 쓴 FIT 내용
+    """
+    lap, session = MESG_NUMS['lap'], MESG_NUMS['session']
+    body = bytearray()
+    definitions = {}    # 로컬 타입 → 정의 메시지 바이트
+    inserted = False
+
+    def insert():
+        encoder = FitEncoder(body)
+        for values in laps:
+            encoder.write('lap', values)
+        return encoder.body + b''.join(definitions.values())
+
+    for message in iter_messages(raw, include_definitions=True):
+        chunk = raw[message.offset:message.offset + message.size]
+        if message.mesg_num is None:
+            definitions[message.local_type] = chunk
+        elif message.mesg_num == lap:
+            continue
+        elif message.mesg_num == session:
+            chunk = bytearray(chunk)
+            definition = definitions[message.local_type]
+            _set_uint16(chunk, definition, _FIRST_LAP_INDEX, 0)
+            _set_uint16(chunk, definition, _NUM_LAPS, len(laps))
+            if not inserted:
+                body = insert()
+                inserted = True
+        body += chunk
+    if not inserted:
+        body = insert()
+    return FitEncoder(body).to_bytes()
+
+
+def add_laps(path, ftp=None, replace=False):
+    """
+    FIT 파일에 검출한 인터벌을 lap으로 기록 (임시 파일 → 교체)
+
+    Args:
+        replace: False면 lap이 이미 2개 이상인 파일은 건너뜀 (기기가 기록한 lap 유지)
+
+    Returns:
+        list or None: 기록한 Interval 목록 (건너뛰었으면 None)
+    """
+    path = Path(path)
+    raw = path.read_bytes()
+    workout = Workout.from_fit(raw)
+    if workout is None or (workout.lap_count > 1 and not replace):
+        return None
+    intervals = detect_intervals(workout, ftp)
+    if len(intervals) < 2:
+        return None
+
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_bytes(write_laps(raw, lap_messages(workout, intervals)))
+    os.replace(tmp_path, path)
+    return intervals
+
+
+def add_laps_for_upload(path):
+    """동기화 중 업로드 전 lap 기록 (WORKOUT_LAPS=1일 때만, 실패해도 업로드는 계속)"""
+    if os.getenv('WORKOUT_LAPS') != '1':
+        return None
+    try:
+        intervals = add_laps(path)
+    except (OSError, ValueError, FitFormatError) as e:
+        print(f"  ⚠️  인터벌 검출 실패: {Path(path).name} - {e}")
+        return None
+    if intervals:
+        work = sum(1 for interval in intervals if interval.kind == 'work')
+        print(f"🧩 인터벌 lap {len(intervals)}개 기록 (작업 {work}개): {Path(path).name}")
+    return intervals
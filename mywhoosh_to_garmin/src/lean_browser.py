@@ -0,0 +1,81 @@
+"""
+MyWhoosh 브라우저 세션용 lean 모드 (선택, MYWHOOSH_LEAN=1)
+
+page.route / context.route로 로그인과 다운로드에 필요 없는 요청을 차단합니다.
+- 이미지, 웹 폰트, 미디어 요청 차단
+- 분석/광고 트래커 도메인 차단
+- reCAPTCHA(google.com/recaptcha, gstatic.com)와 MyWhoosh 앱/API 요청은 항상 허용
+  (reCAPTCHA 이미지 문제도 풀 수 있도록 reCAPTCHA는 리소스 종류와 무관하게 허용)
+"""
+import os
+from urllib.parse import urlparse
+
+BLOCKED_RESOURCE_TYPES = {'image', 'font', 'media'}
+
+TRACKER_DOMAINS = (
+    'google-analytics.com', 'googletagmanager.com', 'doubleclick.net', 'googleadservices.com',
+    'facebook.net', 'facebook.com', 'connect.facebook.net', 'hotjar.com', 'clarity.ms',
+    'segment.io', 'segment.com', 'mixpanel.com', 'amplitude.com', 'intercom.io',
+    'linkedin.com', 'licdn.com', 'tiktok.com', 'analytics.twitter.com', 'bing.com',
+)
+
+ALWAYS_ALLOWED = (
+    ('google.com', '/recaptcha/'),
+    ('recaptcha.net', ''),
+    ('gstatic.com', '/recaptcha/'),
+)
+
+
+def lean_enabled():
+    """lean 모드 사용 여부 (환경 변수)"""
+    return os.getenv('MYWHOOSH_LEAN') == '1'
+
+
+def _host_matches(host, domain):
+    return host == domain or host.endswith('.' + domain)
+
+
+def should_block(url, resource_type):
+    """요청을 차단할지 판단"""
+    parsed = urlparse(url)
+    host = parsed.hostname or ''
+
+    for domain, path_prefix in ALWAYS_ALLOWED:
+        if _host_matches(host, domain) and parsed.path.startswith(path_prefix):
+            return False
+    if any(_host_matches(host, domain) for domain in TRACKER_DOMAINS):
+        return True
+    return resource_type in BLOCKED_RESOURCE_TYPES
+
+
+class RouteBlocker:
+    """route 핸들러 (차단/허용 개수 집계)"""
+
+    def __init__(self):
+        self.blocked = 0
+        self.allowed = 0
+
+    def _decide(self, route):
+        request = route.request
+        if should_block(request.url, request.resource_type):
+            self.blocked += 1
+            return True
+        self.allowed += 1
+        return False
+
+    def handle(self, route):
+        """playwright.sync_api용 핸들러"""
+        if self._decide(route):
+            route.abort()
+        else:
+            route.continue_()
+
+    async def handle_async(self, route):
+        """playwright.async_api용 핸들러"""
+        if self._decide(route):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    def summary(self):
+        return f"요청 차단 {self.blocked}개 / 허용 {self.allowed}개"
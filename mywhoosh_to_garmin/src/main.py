@@ -11,9 +11,10 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from src.mywhoosh_downloader import MyWhooshDownloader
-from src.garmin_uploader import GarminUploader
 from src.history_manager import HistoryManager
+from src.upload_queue import PERMANENT, TRANSIENT, UploadQueue
+from src.garmin_activity_index import GarminActivityIndex
+from src import fit_validator, interval_detector, preflight, training_load, workout_index
 
 
 def setup_logging():
@@ -51,6 +52,19 @@ def main():
     try:
         # 이력 관리자 초기화
         history = HistoryManager()
+        upload_queue = UploadQueue()
+
+        # 사전 점검: 새 활동도 재시도할 업로드도 없으면 브라우저 실행/로그인 생략
+        check = preflight.check(history, upload_queue)
+        if not check.run_needed:
+            print(f"⏭️  동기화 생략: {check.reason}")
+            return 0
+        print(f"🔎 사전 점검: {check.reason}")
+        print()
+
+        # Playwright/garminconnect는 실제로 필요할 때만 import (무거운 모듈)
+        from src.mywhoosh_downloader import MyWhooshDownloader
+        from src.garmin_uploader import GarminUploader
 
         # MyWhoosh 다운로더 초기화
         print("1️⃣  MyWhoosh 다운로드 시작...")
@@ -59,22 +73,39 @@ def main():
         # 활동 다운로드 (최근 30일)
         downloaded_files = downloader.download_recent_activities(days=30)
         print(f"✅ {len(downloaded_files)}개 활동 다운로드 완료")
+
+        # 새로 받은 활동을 훈련 부하(CTL/ATL/TSB)에 반영
+        training_load.record_downloads(downloaded_files)
+        # 비슷한 워크아웃 검색 인덱스에 추가
+        workout_index.index_downloads(downloaded_files)
+
+        # 재시도 시각이 된 이전 실패 파일 추가
+        downloaded_names = {os.path.basename(f) for f in downloaded_files}
+        retry_files = [f for f in upload_queue.due() if os.path.basename(f) not in downloaded_names]
+        if retry_files:
+            print(f"🔁 재시도 대기열에서 {len(retry_files)}개 추가")
+        upload_files = list(downloaded_files) + retry_files
         print()
 
-        if not downloaded_files:
+        if not upload_files:
             print("⚠️  다운로드된 새 활동이 없습니다.")
+            if downloader.last_error is None:
+                history.mark_synced(check.seen_ids)
             return 0
 
-        # Garmin 업로더 초기화
+        # Garmin 업로더는 실제로 올릴 파일이 있을 때 초기화 (로그인)
         print("2️⃣  Garmin Connect 업로드 시작...")
-        uploader = GarminUploader(garmin_email, garmin_password)
+        uploader = None
+        verifier = None
+        activity_index = GarminActivityIndex(days=30)
 
         # 업로드 결과 추적
         success_count = 0
         skip_count = 0
+        deferred_count = 0
         error_count = 0
 
-        for file_path in downloaded_files:
+        for file_path in upload_files:
             file_name = os.path.basename(file_path)
 
             # 이미 업로드했는지 확인
@@ -83,21 +114,77 @@ def main():
                 skip_count += 1
                 continue
 
+            # 격리되었거나 재시도 시각 전이면 시도하지 않음
+            if upload_queue.is_dead(file_name):
+                print(f"🚫 건너뜀: {file_name} (격리됨, data/upload_queue.json 참고)")
+                deferred_count += 1
+                continue
+            if upload_queue.is_waiting(file_name):
+                next_attempt = upload_queue.next_attempt_at(file_name)
+                print(f"⏳ 건너뜀: {file_name} ({next_attempt:%m-%d %H:%M} 이후 재시도)")
+                deferred_count += 1
+                continue
+
+            # 업로드 전 로컬 검증 (잘린 파일은 복구, 복구할 수 없으면 격리)
+            validation = fit_validator.prepare_for_upload(file_path)
+            if validation.repaired:
+                print(f"🩹 {validation.warnings[-1]}: {file_name}")
+            elif not validation.ok:
+                print(f"❌ 검증 실패: {file_name} - {validation.describe()}")
+                upload_queue.record_failure(file_path, validation.describe(), PERMANENT)
+                error_count += 1
+                continue
+
+            # 캐시된 Garmin 활동 목록에 이미 있으면 로그인/업로드 없이 건너뜀
+            if activity_index.is_fresh() and activity_index.find_file(file_path):
+                print(f"🔄 중복: {file_name} (Garmin 활동 목록에 존재)")
+                history.mark_uploaded(file_name)
+                upload_queue.record_success(file_name)
+                skip_count += 1
+                continue
+
+            # 구조화 워크아웃 인터벌을 lap으로 기록 (WORKOUT_LAPS=1)
+            interval_detector.add_laps_for_upload(file_path)
+
+            if uploader is None:
+                uploader = GarminUploader(garmin_email, garmin_password, activity_index=activity_index)
+                if os.getenv('UPLOAD_VERIFY') == '1':
+                    # 업로드를 막지 않도록 백그라운드에서 처리 완료 확인
+                    from src.upload_verifier import UploadVerifier
+                    verifier = UploadVerifier(uploader.garmin)
+                    verifier.start()
+
             # 업로드 시도
             result = uploader.upload(file_path)
 
             if result['success']:
                 print(f"✅ 업로드 성공: {file_name}")
                 history.mark_uploaded(file_name)
+                upload_queue.record_success(file_name)
+                if verifier:
+                    verifier.add(file_path, result)
                 success_count += 1
             elif result.get('duplicate'):
                 print(f"🔄 중복: {file_name} (이미 Garmin에 존재)")
                 history.mark_uploaded(file_name)
+                upload_queue.record_success(file_name)
                 skip_count += 1
             else:
+                entry = upload_queue.record_failure(file_path, result.get('error'),
+                                                    result.get('error_class') or TRANSIENT)
                 print(f"❌ 업로드 실패: {file_name} - {result.get('error')}")
+                if 'dead_letter' in entry:
+                    print(f"   → 격리 ({entry['error_class']}, {entry['attempts']}회 시도)")
+                else:
+                    next_attempt = upload_queue.next_attempt_at(file_name)
+                    print(f"   → {entry['attempts']}회 실패, {next_attempt:%m-%d %H:%M} 이후 재시도")
                 error_count += 1
 
+        if verifier:
+            from src.upload_verifier import record_results
+            print()
+            record_results(verifier.finish(), history)
+
         print()
         print("=" * 60)
         print("동기화 완료")
@@ -105,9 +192,17 @@ def main():
         print(f"✅ 성공: {success_count}개")
         print(f"⏭️  건너뜀: {skip_count}개")
         print(f"❌ 실패: {error_count}개")
+        if deferred_count:
+            print(f"⏳ 재시도 대기/격리로 생략: {deferred_count}개")
+        queue_summary = upload_queue.summary()
+        if queue_summary['pending'] or queue_summary['dead_letter']:
+            print(f"📋 재시도 큐: 대기 {queue_summary['pending']}개, 격리 {queue_summary['dead_letter']}개")
         print(f"종료 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print()
 
+        if error_count == 0 and downloader.last_error is None:
+            history.mark_synced(check.seen_ids)
+
         return 0 if error_count == 0 else 1
 
     except Exception as e:
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+여러 계정(팀원) 동기화 실행기
+
+계정 파일에 등록된 계정들을 하나의 Chromium에서 처리합니다.
+- 계정마다 별도 브라우저 컨텍스트 (동시에 최대 MULTI_SYNC_MAX_CONTEXTS개)
+- 계정마다 분리된 이력(data/accounts/<이름>/), 다운로드 폴더(downloads/<이름>/),
+  Garmin 세션 캐시(.garminconnect/<이름>/)
+- 한 계정이 실패하거나 시간 초과되어도 다른 계정은 계속 진행
+- 마지막에 전체 요약 출력 + logs/multi_sync_<시각>.json 저장
+
+계정 파일 (기본: accounts.json, Git에 올리지 마세요):
+    [
+      {
+        "name": "heone",
+        "mywhoosh_email": "...", "mywhoosh_password": "$HEONE_MYWHOOSH_PASSWORD",
+        "garmin_email": "...", "garmin_password": "$HEONE_GARMIN_PASSWORD"
+      }
+    ]
+값에 $변수명을 쓰면 환경 변수로 치환됩니다 (GitHub Secrets 연동용).
+
+사용법:
+    python src/multi_account_runner.py [계정 파일 경로]
+"""
+import asyncio
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리 설정
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from playwright.async_api import async_playwright
+
+from src.async_main import UploadStage, env_int
+from src.async_mywhoosh_downloader import AsyncMyWhooshDownloader
+from src.history_manager import HistoryManager
+from src.training_load import record_downloads
+from src.workout_index import index_downloads
+
+DEFAULT_ACCOUNTS_FILE = PROJECT_ROOT / "accounts.json"
+REQUIRED_KEYS = ('name', 'mywhoosh_email', 'mywhoosh_password', 'garmin_email', 'garmin_password')
+
+
+def load_accounts(path):
+    """계정 파일 로드 ($변수 치환 + 필수 항목 확인)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        accounts = json.load(f)
+
+    loaded = []
+    for index, account in enumerate(accounts, 1):
+        account = {k: os.path.expandvars(v) if isinstance(v, str) else v for k, v in account.items()}
+        missing = [k for k in REQUIRED_KEYS
+                   if not isinstance(account.get(k), str) or not account[k] or account[k].startswith('$')]
+        if missing:
+            print(f"⚠️  {index}번째 계정 건너뜀: {', '.join(missing)} 없음")
+            continue
+        loaded.append(account)
+
+    return loaded
+
+
+def account_slug(name):
+    """계정 이름을 디렉토리 이름으로 사용할 수 있게 변환"""
+    return re.sub(r'[^\w.-]', '_', name)
+
+
+def account_paths(name):
+    """계정별 이력/다운로드/세션 캐시 경로"""
+    slug = account_slug(name)
+    return {
+        'data_dir': PROJECT_ROOT / "data" / "accounts" / slug,
+        'download_dir': PROJECT_ROOT / "downloads" / slug,
+        'screenshot_dir': PROJECT_ROOT / "screenshot" / slug,
+        'token_dir': PROJECT_ROOT / ".garminconnect" / slug,
+    }
+
+
+async def sync_account(browser, account, days, max_downloads, max_uploads, task_timeout,
+                       max_list_pages=3):
+    """계정 1개 동기화 (다운로드 → 업로드)"""
+    name = account['name']
+    paths = account_paths(name)
+
+    history = HistoryManager(data_dir=paths['data_dir'])
+    downloader = AsyncMyWhooshDownloader(account['mywhoosh_email'], account['mywhoosh_password'],
+                                         download_dir=paths['download_dir'],
+                                         screenshot_dir=paths['screenshot_dir'])
+    upload_stage = UploadStage(account['garmin_email'], account['garmin_password'], history,
+                               max_concurrent=max_uploads, task_timeout=task_timeout,
+                               token_dir=paths['token_dir'])
+
+    queue = asyncio.Queue()
+    upload_stage.enqueue_retries(queue)
+    upload_task = asyncio.create_task(upload_stage.run(queue))
+    try:
+        try:
+            downloaded_files = await downloader.download_recent_activities(
+                days=days, browser=browser, queue=queue,
+                max_concurrent=max_downloads, task_timeout=task_timeout,
+                page_concurrency=max_list_pages)
+        finally:
+            for _ in range(max_uploads):
+                queue.put_nowait(None)
+        await upload_task
+    except BaseException:
+        upload_task.cancel()
+        await asyncio.gather(upload_task, return_exceptions=True)
+        raise
+
+    await asyncio.to_thread(record_downloads, downloaded_files, data_dir=paths['data_dir'])
+    await asyncio.to_thread(index_downloads, downloaded_files, data_dir=paths['data_dir'])
+
+    return {
+        'downloaded': len(downloaded_files),
+        'success': upload_stage.success_count,
+        'skipped': upload_stage.skip_count,
+        'failed': upload_stage.error_count,
+        'deferred': upload_stage.deferred_count,
+        'download_error': downloader.last_error,
+    }
+
+
+async def run_accounts(accounts, max_contexts=2, days=30, account_timeout=900):
+    """워커 풀로 계정들을 나눠 처리하고 계정별 결과 목록 반환"""
+    max_downloads = env_int('SYNC_MAX_DOWNLOADS', 3)
+    max_uploads = env_int('SYNC_MAX_UPLOADS', 2)
+    task_timeout = env_int('SYNC_TASK_TIMEOUT', 120)
+    max_list_pages = env_int('SYNC_MAX_LIST_PAGES', 3)
+
+    pending = asyncio.Queue()
+    for account in accounts:
+        pending.put_nowait(account)
+    results = []
+
+    async def worker(browser):
+        while True:
+            try:
+                account = pending.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            name = account['name']
+            print(f"▶ [{name}] 동기화 시작")
+            started = time.perf_counter()
+            result = {'name': name, 'status': 'ok'}
+            try:
+                result.update(await asyncio.wait_for(
+                    sync_account(browser, account, days, max_downloads, max_uploads, task_timeout,
+                                 max_list_pages),
+                    timeout=account_timeout))
+                if result['failed'] or result['download_error']:
+                    result['status'] = 'partial'
+            except asyncio.TimeoutError:
+                result.update(status='timeout', error=f"{account_timeout}초 초과")
+            except Exception as e:
+                result.update(status='error', error=str(e))
+            result['elapsed'] = round(time.perf_counter() - started, 1)
+
+            print(f"■ [{name}] {result['status']} ({result['elapsed']}초)")
+            results.append(result)
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            workers = min(max_contexts, len(accounts)) or 1
+            await asyncio.gather(*(worker(browser) for _ in range(workers)))
+        finally:
+            await browser.close()
+
+    return results
+
+
+def print_summary(results):
+    """전체 계정 요약 출력"""
+    print()
+    print("=" * 60)
+    print("전체 계정 동기화 요약")
+    print("=" * 60)
+    status_marks = {'ok': '✅', 'partial': '⚠️ ', 'timeout': '⏱️ ', 'error': '❌'}
+    for r in sorted(results, key=lambda r: r['name']):
+        mark = status_marks.get(r['status'], '❓')
+        if 'error' in r:
+            print(f"{mark} {r['name']}: {r['status']} - {r['error']} ({r['elapsed']}초)")
+        else:
+            print(f"{mark} {r['name']}: 다운로드 {r['downloaded']}개, 업로드 {r['success']}개, "
+                  f"건너뜀 {r['skipped']}개, 실패 {r['failed']}개 ({r['elapsed']}초)")
+            if r.get('download_error'):
+                print(f"    다운로드 오류: {r['download_error']}")
+
+    ok_count = sum(1 for r in results if r['status'] == 'ok')
+    print(f"\n계정: {ok_count}/{len(results)}개 정상 완료")
+
+
+def save_summary(results):
+    """요약을 logs/에 JSON으로 저장"""
+    log_dir = PROJECT_ROOT / "logs"
+    log_dir.mkdir(exist_ok=True)
+    summary_file = log_dir / f"multi_sync_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(summary_file, 'w', encoding='utf-8') as f:
+        json.dump({'finished_at': datetime.now().isoformat(), 'accounts': results},
+                  f, indent=2, ensure_ascii=False)
+    return summary_file
+
+
+def main():
+    """메인 실행 함수"""
+    print("=" * 60)
+    print("MyWhoosh to Garmin Connect 다중 계정 동기화")
+    print("=" * 60)
+    print(f"시작 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print()
+
+    accounts_file = Path(sys.argv[1]) if len(sys.argv) > 1 else \
+        Path(os.getenv('ACCOUNTS_FILE', DEFAULT_ACCOUNTS_FILE))
+    if not accounts_file.exists():
+        print(f"❌ 계정 파일을 찾을 수 없습니다: {accounts_file}")
+        return 1
+
+    accounts = load_accounts(accounts_file)
+    if not accounts:
+        print("❌ 실행할 계정이 없습니다.")
+        return 1
+
+    max_contexts = env_int('MULTI_SYNC_MAX_CONTEXTS', 2)
+    account_timeout = env_int('MULTI_SYNC_ACCOUNT_TIMEOUT', 900)
+    print(f"계정 {len(accounts)}개, 동시 브라우저 컨텍스트 {max_contexts}개")
+    print()
+
+    try:
+        results = asyncio.run(run_accounts(accounts, max_contexts=max_contexts,
+                                           account_timeout=account_timeout))
+    except KeyboardInterrupt:
+        print("\n⚠️  동기화가 취소되었습니다.")
+        return 1
+
+    print_summary(results)
+    summary_file = save_summary(results)
+    print(f"요약 저장: {summary_file}")
+    print(f"종료 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+    return 0 if all(r['status'] == 'ok' for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,35 +2,178 @@
 MyWhoosh 활동 다운로더
 """
 import os
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
 
+from src.activity_list import (DOWNLOAD_BUTTON_TEXT, MAX_LIST_PAGES, NEXT_BUTTON_SELECTOR,
+                               PAGE_LINK_SELECTOR, SCROLL_TO_BOTTOM, page_urls_from_hrefs)
+from src.diagnostics import ArtifactRingBuffer, diagnostics_enabled
+from src.lean_browser import RouteBlocker, lean_enabled
+
+ACTIVITIES_URL = "https://event.mywhoosh.com/user/activities#profile"
+
 
 class MyWhooshDownloader:
     """MyWhoosh 웹사이트에서 활동 다운로드"""
 
-    def __init__(self, email, password):
+    def __init__(self, email, password, download_dir=None, screenshot_dir=None, lean=None,
+                 diagnostics=None):
         self.email = email
         self.password = password
-        self.download_dir = Path(__file__).parent.parent / "downloads"
-        self.download_dir.mkdir(exist_ok=True)
-        self.screenshot_dir = Path(__file__).parent.parent / "screenshot"
-        self.screenshot_dir.mkdir(exist_ok=True)
+        self.download_dir = Path(download_dir) if download_dir else Path(__file__).parent.parent / "downloads"
+        self.download_dir.mkdir(parents=True, exist_ok=True)
+        self.screenshot_dir = Path(screenshot_dir) if screenshot_dir else Path(__file__).parent.parent / "screenshot"
+        self.screenshot_dir.mkdir(parents=True, exist_ok=True)
+        self.lean = lean_enabled() if lean is None else lean
+        self.diagnostics = diagnostics_enabled() if diagnostics is None else diagnostics
+        self.artifacts = ArtifactRingBuffer(self.screenshot_dir / "failures")
+        self.last_error = None
+        self.failed_steps = []
+        self.timings = {}  # 단계별 소요 시간 (초, 시작 기준)
+
+    def _failure_screenshot(self, page, name):
+        """실패한 단계 기록 + 스크린샷 (스크린샷 실패는 무시)"""
+        self.failed_steps.append(name)
+        try:
+            screenshot_path = self.artifacts.path_for(name, ".png")
+            page.screenshot(path=str(screenshot_path))
+            self.artifacts.prune()
+            print(f"  실패 스크린샷: {screenshot_path}")
+        except Exception:
+            pass
+
+    def _stop_tracing(self, context):
+        """trace 기록 종료 (실패한 단계가 있을 때만 파일로 저장)"""
+        try:
+            if not self.failed_steps:
+                context.tracing.stop()
+                return
+            trace_path = self.artifacts.path_for('trace_' + '_'.join(self.failed_steps), ".zip")
+            context.tracing.stop(path=str(trace_path))
+            self.artifacts.prune()
+            print(f"  trace 저장: {trace_path} (playwright show-trace로 확인)")
+        except Exception as e:
+            print(f"  ⚠️  trace 저장 실패: {e}")
+
+    def _open_activities(self, page, url, navigation_wait):
+        """목록 페이지 열기 + ACTIVITIES 탭 선택"""
+        page.goto(url)
+        page.wait_for_load_state(navigation_wait)
+        page.click('tab[name="ACTIVITIES"]', timeout=5000)
+        page.wait_for_timeout(2000)
+
+    def _row_count(self, page):
+        return page.locator('button').filter(has_text=DOWNLOAD_BUTTON_TEXT).count()
+
+    def _next_button_enabled(self, page):
+        next_button = page.locator(NEXT_BUTTON_SELECTOR).first
+        try:
+            return next_button.count() > 0 and next_button.is_visible() and next_button.is_enabled()
+        except Exception:
+            return False
+
+    def _detect_list_mode(self, page):
+        """목록이 이어지는 방식 판별 → (모드, 2번째 페이지부터의 URL 목록)"""
+        hrefs = page.eval_on_selector_all(PAGE_LINK_SELECTOR, 'els => els.map(e => e.href)')
+        page_urls = page_urls_from_hrefs(hrefs)
+        if page_urls:
+            return 'pages', page_urls
+
+        if self._next_button_enabled(page):
+            return 'next', []
+
+        before = self._row_count(page)
+        page.evaluate(SCROLL_TO_BOTTOM)
+        page.wait_for_timeout(1500)
+        # 늘어난 행은 첫 번째 처리에서 함께 읽힘
+        return ('scroll' if self._row_count(page) > before else 'single'), []
+
+    def _download_rows(self, page, cutoff_date, seen_files, downloaded_files, started, skip=0):
+        """
+        현재 화면의 활동 다운로드 (skip개 이후 행부터)
+
+        Returns:
+            tuple: (읽은 행 수, 기간을 벗어난 행이 있었는지)
+        """
+        download_buttons = page.locator('button').filter(has_text=DOWNLOAD_BUTTON_TEXT).all()[skip:]
+        print(f"  {len(download_buttons)}개 활동 발견")
+
+        for button in download_buttons:
+            # 날짜 추출 (형식: DD/MM/YYYY)
+            row = button.locator('xpath=ancestor::tr')
+            date_cell = row.locator('td').first
+            date_text = date_cell.inner_text().strip()
+
+            # 날짜 파싱
+            try:
+                activity_date = datetime.strptime(date_text, "%d/%m/%Y")
+            except ValueError:
+                print(f"  ⚠️  날짜 파싱 실패: {date_text}")
+                continue
+
+            # 기간 체크
+            if activity_date < cutoff_date:
+                print(f"  ⏭️  {date_text} - 기간 초과, 중단")
+                return len(download_buttons), True
+
+            # 파일명 생성 (YYYY-MM-DD)
+            file_name = activity_date.strftime("%Y-%m-%d") + ".fit"
+            file_path = self.download_dir / file_name
+            if file_path in seen_files:
+                continue
+            seen_files.add(file_path)
+
+            # 이미 다운로드했으면 건너뛰기
+            if file_path.exists():
+                print(f"  ⏭️  {date_text} - 이미 존재함")
+                continue
+
+            # 다운로드
+            print(f"  ⬇️  다운로드 중: {date_text}...")
+
+            with page.expect_download() as download_info:
+                button.click()
+
+            download = download_info.value
+            download.save_as(file_path)
+
+            downloaded_files.append(str(file_path))
+            self.timings.setdefault('first_download', time.perf_counter() - started)
+            print(f"  ✅ 저장됨: {file_name}")
+
+        return len(download_buttons), False
 
     def download_recent_activities(self, days=30):
         """최근 N일간의 활동 다운로드"""
         downloaded_files = []
+        started = time.perf_counter()
+        self.timings = {}
+        self.failed_steps = []
+
+        # lean 모드: 불필요한 요청 차단, 페이지 이동은 DOM 준비까지만 대기
+        # (필요한 요소는 아래에서 각각 wait_for로 기다림)
+        navigation_wait = "domcontentloaded" if self.lean else "networkidle"
 
         with sync_playwright() as p:
             browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
+            context = browser.new_context()
+            if self.diagnostics:
+                # DOM 스냅샷/네트워크/타이밍을 기록해 두고 실패했을 때만 저장
+                context.tracing.start(screenshots=True, snapshots=True)
+            page = context.new_page()
+            blocker = None
+            if self.lean:
+                blocker = RouteBlocker()
+                page.route("**/*", blocker.handle)
+                print("  lean 모드: 이미지/폰트/트래커 요청 차단")
 
             try:
                 # MyWhoosh 로그인
                 print(f"  MyWhoosh 로그인 중... ({self.email})")
                 page.goto("https://event.mywhoosh.com/auth/login", timeout=60000)
-                page.wait_for_load_state("networkidle", timeout=60000)
+                page.wait_for_load_state(navigation_wait, timeout=60000)
                 page.wait_for_timeout(3000)  # 추가 대기
 
                 # 정책 동의 버튼 클릭 (Accept All)
@@ -64,11 +207,6 @@ class MyWhooshDownloader:
                 password_value = password_input.input_value()
                 print(f"  비밀번호 입력 확인: {'*' * len(password_value)}")
 
-                # 스크린샷 (디버깅)
-                screenshot_path = self.screenshot_dir / "login_before_submit.png"
-                page.screenshot(path=str(screenshot_path))
-                print(f"  스크린샷 저장: {screenshot_path}")
-
                 # reCAPTCHA 체크박스 클릭 (필수)
                 print("  reCAPTCHA 확인 중...")
 
@@ -140,9 +278,7 @@ class MyWhooshDownloader:
 
                 if not recaptcha_clicked:
                     print("  ⚠️ 모든 reCAPTCHA 클릭 방법 실패")
-                    screenshot_path = self.screenshot_dir / "recaptcha_failed.png"
-                    page.screenshot(path=str(screenshot_path))
-                    print(f"  실패 스크린샷: {screenshot_path}")
+                    self._failure_screenshot(page, "recaptcha_failed")
 
                 # Submit 버튼 상태 확인
                 submit_btn = page.locator('button[type="submit"]').first
@@ -160,70 +296,60 @@ class MyWhooshDownloader:
                 submit_btn.click()
                 page.wait_for_load_state("networkidle", timeout=60000)
                 page.wait_for_timeout(3000)
+                self.timings['login'] = time.perf_counter() - started
 
                 # Activities 페이지로 이동
                 print("  Activities 페이지 접속 중...")
-                page.goto("https://event.mywhoosh.com/user/activities#profile")
-                page.wait_for_load_state("networkidle")
-
-                # ACTIVITIES 탭 클릭
-                page.click('tab[name="ACTIVITIES"]', timeout=5000)
-                page.wait_for_timeout(2000)
+                self._open_activities(page, ACTIVITIES_URL, navigation_wait)
 
-                # 활동 목록에서 다운로드
+                # 활동 목록에서 다운로드 (여러 페이지/무한 스크롤이면 기간을 벗어날 때까지 이어서)
                 cutoff_date = datetime.now() - timedelta(days=days)
-
-                # 다운로드 버튼 찾기
-                download_buttons = page.locator('button').filter(has_text="download").all()
-
-                print(f"  {len(download_buttons)}개 활동 발견")
-
-                for idx, button in enumerate(download_buttons):
-                    # 날짜 추출 (형식: DD/MM/YYYY)
-                    row = button.locator('xpath=ancestor::tr')
-                    date_cell = row.locator('td').first
-                    date_text = date_cell.inner_text().strip()
-
-                    # 날짜 파싱
-                    try:
-                        activity_date = datetime.strptime(date_text, "%d/%m/%Y")
-                    except ValueError:
-                        print(f"  ⚠️  날짜 파싱 실패: {date_text}")
-                        continue
-
-                    # 기간 체크
-                    if activity_date < cutoff_date:
-                        print(f"  ⏭️  {date_text} - 기간 초과, 중단")
+                mode, page_urls = self._detect_list_mode(page)
+                print(f"  목록 형식: {mode}")
+
+                seen_files = set()
+                row_count, reached_cutoff = self._download_rows(
+                    page, cutoff_date, seen_files, downloaded_files, started)
+                for page_index in range(MAX_LIST_PAGES - 1):
+                    if reached_cutoff or mode == 'single':
+                        break
+                    skip = 0
+                    if mode == 'pages':
+                        if page_index >= len(page_urls):
+                            break
+                        self._open_activities(page, page_urls[page_index], navigation_wait)
+                    elif mode == 'next':
+                        if not self._next_button_enabled(page):
+                            break
+                        page.locator(NEXT_BUTTON_SELECTOR).first.click(timeout=5000)
+                        page.wait_for_timeout(1500)
+                    else:
+                        # 무한 스크롤: 새로 붙은 행만 처리
+                        skip = self._row_count(page)
+                        page.evaluate(SCROLL_TO_BOTTOM)
+                        page.wait_for_timeout(1500)
+                    row_count, reached_cutoff = self._download_rows(
+                        page, cutoff_date, seen_files, downloaded_files, started, skip=skip)
+                    if row_count == 0:
                         break
-
-                    # 파일명 생성 (YYYY-MM-DD)
-                    file_name = activity_date.strftime("%Y-%m-%d") + ".fit"
-                    file_path = self.download_dir / file_name
-
-                    # 이미 다운로드했으면 건너뛰기
-                    if file_path.exists():
-                        print(f"  ⏭️  {date_text} - 이미 존재함")
-                        continue
-
-                    # 다운로드
-                    print(f"  ⬇️  다운로드 중: {date_text}...")
-
-                    with page.expect_download() as download_info:
-                        button.click()
-
-                    download = download_info.value
-                    download.save_as(file_path)
-
-                    downloaded_files.append(str(file_path))
-                    print(f"  ✅ 저장됨: {file_name}")
 
             except PlaywrightTimeout as e:
                 print(f"  ⚠️  타임아웃 오류: {e}")
+                self.last_error = f"타임아웃: {e}"
+                self._failure_screenshot(page, "error")
             except Exception as e:
                 print(f"  ❌ 오류 발생: {e}")
+                self.last_error = str(e)
+                self._failure_screenshot(page, "error")
                 import traceback
                 traceback.print_exc()
             finally:
+                if self.diagnostics:
+                    self._stop_tracing(context)
                 browser.close()
 
+        self.timings['total'] = time.perf_counter() - started
+        timing_text = ', '.join(f"{k} {v:.1f}초" for k, v in self.timings.items())
+        print(f"  ⏱️  {timing_text}" + (f" (lean 모드, {blocker.summary()})" if blocker else ""))
+
         return downloaded_files
@@ -0,0 +1,87 @@
+"""
+동기화 사전 점검 (브라우저/Garmin 로그인 없이 새 활동 여부 판단)
+
+판단 순서:
+1. FORCE_SYNC=1 이면 항상 전체 실행
+   재시도 시각이 되었고 파일이 남아 있는 실패 업로드(data/upload_queue.json)가 있으면 전체 실행
+2. 마지막 정상 동기화 기록(워터마크)이 없으면 전체 실행
+3. SYNC_MIN_INTERVAL_MINUTES 이내에 정상 동기화했다면 건너뜀
+4. Strava 토큰이 있으면 가벼운 API 조회 1회로 확인:
+   워터마크 이후(여유 PREFLIGHT_LOOKBACK_HOURS) 가상 라이딩 중
+   아직 보지 못한 활동이 없으면 건너뜀
+   (MyWhoosh 라이딩은 Strava에 VirtualRide로 자동 업로드됨)
+5. 확인할 방법이 없으면 안전하게 전체 실행
+"""
+import os
+from datetime import datetime, timedelta
+
+from src.strava_token_manager import get_token_manager
+
+STRAVA_ACTIVITIES_URL = "https://www.strava.com/api/v3/athlete/activities"
+PROBE_ACTIVITY_TYPES = ('VirtualRide',)
+
+
+class PreflightResult:
+    """사전 점검 결과"""
+
+    def __init__(self, run_needed, reason, seen_ids=None):
+        self.run_needed = run_needed
+        self.reason = reason
+        self.seen_ids = seen_ids  # 프로브로 확인한 Strava 활동 ID (정상 완료 시 기록)
+
+
+def probe_strava_activities(access_token, after, timeout=5):
+    """after 이후 시작한 가상 라이딩 ID 목록 (요청 1회)"""
+    import requests
+
+    response = requests.get(
+        STRAVA_ACTIVITIES_URL,
+        headers={"Authorization": f"Bearer {access_token}"},
+        params={"after": int(after.timestamp()), "per_page": 100},
+        timeout=timeout,
+    )
+    response.raise_for_status()
+    return [
+        activity['id'] for activity in response.json()
+        if activity.get('sport_type', activity.get('type')) in PROBE_ACTIVITY_TYPES
+    ]
+
+
+def check(history, upload_queue=None, now=None):
+    """전체 동기화가 필요한지 판단"""
+    now = now or datetime.now()
+
+    if os.getenv('FORCE_SYNC') == '1':
+        return PreflightResult(True, "FORCE_SYNC=1")
+
+    if upload_queue and upload_queue.has_due(now):
+        return PreflightResult(True, "재시도할 업로드 있음")
+
+    state = history.get_sync_state()
+    last_sync = state.get('last_sync')
+    if not last_sync:
+        return PreflightResult(True, "이전 동기화 기록 없음")
+    last_sync = datetime.fromisoformat(last_sync)
+
+    min_interval = int(os.getenv('SYNC_MIN_INTERVAL_MINUTES', '0'))
+    if min_interval and now - last_sync < timedelta(minutes=min_interval):
+        return PreflightResult(False, f"마지막 동기화 후 {min_interval}분이 지나지 않음 ({last_sync:%Y-%m-%d %H:%M})")
+
+    try:
+        access_token = get_token_manager().get_access_token()
+    except Exception as e:
+        return PreflightResult(True, f"Strava 토큰 갱신 실패 ({e})")
+    if not access_token:
+        return PreflightResult(True, "새 활동 확인 수단 없음 (Strava 토큰 미설정)")
+
+    lookback = timedelta(hours=int(os.getenv('PREFLIGHT_LOOKBACK_HOURS', '24')))
+    try:
+        activity_ids = probe_strava_activities(access_token, last_sync - lookback)
+    except Exception as e:
+        return PreflightResult(True, f"Strava 확인 실패 ({e})")
+
+    new_ids = set(activity_ids) - set(state.get('seen_activity_ids', []))
+    if not new_ids:
+        return PreflightResult(False, f"{last_sync:%Y-%m-%d %H:%M} 이후 새 활동 없음", activity_ids)
+
+    return PreflightResult(True, f"새 활동 {len(new_ids)}개 감지", activity_ids)
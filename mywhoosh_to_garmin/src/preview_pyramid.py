@@ -0,0 +1,238 @@
+"""
+긴 활동 그래프용 미리보기 피라미드 (채널별 min / max / mean 단계 축소)
+
+4~6시간 라이딩의 파워/심박 그래프를 그릴 때마다 전체 스트림을 읽지 않도록
+활동 파일 옆에 <이름>.preview.npz를 만들어 둡니다.
+- 채널: 파워, 심박, 케이던스, 속도, 고도 (1Hz 격자, 없는 초는 NaN)
+- 단계: 1초 / 10초 / 60초 / 300초 버킷마다 [min, max, mean] (float32)
+  (누적 reduceat으로 한 번에 계산, NaN은 무시)
+- 화면 너비 W에 맞춰 버킷이 W개 이상인 가장 거친 단계를 골라 W개로 합치므로
+  전체 보기는 활동 길이와 관계없이 O(W)
+SVG 스파크라인 썸네일(<이름>.preview.<채널>.svg)도 피라미드에서 만들어 캐시합니다.
+원본 크기/수정 시각이 바뀌면 다시 만들고, 원본이 아카이브로 옮겨져도 미리보기는 유지됩니다.
+"""
+import math
+import os
+from pathlib import Path
+
+import numpy as np
+
+from src.activity_model import Activity
+
+LEVELS = (1, 10, 60, 300)
+CHANNELS = ('power', 'heart_rate', 'cadence', 'speed', 'altitude')
+# 채널 → Strava 스트림 이름
+CHANNEL_STREAMS = {
+    'power': 'watts',
+    'heart_rate': 'heartrate',
+    'cadence': 'cadence',
+    'speed': 'velocity_smooth',
+    'altitude': 'altitude',
+}
+
+# 채널 → 스파크라인 색 (선, 범위)
+COLORS = {
+    'power': ('#d6604d', '#f4a582'),
+    'heart_rate': ('#b2182b', '#f4a6a6'),
+    'cadence': ('#2166ac', '#92c5de'),
+    'speed': ('#1b7837', '#a6dba0'),
+    'altitude': ('#5a5a5a', '#cccccc'),
+}
+
+
+def preview_path(path):
+    """활동 파일 → 미리보기 파일 경로"""
+    path = Path(path)
+    return path.with_name(path.stem + '.preview.npz')
+
+
+def thumbnail_path(path, channel):
+    path = Path(path)
+    return path.with_name(f"{path.stem}.preview.{channel}.svg")
+
+
+def to_grid(times, values):
+    """(시작 기준 초, 값) → 1Hz 배열 (없는 초 / None은 NaN)"""
+    seconds = np.asarray(times, dtype=np.int64)
+    grid = np.full(int(seconds.max()) + 1 if len(seconds) else 0, np.nan)
+    grid[seconds] = np.asarray(values[:len(seconds)], dtype=float)
+    return grid
+
+
+def reduce_buckets(minimum, maximum, total, count, size):
+    """
+    size개씩 묶어 min / max / 합계 / 개수 다시 계산
+
+    Returns:
+        tuple: (min, max, 합계, 개수) 배열
+    """
+    starts = np.arange(0, len(minimum), size)
+    return (np.fmin.reduceat(minimum, starts), np.fmax.reduceat(maximum, starts),
+            np.add.reduceat(total, starts), np.add.reduceat(count, starts))
+
+
+def _levels(values):
+    """1Hz 값 → {단계(초): float32 [3, 버킷 수] (min, max, mean)}"""
+    present = ~np.isnan(values)
+    state = (values, values, np.where(present, values, 0.0), present.astype(np.int64))
+    levels = {}
+    previous = 1
+    for seconds in LEVELS:
+        if seconds != previous:
+            state = reduce_buckets(*state, seconds // previous)
+            previous = seconds
+        minimum, maximum, total, count = state
+        mean = np.divide(total, count, out=np.full(len(total), np.nan), where=count > 0)
+        levels[seconds] = np.stack((minimum, maximum, mean)).astype(np.float32)
+    return levels
+
+
+def build_arrays(streams):
+    """StreamSet → npz에 저장할 배열"""
+    arrays = {}
+    times = streams['time']
+    duration = int(times.max()) + 1 if len(times) else 0
+    for channel in CHANNELS:
+        values = streams.get(CHANNEL_STREAMS[channel])
+        if values is None or not len(values) or np.isnan(values).all():
+            continue
+        grid = to_grid(times, values)
+        if len(grid) < duration:
+            grid = np.concatenate((grid, np.full(duration - len(grid), np.nan)))
+        for seconds, level in _levels(grid).items():
+            arrays[f"{channel}_{seconds}"] = level
+    arrays['duration'] = np.array(duration)
+    return arrays
+
+
+def build_preview(path, force=False):
+    """
+    활동 파일(FIT 또는 Strava 백업 JSON) 옆에 미리보기 피라미드 만들기
+
+    Returns:
+        Path or None: 미리보기 파일 (시계열이 없으면 None)
+    """
+    path = Path(path)
+    target = preview_path(path)
+    source = None
+    if path.exists():
+        stat = path.stat()
+        source = np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+    if target.exists() and not force:
+        if source is None:
+            return target  # 원본은 아카이브로 옮겨짐
+        with np.load(target) as stored:
+            if 'source' in stored and np.array_equal(stored['source'], source):
+                return target
+
+    activity = Activity.load(path)
+    if activity is None or 'time' not in activity.streams or not activity.streams.size('time'):
+        return None
+    arrays = build_arrays(activity.streams)
+    if source is not None:
+        arrays['source'] = source
+
+    tmp_path = target.with_name(target.stem + '.tmp.npz')
+    np.savez_compressed(tmp_path, **arrays)
+    os.replace(tmp_path, target)
+    return target
+
+
+class Preview:
+    """미리보기 파일 (요청한 채널/단계만 읽음)"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._npz = np.load(self.path)
+        self.duration = int(self._npz['duration'])
+        self.channels = [channel for channel in CHANNELS if f"{channel}_{LEVELS[0]}" in self._npz]
+
+    def close(self):
+        self._npz.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def level(self, channel, seconds):
+        """float32 [3, 버킷 수] (min, max, mean)"""
+        return self._npz[f"{channel}_{seconds}"]
+
+    def series(self, channel, width, start=0, end=None):
+        """
+        [start, end)초 구간을 width개 이하 버킷으로
+
+        Returns:
+            dict: {'bucket': 버킷 길이(초), 'start': 첫 버킷 시작(초), 'min', 'max', 'mean'}
+        """
+        end = self.duration if end is None else min(end, self.duration)
+        span = max(end - start, 1)
+        seconds = max([level for level in LEVELS if span / level >= width], default=LEVELS[0])
+        data = self.level(channel, seconds)[:, start // seconds:math.ceil(end / seconds)]
+
+        group = max(1, math.ceil(data.shape[1] / width))
+        minimum, maximum, mean = data.astype(float)
+        if group > 1:
+            present = ~np.isnan(mean)
+            minimum, maximum, total, count = reduce_buckets(
+                minimum, maximum, np.where(present, mean, 0.0), present.astype(np.int64), group)
+            mean = np.divide(total, count, out=np.full(len(total), np.nan), where=count > 0)
+        return {
+            'bucket': seconds * group,
+            'start': start // seconds * seconds,
+            'min': minimum,
+            'max': maximum,
+            'mean': mean,
+        }
+
+
+def sparkline_svg(preview, channel='power', width=160, height=32):
+    """min~max 범위 + 평균 선 SVG (채널이 없으면 None)"""
+    if channel not in preview.channels:
+        return None
+    series = preview.series(channel, width)
+    minimum, maximum, mean = series['min'], series['max'], series['mean']
+    if np.isnan(maximum).all():
+        return None
+    low = float(np.nanmin(minimum)) if channel == 'altitude' else 0.0
+    high = max(float(np.nanmax(maximum)), low + 1.0)
+
+    def y(values):
+        return height - 1 - (np.nan_to_num(values, nan=low) - low) / (high - low) * (height - 2)
+
+    step = width / len(mean)
+    x = (np.arange(len(mean)) + 0.5) * step
+
+    def points(xs, ys):
+        return ' '.join(f"{a:.1f},{b:.1f}" for a, b in zip(xs, ys))
+
+    line, band = COLORS[channel]
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+            f'viewBox="0 0 {width} {height}">'
+            f'<polygon points="{points(np.r_[x, x[::-1]], np.r_[y(maximum), y(minimum)[::-1]])}" '
+            f'fill="{band}" fill-opacity="0.5"/>'
+            f'<polyline points="{points(x, y(mean))}" fill="none" stroke="{line}" stroke-width="1"/>'
+            f'</svg>')
+
+
+def thumbnail(path, channel='power', width=160, height=32):
+    """
+    활동 파일의 스파크라인 SVG 경로 (미리보기보다 오래됐으면 다시 만듦)
+
+    Returns:
+        Path or None: 채널/시계열이 없으면 None
+    """
+    preview_file = build_preview(path)
+    if preview_file is None:
+        return None
+    target = thumbnail_path(path, channel)
+    if target.exists() and target.stat().st_mtime_ns >= preview_file.stat().st_mtime_ns:
+        return target
+    with Preview(preview_file) as preview:
+        svg = sparkline_svg(preview, channel, width, height)
+    if svg is None:
+        return None
+    target.write_text(svg, encoding='utf-8')
+    return target
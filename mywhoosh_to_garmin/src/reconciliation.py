@@ -0,0 +1,271 @@
+"""
+MyWhoosh 다운로드 / Strava 백업 / Garmin Connect 활동 대조
+
+세 곳의 활동을 (시작 시각, 경과 시간, 종목) 키로 정규화한 뒤
+시작 시각 순으로 정렬해 한 번씩만 훑는 병합 조인(sorted-merge join)으로 맞춰 봅니다.
+- 누락(missing): 기준 쪽에만 있는 활동
+- 추가(extra): 비교 대상 쪽에만 있는 활동
+- 불일치(mismatch): 시작 시각은 맞지만 경과 시간이나 종목이 다른 활동
+
+FIT/JSON 요약은 (파일 크기, 수정 시각)이 같으면 캐시에서 재사용하므로
+몇 년치 이력도 두 번째 실행부터는 파일을 다시 읽지 않습니다.
+"""
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+from src.backup_reader import scan_backup
+from src.garmin_activity_index import (DURATION_TOLERANCE, START_TOLERANCE, fit_session_summary,
+                                       garmin_activity_summary)
+
+# 종목 정규화 (알 수 없으면 None → 어느 종목과도 일치로 봄)
+FIT_SPORTS = {1: 'running', 2: 'cycling', 5: 'swimming', 11: 'walking', 17: 'hiking'}
+STRAVA_SPORTS = {
+    'Ride': 'cycling', 'VirtualRide': 'cycling', 'EBikeRide': 'cycling', 'GravelRide': 'cycling',
+    'MountainBikeRide': 'cycling', 'Run': 'running', 'VirtualRun': 'running',
+    'TrailRun': 'running', 'Swim': 'swimming', 'Walk': 'walking', 'Hike': 'hiking',
+}
+GARMIN_SPORT_KEYWORDS = (
+    ('cycling', 'cycling'), ('biking', 'cycling'), ('ride', 'cycling'),
+    ('running', 'running'), ('swimming', 'swimming'), ('walking', 'walking'), ('hiking', 'hiking'),
+)
+
+
+class SourceActivity:
+    """정규화된 활동 키 (출처, 참조, 시작 Unix 시각, 경과 시간, 종목)"""
+
+    __slots__ = ('source', 'ref', 'start', 'duration', 'sport')
+
+    def __init__(self, source, ref, start, duration, sport=None):
+        self.source = source
+        self.ref = ref
+        self.start = start
+        self.duration = duration
+        self.sport = sport
+
+    def to_dict(self):
+        return {
+            'source': self.source,
+            'ref': self.ref,
+            'start': datetime.fromtimestamp(self.start, timezone.utc).isoformat(),
+            'duration': round(self.duration),
+            'sport': self.sport,
+        }
+
+
+class ActivitySource:
+    """한 출처의 활동 목록 + 조회 범위 (범위 밖 활동은 대조에서 제외)"""
+
+    def __init__(self, name, activities, coverage=None):
+        self.name = name
+        self.activities = sorted(activities, key=lambda a: a.start)
+        self.coverage = coverage  # (시작 Unix, 끝 Unix) 또는 None (전체)
+
+    def covers(self, start):
+        return self.coverage is None or self.coverage[0] <= start <= self.coverage[1]
+
+
+def garmin_sport(type_key):
+    """Garmin activityType.typeKey → 정규화 종목"""
+    type_key = (type_key or '').lower()
+    for keyword, sport in GARMIN_SPORT_KEYWORDS:
+        if keyword in type_key:
+            return sport
+    return None
+
+
+def fit_activity_summary(file_path):
+    """
+    FIT 파일 요약 (session 메시지 우선, 없으면 record timestamp 범위)
+
+    Returns:
+        tuple or None: (start, duration, sport)
+    """
+    summary = fit_session_summary(file_path)
+    if not summary:
+        return None
+    start, duration, sport = summary
+    return start, duration, FIT_SPORTS.get(sport)
+
+
+def strava_activity_summary(file_path):
+    """Strava 백업 JSON 요약 → (start, duration, sport) 또는 None (스트림 배열은 만들지 않음)"""
+    activity = scan_backup(Path(file_path).read_bytes()).get('activity', {})
+    start_date = activity.get('start_date')
+    if not start_date:
+        return None
+    start = datetime.fromisoformat(start_date.replace('Z', '+00:00')).timestamp()
+    duration = activity.get('elapsed_time') or activity.get('moving_time') or 0
+    sport = STRAVA_SPORTS.get(activity.get('sport_type') or activity.get('type'))
+    return start, float(duration), sport
+
+
+class SummaryCache:
+    """파일 요약 캐시 (경로 → 크기, 수정 시각, 요약)"""
+
+    def __init__(self, cache_file=None, restore=tuple):
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.restore = restore  # JSON에서 읽은 요약 → 원래 형태
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        if self.cache_file and self.cache_file.exists():
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    def summary(self, file_path, summarize):
+        """캐시된 요약 (파일이 바뀌었으면 summarize로 다시 계산)"""
+        stat = file_path.stat()
+        key = str(file_path.resolve())
+        cached = self.entries.get(key)
+        if cached and cached['size'] == stat.st_size and cached['mtime'] == stat.st_mtime_ns:
+            self.hits += 1
+            return self.restore(cached['summary']) if cached['summary'] else None
+
+        self.misses += 1
+        try:
+            summary = summarize(file_path)
+        except (OSError, ValueError) as e:
+            print(f"  ⚠️  요약 실패: {file_path.name} - {e}")
+            summary = None
+        self.entries[key] = {'size': stat.st_size, 'mtime': stat.st_mtime_ns,
+                             'summary': summary or None}
+        return summary
+
+    def save(self):
+        """캐시 파일 저장 (임시 파일 → 교체)"""
+        if not self.cache_file or not self.misses:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.cache_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_file, self.cache_file)
+
+
+def load_directory(name, directory, pattern, summarize, cache=None):
+    """폴더의 파일들을 요약하여 ActivitySource로"""
+    cache = cache or SummaryCache()
+    activities = []
+    directory = Path(directory)
+    for file_path in sorted(directory.glob(pattern)):
+        summary = cache.summary(file_path, summarize)
+        if summary:
+            # 계정별 하위 폴더의 같은 날짜 파일을 구분하도록 폴더 기준 상대 경로로 표시
+            activities.append(SourceActivity(name, file_path.relative_to(directory).as_posix(), *summary))
+    return ActivitySource(name, activities)
+
+
+def load_mywhoosh(directory, cache=None):
+    """downloads/의 FIT 파일 (계정별 하위 폴더 포함)"""
+    return load_directory('mywhoosh', directory, '**/*.fit', fit_activity_summary, cache)
+
+
+def load_strava(directory, cache=None):
+    """strava_data/의 Strava 백업 JSON"""
+    return load_directory('strava', directory, '*_activity.json', strava_activity_summary, cache)
+
+
+def load_garmin_index(cache_file):
+    """
+    GarminActivityIndex 캐시 파일 (종목 정보 없음, 캐시가 조회한 기간만 대조)
+
+    Returns:
+        ActivitySource or None: 캐시 파일이 없으면 None
+    """
+    cache_file = Path(cache_file)
+    if not cache_file.exists():
+        return None
+    with open(cache_file, 'r', encoding='utf-8') as f:
+        cache = json.load(f)
+    activities = [SourceActivity('garmin', activity_id, start, duration)
+                  for start, duration, activity_id in cache['activities']]
+    coverage = (datetime.fromisoformat(cache['window_start']).timestamp(),
+                datetime.fromisoformat(cache['fetched_at']).timestamp())
+    return ActivitySource('garmin', activities, coverage)
+
+
+def load_garmin_activities(garmin, start_date, end_date):
+    """Garmin Connect 활동 목록 조회 (날짜 범위 전체, 종목 포함)"""
+    activities = []
+    for activity in garmin.get_activities_by_date(start_date.strftime('%Y-%m-%d'),
+                                                  end_date.strftime('%Y-%m-%d')) or []:
+        summary = garmin_activity_summary(activity)
+        if summary:
+            start, duration, activity_id, type_key = summary
+            activities.append(SourceActivity('garmin', activity_id, start, duration, garmin_sport(type_key)))
+    # 범위 끝 날짜 하루 전체 포함
+    coverage = (start_date.timestamp(), end_date.timestamp() + 86400)
+    return ActivitySource('garmin', activities, coverage)
+
+
+def merge_join(left, right, tolerance=START_TOLERANCE):
+    """
+    시작 시각 순으로 정렬된 두 목록을 허용 오차 안에서 1:1로 맞춤
+
+    left를 한 번 훑으면서 right 쪽 창(window)의 시작 위치만 앞으로 옮기므로
+    O(n + m + 창 안의 후보 수)입니다. 후보가 여러 개면 시작 시각이 가장 가까운 것을 고릅니다.
+
+    Returns:
+        tuple: ([(left, right), ...], 짝이 없는 left 목록, 짝이 없는 right 목록)
+    """
+    pairs = []
+    unmatched_left = []
+    used = [False] * len(right)
+    low = 0
+    for item in left:
+        while low < len(right) and right[low].start < item.start - tolerance:
+            low += 1
+        best = None
+        index = low
+        while index < len(right) and right[index].start <= item.start + tolerance:
+            if not used[index] and (best is None or
+                                    abs(right[index].start - item.start) < abs(right[best].start - item.start)):
+                best = index
+            index += 1
+        if best is None:
+            unmatched_left.append(item)
+        else:
+            used[best] = True
+            pairs.append((item, right[best]))
+    unmatched_right = [other for other, matched in zip(right, used) if not matched]
+    return pairs, unmatched_left, unmatched_right
+
+
+def mismatch_reasons(left, right):
+    """짝지어진 두 활동의 차이 (경과 시간/종목)"""
+    reasons = []
+    if abs(left.duration - right.duration) > max(DURATION_TOLERANCE, left.duration * 0.02):
+        reasons.append(f"경과 시간 {left.duration:.0f}초 ≠ {right.duration:.0f}초")
+    if left.sport and right.sport and left.sport != right.sport:
+        reasons.append(f"종목 {left.sport} ≠ {right.sport}")
+    return reasons
+
+
+def reconcile(reference, other, tolerance=START_TOLERANCE):
+    """
+    기준 출처와 비교 대상 출처 대조 (두 출처의 조회 범위가 겹치는 활동만)
+
+    Returns:
+        dict: {'matched': 개수, 'missing': [...], 'extra': [...], 'mismatch': [...]}
+    """
+    left = [a for a in reference.activities if other.covers(a.start)]
+    right = [a for a in other.activities if reference.covers(a.start)]
+    pairs, missing, extra = merge_join(left, right, tolerance)
+
+    mismatch = []
+    for ref_activity, other_activity in pairs:
+        reasons = mismatch_reasons(ref_activity, other_activity)
+        if reasons:
+            mismatch.append({'reference': ref_activity.to_dict(), 'other': other_activity.to_dict(),
+                             'reasons': reasons})
+
+    return {
+        'reference': reference.name,
+        'other': other.name,
+        'matched': len(pairs),
+        'missing': [a.to_dict() for a in missing],
+        'extra': [a.to_dict() for a in extra],
+        'mismatch': mismatch,
+    }
@@ -0,0 +1,148 @@
+"""
+Strava 활동 스트림 조회 (해상도 / 기준 축 / 키 선택 + 응답 캐시)
+
+GET /activities/{id}/streams는 기본적으로 요청한 모든 스트림을 전체 해상도로 돌려줍니다.
+포인트 수나 미리보기만 필요하면 더 싼 요청으로 충분합니다.
+- resolution: 'low'(~100), 'medium'(~1000), 'high'(~10000 포인트). None이면 전체
+- series_type: 다운샘플 기준 축 ('time' 또는 'distance')
+- keys: 필요한 스트림만 (None이면 STREAM_TYPES 전체)
+
+줄인 해상도에서도 각 스트림의 original_size에 원래 포인트 수가 들어 있습니다.
+
+응답은 (활동, 키, 해상도, 기준 축)별로 캐시합니다.
+이미 더 많은 키로 받아 둔 같은 해상도 응답이 있으면 그 안에서 골라 돌려줍니다.
+"""
+import json
+import os
+from pathlib import Path
+
+STRAVA_API_URL = "https://www.strava.com/api/v3"
+
+STREAM_TYPES = [
+    'time', 'latlng', 'distance', 'altitude', 'velocity_smooth',
+    'heartrate', 'cadence', 'watts', 'temp', 'moving', 'grade_smooth'
+]
+RESOLUTIONS = ('low', 'medium', 'high')
+SERIES_TYPES = ('time', 'distance')
+
+# 포인트 수/필드 목록만 필요한 비교·목록 작업용 (모든 키, 최저 해상도)
+SUMMARY_TIER = {'resolution': 'low', 'series_type': 'time'}
+
+STREAM_CACHE_DIR = Path(__file__).parent.parent / "data" / "stream_cache"
+
+
+def stream_params(keys=None, resolution=None, series_type=None):
+    """
+    streams 요청 파라미터
+
+    Raises:
+        ValueError: 알 수 없는 키/해상도/기준 축
+    """
+    keys = list(keys) if keys else list(STREAM_TYPES)
+    unknown = [key for key in keys if key not in STREAM_TYPES]
+    if unknown:
+        raise ValueError(f"알 수 없는 스트림: {', '.join(unknown)} (가능: {', '.join(STREAM_TYPES)})")
+    if resolution is not None and resolution not in RESOLUTIONS:
+        raise ValueError(f"알 수 없는 해상도: {resolution} (가능: {', '.join(RESOLUTIONS)})")
+    if series_type is not None and series_type not in SERIES_TYPES:
+        raise ValueError(f"알 수 없는 기준 축: {series_type} (가능: {', '.join(SERIES_TYPES)})")
+
+    params = {"keys": ','.join(keys), "key_by_type": True}
+    if resolution:
+        params["resolution"] = resolution
+    if series_type:
+        params["series_type"] = series_type
+    return params
+
+
+def stream_points(stream):
+    """스트림의 원래 포인트 수 (해상도를 줄였어도 original_size 사용)"""
+    return stream.get('original_size') or len(stream.get('data', []))
+
+
+class StreamCache:
+    """
+    스트림 응답 캐시
+
+    directory가 없으면 메모리에만 (한 번 실행하는 동안 같은 활동을 두 번 받지 않도록),
+    있으면 파일로도 저장합니다 (반복 실행하는 대량 점검용).
+    """
+
+    def __init__(self, directory=None):
+        self.directory = Path(directory) if directory else None
+        self.entries = {}   # (활동 ID, 해상도, 기준 축) → [(키 집합, 스트림)]
+        self.hits = 0
+        self.misses = 0
+
+    def _file(self, activity_id, resolution, series_type, keys):
+        return self.directory / (f"{activity_id}_{resolution or 'all'}_{series_type or 'default'}_"
+                                 f"{'-'.join(sorted(keys))}.json")
+
+    def _load_files(self, slot):
+        """디스크에 있는 같은 (활동, 해상도, 기준 축) 응답 불러오기"""
+        activity_id, resolution, series_type = slot
+        responses = []
+        pattern = f"{activity_id}_{resolution or 'all'}_{series_type or 'default'}_*.json"
+        for path in self.directory.glob(pattern):
+            keys = frozenset(path.stem.split('_', 3)[3].split('-'))
+            with open(path, 'r', encoding='utf-8') as f:
+                responses.append((keys, json.load(f)))
+        return responses
+
+    def get(self, activity_id, keys, resolution=None, series_type=None):
+        """캐시된 응답 (요청한 키를 모두 포함한 응답에서 골라냄) 또는 None"""
+        slot = (str(activity_id), resolution, series_type)
+        if slot not in self.entries:
+            self.entries[slot] = self._load_files(slot) if self.directory else []
+        wanted = frozenset(keys)
+        for cached_keys, streams in self.entries[slot]:
+            if wanted <= cached_keys:
+                self.hits += 1
+                return {name: stream for name, stream in streams.items() if name in wanted}
+        self.misses += 1
+        return None
+
+    def put(self, activity_id, keys, streams, resolution=None, series_type=None):
+        slot = (str(activity_id), resolution, series_type)
+        self.entries.setdefault(slot, []).append((frozenset(keys), streams))
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self._file(activity_id, resolution, series_type, keys)
+            tmp_path = path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(streams, f)
+            os.replace(tmp_path, path)
+
+
+def fetch_streams(get, activity_id, keys=None, resolution=None, series_type=None, cache=None):
+    """
+    활동 스트림 조회
+
+    Args:
+        get: 인증된 GET 함수 (StravaTokenManager.get)
+        keys: 받을 스트림 (None이면 전체)
+        resolution: 'low'/'medium'/'high' (None이면 전체 해상도)
+        series_type: 'time'/'distance'
+        cache: StreamCache (None이면 캐시 사용 안 함)
+
+    Returns:
+        dict: {스트림 이름: {data, original_size, resolution, series_type}}
+        (활동에 없는 스트림은 빠짐)
+
+    Raises:
+        requests.HTTPError: API 오류
+    """
+    params = stream_params(keys, resolution, series_type)
+    keys = params["keys"].split(',')
+    if cache is not None:
+        cached = cache.get(activity_id, keys, resolution, series_type)
+        if cached is not None:
+            return cached
+
+    response = get(f"{STRAVA_API_URL}/activities/{activity_id}/streams", params=params)
+    response.raise_for_status()
+    streams = response.json()
+
+    if cache is not None:
+        cache.put(activity_id, keys, streams, resolution, series_type)
+    return streams
@@ -0,0 +1,177 @@
+"""
+Strava 토큰 관리자
+
+- access/refresh 토큰과 expires_at을 로컬 파일(.strava_token.json)에 저장
+- 만료 몇 분 전에 미리 갱신 (401을 받고 나서야 알아차리지 않도록)
+- 스레드 잠금 + 파일 잠금(fcntl)으로 여러 스레드/프로세스가 동시에 써도
+  갱신은 한 번만 일어나고 나머지는 갱신된 토큰을 다시 읽어 사용
+
+처음 실행 시 토큰 파일이 없으면 .env의 STRAVA_ACCESS_TOKEN / STRAVA_REFRESH_TOKEN으로
+시작하고, 갱신에는 STRAVA_CLIENT_ID / STRAVA_CLIENT_SECRET이 필요합니다.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 스레드 잠금만 사용
+    fcntl = None
+
+TOKEN_URL = "https://www.strava.com/oauth/token"
+DEFAULT_TOKEN_FILE = Path(__file__).parent.parent / ".strava_token.json"
+
+# 같은 파일을 쓰는 관리자 인스턴스끼리 공유하는 스레드 잠금
+_thread_locks = {}
+_thread_locks_guard = threading.Lock()
+
+
+def _thread_lock_for(path):
+    """토큰 파일 경로별 스레드 잠금"""
+    with _thread_locks_guard:
+        return _thread_locks.setdefault(str(path), threading.Lock())
+
+
+class StravaTokenManager:
+    """만료 시각을 보고 미리 갱신하는 Strava 토큰 관리자"""
+
+    def __init__(self, token_file=None, client_id=None, client_secret=None, refresh_margin=300):
+        self.token_file = Path(token_file or os.getenv('STRAVA_TOKEN_FILE') or DEFAULT_TOKEN_FILE)
+        self.lock_file = self.token_file.with_name(self.token_file.name + '.lock')
+        self.client_id = client_id or os.getenv('STRAVA_CLIENT_ID')
+        self.client_secret = client_secret or os.getenv('STRAVA_CLIENT_SECRET')
+        self.refresh_margin = refresh_margin
+        self._thread_lock = _thread_lock_for(self.token_file)
+        self._token = None
+
+    @contextmanager
+    def _locked(self):
+        """스레드 잠금 + 프로세스 간 파일 잠금"""
+        with self._thread_lock:
+            if fcntl is None:
+                yield
+                return
+            self.lock_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.lock_file, 'a') as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _load(self):
+        """토큰 파일 로드 (없으면 환경 변수로 시작)"""
+        if self.token_file.exists():
+            with open(self.token_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+
+        access_token = os.getenv('STRAVA_ACCESS_TOKEN')
+        refresh_token = os.getenv('STRAVA_REFRESH_TOKEN')
+        if not access_token and not refresh_token:
+            return None
+        # 만료 시각을 모르므로 갱신 가능하면 바로 갱신되도록 0으로 둠
+        return {'access_token': access_token, 'refresh_token': refresh_token, 'expires_at': 0}
+
+    def _save(self, token):
+        """토큰 파일 저장 (임시 파일 → 교체, 본인만 읽기 가능)"""
+        self.token_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.token_file.with_name(self.token_file.name + '.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(token, f, indent=2)
+        os.chmod(tmp_file, 0o600)
+        os.replace(tmp_file, self.token_file)
+
+    def _is_fresh(self, token):
+        """만료까지 refresh_margin 이상 남았는지"""
+        return bool(token and token.get('access_token')) and \
+            token.get('expires_at', 0) - self.refresh_margin > time.time()
+
+    def _can_refresh(self, token):
+        """갱신에 필요한 정보가 모두 있는지"""
+        return bool(token and token.get('refresh_token') and self.client_id and self.client_secret)
+
+    def _request_refresh(self, refresh_token):
+        """Strava OAuth 토큰 갱신 요청"""
+        import requests
+
+        response = requests.post(TOKEN_URL, data={
+            'client_id': self.client_id,
+            'client_secret': self.client_secret,
+            'refresh_token': refresh_token,
+            'grant_type': 'refresh_token'
+        }, timeout=30)
+        response.raise_for_status()
+        data = response.json()
+        return {
+            'access_token': data['access_token'],
+            'refresh_token': data['refresh_token'],
+            'expires_at': data['expires_at'],
+        }
+
+    def get_access_token(self):
+        """유효한 access token 반환 (만료 임박 시 갱신, 설정이 없으면 None)"""
+        # 메모리에 있는 토큰이 충분히 유효하면 잠금 없이 반환
+        token = self._token
+        if self._is_fresh(token):
+            return token['access_token']
+
+        with self._locked():
+            # 다른 스레드/프로세스가 이미 갱신했을 수 있으므로 파일을 다시 읽음
+            token = self._load()
+            if not self._is_fresh(token) and self._can_refresh(token):
+                token = self._request_refresh(token['refresh_token'])
+                self._save(token)
+            self._token = token
+
+        return token.get('access_token') if token else None
+
+    def refresh(self, stale_access_token=None):
+        """
+        만료 여부와 관계없이 즉시 갱신 (401을 받았을 때 등)
+
+        stale_access_token을 주면, 그 사이 다른 스레드/프로세스가 이미
+        새 토큰으로 바꿔 둔 경우 다시 갱신하지 않고 그 토큰을 사용합니다.
+        """
+        with self._locked():
+            token = self._load()
+            if stale_access_token and token and token.get('access_token') != stale_access_token \
+                    and self._is_fresh(token):
+                self._token = token
+                return token
+            if not self._can_refresh(token):
+                raise RuntimeError("STRAVA_REFRESH_TOKEN, STRAVA_CLIENT_ID, STRAVA_CLIENT_SECRET이 필요합니다.")
+            token = self._request_refresh(token['refresh_token'])
+            self._save(token)
+            self._token = token
+        return token
+
+    def auth_headers(self):
+        """Authorization 헤더"""
+        return {"Authorization": f"Bearer {self.get_access_token()}"}
+
+    def get(self, url, **kwargs):
+        """인증된 GET 요청 (그래도 401이면 한 번 강제 갱신 후 재시도)"""
+        import requests
+
+        access_token = self.get_access_token()
+        response = requests.get(url, headers={"Authorization": f"Bearer {access_token}"}, **kwargs)
+        if response.status_code == 401 and self._can_refresh(self._token):
+            self.refresh(stale_access_token=access_token)
+            response = requests.get(url, headers=self.auth_headers(), **kwargs)
+        return response
+
+
+_default_manager = None
+_default_manager_guard = threading.Lock()
+
+
+def get_token_manager():
+    """프로세스 전체에서 공유하는 기본 토큰 관리자"""
+    global _default_manager
+    with _default_manager_guard:
+        if _default_manager is None:
+            _default_manager = StravaTokenManager()
+        return _default_manager
@@ -0,0 +1,237 @@
+"""
+GPX 내보내기 전 트랙 단순화 / 시간 간격 솎아내기 (numpy)
+
+1Hz 포인트를 모두 <trkpt>로 쓰면 장거리 라이딩 GPX가 수 MB가 되므로,
+직렬화 전에 남길 포인트 인덱스를 고릅니다.
+- 'rdp':         Ramer–Douglas–Peucker. 남긴 선에서 tolerance(m)보다 멀어지는 포인트만 추가
+- 'visvalingam': 이웃 두 점과 만드는 삼각형 면적이 tolerance²(m²)보다 작은 포인트부터 제거
+- interval:      interval초마다 1개 + 구간별 파워/심박 최고점은 항상 유지
+
+위경도는 활동 중심 기준 평면(m)으로 바꾸고 고도를 세 번째 축으로 사용합니다.
+결과 리포트에는 원래 포인트에서 단순화된 선까지의 거리(최대/평균, m)가 들어갑니다.
+"""
+import numpy as np
+
+EARTH_RADIUS = 6371000.0
+METHODS = ('rdp', 'visvalingam')
+PEAK_STREAMS = ('watts', 'heartrate')
+
+
+def _stream(streams, name):
+    """Strava 스트림 딕셔너리 또는 StreamSet에서 값 배열"""
+    stream = streams.get(name)
+    if stream is None:
+        return []
+    return stream.get('data', []) if isinstance(stream, dict) else stream
+
+
+def track_points(latlng, altitude=None):
+    """
+    위경도(+고도) → 활동 중심 기준 평면 좌표 (N×3, m)
+
+    수십~수백 km 범위에서는 등장방형 근사 오차가 단순화 허용 오차보다 훨씬 작습니다.
+    """
+    coords = np.asarray(latlng, dtype=float).reshape(-1, 2)
+    lat = np.radians(coords[:, 0])
+    lng = np.radians(coords[:, 1])
+    lat0 = lat.mean() if len(lat) else 0.0
+    lng0 = lng.mean() if len(lng) else 0.0
+    points = np.zeros((len(coords), 3))
+    points[:, 0] = (lng - lng0) * np.cos(lat0) * EARTH_RADIUS
+    points[:, 1] = (lat - lat0) * EARTH_RADIUS
+    if altitude is not None and len(altitude) == len(coords):
+        points[:, 2] = np.nan_to_num(np.asarray(altitude, dtype=float))
+    return points
+
+
+def segment_distances(points, start, end):
+    """각 점에서 선분 start→end까지의 거리 (start/end는 점 1개 또는 점마다 1개)"""
+    direction = end - start
+    length_sq = np.einsum('...i,...i->...', direction, direction)
+    offset = points - start
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t = np.einsum('...i,...i->...', offset, direction) / length_sq
+    t = np.clip(np.nan_to_num(t), 0.0, 1.0)
+    nearest = start + t[..., None] * direction
+    return np.linalg.norm(points - nearest, axis=-1)
+
+
+def rdp_mask(points, tolerance):
+    """Ramer–Douglas–Peucker (구간별 거리 계산은 벡터화, 구간 분할은 스택)"""
+    count = len(points)
+    keep = np.zeros(count, dtype=bool)
+    if count <= 2:
+        keep[:] = True
+        return keep
+    keep[0] = keep[-1] = True
+
+    stack = [(0, count - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        distances = segment_distances(points[first + 1:last], points[first], points[last])
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            middle = first + 1 + farthest
+            keep[middle] = True
+            stack.append((first, middle))
+            stack.append((middle, last))
+    return keep
+
+
+def visvalingam_mask(points, tolerance):
+    """
+    Visvalingam–Whyatt (면적 tolerance² 미만 제거)
+
+    한 번에 하나씩 지우는 대신, 면적이 기준 미만이면서 양옆보다 작은 포인트를
+    한 라운드에 모두 지우고 이웃 면적을 다시 계산합니다 (이웃한 두 점이 같은 라운드에 지워지지 않음).
+    """
+    count = len(points)
+    keep = np.zeros(count, dtype=bool)
+    remaining = np.arange(count)
+    min_area = tolerance ** 2
+
+    while len(remaining) > 2:
+        prev_points = points[remaining[:-2]]
+        cur_points = points[remaining[1:-1]]
+        next_points = points[remaining[2:]]
+        area = 0.5 * np.linalg.norm(np.cross(cur_points - prev_points, next_points - prev_points), axis=1)
+
+        left = np.r_[np.inf, area[:-1]]
+        right = np.r_[area[1:], np.inf]
+        remove = (area < min_area) & (area <= left) & (area < right)
+        if not remove.any():
+            break
+        remaining = np.r_[remaining[0], remaining[1:-1][~remove], remaining[-1]]
+
+    keep[remaining] = True
+    return keep
+
+
+def decimation_mask(times, interval, peak_values=()):
+    """
+    interval초 구간마다 첫 포인트 + 구간별 최고값 포인트 (파워/심박 피크 유지)
+
+    Args:
+        times: 시작 기준 초 (오름차순)
+        peak_values: 최고점을 남길 값 배열들 (times와 같은 길이, 없는 값은 NaN)
+    """
+    times = np.asarray(times, dtype=float)
+    count = len(times)
+    keep = np.zeros(count, dtype=bool)
+    if count == 0:
+        return keep
+
+    buckets = np.floor(times / interval).astype(np.int64)
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    keep[starts] = True
+    keep[-1] = True
+
+    positions = np.arange(count)
+    for values in peak_values:
+        values = np.nan_to_num(np.asarray(values, dtype=float), nan=-np.inf)
+        if len(values) != count:
+            continue
+        bucket_max = np.repeat(np.maximum.reduceat(values, starts), np.diff(np.r_[starts, count]))
+        # 최고값이 여러 번 나오면 구간에서 처음 나온 포인트만
+        first_max = np.minimum.reduceat(np.where(values == bucket_max, positions, count), starts)
+        keep[first_max[first_max < count]] = True
+    return keep
+
+
+def geometric_error(points, keep):
+    """원래 포인트에서 단순화된 선까지의 거리 (각 포인트, m)"""
+    kept = np.flatnonzero(keep)
+    if len(kept) < 2:
+        return np.zeros(len(points))
+    segment = np.clip(np.searchsorted(kept, np.arange(len(points)), side='right') - 1, 0, len(kept) - 2)
+    return segment_distances(points, points[kept[segment]], points[kept[segment + 1]])
+
+
+def track_length(points):
+    """평면 좌표 경로 길이 (고도 제외, m)"""
+    if len(points) < 2:
+        return 0.0
+    return float(np.linalg.norm(np.diff(points[:, :2], axis=0), axis=1).sum())
+
+
+def simplify_track(streams, method=None, tolerance=5.0, interval=None):
+    """
+    Strava 스트림에서 GPX로 쓸 포인트 인덱스 선택
+
+    method와 interval을 함께 주면 두 결과를 합칩니다 (모양 + 일정 간격 + 피크).
+
+    Args:
+        streams: Strava 스트림 딕셔너리 또는 StreamSet (latlng 필수)
+        method: 'rdp', 'visvalingam' 또는 None
+        tolerance: 허용 거리 (m)
+        interval: 시간 간격 솎아내기 (초, None이면 사용 안 함)
+
+    Returns:
+        tuple: (남길 인덱스 배열, 리포트 딕셔너리)
+    """
+    if method is not None and method not in METHODS:
+        raise ValueError(f"알 수 없는 단순화 방법: {method} (가능: {', '.join(METHODS)})")
+
+    latlng = _stream(streams, 'latlng')
+    altitude = _stream(streams, 'altitude')
+    points = track_points(latlng, altitude)
+    count = len(points)
+
+    if method is None and not interval:
+        keep = np.ones(count, dtype=bool)
+    else:
+        keep = np.zeros(count, dtype=bool)
+        if method == 'rdp':
+            keep |= rdp_mask(points, tolerance)
+        elif method == 'visvalingam':
+            keep |= visvalingam_mask(points, tolerance)
+        if interval:
+            times = _stream(streams, 'time')
+            times = times if len(times) == count else range(count)
+            peak_values = [_stream(streams, name)[:count] for name in PEAK_STREAMS]
+            keep |= decimation_mask(times, interval, peak_values)
+
+    errors = geometric_error(points, keep)
+    original_length = track_length(points)
+    report = {
+        'method': method,
+        'tolerance': tolerance,
+        'interval': interval,
+        'points': count,
+        'kept': int(keep.sum()),
+        'max_error_m': float(errors.max()) if count else 0.0,
+        'mean_error_m': float(errors.mean()) if count else 0.0,
+        'length_m': original_length,
+        'simplified_length_m': track_length(points[keep]),
+        'peaks': {},
+    }
+    for name in PEAK_STREAMS:
+        values = np.asarray(_stream(streams, name)[:count], dtype=float)
+        if len(values) == count and count and not np.isnan(values).all():
+            report['peaks'][name] = (float(np.nanmax(values)), float(np.nanmax(values[keep])))
+
+    return np.flatnonzero(keep), report
+
+
+def format_report(report):
+    """리포트 출력용 문자열 목록"""
+    if report['kept'] == report['points']:
+        return [f"  포인트 수: {report['points']:,} (단순화 안 함)"]
+    settings = []
+    if report['method']:
+        settings.append(f"{report['method']} {report['tolerance']:g}m")
+    if report['interval']:
+        settings.append(f"{report['interval']:g}초 간격")
+    ratio = report['kept'] / report['points'] * 100 if report['points'] else 0
+    lines = [
+        f"  단순화 ({', '.join(settings)}): {report['points']:,} → {report['kept']:,} 포인트 ({ratio:.1f}%)",
+        f"  위치 오차: 최대 {report['max_error_m']:.1f}m, 평균 {report['mean_error_m']:.2f}m",
+    ]
+    if report['length_m']:
+        lines.append(f"  경로 길이: {report['length_m'] / 1000:.2f}km → "
+                     f"{report['simplified_length_m'] / 1000:.2f}km")
+    for name, (original, kept) in report['peaks'].items():
+        lines.append(f"  {name} 최고값: {original:.0f} → {kept:.0f}")
+    return lines
@@ -0,0 +1,274 @@
+"""
+훈련 부하 (CTL / ATL / TSB) 증분 관리
+
+동기화할 때 새로 받은 FIT 파일마다 부하(TSS)를 계산해 일별 부하에 더하고,
+지수 가중 평균으로 체력(CTL, 42일)과 피로(ATL, 7일)를 이어서 계산합니다.
+- 활동 부하: 파워가 있으면 NP 기반 TSS, 없으면 평균 심박 기반 hrTSS
+- 일반적인 경우 마지막 계산일 이후 날짜만 계산 (O(지난 일수))
+- 과거 날짜 활동이 늦게 들어오거나 삭제되면 그 날짜부터만 다시 계산
+- TSB(컨디션) = 전날 CTL - 전날 ATL
+
+GitHub Actions에서는 downloads/가 매번 비어 있으므로 활동별 부하와 일별 시계열을
+data/training_load.json에 저장하고 이력처럼 커밋합니다.
+
+설정 (환경 변수):
+    TRAINING_FTP   기능적 역치 파워 (W, 기본 200)
+    TRAINING_LTHR  젖산 역치 심박 (bpm, 기본 170)
+"""
+import json
+import math
+import os
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from src.analytics_store import parse_fit
+
+CTL_DAYS = 42
+ATL_DAYS = 7
+NP_WINDOW = 30      # 정규화 파워 이동 평균 (초, 1Hz 기준 샘플 수)
+DEFAULT_FTP = 200
+DEFAULT_LTHR = 170
+
+
+def env_number(name, default):
+    """숫자 환경 변수 읽기 (숫자가 아니면 경고 후 기본값)"""
+    value = os.getenv(name)
+    try:
+        return float(value) if value else default
+    except ValueError:
+        print(f"⚠️  {name} 값이 숫자가 아님: {value} (기본값 {default} 사용)")
+        return default
+
+
+def normalized_power(watts):
+    """정규화 파워 (30초 이동 평균의 4제곱 평균의 4제곱근, 짧으면 평균 파워)"""
+    watts = np.nan_to_num(np.asarray(watts, dtype=float))
+    if len(watts) < NP_WINDOW:
+        return float(watts.mean()) if len(watts) else 0.0
+    cumsum = np.concatenate(([0.0], np.cumsum(watts)))
+    rolling = (cumsum[NP_WINDOW:] - cumsum[:-NP_WINDOW]) / NP_WINDOW
+    return float(np.mean(rolling ** 4) ** 0.25)
+
+
+def activity_load(summary, columns, ftp=DEFAULT_FTP, lthr=DEFAULT_LTHR):
+    """
+    활동 부하 계산
+
+    Args:
+        summary: parse_fit 요약 (moving_time, elapsed_time, avg_heart_rate)
+        columns: parse_fit 컬럼 (power)
+
+    Returns:
+        tuple: (부하, 'power'/'hr') 또는 (None, None) (파워/심박 모두 없음)
+    """
+    seconds = summary.get('moving_time') or summary.get('elapsed_time') or 0
+    watts = columns.get('power') or []
+    if seconds and any(watts):
+        intensity = normalized_power(watts) / ftp
+        return seconds * intensity ** 2 / 3600 * 100, 'power'
+    heart_rate = summary.get('avg_heart_rate')
+    if seconds and heart_rate:
+        return seconds / 3600 * (heart_rate / lthr) ** 2 * 100, 'hr'
+    return None, None
+
+
+class TrainingLoad:
+    """활동별 부하 + 일별 부하/CTL/ATL 시계열"""
+
+    def __init__(self, data_dir=None, ftp=None, lthr=None):
+        self.data_dir = Path(data_dir) if data_dir else Path(__file__).parent.parent / "data"
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.state_file = self.data_dir / "training_load.json"
+        self.ftp = ftp or env_number('TRAINING_FTP', DEFAULT_FTP)
+        self.lthr = lthr or env_number('TRAINING_LTHR', DEFAULT_LTHR)
+
+        self.activities = {}    # 파일명 → {date, load, method, size}
+        self.start = None       # 시계열 첫 날짜 (date)
+        self.load = []          # 일별 부하 (start부터)
+        self.ctl = []           # 계산된 날까지만 (len(ctl) <= len(load), 이어서 계산하도록 반올림하지 않음)
+        self.atl = []
+        self.dirty_from = None  # 다시 계산할 첫 인덱스
+        self._load_state()
+
+    def _load_state(self):
+        """상태 파일 로드"""
+        if not self.state_file.exists():
+            return
+        with open(self.state_file, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        self.activities = state.get('activities', {})
+        daily = state.get('daily', {})
+        if daily.get('start'):
+            self.start = date.fromisoformat(daily['start'])
+            self.load = daily.get('load', [])
+            self.ctl = daily.get('ctl', [])
+            self.atl = daily.get('atl', [])
+        self.dirty_from = state.get('dirty_from')
+
+    def save(self):
+        """상태 파일 저장 (임시 파일 → 교체)"""
+        tmp_file = self.state_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'updated_at': datetime.now().isoformat(),
+                'ftp': self.ftp,
+                'lthr': self.lthr,
+                'dirty_from': self.dirty_from,
+                'daily': {
+                    'start': self.start.isoformat() if self.start else None,
+                    'load': self.load,
+                    'ctl': self.ctl,
+                    'atl': self.atl,
+                },
+                'activities': self.activities,
+            }, f, indent=1, ensure_ascii=False)
+        os.replace(tmp_file, self.state_file)
+
+    def _mark_dirty(self, index):
+        self.dirty_from = index if self.dirty_from is None else min(self.dirty_from, index)
+
+    def _day_index(self, day):
+        """날짜 → 시계열 인덱스 (시계열보다 앞 날짜면 앞쪽을 늘리고 전체 재계산)"""
+        if self.start is None:
+            self.start = day
+        if day < self.start:
+            shift = (self.start - day).days
+            self.load = [0.0] * shift + self.load
+            self.ctl, self.atl = [], []
+            self.start = day
+            self.dirty_from = 0
+        index = (day - self.start).days
+        if index >= len(self.load):
+            self.load.extend([0.0] * (index + 1 - len(self.load)))
+        return index
+
+    def _add_to_day(self, day, load):
+        index = self._day_index(day)
+        self.load[index] = round(max(0.0, self.load[index] + load), 1)
+        self._mark_dirty(index)
+
+    def add_activity(self, name, day, load, method=None, size=None):
+        """
+        활동 부하 기록 (같은 파일명이 이미 있으면 교체)
+
+        Returns:
+            bool: 시계열이 바뀌었으면 True
+        """
+        load = round(load, 1)
+        previous = self.activities.get(name)
+        if previous and previous['date'] == day.isoformat() and previous['load'] == load:
+            previous['size'] = size
+            return False
+        if previous:
+            self._add_to_day(date.fromisoformat(previous['date']), -previous['load'])
+        self._add_to_day(day, load)
+        self.activities[name] = {'date': day.isoformat(), 'load': load, 'method': method, 'size': size}
+        return True
+
+    def remove_activity(self, name):
+        """삭제된 활동의 부하 제거 (그 날짜부터 다시 계산)"""
+        previous = self.activities.pop(name, None)
+        if previous is None:
+            return False
+        self._add_to_day(date.fromisoformat(previous['date']), -previous['load'])
+        return True
+
+    def add_file(self, file_path):
+        """
+        FIT 파일 부하 기록 (같은 파일명·크기로 이미 기록했으면 읽지 않음)
+
+        Returns:
+            bool: 시계열이 바뀌었으면 True
+        """
+        file_path = Path(file_path)
+        size = file_path.stat().st_size
+        previous = self.activities.get(file_path.name)
+        if previous and previous.get('size') == size:
+            return False
+
+        summary, _, columns = parse_fit(file_path.read_bytes())
+        if summary is None:
+            return False
+        load, method = activity_load(summary, columns, self.ftp, self.lthr)
+        if load is None:
+            return False
+        day = datetime.fromtimestamp(summary['start']).date()
+        return self.add_activity(file_path.name, day, load, method, size)
+
+    def update(self, today=None):
+        """
+        오늘까지 시계열 늘리고 CTL/ATL 계산 (바뀐 날짜 또는 마지막 계산일부터)
+
+        Returns:
+            int: 계산한 일수
+        """
+        if self.start is None:
+            return 0
+        today = today or date.today()
+        if today >= self.start:
+            self._day_index(today)
+
+        first = len(self.ctl) if self.dirty_from is None else min(self.dirty_from, len(self.ctl))
+        del self.ctl[first:], self.atl[first:]
+        ctl = self.ctl[-1] if self.ctl else 0.0
+        atl = self.atl[-1] if self.atl else 0.0
+        ctl_decay = math.exp(-1 / CTL_DAYS)
+        atl_decay = math.exp(-1 / ATL_DAYS)
+        for load in self.load[first:]:
+            ctl = ctl * ctl_decay + load * (1 - ctl_decay)
+            atl = atl * atl_decay + load * (1 - atl_decay)
+            self.ctl.append(ctl)
+            self.atl.append(atl)
+        self.dirty_from = None
+        return len(self.load) - first
+
+    def series(self, days=None):
+        """
+        (날짜, 부하, CTL, ATL, TSB) 목록 (update 이후 계산된 날까지)
+
+        Args:
+            days: 최근 N일만 (None이면 전체)
+        """
+        rows = []
+        first = 0 if days is None else max(0, len(self.ctl) - days)
+        for i in range(first, len(self.ctl)):
+            tsb = self.ctl[i - 1] - self.atl[i - 1] if i else 0.0
+            rows.append((self.start + timedelta(days=i), self.load[i], round(self.ctl[i], 2),
+                         round(self.atl[i], 2), round(tsb, 2)))
+        return rows
+
+    def latest(self):
+        """마지막 날 (날짜, 부하, CTL, ATL, TSB) 또는 None"""
+        rows = self.series(days=1)
+        return rows[0] if rows else None
+
+
+def record_downloads(files, data_dir=None):
+    """
+    동기화 중 새로 받은 FIT 파일을 훈련 부하에 반영 (실패해도 동기화는 계속)
+
+    Returns:
+        tuple or None: 최신 (날짜, 부하, CTL, ATL, TSB)
+    """
+    try:
+        model = TrainingLoad(data_dir)
+        changed = 0
+        for file_path in files:
+            try:
+                changed += model.add_file(file_path)
+            except (OSError, ValueError) as e:
+                print(f"  ⚠️  부하 계산 실패: {Path(file_path).name} - {e}")
+        days = model.update()
+        if changed or days:
+            model.save()
+    except (OSError, ValueError) as e:
+        print(f"⚠️  훈련 부하 갱신 실패: {e}")
+        return None
+
+    latest = model.latest()
+    if latest:
+        print(f"📈 훈련 부하: CTL {latest[2]:.1f}, ATL {latest[3]:.1f}, TSB {latest[4]:+.1f} "
+              f"(새 활동 {changed}개, {days}일 계산)")
+    return latest
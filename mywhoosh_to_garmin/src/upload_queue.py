@@ -0,0 +1,196 @@
+"""
+실패한 업로드 재시도 큐
+
+data/upload_queue.json에 실패한 업로드를 기록해 실행 간에 유지합니다.
+- pending: 재시도 대기 (시도 횟수, 다음 시도 시각, 오류 분류, 마지막 오류)
+- dead_letter: 영구 오류(잘못된 파일 등)이거나 재시도 횟수를 넘긴 파일,
+  또는 파일이 사라진 채 다운로드 기간(30일)이 지나 다시 받을 수 없는 파일
+  → 다음 실행부터 업로드를 시도하지 않음
+
+일시적 오류(네트워크, 5xx, 429, 인증)는 지터가 있는 지수 백오프로 다음 실행에서
+다시 시도하고, 다음 시도 시각 전에는 같은 파일을 다시 두드리지 않습니다.
+"""
+import json
+import os
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 오류 분류 (GarminUploader.upload의 error_class)
+TRANSIENT = 'transient'
+AUTH = 'auth'
+PERMANENT = 'permanent'
+
+BASE_DELAY = timedelta(minutes=30)
+MAX_DELAY = timedelta(hours=24)
+MAX_ATTEMPTS = 8
+DOWNLOAD_WINDOW = timedelta(days=30)  # download_recent_activities(days=30)과 같은 기간
+
+
+def backoff_delay(attempts, rng=random):
+    """
+    attempts번째 실패 후 대기 시간
+
+    30분, 1시간, 2시간 ... 최대 24시간을 기준으로 50~100% 사이 무작위 값
+    (여러 파일/계정이 같은 시각에 몰려 재시도하지 않도록)
+    """
+    delay = min(BASE_DELAY * 2 ** (attempts - 1), MAX_DELAY)
+    return delay * rng.uniform(0.5, 1.0)
+
+
+class UploadQueue:
+    """실패한 업로드의 재시도 일정과 격리 목록 관리"""
+
+    def __init__(self, data_dir=None):
+        self.data_dir = Path(data_dir) if data_dir else Path(__file__).parent.parent / "data"
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.queue_file = self.data_dir / "upload_queue.json"
+        self.queue = self._load_queue()
+
+    def _load_queue(self):
+        """큐 파일 로드"""
+        if self.queue_file.exists():
+            with open(self.queue_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {
+            'pending': {},
+            'dead_letter': {}
+        }
+
+    def _save_queue(self):
+        """큐 파일 저장 (임시 파일 → 교체)"""
+        tmp_file = self.queue_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.queue, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_file, self.queue_file)
+
+    def is_dead(self, file_name):
+        """격리된 파일인지 확인"""
+        return file_name in self.queue['dead_letter']
+
+    def is_waiting(self, file_name, now=None):
+        """재시도 대기 중이라 아직 시도하면 안 되는지 확인"""
+        entry = self.queue['pending'].get(file_name)
+        if not entry:
+            return False
+        now = now or datetime.now()
+        return datetime.fromisoformat(entry['next_attempt_at']) > now
+
+    def next_attempt_at(self, file_name):
+        """다음 시도 가능 시각 (대기 중이 아니면 None)"""
+        entry = self.queue['pending'].get(file_name)
+        return datetime.fromisoformat(entry['next_attempt_at']) if entry else None
+
+    def due(self, now=None):
+        """
+        지금 재시도할 수 있고 파일이 남아 있는 항목의 경로 목록
+
+        (GitHub Actions처럼 다운로드 폴더가 매번 비는 환경에서는 파일이 없을 수 있으며,
+        그 경우 다시 다운로드되었을 때 재시도됩니다)
+        """
+        return [entry['path'] for entry in self._due_entries(now)]
+
+    def has_due(self, now=None):
+        """due()와 같은 기준으로 재시도할 항목이 있는지"""
+        return bool(self._due_entries(now))
+
+    def _due_entries(self, now=None):
+        """재시도 시각이 되었고 파일이 있는 항목 (다시 받을 수 없는 항목은 먼저 격리)"""
+        now = now or datetime.now()
+        self.expire_missing(now)
+        return [entry for entry in self.queue['pending'].values()
+                if datetime.fromisoformat(entry['next_attempt_at']) <= now and Path(entry['path']).exists()]
+
+    def expire_missing(self, now=None):
+        """
+        파일이 없고 첫 실패가 다운로드 기간보다 오래된 항목을 격리
+
+        활동 날짜는 첫 실패 시각보다 앞이므로, 이런 파일은 다음 다운로드에서도 받지 않아
+        영원히 재시도 대기로 남게 됩니다.
+
+        Returns:
+            int: 격리한 항목 수
+        """
+        now = now or datetime.now()
+        expired = [
+            name for name, entry in self.queue['pending'].items()
+            if now - datetime.fromisoformat(entry['first_failed_at']) > DOWNLOAD_WINDOW
+            and not Path(entry['path']).exists()
+        ]
+        for name in expired:
+            entry = self.queue['pending'].pop(name)
+            entry.pop('next_attempt_at', None)
+            entry['dead_letter'] = now.isoformat()
+            entry['last_error'] = f"파일 없음 (다운로드 기간 {DOWNLOAD_WINDOW.days}일 경과) - {entry.get('last_error', '')}"[:500]
+            self.queue['dead_letter'][name] = entry
+        if expired:
+            self._save_queue()
+        return len(expired)
+
+    def record_failure(self, file_path, error, error_class=TRANSIENT, now=None):
+        """
+        업로드 실패 기록
+
+        Returns:
+            dict: 갱신된 항목 ('dead_letter' 키가 있으면 격리됨)
+        """
+        now = now or datetime.now()
+        file_name = os.path.basename(file_path)
+        entry = self.queue['pending'].pop(file_name, None) or {
+            'path': str(file_path),
+            'attempts': 0,
+            'first_failed_at': now.isoformat(),
+        }
+        entry.update(
+            path=str(file_path),
+            attempts=entry['attempts'] + 1,
+            last_attempt_at=now.isoformat(),
+            error_class=error_class,
+            last_error=str(error)[:500],
+        )
+
+        if error_class == PERMANENT or entry['attempts'] >= MAX_ATTEMPTS:
+            entry.pop('next_attempt_at', None)
+            entry['dead_letter'] = now.isoformat()
+            self.queue['dead_letter'][file_name] = entry
+        else:
+            entry['next_attempt_at'] = (now + backoff_delay(entry['attempts'])).isoformat()
+            self.queue['pending'][file_name] = entry
+
+        self._save_queue()
+        return entry
+
+    def record_success(self, file_name):
+        """업로드 성공(또는 중복 확인) 시 큐에서 제거"""
+        removed = self.queue['pending'].pop(file_name, None)
+        removed = self.queue['dead_letter'].pop(file_name, None) or removed
+        if removed:
+            self._save_queue()
+
+    def release(self, file_name=None):
+        """
+        격리된 파일을 다시 재시도 대상으로 되돌림 (file_name이 없으면 전체)
+
+        Returns:
+            int: 되돌린 파일 수
+        """
+        names = [file_name] if file_name else list(self.queue['dead_letter'])
+        released = 0
+        for name in names:
+            entry = self.queue['dead_letter'].pop(name, None)
+            if entry:
+                entry.pop('dead_letter', None)
+                entry['attempts'] = 0
+                entry['next_attempt_at'] = datetime.now().isoformat()
+                self.queue['pending'][name] = entry
+                released += 1
+        if released:
+            self._save_queue()
+        return released
+
+    def summary(self):
+        """대기/격리 개수"""
+        return {
+            'pending': len(self.queue['pending']),
+            'dead_letter': len(self.queue['dead_letter'])
+        }
@@ -0,0 +1,126 @@
+"""
+업로드 후 Garmin 처리 완료 확인 (선택, UPLOAD_VERIFY=1)
+
+upload_activity는 파일을 접수만 하고 반환하므로, 실제로 활동이 만들어졌는지는 알 수 없습니다.
+업로드마다 따로 상태를 묻는 대신 백그라운드 스레드에서 활동 목록을 한 번씩 조회하여
+대기 중인 업로드 전체를 (시작 시각, 경과 시간)으로 한꺼번에 맞춰 봅니다.
+- 조회 간격: 5초에서 시작, 새로 확인된 것이 없으면 1.5배씩 늘려 최대 60초
+- 전체 제한 시간: UPLOAD_VERIFY_DEADLINE (기본 300초, 마지막 업로드 이후 기준)
+- 업로드 응답에 이미 활동 ID가 있으면 조회 없이 바로 확인 처리
+
+업로드 스레드를 막지 않으며, 결과(Garmin 활동 ID)는 finish()에서 받아 이력에 기록합니다.
+"""
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from src.garmin_activity_index import fit_start_and_duration, is_same_activity, parse_garmin_activity
+
+MIN_INTERVAL = 5.0
+MAX_INTERVAL = 60.0
+BACKOFF = 1.5
+
+
+class UploadVerifier(threading.Thread):
+    """업로드한 파일의 Garmin 활동 생성 여부를 묶어서 확인하는 스레드"""
+
+    def __init__(self, garmin, deadline=None):
+        super().__init__(daemon=True)
+        self.garmin = garmin
+        self.deadline_seconds = deadline or int(os.getenv('UPLOAD_VERIFY_DEADLINE', '300'))
+        self.pending = {}      # 파일명 → (시작 시각, 경과 시간)
+        self.resolved = {}     # 파일명 → Garmin 활동 ID
+        self.rounds = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = threading.Event()
+        self._deadline = time.monotonic() + self.deadline_seconds
+
+    def add(self, file_path, upload_result):
+        """업로드 성공한 파일 등록 (응답에 활동 ID가 있으면 바로 확인 처리)"""
+        file_name = os.path.basename(file_path)
+        activity_id = upload_result.get('activity_id')
+        summary = None if activity_id else fit_start_and_duration(file_path)
+
+        with self._lock:
+            if activity_id:
+                self.resolved[file_name] = activity_id
+            elif summary:
+                self.pending[file_name] = summary
+            # 마지막 업로드 이후 deadline초 동안 확인
+            self._deadline = time.monotonic() + self.deadline_seconds
+
+    def run(self):
+        interval = MIN_INTERVAL
+        while True:
+            self._wake.wait(timeout=interval)
+            self._wake.clear()
+
+            with self._lock:
+                has_pending = bool(self.pending)
+                expired = time.monotonic() >= self._deadline
+            if expired or (self._closed.is_set() and not has_pending):
+                return
+            if not has_pending:
+                interval = MIN_INTERVAL
+                continue
+
+            try:
+                found = self._poll_once()
+            except Exception as e:
+                print(f"  ⚠️  업로드 처리 확인 실패 (다음 조회에서 재시도): {e}")
+                found = 0
+            # 새로 확인된 게 있으면 짧게, 없으면 점점 길게
+            interval = MIN_INTERVAL if found else min(interval * BACKOFF, MAX_INTERVAL)
+
+    def _poll_once(self):
+        """대기 중인 업로드의 날짜 범위 활동 목록을 한 번 조회하여 전체 확인"""
+        with self._lock:
+            pending = dict(self.pending)
+        # 목록은 시작 시각 순이므로 오래된 활동을 올린 경우에도 찾을 수 있게 날짜 범위로 조회
+        starts = [start for start, _ in pending.values()]
+        first_day = datetime.fromtimestamp(min(starts)) - timedelta(days=1)
+        last_day = datetime.fromtimestamp(max(starts)) + timedelta(days=1)
+        activities = [p for p in (parse_garmin_activity(a) for a in self.garmin.get_activities_by_date(
+            first_day.strftime('%Y-%m-%d'), last_day.strftime('%Y-%m-%d')) or []) if p]
+        self.rounds += 1
+
+        found = 0
+        for file_name, (start, duration) in pending.items():
+            for activity_start, activity_duration, activity_id in activities:
+                if is_same_activity(start, duration, activity_start, activity_duration):
+                    with self._lock:
+                        self.pending.pop(file_name, None)
+                        self.resolved[file_name] = activity_id
+                    found += 1
+                    break
+        return found
+
+    def finish(self):
+        """
+        더 이상 업로드가 없음을 알리고, 남은 항목을 제한 시간까지 확인
+
+        Returns:
+            dict: {'resolved': {파일명: 활동 ID}, 'stuck': [파일명, ...], 'rounds': 조회 횟수}
+        """
+        self._closed.set()
+        self._wake.set()
+        if self.is_alive():
+            self.join(timeout=max(0, self._deadline - time.monotonic()) + MAX_INTERVAL)
+        with self._lock:
+            return {
+                'resolved': dict(self.resolved),
+                'stuck': sorted(self.pending),
+                'rounds': self.rounds,
+            }
+
+
+def record_results(verify_result, history):
+    """확인 결과를 이력에 기록하고 처리되지 않은 파일 출력"""
+    for file_name, activity_id in verify_result['resolved'].items():
+        history.mark_garmin_activity(file_name, activity_id)
+    print(f"🔍 Garmin 처리 확인: {len(verify_result['resolved'])}개 "
+          f"(목록 조회 {verify_result['rounds']}회)")
+    for file_name in verify_result['stuck']:
+        print(f"   ⚠️  아직 처리 중이거나 활동이 만들어지지 않음: {file_name}")
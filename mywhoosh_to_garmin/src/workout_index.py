@@ -0,0 +1,266 @@
+"""
+비슷한 워크아웃 검색 인덱스 (파워 프로필 특징 벡터)
+
+활동마다 길이가 같은 특징 벡터를 만들어 float32 행렬 하나에 연속으로 저장하고,
+질의 벡터와의 가중 거리를 행렬 전체에 대해 한 번에 계산합니다 (활동 수천 개도 1ms 안팎).
+- 파워 분포: FTP 대비 구간별 시간 비율 (활동 길이로 정규화)
+- 최대 평균 파워: 5초 / 1분 / 5분 / 20분 / 60분 (FTP 대비)
+- 인터벌 특징: 작업 구간 수, 작업 시간 비율, 평균 작업 길이, 작업/회복 평균 파워, 활동 길이
+FTP 대비 값이라 FTP가 올라도 같은 워크아웃끼리 가깝게 나옵니다 (벡터는 계산 당시 FTP 기준).
+
+동기화할 때 새로 받은 FIT 파일만 추가하고(같은 파일명·크기면 읽지 않음),
+GitHub Actions에서도 유지되도록 data/workout_index.npy + workout_index.json에 저장합니다.
+"""
+import json
+import math
+import os
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from src.fit_encoder import FIT_EPOCH_OFFSET
+from src.interval_detector import Workout, detect_intervals
+from src.training_load import DEFAULT_FTP, env_number, normalized_power
+
+FEATURE_VERSION = 1
+
+ZONE_EDGES = (0.55, 0.75, 0.9, 1.05, 1.2, 1.5)     # FTP 대비 파워 구간 경계
+MEAN_MAX_SECONDS = (5, 60, 300, 1200, 3600)
+SIGNATURE = ('work_count', 'work_share', 'work_duration', 'work_power', 'recovery_power', 'duration')
+
+FEATURE_NAMES = ([f"zone_{i}" for i in range(len(ZONE_EDGES) + 1)]
+                 + [f"mmp_{seconds}" for seconds in MEAN_MAX_SECONDS] + list(SIGNATURE))
+FEATURE_SIZE = len(FEATURE_NAMES)
+
+# 특징 묶음(분포 / 최대 평균 / 인터벌)이 거리에 비슷하게 기여하도록 맞춘 가중치
+FEATURE_WEIGHTS = np.array([2.0] * (len(ZONE_EDGES) + 1) + [1.0] * len(MEAN_MAX_SECONDS)
+                           + [1.0] * len(SIGNATURE), dtype=np.float32)
+
+
+def mean_max(power, seconds):
+    """seconds초 최대 평균 파워 (활동이 더 짧으면 전체 평균)"""
+    window = min(seconds, len(power))
+    cumsum = np.concatenate(([0.0], np.cumsum(power)))
+    return float((cumsum[window:] - cumsum[:-window]).max() / window)
+
+
+def workout_features(workout, ftp):
+    """
+    Workout → 특징 벡터
+
+    Returns:
+        tuple: (np.ndarray float32 [FEATURE_SIZE], 표시용 요약 딕셔너리)
+    """
+    power = workout.power
+    duration = len(power)
+    relative = power / ftp
+
+    zones = np.bincount(np.searchsorted(ZONE_EDGES, relative, side='right'),
+                        minlength=len(ZONE_EDGES) + 1) / duration
+    peaks = [mean_max(power, seconds) / ftp for seconds in MEAN_MAX_SECONDS]
+
+    intervals = detect_intervals(workout, ftp)
+    work = [interval for interval in intervals if interval.kind == 'work']
+    recovery = [interval for interval in intervals if interval.kind == 'recovery']
+    work_time = sum(interval.duration for interval in work)
+    signature = [
+        len(work) / 10,
+        work_time / duration,
+        work_time / len(work) / 1200 if work else 0.0,
+        sum(i.avg_power * i.duration for i in work) / work_time / ftp if work else 0.0,
+        sum(i.avg_power * i.duration for i in recovery) / sum(i.duration for i in recovery) / ftp
+        if recovery else 0.0,
+        math.log1p(duration / 3600),
+    ]
+
+    vector = np.concatenate((zones, peaks, signature)).astype(np.float32)
+    summary = {
+        'start': datetime.fromtimestamp(workout.start + FIT_EPOCH_OFFSET).isoformat(),
+        'duration': duration,
+        'avg_power': round(float(power.mean()), 1),
+        'normalized_power': round(normalized_power(power), 1),
+        'work_intervals': len(work),
+        'ftp': ftp,
+    }
+    return vector, summary
+
+
+class WorkoutIndex:
+    """활동 특징 벡터 행렬 (행 순서 = entries 순서)"""
+
+    def __init__(self, data_dir=None, ftp=None):
+        self.data_dir = Path(data_dir) if data_dir else Path(__file__).parent.parent / "data"
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.matrix_file = self.data_dir / "workout_index.npy"
+        self.entries_file = self.data_dir / "workout_index.json"
+        self.ftp = ftp or env_number('TRAINING_FTP', DEFAULT_FTP)
+
+        self.entries = []       # [{name, size, start, duration, avg_power, ...}]
+        self.rows = {}          # 파일명 → 행 번호
+        self._buffer = np.zeros((0, FEATURE_SIZE), dtype=np.float32)
+        self._load()
+
+    def _load(self):
+        """저장된 인덱스 로드 (특징 버전이 다르면 비어 있는 상태로 시작)"""
+        if not (self.entries_file.exists() and self.matrix_file.exists()):
+            return
+        with open(self.entries_file, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        matrix = np.load(self.matrix_file)
+        entries = state.get('entries', [])
+        if state.get('version') != FEATURE_VERSION or matrix.shape != (len(entries), FEATURE_SIZE):
+            print("⚠️  워크아웃 인덱스 형식이 달라 새로 만듭니다.")
+            return
+        self.entries = entries
+        self.rows = {entry['name']: row for row, entry in enumerate(entries)}
+        self._buffer = np.ascontiguousarray(matrix, dtype=np.float32)
+
+    @property
+    def matrix(self):
+        """활동 수 × FEATURE_SIZE float32 행렬 (연속 메모리 뷰)"""
+        return self._buffer[:len(self.entries)]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def save(self):
+        """행렬 / 목록 저장 (임시 파일 → 교체)"""
+        tmp_matrix = self.matrix_file.with_name(self.matrix_file.stem + '.tmp.npy')
+        np.save(tmp_matrix, self.matrix)
+        tmp_entries = self.entries_file.with_suffix('.json.tmp')
+        with open(tmp_entries, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': FEATURE_VERSION,
+                'features': FEATURE_NAMES,
+                'updated_at': datetime.now().isoformat(),
+                'entries': self.entries,
+            }, f, indent=1, ensure_ascii=False)
+        os.replace(tmp_matrix, self.matrix_file)
+        os.replace(tmp_entries, self.entries_file)
+
+    def _set_row(self, row, vector):
+        if row >= len(self._buffer):
+            # 한 행씩 늘리지 않고 용량을 두 배로 (대량 추가 시 복사 횟수 O(log n))
+            grown = np.zeros((max(16, 2 * len(self._buffer)), FEATURE_SIZE), dtype=np.float32)
+            grown[:len(self._buffer)] = self._buffer
+            self._buffer = grown
+        self._buffer[row] = vector
+
+    def add(self, name, vector, entry):
+        """활동 추가 (같은 이름이 있으면 교체)"""
+        entry = dict(entry, name=name)
+        row = self.rows.get(name)
+        if row is None:
+            row = len(self.entries)
+            self._set_row(row, vector)
+            self.entries.append(entry)
+            self.rows[name] = row
+        else:
+            self._buffer[row] = vector
+            self.entries[row] = entry
+
+    def remove(self, name):
+        """활동 제거 (마지막 행을 빈자리로 옮김)"""
+        row = self.rows.pop(name, None)
+        if row is None:
+            return False
+        last = len(self.entries) - 1
+        if row != last:
+            self._buffer[row] = self._buffer[last]
+            self.entries[row] = self.entries[last]
+            self.rows[self.entries[row]['name']] = row
+        self.entries.pop()
+        return True
+
+    def add_file(self, file_path):
+        """
+        FIT 파일 추가 (같은 파일명·크기로 이미 있으면 읽지 않음)
+
+        Returns:
+            bool: 추가/교체했으면 True
+        """
+        file_path = Path(file_path)
+        size = file_path.stat().st_size
+        row = self.rows.get(file_path.name)
+        if row is not None and self.entries[row].get('size') == size:
+            return False
+        workout = Workout.from_file(file_path)
+        if workout is None or not workout.power.any():
+            return False
+        vector, summary = workout_features(workout, self.ftp)
+        self.add(file_path.name, vector, dict(summary, size=size))
+        return True
+
+    def nearest(self, vector, k=5, exclude=None):
+        """
+        가중 거리로 가까운 활동 k개
+
+        Returns:
+            list: [(entry, 거리)] 가까운 순
+        """
+        if not self.entries:
+            return []
+        diff = self.matrix - np.asarray(vector, dtype=np.float32)
+        distances = np.sqrt(np.einsum('ij,ij,j->i', diff, diff, FEATURE_WEIGHTS))
+        if exclude is not None and exclude in self.rows:
+            distances[self.rows[exclude]] = np.inf
+        k = min(k, len(distances))
+        top = np.argpartition(distances, k - 1)[:k]
+        top = top[np.argsort(distances[top])]
+        return [(self.entries[row], float(distances[row])) for row in top if np.isfinite(distances[row])]
+
+    def similar(self, name, k=5):
+        """인덱스에 있는 활동과 비슷한 다른 활동"""
+        return self.nearest(self.matrix[self.rows[name]], k, exclude=name)
+
+    def similar_to_file(self, file_path, k=5):
+        """
+        FIT 파일과 비슷한 활동 (인덱스에 없으면 추가하지 않고 특징만 계산)
+
+        Returns:
+            tuple: (파일 요약 또는 None, [(entry, 거리)])
+        """
+        file_path = Path(file_path)
+        row = self.rows.get(file_path.name)
+        if row is not None:
+            return self.entries[row], self.similar(file_path.name, k)
+        workout = Workout.from_file(file_path)
+        if workout is None or not workout.power.any():
+            return None, []
+        vector, summary = workout_features(workout, self.ftp)
+        return summary, self.nearest(vector, k)
+
+
+def index_downloads(files, data_dir=None, k=3):
+    """
+    동기화 중 새로 받은 FIT 파일을 인덱스에 추가하고 비슷한 이전 활동 출력 (실패해도 동기화는 계속)
+
+    Returns:
+        int: 추가한 활동 수
+    """
+    try:
+        index = WorkoutIndex(data_dir)
+        added = []
+        for file_path in files:
+            try:
+                if index.add_file(file_path):
+                    added.append(Path(file_path).name)
+            except (OSError, ValueError) as e:
+                print(f"  ⚠️  특징 계산 실패: {Path(file_path).name} - {e}")
+        if added:
+            index.save()
+    except (OSError, ValueError) as e:
+        print(f"⚠️  워크아웃 인덱스 갱신 실패: {e}")
+        return 0
+
+    for name in added:
+        matches = index.similar(name, k)
+        if not matches:
+            continue
+        entry = index.entries[index.rows[name]]
+        print(f"🔍 {name} (NP {entry['normalized_power']:.0f}W)와 비슷한 이전 활동:")
+        for match, distance in matches:
+            print(f"   - {match['name']}: NP {match['normalized_power']:.0f}W "
+                  f"({round(match['normalized_power'] - entry['normalized_power']):+d}W), 거리 {distance:.3f}")
+    return len(added)
@@ -0,0 +1,12 @@
+"""
+pytest 공통 설정
+
+src/와 합성 데이터 생성기(scripts/benchmark/synthetic_data.py)를 import할 수 있게 경로를 추가합니다.
+테스트는 네트워크/계정 정보 없이 임시 폴더에서만 동작합니다.
+"""
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / 'scripts' / 'benchmark'))
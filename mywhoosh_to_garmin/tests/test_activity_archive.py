@@ -0,0 +1,88 @@
+"""ActivityArchive 저장 / 읽기 / 원본 삭제 후 조회"""
+import subprocess
+import sys
+from datetime import timedelta
+from pathlib import Path
+
+from synthetic_data import DEFAULT_START, write_fit, write_strava_json
+
+from src.activity_archive import ActivityArchive, entry_name, open_activity
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def make_sources(tmp_path):
+    downloads = tmp_path / 'downloads'
+    strava_dir = tmp_path / 'strava_data'
+    for folder in (downloads / 'alice', downloads / 'bob', strava_dir):
+        folder.mkdir(parents=True)
+    alice = downloads / 'alice' / '2025-12-11.fit'
+    bob = downloads / 'bob' / '2025-12-11.fit'
+    write_fit(alice, 600, seed=1)
+    write_fit(bob, 900, seed=2, start=DEFAULT_START + timedelta(hours=3))
+    write_strava_json(strava_dir / '1_activity.json', 600)
+    write_strava_json(strava_dir / '2_activity.json', 900, seed=2)
+    return downloads, strava_dir, alice, bob
+
+
+def test_entry_name_is_relative_to_source_root(tmp_path):
+    roots = (tmp_path / 'downloads', tmp_path / 'strava_data')
+    assert entry_name(tmp_path / 'downloads' / 'alice' / 'a.fit', roots) == 'alice/a.fit'
+    assert entry_name(tmp_path / 'downloads' / 'a.fit', roots) == 'a.fit'
+    assert entry_name(tmp_path / 'strava_data' / '1_activity.json', roots) == '1_activity.json'
+    assert entry_name(tmp_path / 'elsewhere' / 'a.fit', roots) == 'a.fit'
+
+
+def test_same_day_files_from_two_accounts_round_trip(tmp_path):
+    downloads, strava_dir, alice, bob = make_sources(tmp_path)
+    roots = (downloads, strava_dir)
+    originals = {path: path.read_bytes() for path in [alice, bob, *strava_dir.iterdir()]}
+    assert originals[alice] != originals[bob]
+
+    archive = ActivityArchive(tmp_path / 'archive', roots)
+    result = archive.add_files(originals)
+    assert result == {'added': 4, 'duplicates': 0}
+
+    # 인덱스를 다시 읽어도 두 계정 파일이 각각 복원됨
+    reopened = ActivityArchive(tmp_path / 'archive', roots)
+    assert reopened.read_bytes('alice/2025-12-11.fit') == originals[alice]
+    assert reopened.read_bytes('bob/2025-12-11.fit') == originals[bob]
+    for path, raw in originals.items():
+        assert reopened.verify(reopened.entry_name(path), raw)
+
+    for path in originals:
+        path.unlink()
+    for path, raw in originals.items():
+        assert open_activity(path, reopened) == raw
+
+
+def test_duplicate_content_is_stored_once(tmp_path):
+    archive = ActivityArchive(tmp_path / 'archive')
+    assert archive.add_bytes('alice/a.fit', b'same')
+    assert not archive.add_bytes('bob/a.fit', b'same')
+    assert archive.stats()['objects'] == 1
+    assert archive.read_bytes('bob/a.fit') == b'same'
+
+
+def test_find_falls_back_to_legacy_file_name_entry(tmp_path):
+    archive = ActivityArchive(tmp_path / 'archive', [tmp_path / 'downloads'])
+    archive.add_bytes('2025-12-11.fit', b'legacy')
+    assert archive.find(tmp_path / 'downloads' / 'alice' / '2025-12-11.fit') == '2025-12-11.fit'
+    assert archive.find(tmp_path / 'downloads' / 'alice' / '2025-12-12.fit') is None
+
+
+def test_move_keeps_both_accounts_recoverable(tmp_path):
+    downloads, strava_dir, alice, bob = make_sources(tmp_path)
+    originals = {'alice/2025-12-11.fit': alice.read_bytes(), 'bob/2025-12-11.fit': bob.read_bytes()}
+
+    subprocess.run(
+        [sys.executable, str(PROJECT_ROOT / 'scripts' / 'archive' / 'archive_activities.py'),
+         '--archive', str(tmp_path / 'archive'), 'add', '--move', '--older-than', '-1',
+         '--downloads', str(downloads), '--strava-dir', str(strava_dir)],
+        check=True, capture_output=True)
+
+    assert not alice.exists() and not bob.exists()
+    archive = ActivityArchive(tmp_path / 'archive')
+    for name, raw in originals.items():
+        assert archive.read_bytes(name) == raw
+
@@ -0,0 +1,25 @@
+"""활동 목록 페이지 링크 → 페이지 URL"""
+from src.activity_list import page_urls_from_hrefs
+
+BASE = 'https://event.mywhoosh.com/user/activities'
+
+
+def test_single_page_has_no_extra_urls():
+    assert page_urls_from_hrefs([]) == []
+    assert page_urls_from_hrefs([f'{BASE}#top', None]) == []
+
+
+def test_fills_elided_page_numbers():
+    hrefs = [f'{BASE}?page=2', f'{BASE}?page=3', f'{BASE}?page=10']
+    assert page_urls_from_hrefs(hrefs) == [f'{BASE}?page={n}' for n in range(2, 11)]
+
+
+def test_keeps_other_query_parameters():
+    hrefs = [f'{BASE}?sort=date&page=2&size=20', f'{BASE}?sort=date&page=3&size=20']
+    assert page_urls_from_hrefs(hrefs) == [f'{BASE}?sort=date&page=2&size=20',
+                                           f'{BASE}?sort=date&page=3&size=20']
+
+
+def test_zero_based_pages():
+    hrefs = [f'{BASE}?page=0', f'{BASE}?page=1', f'{BASE}?page=2']
+    assert page_urls_from_hrefs(hrefs) == [f'{BASE}?page=1', f'{BASE}?page=2']
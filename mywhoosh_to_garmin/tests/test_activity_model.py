@@ -0,0 +1,69 @@
+"""Activity / StreamSet 변환과 이를 쓰는 FIT 로더"""
+import json
+
+import numpy as np
+from synthetic_data import generate_strava_activity, write_fit, write_strava_json
+
+from src.activity_model import Activity, StreamSet
+from src.analytics_store import parse_fit
+from src.preview_pyramid import Preview, build_preview
+
+
+def test_strava_round_trip_keeps_values_and_nulls():
+    data = generate_strava_activity(300, gps=True)
+    data['streams']['heartrate']['data'][10] = None
+    activity = Activity.from_strava(json.loads(json.dumps(data)))
+
+    assert activity.to_strava() == {'activity': data['activity'], 'streams': data['streams']}
+    assert activity.streams.to_list('heartrate')[10] is None
+    assert isinstance(activity.streams.to_list('heartrate')[11], int)
+
+
+def test_slice_is_a_view():
+    streams = StreamSet.from_strava(generate_strava_activity(120)['streams'])
+    part = streams[10:20]
+    assert part.length == 10
+    assert np.shares_memory(part['watts'], streams['watts'])
+
+
+def test_from_fit_reads_records_and_session(tmp_path):
+    path = tmp_path / 'ride.fit'
+    write_fit(path, 600)
+    activity = Activity.load(path)
+
+    assert activity.meta['sport_type'] == 'VirtualRide'
+    assert activity.meta['elapsed_time'] == 600
+    assert activity.streams.length == 600
+    assert activity.streams['time'][-1] == 599
+    watts = activity.streams['watts']
+    assert activity.meta['max_watts'] == watts.max()
+    assert 'lat' not in activity.streams.columns
+
+
+def test_parse_fit_summary_from_activity(tmp_path):
+    path = tmp_path / 'ride.fit'
+    write_fit(path, 900, gps=True)
+    activity = Activity.load(path)
+
+    summary, times, columns = parse_fit(path.read_bytes())
+
+    assert summary['start'] == activity.start_timestamp
+    assert summary['sport'] == 'cycling'
+    assert summary['avg_power'] == activity.meta['average_watts']
+    assert summary['distance'] == activity.meta['distance']
+    assert times == list(range(900))
+    assert columns['power'] == activity.streams.to_list('watts')
+    assert summary['kilojoules'] > 0
+
+
+def test_preview_same_for_fit_and_json(tmp_path):
+    fit = tmp_path / 'ride.fit'
+    json_path = tmp_path / 'ride_activity.json'
+    write_fit(fit, 1200)
+    write_strava_json(json_path, 1200)
+
+    with Preview(build_preview(fit)) as from_fit, Preview(build_preview(json_path)) as from_json:
+        assert from_fit.duration == from_json.duration == 1200
+        assert np.array_equal(from_fit.level('power', 60), from_json.level('power', 60))
+        series = from_fit.series('power', 10)
+        assert series['bucket'] == 120 and len(series['mean']) == 10
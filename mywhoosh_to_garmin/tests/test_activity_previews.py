@@ -0,0 +1,33 @@
+"""활동 카탈로그 썸네일 링크"""
+import importlib.util
+import sys
+from pathlib import Path
+
+from synthetic_data import write_strava_json
+
+from src.reconciliation import SummaryCache
+
+SCRIPT = Path(__file__).parent.parent / 'scripts' / 'analytics' / 'activity_previews.py'
+spec = importlib.util.spec_from_file_location('activity_previews', SCRIPT)
+activity_previews = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(activity_previews)
+
+
+def test_image_url_encodes_fragment_and_spaces(tmp_path):
+    image = tmp_path / 'strava_data' / 'Sweetspot #1 ride.preview.power.svg'
+    assert activity_previews.image_url(image, tmp_path / 'data') == \
+        '../strava_data/Sweetspot%20%231%20ride.preview.power.svg'
+
+
+def test_catalogue_links_strava_backup_thumbnails(tmp_path, monkeypatch):
+    backup = tmp_path / '2025-12-11_MyWhoosh_-_Sweetspot_#1_activity.json'
+    write_strava_json(backup, 600)
+    output = tmp_path / 'catalogue.html'
+    cache = SummaryCache(tmp_path / 'header_cache.json', restore=dict)
+    monkeypatch.setattr(activity_previews, 'get_header_cache', lambda: cache)
+    monkeypatch.setattr(sys, 'argv', ['activity_previews.py', 'catalogue', str(tmp_path), '--output', str(output)])
+
+    assert activity_previews.main() == 0
+    page = output.read_text(encoding='utf-8')
+    assert 'src="2025-12-11_MyWhoosh_-_Sweetspot_%231_activity.preview.power.svg"' in page
+    assert '#1_activity.preview' not in page
@@ -0,0 +1,33 @@
+"""분석 저장소 수집 (깨진 파일은 파일별 오류로)"""
+from datetime import timedelta
+
+import pytest
+from synthetic_data import DEFAULT_START, write_strava_json
+
+from src.analytics_store import AnalyticsStore, parse_strava_json, source_files
+
+
+@pytest.mark.parametrize('raw', [b'{"activity": null}', b'[1, 2]', b'{"activity": []}', b'"text"'])
+def test_malformed_backup_is_empty(raw):
+    assert parse_strava_json(raw) == (None, [], {})
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_bad_backup_does_not_abort_batch(tmp_path, workers):
+    strava_dir = tmp_path / 'strava_data'
+    strava_dir.mkdir()
+    for i in range(4):
+        write_strava_json(strava_dir / f'{i}_activity.json', 600, seed=i,
+                          start=DEFAULT_START + timedelta(days=i))
+    (strava_dir / '9_activity.json').write_text('{"activity": {"start_date": "2025-12-01T00:00:00Z"}, '
+                                                '"streams": [1, 2]}')
+
+    store = AnalyticsStore(tmp_path / 'analytics.sqlite')
+    try:
+        counts = store.ingest(source_files(tmp_path / 'downloads', strava_dir), workers=workers)
+        assert counts['parsed'] == 4
+        assert counts['error'] == 1
+        assert counts['errors'][0][0].endswith('9_activity.json')
+        assert store.query("SELECT count(*) FROM activities")[0][0] == 4
+    finally:
+        store.close()
@@ -0,0 +1,75 @@
+"""async_main.sync 실패 시 작업 정리"""
+import asyncio
+
+import pytest
+
+from src import async_main
+
+
+class FakeUploadStage:
+    """큐를 소비하지 않고 취소될 때까지 기다리는 업로드 단계"""
+
+    instances = []
+
+    def __init__(self, *args, **kwargs):
+        self.cancelled = False
+        self.success_count = self.skip_count = self.error_count = self.deferred_count = 0
+        FakeUploadStage.instances.append(self)
+
+    def enqueue_retries(self, queue):
+        return []
+
+    async def run(self, queue):
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+
+class FakeStravaBackup:
+    instances = []
+
+    def __init__(self, *args, **kwargs):
+        self.cancelled = False
+        FakeStravaBackup.instances.append(self)
+
+    async def backup_recent(self, days):
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+
+class FailingDownloader:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    async def download_recent_activities(self, **kwargs):
+        await asyncio.sleep(0)
+        raise RuntimeError("목록 페이지 오류")
+
+
+class FakeTokenManager:
+    def get_access_token(self):
+        return 'token'
+
+
+def test_download_error_cancels_and_awaits_upload_and_strava(monkeypatch, tmp_path):
+    FakeUploadStage.instances.clear()
+    FakeStravaBackup.instances.clear()
+    monkeypatch.setattr(async_main, 'HistoryManager', lambda: object())
+    monkeypatch.setattr(async_main, 'UploadStage', FakeUploadStage)
+    monkeypatch.setattr(async_main, 'AsyncStravaBackup', FakeStravaBackup)
+    monkeypatch.setattr(async_main, 'AsyncMyWhooshDownloader', FailingDownloader)
+    monkeypatch.setattr(async_main, 'get_token_manager', FakeTokenManager)
+
+    async def run():
+        with pytest.raises(RuntimeError, match="목록 페이지 오류"):
+            await async_main.sync('a@example.com', 'pw', 'b@example.com', 'pw')
+        # asyncio.run의 종료 정리 전에 이미 취소·대기가 끝나 있어야 함
+        assert FakeUploadStage.instances[0].cancelled
+        assert FakeStravaBackup.instances[0].cancelled
+
+    asyncio.run(run())
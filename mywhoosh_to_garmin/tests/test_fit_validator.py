@@ -0,0 +1,50 @@
+"""업로드 전 FIT 검증 / 잘린 파일 복구"""
+from synthetic_data import write_fit
+
+from src.activity_model import Activity
+from src.fit_validator import SESSION, prepare_for_upload, repair_bytes, validate_bytes, validate_file
+
+
+def test_complete_file_is_ok(tmp_path):
+    path = tmp_path / 'ride.fit'
+    write_fit(path, 600)
+    result = validate_file(path)
+    assert result.ok, result.describe()
+    assert result.counts[SESSION] == 1
+
+
+def test_truncated_file_is_repaired(tmp_path):
+    path = tmp_path / 'ride.fit'
+    write_fit(path, 1200)
+    raw = path.read_bytes()
+    cut = raw[:len(raw) // 2 + 3]  # 메시지 중간에서 끊김
+
+    result = validate_bytes(cut)
+    assert {code for code, _ in result.errors} >= {'truncated'}
+    assert result.repairable
+
+    repaired = repair_bytes(cut, result)
+    repaired_result = validate_bytes(repaired)
+    assert repaired_result.ok, repaired_result.describe()
+    assert repaired_result.counts[SESSION] == 1
+    assert repaired_result.first_timestamp == result.first_timestamp
+    assert repaired_result.last_timestamp == result.last_timestamp
+
+    activity = Activity.from_fit(repaired)
+    assert activity.meta['elapsed_time'] == result.last_timestamp - result.first_timestamp
+
+
+def test_prepare_for_upload_replaces_truncated_file(tmp_path):
+    path = tmp_path / 'ride.fit'
+    write_fit(path, 600)
+    path.write_bytes(path.read_bytes()[:-200])
+
+    result = prepare_for_upload(path)
+    assert result.ok and result.repaired
+    assert validate_file(path).ok
+
+
+def test_garbage_is_not_repairable(tmp_path):
+    result = validate_bytes(b'not a fit file at all')
+    assert not result.ok
+    assert not result.repairable
@@ -0,0 +1,67 @@
+"""워크아웃 인터벌 검출 / FIT lap 기록"""
+import numpy as np
+from synthetic_data import write_fit
+
+from src.fit_validator import LAP, validate_file
+from src.interval_detector import Workout, add_laps, detect_intervals
+
+FTP = 200
+# synthetic_data 워크아웃: 10분 워밍업 램프 → (10분 90% + 5분 55%) 반복
+EXPECTED = [('ramp', 0), ('work', 600), ('recovery', 1200), ('work', 1500), ('recovery', 2100)]
+
+
+def workout_from_power(power):
+    power = np.asarray(power, dtype=float)
+    nan = np.full(len(power), np.nan)
+    return Workout(0, power, nan, nan, None)
+
+
+def test_step_changes_become_work_and_recovery():
+    power = [110] * 300 + [250] * 400 + [120] * 200 + [250] * 400
+    intervals = detect_intervals(workout_from_power(power), ftp=FTP)
+
+    assert [(i.kind, i.start, i.duration) for i in intervals] == [
+        ('recovery', 0, 300), ('work', 300, 400), ('recovery', 700, 200), ('work', 900, 400)]
+    assert intervals[1].avg_power == 250 and intervals[1].max_power == 250
+    assert intervals[0].avg_heart_rate is None
+
+
+def test_linear_ramp_is_one_interval():
+    power = list(np.linspace(100, 250, 600)) + [100] * 300
+    intervals = detect_intervals(workout_from_power(power), ftp=FTP)
+    assert [(i.kind, i.start, i.duration) for i in intervals] == [('ramp', 0, 600), ('recovery', 600, 300)]
+
+
+def test_no_power_means_no_intervals():
+    assert detect_intervals(workout_from_power([0] * 600), ftp=FTP) == []
+
+
+def test_synthetic_workout_file(tmp_path):
+    path = tmp_path / 'workout.fit'
+    write_fit(path, 2400, lap_seconds=10 ** 6)
+    workout = Workout.from_fit(path.read_bytes())
+    assert workout.lap_count == 1
+
+    intervals = detect_intervals(workout, ftp=FTP)
+    assert [i.kind for i in intervals] == [kind for kind, _ in EXPECTED]
+    for interval, (_, start) in zip(intervals, EXPECTED):
+        assert abs(interval.start - start) <= 10
+    assert sum(i.duration for i in intervals) == len(workout.power)
+    assert all(i.avg_heart_rate for i in intervals)
+    assert intervals[-1].distance > 0
+
+
+def test_add_laps_writes_valid_file_once(tmp_path):
+    path = tmp_path / 'workout.fit'
+    write_fit(path, 2400, lap_seconds=10 ** 6)
+
+    intervals = add_laps(path, ftp=FTP)
+    assert len(intervals) == len(EXPECTED)
+    result = validate_file(path)
+    assert result.ok, result.describe()
+    assert result.counts[LAP] == len(intervals)
+
+    # lap이 이미 여러 개면 기본적으로 건너뜀
+    assert add_laps(path, ftp=FTP) is None
+    assert add_laps(path, ftp=FTP, replace=True) is not None
+    assert validate_file(path).counts[LAP] == len(intervals)
@@ -0,0 +1,28 @@
+"""계정 파일 로드"""
+import json
+
+from src.multi_account_runner import load_accounts
+
+
+def account(name, **overrides):
+    values = {'name': name, 'mywhoosh_email': 'a@example.com', 'mywhoosh_password': 'pw',
+              'garmin_email': 'g@example.com', 'garmin_password': 'pw'}
+    values.update(overrides)
+    return values
+
+
+def test_invalid_required_values_skip_account(tmp_path, monkeypatch, capsys):
+    monkeypatch.delenv('UNSET_PASSWORD', raising=False)
+    path = tmp_path / 'accounts.json'
+    path.write_text(json.dumps([
+        account('ok'),
+        account('number', garmin_password=1234),
+        account('null', mywhoosh_password=None),
+        account('unset', garmin_password='$UNSET_PASSWORD'),
+        account('empty', mywhoosh_email=''),
+    ]), encoding='utf-8')
+
+    assert [a['name'] for a in load_accounts(path)] == ['ok']
+    output = capsys.readouterr().out
+    assert '2번째 계정 건너뜀: garmin_password 없음' in output
+    assert output.count('건너뜀') == 4
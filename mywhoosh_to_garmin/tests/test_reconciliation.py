@@ -0,0 +1,99 @@
+"""출처 간 활동 대조 (병합 조인 / 요약 / 폴더 로드)"""
+from datetime import timedelta
+
+from synthetic_data import DEFAULT_START, write_fit, write_strava_json
+
+from src.garmin_activity_index import fit_start_and_duration, parse_garmin_activity
+from src.reconciliation import (ActivitySource, SourceActivity, fit_activity_summary,
+                                load_garmin_activities, load_mywhoosh, load_strava, merge_join,
+                                reconcile)
+
+START = DEFAULT_START.timestamp()
+
+
+def activity(source, ref, start, duration=3600, sport='cycling'):
+    return SourceActivity(source, ref, start, duration, sport)
+
+
+def test_merge_join_picks_closest_within_tolerance():
+    left = [activity('a', 1, 0), activity('a', 2, 1000), activity('a', 3, 5000)]
+    right = [activity('b', 'x', 50), activity('b', 'y', 990), activity('b', 'z', 1030), activity('b', 'w', 9000)]
+
+    pairs, unmatched_left, unmatched_right = merge_join(left, right, tolerance=60)
+
+    assert [(l.ref, r.ref) for l, r in pairs] == [(1, 'x'), (2, 'y')]
+    assert [a.ref for a in unmatched_left] == [3]
+    assert [a.ref for a in unmatched_right] == ['z', 'w']
+
+
+def test_merge_join_uses_each_right_item_once():
+    left = [activity('a', 1, 100), activity('a', 2, 110)]
+    right = [activity('b', 'x', 105)]
+    pairs, unmatched_left, unmatched_right = merge_join(left, right, tolerance=60)
+    assert len(pairs) == 1 and len(unmatched_left) == 1 and not unmatched_right
+
+
+def test_reconcile_reports_missing_extra_and_mismatch():
+    reference = ActivitySource('mywhoosh', [activity('mywhoosh', 'a.fit', 0), activity('mywhoosh', 'b.fit', 10000),
+                                            activity('mywhoosh', 'c.fit', 20000, duration=1800),
+                                            activity('mywhoosh', 'd.fit', 50000)])
+    other = ActivitySource('garmin', [activity('garmin', 1, 30), activity('garmin', 2, 20010, sport='running'),
+                                      activity('garmin', 3, 40000)], coverage=(0, 30000))
+
+    report = reconcile(reference, other)
+
+    assert report['matched'] == 2
+    # d.fit은 비교 대상 조회 범위 밖이라 누락으로 보지 않음
+    assert [a['ref'] for a in report['missing']] == ['b.fit']
+    assert [a['ref'] for a in report['extra']] == [3]
+    assert len(report['mismatch']) == 1
+    assert any('종목' in reason for reason in report['mismatch'][0]['reasons'])
+
+
+def test_fit_summary_includes_sport(tmp_path):
+    path = tmp_path / 'ride.fit'
+    write_fit(path, 600)
+
+    start, duration, sport = fit_activity_summary(path)
+    assert abs(start - START) <= 1
+    assert abs(duration - 600) <= 1
+    assert sport == 'cycling'
+    assert fit_start_and_duration(path) == (start, duration)
+
+
+def test_load_mywhoosh_includes_account_folders(tmp_path):
+    for account in ('alice', 'bob'):
+        (tmp_path / account).mkdir()
+    write_fit(tmp_path / '2025-12-11.fit', 600)
+    write_fit(tmp_path / 'alice' / '2025-12-11.fit', 600, start=DEFAULT_START + timedelta(hours=2))
+    write_fit(tmp_path / 'bob' / '2025-12-11.fit', 600, start=DEFAULT_START + timedelta(hours=4))
+
+    source = load_mywhoosh(tmp_path)
+
+    assert [a.ref for a in source.activities] == ['2025-12-11.fit', 'alice/2025-12-11.fit', 'bob/2025-12-11.fit']
+
+
+def test_load_strava_matches_fit(tmp_path):
+    (tmp_path / 'downloads').mkdir()
+    (tmp_path / 'strava').mkdir()
+    write_fit(tmp_path / 'downloads' / '2025-12-11.fit', 900)
+    write_strava_json(tmp_path / 'strava' / '1_activity.json', 900)
+
+    report = reconcile(load_mywhoosh(tmp_path / 'downloads'), load_strava(tmp_path / 'strava'))
+    assert report['matched'] == 1 and not report['missing'] and not report['mismatch']
+
+
+def test_load_garmin_activities_normalises_sport():
+    class Garmin:
+        def get_activities_by_date(self, start, end):
+            return [
+                {'activityId': 7, 'startTimeGMT': '2025-12-11 11:14:44', 'elapsedDuration': 600.0,
+                 'activityType': {'typeKey': 'virtual_ride'}},
+                {'activityId': 8, 'startTimeGMT': None},
+            ]
+
+    source = load_garmin_activities(Garmin(), DEFAULT_START.replace(tzinfo=None), DEFAULT_START.replace(tzinfo=None))
+
+    assert [(a.ref, a.start, a.duration, a.sport) for a in source.activities] == [(7, START, 600.0, 'cycling')]
+    assert parse_garmin_activity({'activityId': 7, 'startTimeGMT': '2025-12-11 11:14:44',
+                                  'elapsedDuration': 600.0}) == (START, 600.0, 7)
@@ -0,0 +1,56 @@
+"""GPX 트랙 단순화 / 시간 간격 솎아내기"""
+import numpy as np
+import pytest
+from synthetic_data import generate_strava_activity
+
+from src.activity_model import StreamSet
+from src.track_simplify import decimation_mask, rdp_mask, simplify_track, visvalingam_mask
+
+
+def test_rdp_drops_collinear_points_and_keeps_corner():
+    points = np.array([[x, 0.0, 0.0] for x in range(10)] + [[9.0, y, 0.0] for y in range(1, 10)])
+    keep = rdp_mask(points, tolerance=0.5)
+    assert np.flatnonzero(keep).tolist() == [0, 9, 18]
+
+
+def test_visvalingam_keeps_end_points():
+    points = np.array([[x, 0.01 * (x % 2), 0.0] for x in range(20)])
+    keep = visvalingam_mask(points, tolerance=1.0)
+    assert keep[0] and keep[-1]
+    assert keep.sum() < len(points)
+
+
+def test_decimation_keeps_interval_starts_and_peaks():
+    times = np.arange(100)
+    watts = np.full(100, 100.0)
+    watts[37] = 900
+    keep = decimation_mask(times, 10, [watts])
+    assert set(np.flatnonzero(keep)) == set(range(0, 100, 10)) | {37, 99}
+
+
+@pytest.mark.parametrize('method', ['rdp', 'visvalingam'])
+def test_simplify_respects_tolerance_and_peaks(method):
+    streams = generate_strava_activity(1800, gps=True)['streams']
+    indices, report = simplify_track(streams, method, tolerance=5.0, interval=60)
+
+    assert report['points'] == 1800
+    assert 2 <= report['kept'] == len(indices) < report['points']
+    if method == 'rdp':
+        assert report['max_error_m'] <= 5.0 + 1e-6
+    assert report['peaks']['watts'][0] == report['peaks']['watts'][1]
+    assert report['simplified_length_m'] <= report['length_m']
+
+
+def test_simplify_same_for_dict_and_streamset():
+    streams = generate_strava_activity(600, gps=True)['streams']
+    from_dict, _ = simplify_track(streams, 'rdp', 3.0)
+    from_set, _ = simplify_track(StreamSet.from_strava(streams), 'rdp', 3.0)
+    assert np.array_equal(from_dict, from_set)
+
+
+def test_no_simplification_keeps_everything_and_rejects_unknown_method():
+    streams = generate_strava_activity(120, gps=True)['streams']
+    indices, report = simplify_track(streams)
+    assert len(indices) == report['points'] == 120
+    with pytest.raises(ValueError):
+        simplify_track(streams, 'spline')
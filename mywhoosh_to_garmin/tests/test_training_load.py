@@ -0,0 +1,89 @@
+"""훈련 부하 증분 계산 (CTL / ATL / TSB)"""
+from datetime import date, timedelta
+
+import pytest
+from synthetic_data import DEFAULT_START, write_fit
+
+from src.training_load import TrainingLoad, activity_load, normalized_power
+
+DAY = date(2025, 1, 1)
+LOADS = [80, 0, 120, 45, 0, 0, 200, 60, 90, 0, 30, 150]
+
+
+def full_series(data_dir, loads):
+    model = TrainingLoad(data_dir, ftp=200, lthr=170)
+    for i, load in enumerate(loads):
+        if load:
+            model.add_activity(f'{i}.fit', DAY + timedelta(days=i), load)
+    model.update(DAY + timedelta(days=len(loads) - 1))
+    return model.series()
+
+
+def test_incremental_update_matches_full_recompute(tmp_path):
+    expected = full_series(tmp_path / 'full', LOADS)
+
+    model = TrainingLoad(tmp_path / 'inc', ftp=200, lthr=170)
+    for i, load in enumerate(LOADS):
+        if load:
+            model.add_activity(f'{i}.fit', DAY + timedelta(days=i), load)
+        model.update(DAY + timedelta(days=i))
+        model.save()
+        model = TrainingLoad(tmp_path / 'inc', ftp=200, lthr=170)  # 실행마다 상태 파일에서 이어서
+    assert model.series() == expected
+
+
+def test_late_and_removed_activities_recompute_from_that_day(tmp_path):
+    model = TrainingLoad(tmp_path, ftp=200, lthr=170)
+    for i, load in enumerate(LOADS):
+        if load:
+            model.add_activity(f'{i}.fit', DAY + timedelta(days=i), load)
+    model.update(DAY + timedelta(days=len(LOADS) - 1))
+
+    # 과거 날짜 활동이 늦게 들어오고, 다른 활동은 삭제됨
+    model.add_activity('late.fit', DAY + timedelta(days=4), 70)
+    model.remove_activity('7.fit')
+    assert model.dirty_from == 4
+    days = model.update(DAY + timedelta(days=len(LOADS) - 1))
+    assert days == len(LOADS) - 4
+
+    changed = list(LOADS)
+    changed[4] += 70
+    changed[7] = 0
+    assert model.series() == full_series(tmp_path / 'full', changed)
+
+
+def test_earlier_day_extends_series_backwards(tmp_path):
+    model = TrainingLoad(tmp_path, ftp=200, lthr=170)
+    model.add_activity('b.fit', DAY + timedelta(days=5), 100)
+    model.update(DAY + timedelta(days=6))
+    model.add_activity('a.fit', DAY, 50)
+    model.update(DAY + timedelta(days=6))
+    assert model.start == DAY
+    assert [row[1] for row in model.series()] == [50, 0, 0, 0, 0, 100, 0]
+
+
+def test_tsb_is_previous_day_ctl_minus_atl(tmp_path):
+    rows = full_series(tmp_path, LOADS)
+    for previous, row in zip(rows, rows[1:]):
+        assert row[4] == pytest.approx(previous[2] - previous[3], abs=0.011)
+
+
+def test_activity_load_power_and_heart_rate():
+    assert normalized_power([200] * 600) == pytest.approx(200)
+    load, method = activity_load({'moving_time': 3600}, {'power': [200] * 3600}, ftp=200)
+    assert method == 'power' and load == pytest.approx(100)
+    load, method = activity_load({'moving_time': 1800, 'avg_heart_rate': 170}, {}, lthr=170)
+    assert method == 'hr' and load == pytest.approx(50)
+    assert activity_load({'moving_time': 0}, {}) == (None, None)
+
+
+def test_add_file_skips_unchanged_file(tmp_path):
+    fit = tmp_path / 'ride.fit'
+    write_fit(fit, 1800)
+    model = TrainingLoad(tmp_path / 'data', ftp=200, lthr=170)
+
+    assert model.add_file(fit)
+    assert not model.add_file(fit)
+    entry = model.activities['ride.fit']
+    assert entry['method'] == 'power' and entry['load'] > 0
+    assert entry['date'] == DEFAULT_START.astimezone().date().isoformat()
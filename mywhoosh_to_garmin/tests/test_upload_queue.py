@@ -0,0 +1,97 @@
+"""UploadQueue 백오프 / 격리 / 재시도 대상 판정"""
+import random
+from datetime import datetime, timedelta
+
+from src import preflight
+from src.upload_queue import (BASE_DELAY, DOWNLOAD_WINDOW, MAX_ATTEMPTS, MAX_DELAY, PERMANENT,
+                              UploadQueue, backoff_delay)
+
+NOW = datetime(2025, 6, 1, 12, 0)
+
+
+def test_backoff_doubles_with_jitter_and_caps():
+    rng = random.Random(0)
+    for attempts in range(1, 12):
+        base = min(BASE_DELAY * 2 ** (attempts - 1), MAX_DELAY)
+        delay = backoff_delay(attempts, rng)
+        assert base * 0.5 <= delay <= base
+    assert backoff_delay(30, rng) <= MAX_DELAY
+
+
+def test_transient_failures_wait_then_dead_letter(tmp_path):
+    queue = UploadQueue(tmp_path)
+    fit = tmp_path / '2025-06-01.fit'
+    fit.write_bytes(b'fit')
+
+    entry = queue.record_failure(fit, 'timeout', now=NOW)
+    assert entry['attempts'] == 1
+    assert queue.is_waiting(fit.name, NOW)
+    assert queue.due(NOW) == []
+    later = queue.next_attempt_at(fit.name)
+    assert queue.due(later) == [str(fit)]
+
+    for attempt in range(2, MAX_ATTEMPTS + 1):
+        entry = queue.record_failure(fit, 'timeout', now=NOW)
+    assert 'dead_letter' in entry
+    assert queue.is_dead(fit.name)
+    assert queue.summary() == {'pending': 0, 'dead_letter': 1}
+
+    # 파일에서 다시 읽어도 같은 상태
+    assert UploadQueue(tmp_path).is_dead(fit.name)
+    assert queue.release() == 1
+    assert not queue.is_dead(fit.name)
+
+
+def test_permanent_failure_is_dead_immediately(tmp_path):
+    queue = UploadQueue(tmp_path)
+    entry = queue.record_failure(tmp_path / 'bad.fit', 'invalid file', PERMANENT, now=NOW)
+    assert entry['attempts'] == 1
+    assert queue.is_dead('bad.fit')
+
+
+def test_has_due_matches_due_for_missing_files(tmp_path):
+    queue = UploadQueue(tmp_path)
+    fit = tmp_path / '2025-06-01.fit'
+    queue.record_failure(fit, 'timeout', now=NOW)
+    later = NOW + MAX_DELAY
+
+    assert queue.due(later) == []
+    assert not queue.has_due(later)
+
+    fit.write_bytes(b'fit')
+    assert queue.due(later) == [str(fit)]
+    assert queue.has_due(later)
+
+
+def test_missing_file_expires_after_download_window(tmp_path):
+    queue = UploadQueue(tmp_path)
+    missing = tmp_path / '2025-06-01.fit'
+    kept = tmp_path / '2025-06-02.fit'
+    kept.write_bytes(b'fit')
+    queue.record_failure(missing, 'timeout', now=NOW)
+    queue.record_failure(kept, 'timeout', now=NOW)
+
+    # 기간 안에서는 다시 다운로드될 수 있으니 대기 유지
+    assert queue.expire_missing(NOW + DOWNLOAD_WINDOW) == 0
+    assert queue.summary() == {'pending': 2, 'dead_letter': 0}
+
+    later = NOW + DOWNLOAD_WINDOW + timedelta(days=1)
+    assert queue.due(later) == [str(kept)]
+    assert queue.is_dead(missing.name)
+    assert not queue.is_dead(kept.name)
+    assert UploadQueue(tmp_path).summary() == {'pending': 1, 'dead_letter': 1}
+
+
+def test_preflight_ignores_retries_whose_file_is_gone(tmp_path, monkeypatch):
+    monkeypatch.delenv('FORCE_SYNC', raising=False)
+    queue = UploadQueue(tmp_path)
+    queue.record_failure(tmp_path / 'gone.fit', 'timeout', now=NOW)
+
+    class History:
+        def get_sync_state(self):
+            return {'last_sync': NOW.isoformat()}
+
+    monkeypatch.setenv('SYNC_MIN_INTERVAL_MINUTES', str(60 * 24 * 365))
+    result = preflight.check(History(), queue, now=NOW + DOWNLOAD_WINDOW * 2)
+    assert not result.run_needed
+    assert queue.is_dead('gone.fit')
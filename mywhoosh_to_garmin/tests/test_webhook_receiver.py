@@ -0,0 +1,65 @@
+"""Strava 웹훅 수신기 이벤트 검증"""
+import importlib.util
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).parent.parent / 'scripts' / 'strava' / 'webhook_receiver.py'
+spec = importlib.util.spec_from_file_location('webhook_receiver', SCRIPT)
+webhook_receiver = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(webhook_receiver)
+
+
+@pytest.fixture
+def receiver(tmp_path):
+    spool = webhook_receiver.EventSpool(tmp_path / 'spool')
+    stats = webhook_receiver.Stats()
+    handler = webhook_receiver.make_handler(spool, 'token', stats, subscription_id='7')
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/", spool, stats
+    server.shutdown()
+    server.server_close()
+
+
+def post(url, body):
+    request = urllib.request.Request(url, data=json.dumps(body).encode(), method='POST',
+                                     headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def event(subscription_id):
+    return {'aspect_type': 'create', 'event_time': 1, 'object_id': 123,
+            'object_type': 'activity', 'owner_id': 1, 'subscription_id': subscription_id}
+
+
+@pytest.mark.parametrize('body', [[1, 2], 42, 'text', None])
+def test_non_object_body_is_rejected(receiver, body):
+    url, spool, _ = receiver
+    assert post(url, body) == 400
+    assert spool.pending_count() == 0
+
+
+def test_foreign_subscription_is_rejected(receiver):
+    url, spool, stats = receiver
+    assert post(url, event(8)) == 403
+    assert post(url, {'object_type': 'activity', 'object_id': 123}) == 403
+    assert spool.pending_count() == 0
+    assert stats.snapshot()['rejected'] == 2
+
+
+def test_matching_subscription_is_spooled(receiver):
+    url, spool, stats = receiver
+    assert post(url, event(7)) == 200
+    assert spool.pending_count() == 1
+    assert stats.snapshot()['received'] == 1